@@ -0,0 +1,70 @@
+"""
+模板对象构建性能基准
+对比每个视频媒体构建草稿模板对象的开销：
+before - 每次都执行模板字面量并为每个子对象生成uuid4（模板工厂之前的做法）
+after  - 通过模板工厂复制预构建的模板，只填入id字段
+
+运行: python .test/benchmark_template.py [片段数量]
+"""
+import os
+import sys
+import time
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core import template
+from JianYingDraft.utils import tools
+
+# Media/MediaVideo为每个视频媒体构建的模板
+VIDEO_MEDIA_BUILDERS = [
+    template._build_material_for_meta_info,
+    template._build_sound_channel_mapping,
+    template._build_canvas,
+    template._build_speed,
+    template._build_video,
+    template._build_segment,
+]
+
+VIDEO_MEDIA_GETTERS = [
+    template.get_material_for_meta_info,
+    template.get_sound_channel_mapping,
+    template.get_canvas,
+    template.get_speed,
+    template.get_video,
+    template.get_segment,
+]
+
+
+def build_before(clip_count: int, with_id: bool = True):
+    for _ in range(clip_count):
+        for builder in VIDEO_MEDIA_BUILDERS:
+            data = builder()
+            data["id"] = tools.generate_id() if with_id else ""
+
+
+def build_after(clip_count: int, with_id: bool = True):
+    for _ in range(clip_count):
+        for getter in VIDEO_MEDIA_GETTERS:
+            getter(None if with_id else "")
+
+
+def measure(func, clip_count: int, with_id: bool) -> float:
+    start = time.perf_counter()
+    func(clip_count, with_id)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    clip_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    # 预热（模板工厂首次调用时构建模板）
+    build_before(100)
+    build_after(100)
+
+    print(f"📊 {clip_count}个视频片段的模板对象构建耗时")
+    for with_id, title in ((True, "含id生成"), (False, "仅模板结构")):
+        before = measure(build_before, clip_count, with_id)
+        after = measure(build_after, clip_count, with_id)
+        print(f"  [{title}] before: {before:.3f}s（每片段 {before / clip_count * 1e6:.1f}µs）  "
+              f"after: {after:.3f}s（每片段 {after / clip_count * 1e6:.1f}µs）  加速比: {before / after:.2f}x")
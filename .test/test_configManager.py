@@ -0,0 +1,104 @@
+"""
+配置快照与批量更新测试用例
+"""
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from unittest.mock import patch
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core.configManager import SimpleConfigHelper, AutoMixConfigManager, AutoMixConfigSnapshot
+
+
+class TestAutoMixConfig(unittest.TestCase):
+    """配置快照与批量更新测试类"""
+
+    def setUp(self):
+        """每个用例使用独立的配置文件"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, '_projectConfig.ini')
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            f.write(f"[{AutoMixConfigManager.SECTION_NAME}]\neffect_probability = 0.5\nbatch_count = 7\n")
+
+        self._saved = (SimpleConfigHelper._config_file, SimpleConfigHelper._config,
+                       SimpleConfigHelper._config_mtime, AutoMixConfigManager._snapshot)
+        SimpleConfigHelper._config_file = self.config_file
+        SimpleConfigHelper._config = None
+        SimpleConfigHelper._config_mtime = None
+        AutoMixConfigManager._snapshot = None
+
+    def tearDown(self):
+        (SimpleConfigHelper._config_file, SimpleConfigHelper._config,
+         SimpleConfigHelper._config_mtime, AutoMixConfigManager._snapshot) = self._saved
+        shutil.rmtree(self.test_dir)
+
+    def _read_config(self):
+        with open(self.config_file, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_snapshot_is_typed_and_immutable(self):
+        """快照按默认值类型转换配置值，不可修改，配置文件未变化时复用同一个快照"""
+        snapshot = AutoMixConfigManager.get_snapshot()
+        self.assertIsInstance(snapshot, AutoMixConfigSnapshot)
+        self.assertEqual(snapshot.get_effect_probability(), 0.5)
+        self.assertEqual(snapshot.get_batch_count(), 7)
+        self.assertEqual(snapshot['overlay_pool_size'], AutoMixConfigManager.DEFAULT_CONFIG['overlay_pool_size'])
+        self.assertIs(AutoMixConfigManager.get_snapshot(), snapshot)
+
+        with self.assertRaises(AttributeError):
+            snapshot.batch_count = 1
+        with self.assertRaises(AttributeError):
+            snapshot.set_batch_count(1)
+
+    def test_snapshot_is_unchanged_after_update(self):
+        """update()之后已取得的快照保持原值，新的快照反映新值"""
+        snapshot = AutoMixConfigManager.get_snapshot()
+
+        self.assertEqual(AutoMixConfigManager.update(batch_count=9, effect_probability='0.25'), (True, []))
+
+        self.assertEqual(snapshot.get_batch_count(), 7)
+        self.assertEqual(snapshot.get_effect_probability(), 0.5)
+        updated = AutoMixConfigManager.get_snapshot()
+        self.assertIsNot(updated, snapshot)
+        self.assertEqual(updated.get_batch_count(), 9)
+        self.assertEqual(updated.get_effect_probability(), 0.25)
+
+    def test_update_writes_file_once_atomically(self):
+        """批量更新只原子替换一次配置文件，不留下临时文件"""
+        with patch('JianYingDraft.core.configManager.os.replace', wraps=os.replace) as replace:
+            success, errors = AutoMixConfigManager.update(batch_count=3, filter_probability=0.4,
+                                                         enable_pexels_overlay='false')
+
+        self.assertTrue(success, errors)
+        replace.assert_called_once_with(f"{self.config_file}.tmp", self.config_file)
+        self.assertEqual(os.listdir(self.test_dir), ['_projectConfig.ini'])
+        content = self._read_config()
+        for line in ('batch_count = 3', 'filter_probability = 0.4', 'enable_pexels_overlay = False',
+                     'effect_probability = 0.5'):
+            self.assertIn(line, content)
+
+    def test_out_of_range_probability_is_rejected(self):
+        """概率超出0-1范围时整批更新被拒绝，配置文件保持不变"""
+        before = self._read_config()
+        mtime = os.stat(self.config_file).st_mtime_ns
+
+        success, errors = AutoMixConfigManager.update(batch_count=3, flip_probability=1.5)
+        self.assertFalse(success)
+        self.assertEqual(len(errors), 1)
+        self.assertIn('flip_probability', errors[0])
+
+        success, errors = AutoMixConfigManager.update(effect_probability=-0.1, batch_count='many')
+        self.assertFalse(success)
+        self.assertEqual(len(errors), 2)
+
+        self.assertEqual(self._read_config(), before)
+        self.assertEqual(os.stat(self.config_file).st_mtime_ns, mtime)
+        self.assertEqual(AutoMixConfigManager.get_snapshot().get_batch_count(), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
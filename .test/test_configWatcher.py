@@ -0,0 +1,113 @@
+"""
+配置文件监视器测试用例
+"""
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core.configManager import SimpleConfigHelper, AutoMixConfigManager
+from JianYingDraft.core.configWatcher import ConfigWatcher
+
+
+class TestConfigWatcher(unittest.TestCase):
+    """配置文件监视器测试类"""
+
+    def setUp(self):
+        """每个用例使用独立的配置文件"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, '_projectConfig.ini')
+        self._write_config(batch_count=5)
+
+        self._saved = (SimpleConfigHelper._config_file, SimpleConfigHelper._config,
+                       SimpleConfigHelper._config_mtime, AutoMixConfigManager._snapshot)
+        SimpleConfigHelper._config_file = self.config_file
+        SimpleConfigHelper._config = None
+        SimpleConfigHelper._config_mtime = None
+        AutoMixConfigManager._snapshot = None
+
+        self.watcher = ConfigWatcher(interval=0.01)
+        self.events = []
+
+    def tearDown(self):
+        self.watcher.stop()
+        (SimpleConfigHelper._config_file, SimpleConfigHelper._config,
+         SimpleConfigHelper._config_mtime, AutoMixConfigManager._snapshot) = self._saved
+        shutil.rmtree(self.test_dir)
+
+    def _write_config(self, **values):
+        """外部修改配置文件，并确保修改时间发生变化"""
+        lines = [f"[{AutoMixConfigManager.SECTION_NAME}]"] + [f"{key} = {value}" for key, value in values.items()]
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        self._bump_mtime()
+
+    def _bump_mtime(self):
+        stat = os.stat(self.config_file)
+        os.utime(self.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+    def test_only_value_changes_are_notified(self):
+        """修改时间变化但配置值不变时不通知；配置值变化时版本号递增并列出变化的配置项"""
+        self.watcher.subscribe(self.events.append)
+        self.assertIsNone(self.watcher.check())
+        self.assertEqual(self.watcher.get_snapshot().get_batch_count(), 5)
+
+        # 文件未变化、只touch文件都不触发通知
+        self.assertIsNone(self.watcher.check())
+        self._bump_mtime()
+        self.assertIsNone(self.watcher.check())
+        self.assertEqual(self.watcher.version, 0)
+
+        self._write_config(batch_count=8, filter_probability=0.3)
+        event = self.watcher.check()
+        self.assertEqual(event['version'], 1)
+        self.assertEqual(event['changed_keys'], ['batch_count', 'filter_probability'])
+        self.assertEqual(event['snapshot'].get_batch_count(), 8)
+        self.assertIs(self.watcher.get_snapshot(), event['snapshot'])
+        self.assertEqual(self.events, [event])
+
+        self._write_config(batch_count=9, filter_probability=0.3)
+        self.assertEqual(self.watcher.check()['changed_keys'], ['batch_count'])
+        self.assertEqual(self.watcher.version, 2)
+
+    def test_subscribe_and_unsubscribe(self):
+        """重复订阅只通知一次，取消订阅后不再通知，单个订阅者出错不影响其他订阅者"""
+        def failing_callback(event):
+            raise RuntimeError('boom')
+
+        self.watcher.subscribe(failing_callback)
+        self.watcher.subscribe(self.events.append)
+        self.watcher.subscribe(self.events.append)
+        self.watcher.check()
+
+        self._write_config(batch_count=6)
+        self.watcher.check()
+        self.assertEqual(len(self.events), 1)
+
+        self.watcher.unsubscribe(self.events.append)
+        self.watcher.unsubscribe(self.events.append)
+        self._write_config(batch_count=7)
+        self.assertIsNotNone(self.watcher.check())
+        self.assertEqual(len(self.events), 1)
+
+    def test_background_thread_detects_changes(self):
+        """后台线程轮询修改时间，发现变化后通知订阅者"""
+        self.watcher.subscribe(self.events.append)
+        self.watcher.start()
+        self.watcher.start()
+        self._write_config(batch_count=11)
+
+        deadline = time.time() + 5
+        while not self.events and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual([event['changed_keys'] for event in self.events], [['batch_count']])
+        self.assertEqual(AutoMixConfigManager.get_snapshot().get_batch_count(), 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
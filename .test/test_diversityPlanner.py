@@ -0,0 +1,72 @@
+"""
+批量多样性规划器测试用例
+"""
+import unittest
+import os
+import sys
+import random
+from itertools import combinations
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core.diversityPlanner import DiversityPlanner
+
+
+class TestDiversityPlanner(unittest.TestCase):
+    """批量多样性规划器测试类"""
+
+    def setUp(self):
+        self.videos = [
+            {'path': f'/materials/A83/folder{folder}/clip{clip}.mp4', 'folder_name': f'folder{folder}'}
+            for folder in range(8) for clip in range(4)
+        ]
+        self.filters = [f'filter{i}' for i in range(30)]
+        self.effects = [f'effect{i}' for i in range(30)]
+        self.transitions = [f'transition{i}' for i in range(20)]
+
+    def _create_planner(self, seed):
+        return DiversityPlanner(self.videos, self.filters, self.effects, self.transitions, rng=random.Random(seed))
+
+    def _random_plan(self, rng, video_count):
+        """每个草稿独立随机选择（规划前的做法）"""
+        folders = rng.sample(sorted({video['folder_name'] for video in self.videos}), video_count)
+        return {
+            'videos': [rng.choice([v['path'] for v in self.videos if v['folder_name'] == f]) for f in folders],
+            'filters': [rng.choice(self.filters) for _ in range(video_count)],
+            'effects': [rng.choice(self.effects) for _ in range(video_count)],
+            'transitions': [rng.choice(self.transitions) for _ in range(video_count - 1)]
+        }
+
+    def test_plan_respects_segment_structure(self):
+        """每个文件夹最多一个视频，滤镜/特效与片段数一致，转场比片段少一个"""
+        plans = self._create_planner(1).plan([5, 3, 10])
+
+        self.assertEqual([len(plan['videos']) for plan in plans], [5, 3, 8])
+        for plan in plans:
+            folders = [os.path.basename(os.path.dirname(path)) for path in plan['videos']]
+            self.assertEqual(len(folders), len(set(folders)))
+            self.assertEqual(len(plan['filters']), len(plan['videos']))
+            self.assertEqual(len(plan['effects']), len(plan['videos']))
+            self.assertEqual(len(plan['transitions']), len(plan['videos']) - 1)
+
+    def test_plan_is_reproducible_with_seed(self):
+        """相同种子得到相同方案"""
+        self.assertEqual(self._create_planner(42).plan([5] * 6), self._create_planner(42).plan([5] * 6))
+
+    def test_plan_is_more_diverse_than_independent_choice(self):
+        """规划后的批量最小两两距离不低于独立随机选择"""
+        def min_pairwise(plans):
+            return min(DiversityPlanner.distance(a, b) for a, b in combinations(plans, 2))
+
+        planned = [min_pairwise(self._create_planner(seed).plan([5] * 12)) for seed in range(5)]
+        baseline = []
+        for seed in range(5):
+            rng = random.Random(seed)
+            baseline.append(min_pairwise([self._random_plan(rng, 5) for _ in range(12)]))
+
+        self.assertGreater(sum(planned) / len(planned), sum(baseline) / len(baseline))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+草稿对象id生成器测试用例
+"""
+import unittest
+import os
+import re
+import sys
+import subprocess
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pyJianYingDraft.id_provider import Id_provider, Sequential_id_provider, get_id_provider, set_id_provider, \
+    id_scope, new_id
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+UUID4_PATTERN = re.compile(r'^[0-9A-F]{8}-[0-9A-F]{4}-4[0-9A-F]{3}-[89AB][0-9A-F]{3}-[0-9A-F]{12}$')
+
+
+class TestIdProvider(unittest.TestCase):
+    """id生成器测试类"""
+
+    def tearDown(self):
+        set_id_provider(None)
+
+    def test_sequential_ids_are_unique_and_uuid_shaped(self):
+        """顺序id互不重复，且符合uuid4的布局"""
+        provider = Sequential_id_provider()
+        ids = [provider.new_uuid() for _ in range(1000)]
+        self.assertEqual(len(set(ids)), len(ids))
+        for value in ids[:5] + ids[-5:]:
+            self.assertRegex(value, UUID4_PATTERN)
+
+        hex_id = provider.new_hex()
+        self.assertEqual(len(hex_id), 32)
+        self.assertEqual(hex_id, hex_id.lower())
+
+    def test_seed_reproduces_sequence(self):
+        """相同种子生成相同的id序列，不同种子前缀不同"""
+        first, second = Sequential_id_provider(42), Sequential_id_provider(42)
+        self.assertEqual([first.new_hex() for _ in range(3)], [second.new_hex() for _ in range(3)])
+        self.assertNotEqual(Sequential_id_provider(43).new_hex(), Sequential_id_provider(42).new_hex())
+
+    def test_global_and_scoped_selection(self):
+        """全局设置与id_scope范围内的设置，离开范围后恢复"""
+        self.assertIs(type(get_id_provider()), Id_provider)
+
+        global_provider = Sequential_id_provider(1)
+        set_id_provider(global_provider)
+        self.assertEqual(new_id(), Sequential_id_provider(1).new_hex())
+
+        scoped_provider = Sequential_id_provider(2)
+        with id_scope(scoped_provider):
+            self.assertIs(get_id_provider(), scoped_provider)
+            with id_scope(None):
+                self.assertIs(get_id_provider(), scoped_provider)
+        self.assertIs(get_id_provider(), global_provider)
+
+        set_id_provider(None)
+        self.assertIs(type(get_id_provider()), Id_provider)
+
+    def test_legacy_builder_does_not_import_uiautomation(self):
+        """旧版草稿构建器使用id生成器和探测缓存时不导入仅Windows可用的uiautomation"""
+        code = ("import sys\n"
+                "import JianYingDraft.utils.tools, JianYingDraft.core.mediaFactory\n"
+                "print('pyJianYingDraft' in sys.modules, 'uiautomation' in sys.modules)")
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.split(), ['True', 'False'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+混剪任务日志测试用例
+"""
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+from unittest.mock import Mock
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core.jobJournal import JobJournal
+
+
+def _plan(count):
+    """生成草稿计划列表"""
+    return [{'index': i + 1, 'duration': 30, 'seed': 1000 + i} for i in range(count)]
+
+
+class TestJobJournal(unittest.TestCase):
+    """混剪任务日志测试类"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.journal_file = os.path.join(self.test_dir, 'data', 'job_journal.jsonl')
+        self.journal = JobJournal(self.journal_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _read_records(self):
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_append_and_load_jobs(self):
+        """追加的记录按行写入，回放后得到每个任务的计划、已结束草稿与结束状态"""
+        self.journal.record_job_planned('job-a', 'batch', 'A', _plan(3), {'count': 3})
+        self.journal.record_draft_finished('job-a', 1, 'success', 'A_1', '/drafts/A_1', extra={'video_count': 5})
+        self.journal.record_draft_finished('job-a', 2, 'failed', error='boom')
+        self.journal.record_job_finished('job-a', 'failed')
+
+        records = self._read_records()
+        self.assertEqual([record['event'] for record in records],
+                         ['job_planned', 'draft_finished', 'draft_finished', 'job_finished'])
+        self.assertTrue(all('timestamp' in record for record in records))
+
+        job = self.journal.load_jobs()['job-a']
+        self.assertEqual(job['job_type'], 'batch')
+        self.assertEqual(job['params'], {'count': 3})
+        self.assertEqual(job['drafts'], _plan(3))
+        self.assertEqual(sorted(job['finished']), [1, 2])
+        self.assertEqual(job['finished'][1]['extra'], {'video_count': 5})
+        self.assertEqual(job['finished'][2]['error'], 'boom')
+        self.assertEqual(job['status'], 'failed')
+
+    def test_load_unfinished_jobs(self):
+        """只返回没有job_finished记录的任务，按计划时间排序并列出尚未完成的草稿"""
+        self.journal.record_job_planned('job-done', 'single', 'A', _plan(1))
+        self.journal.record_draft_finished('job-done', 1, 'success', 'A_1', '/drafts/A_1')
+        self.journal.record_job_finished('job-done', 'completed')
+        self.journal.record_job_planned('job-b', 'batch', 'B', _plan(3))
+        self.journal.record_job_planned('job-c', 'batch', 'C', _plan(2))
+        self.journal.record_draft_finished('job-b', 2, 'success', 'B_2', '/drafts/B_2')
+        # 没有计划记录的任务无法续跑，忽略
+        self.journal.record_draft_finished('job-unknown', 1, 'success')
+
+        unfinished = self.journal.load_unfinished_jobs()
+        self.assertEqual([job['job_id'] for job in unfinished], ['job-b', 'job-c'])
+        self.assertEqual([draft['index'] for draft in unfinished[0]['pending_drafts']], [1, 3])
+        self.assertEqual([draft['index'] for draft in unfinished[1]['pending_drafts']], [1, 2])
+
+    def test_truncated_last_line_is_ignored(self):
+        """崩溃时写了一半的最后一行被忽略，之前的记录仍然有效，之后的追加不受影响"""
+        self.journal.record_job_planned('job-a', 'batch', 'A', _plan(3))
+        self.journal.record_draft_finished('job-a', 1, 'success', 'A_1', '/drafts/A_1')
+        line = json.dumps({'event': 'draft_finished', 'job_id': 'job-a', 'index': 2, 'status': 'success'})
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write(line[:len(line) // 2])
+
+        unfinished = self.journal.load_unfinished_jobs()
+        self.assertEqual(len(unfinished), 1)
+        self.assertEqual(sorted(unfinished[0]['finished']), [1])
+        self.assertEqual([draft['index'] for draft in unfinished[0]['pending_drafts']], [2, 3])
+
+        # 压缩后半行记录被丢弃，新的记录从完整的一行开始
+        self.journal.compact()
+        self.journal.record_draft_finished('job-a', 2, 'success', 'A_2', '/drafts/A_2')
+        self.assertEqual([record['event'] for record in self._read_records()],
+                         ['job_planned', 'draft_finished', 'draft_finished'])
+        job = self.journal.load_unfinished_jobs()[0]
+        self.assertEqual([draft['index'] for draft in job['pending_drafts']], [3])
+
+    def test_compact_keeps_only_unfinished_jobs(self):
+        """压缩后只保留未完成任务的计划与草稿记录，回放结果不变"""
+        self.journal.record_job_planned('job-done', 'single', 'A', _plan(1))
+        self.journal.record_draft_finished('job-done', 1, 'success', 'A_1', '/drafts/A_1')
+        self.journal.record_job_finished('job-done', 'completed')
+        self.journal.record_job_planned('job-b', 'batch', 'B', _plan(3), {'count': 3})
+        self.journal.record_draft_finished('job-b', 2, 'success', 'B_2', '/drafts/B_2')
+        self.journal.record_draft_finished('job-b', 1, 'failed', error='boom')
+        before = self.journal.load_unfinished_jobs()
+
+        self.journal.compact()
+
+        records = self._read_records()
+        self.assertEqual({record['job_id'] for record in records}, {'job-b'})
+        self.assertEqual([record.get('index') for record in records], [None, 1, 2])
+        self.assertFalse(os.path.exists(f"{self.journal_file}.tmp"))
+        self.assertEqual(self.journal.load_unfinished_jobs(), before)
+
+    def test_resume_starts_from_first_unfinished_draft(self):
+        """续跑沿用原任务ID与计划，已结束的草稿作为finished传入，全部草稿都已结束的任务直接补记结束"""
+        from web_interface import OptimizedWebInterface
+
+        self.journal.record_job_planned('job-b', 'batch', 'B', _plan(4), {'count': 4})
+        self.journal.record_draft_finished('job-b', 1, 'success', 'B_1', '/drafts/B_1')
+        self.journal.record_draft_finished('job-b', 2, 'failed', error='boom')
+        self.journal.record_job_planned('job-c', 'single', 'C', _plan(1))
+        self.journal.record_draft_finished('job-c', 1, 'success', 'C_1', '/drafts/C_1')
+
+        interface = Mock(job_journal=self.journal)
+        OptimizedWebInterface._resume_unfinished_jobs(interface)
+
+        interface._submit_planned_job.assert_called_once()
+        args, kwargs = interface._submit_planned_job.call_args
+        self.assertEqual(args, ('batch', 'B', _plan(4), {'count': 4}))
+        self.assertEqual(kwargs['job_id'], 'job-b')
+        self.assertEqual(sorted(kwargs['finished']), [1, 2])
+        pending = [draft['index'] for draft in args[2] if draft['index'] not in kwargs['finished']]
+        self.assertEqual(pending[0], 3)
+
+        # 续跑不会重复记录任务计划；只剩续跑中的任务未结束
+        self.assertEqual(sum(record['event'] == 'job_planned' and record['job_id'] == 'job-b'
+                             for record in self._read_records()), 1)
+        self.assertEqual([job['job_id'] for job in self.journal.load_unfinished_jobs()], ['job-b'])
+        self.assertEqual(self.journal.load_jobs()['job-c']['status'], 'completed')
+
+    def test_importing_web_interface_does_not_resume_jobs(self):
+        """导入web_interface不会创建Web界面实例，也就不会续跑任务或写入data目录下的任务日志"""
+        import web_interface
+
+        self.assertIsNone(web_interface._web_interface)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+混剪任务队列测试用例
+"""
+import unittest
+import os
+import sys
+import threading
+import time
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core.jobQueue import AutoMixJob, AutoMixJobQueue, JobCancelledError
+
+
+def _wait_until(predicate, timeout=5.0):
+    """等待条件成立"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class _BlockingRunner:
+    """阻塞直到被放行的任务执行函数，记录同时运行的任务数量"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, job):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            while not self.release.wait(0.01):
+                job.check_cancelled()
+            job.update(result={'success': True})
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+class TestJobQueue(unittest.TestCase):
+    """混剪任务队列测试类"""
+
+    def test_submitted_job_runs_to_completion(self):
+        """提交的任务在工作线程中执行并记录结果"""
+        job_queue = AutoMixJobQueue(max_workers=1)
+        job = job_queue.submit('single', lambda job: job.update(result={'success': True}), {'product': 'A'})
+
+        self.assertTrue(_wait_until(lambda: job.is_finished))
+        self.assertEqual(job.status, AutoMixJob.STATUS_COMPLETED)
+        self.assertEqual(job.to_dict()['result'], {'success': True})
+        self.assertEqual(job_queue.list_jobs()[0]['job_id'], job.job_id)
+
+    def test_failed_job_records_error(self):
+        """执行函数抛出异常时任务标记为失败"""
+        def runner(job):
+            raise RuntimeError('boom')
+
+        job = AutoMixJobQueue(max_workers=1).submit('single', runner)
+        self.assertTrue(_wait_until(lambda: job.is_finished))
+        self.assertEqual(job.status, AutoMixJob.STATUS_FAILED)
+        self.assertEqual(job.get('error'), 'boom')
+
+    def test_concurrency_is_limited(self):
+        """同时运行的任务数量不超过max_workers，其余任务排队等待"""
+        runner = _BlockingRunner()
+        job_queue = AutoMixJobQueue(max_workers=2)
+        jobs = [job_queue.submit('single', runner) for _ in range(4)]
+
+        self.assertTrue(_wait_until(lambda: runner.running == 2))
+        time.sleep(0.05)
+        self.assertEqual(runner.max_running, 2)
+        self.assertEqual(sum(job.status == AutoMixJob.STATUS_QUEUED for job in jobs), 2)
+
+        runner.release.set()
+        self.assertTrue(_wait_until(lambda: all(job.is_finished for job in jobs)))
+        self.assertEqual(runner.max_running, 2)
+        self.assertTrue(all(job.status == AutoMixJob.STATUS_COMPLETED for job in jobs))
+
+    def test_lowering_max_workers_takes_effect(self):
+        """调低max_workers后多余线程退出，同时运行的任务数量随之减少"""
+        job_queue = AutoMixJobQueue(max_workers=3)
+        job_queue.IDLE_CHECK_INTERVAL = 0.01
+        first = _BlockingRunner()
+        jobs = [job_queue.submit('single', first) for _ in range(3)]
+        self.assertTrue(_wait_until(lambda: first.running == 3))
+
+        job_queue.set_max_workers(1)
+        first.release.set()
+        self.assertTrue(_wait_until(lambda: all(job.is_finished for job in jobs)))
+        self.assertTrue(_wait_until(lambda: len([w for w in job_queue._workers if w.is_alive()]) == 1))
+
+        second = _BlockingRunner()
+        jobs = [job_queue.submit('single', second) for _ in range(3)]
+        self.assertTrue(_wait_until(lambda: second.running == 1))
+        time.sleep(0.05)
+        self.assertEqual(second.max_running, 1)
+        second.release.set()
+        self.assertTrue(_wait_until(lambda: all(job.is_finished for job in jobs)))
+
+        job_queue.set_max_workers(2)
+        self.assertEqual(len(job_queue._workers), 2)
+
+    def test_cancel_queued_and_running_jobs(self):
+        """排队中的任务立即取消且不会执行，运行中的任务在检查点停止"""
+        runner = _BlockingRunner()
+        job_queue = AutoMixJobQueue(max_workers=1)
+        running_job = job_queue.submit('single', runner)
+        self.assertTrue(_wait_until(lambda: running_job.status == AutoMixJob.STATUS_RUNNING))
+        queued_job = job_queue.submit('single', runner)
+
+        self.assertTrue(job_queue.cancel(queued_job.job_id))
+        self.assertEqual(queued_job.status, AutoMixJob.STATUS_CANCELLED)
+        self.assertTrue(job_queue.cancel(running_job.job_id))
+
+        self.assertTrue(_wait_until(lambda: running_job.is_finished))
+        self.assertEqual(running_job.status, AutoMixJob.STATUS_CANCELLED)
+        self.assertFalse(job_queue.cancel(running_job.job_id))
+        time.sleep(0.05)
+        self.assertEqual(runner.max_running, 1)
+        self.assertIsNone(queued_job.get('started_at'))
+
+    def test_check_cancelled_raises(self):
+        """请求取消后检查点抛出JobCancelledError"""
+        job = AutoMixJob('single', {})
+        job.check_cancelled()
+        job.request_cancel()
+        with self.assertRaises(JobCancelledError):
+            job.check_cancelled()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,4 +23,20 @@ def test_create():
     assert isinstance(actual, MediaImage)
 
 
+def test_probe_many():
+    root_path = ProjectHelper.get_root_physical_path()
+    video = os.path.join(root_path, ".test/_res/my-video.mov")
+    audio = os.path.join(root_path, ".test/_res/my-audio.mp3")
+    missing = os.path.join(root_path, ".test/_res/not-exists.mp4")
+
+    actual = MediaFactory.probe_many([video, audio, video, missing])
+    assert actual[0]["track_type"] == "Video"
+    assert actual[1]["track_type"] == "Audio"
+    assert actual[2] is actual[0]
+    assert actual[3] is None
+
+    media = MediaFactory.create_from_media_info(audio, actual[1])
+    assert isinstance(media, MediaAudio)
+
+
 pass
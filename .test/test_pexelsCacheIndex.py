@@ -0,0 +1,116 @@
+"""
+Pexels缓存索引测试用例
+"""
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core.pexelsCacheIndex import PexelsCacheIndex
+
+
+class TestPexelsCacheIndex(unittest.TestCase):
+    """Pexels缓存索引测试类"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _write_file(self, filename, size=1000):
+        with open(os.path.join(self.cache_dir, filename), 'wb') as f:
+            f.write(b'x' * size)
+
+    def _set_last_access(self, index, filename, seconds_ago):
+        with index._lock:
+            index._entries[filename]['last_access'] = time.time() - seconds_ago
+
+    def _read_index(self):
+        with open(os.path.join(self.cache_dir, PexelsCacheIndex.INDEX_FILENAME), 'r', encoding='utf-8') as f:
+            return json.load(f)['entries']
+
+    def test_evict_removes_least_recently_used_first(self):
+        """超过容量上限时按最近访问时间从旧到新淘汰，直到总大小不超过上限"""
+        index = PexelsCacheIndex(self.cache_dir, max_bytes=0, max_age_seconds=0, flush_delay=0)
+        for i, seconds_ago in enumerate((30, 10, 40, 20)):
+            self._write_file(f'v{i}.mp4')
+            index.add(f'v{i}.mp4')
+            index._evict_thread.join()
+            self._set_last_access(index, f'v{i}.mp4', seconds_ago)
+        index.touch('v2.mp4')
+
+        index.max_bytes = 2500
+        self.assertEqual(index.evict(), {'removed_count': 2, 'freed_bytes': 2000})
+
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ['cache_index.json', 'v1.mp4', 'v2.mp4'])
+        self.assertEqual(sorted(self._read_index()), ['v1.mp4', 'v2.mp4'])
+        self.assertEqual(index.get_info()['total_size'], 2000)
+
+    def test_evict_removes_expired_files(self):
+        """超过最长保留时间未访问的文件被淘汰，未超过容量上限时其他文件保留"""
+        index = PexelsCacheIndex(self.cache_dir, max_bytes=10000, max_age_seconds=60, flush_delay=0)
+        for filename in ('old.mp4', 'recent.mp4'):
+            self._write_file(filename)
+            index.add(filename)
+            index._evict_thread.join()
+        self._set_last_access(index, 'old.mp4', 120)
+        self._set_last_access(index, 'recent.mp4', 30)
+
+        self.assertEqual(index.evict()['removed_count'], 1)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ['cache_index.json', 'recent.mp4'])
+        self.assertEqual(index.evict()['removed_count'], 0)
+
+    def test_rebuild_syncs_with_directory(self):
+        """加载时与缓存目录核对：补登外部新增的文件，删除已不存在的记录，保留原有访问时间"""
+        index = PexelsCacheIndex(self.cache_dir, max_bytes=0, max_age_seconds=0, flush_delay=0)
+        for filename in ('kept.mp4', 'deleted.mp4'):
+            self._write_file(filename)
+            index.add(filename)
+            index._evict_thread.join()
+        self._set_last_access(index, 'kept.mp4', 500)
+        index.flush()
+        last_access = self._read_index()['kept.mp4']['last_access']
+
+        os.remove(os.path.join(self.cache_dir, 'deleted.mp4'))
+        self._write_file('external.mp4', size=300)
+        self._write_file('partial.mp4.part')
+        os.makedirs(os.path.join(self.cache_dir, 'overlays'))
+
+        reloaded = PexelsCacheIndex(self.cache_dir, max_bytes=0, max_age_seconds=0, flush_delay=0)
+        entries = self._read_index()
+        self.assertEqual(sorted(entries), ['external.mp4', 'kept.mp4'])
+        self.assertEqual(entries['kept.mp4']['last_access'], last_access)
+        self.assertEqual(reloaded.get_info()['total_size'], 1300)
+
+    def test_flush_is_debounced_and_atomic(self):
+        """防抖期间的多次变更合并为一次写盘，写盘通过临时文件原子替换，不留下临时文件"""
+        index = PexelsCacheIndex(self.cache_dir, max_bytes=0, max_age_seconds=0, flush_delay=0.2)
+        for i in range(3):
+            self._write_file(f'v{i}.mp4')
+
+        with patch('JianYingDraft.core.pexelsCacheIndex.os.replace', wraps=os.replace) as replace:
+            for i in range(3):
+                index.touch(f'v{i}.mp4')
+            index.remove('v2.mp4')
+            self.assertEqual(replace.call_count, 0)
+
+            deadline = time.time() + 5
+            while replace.call_count == 0 and time.time() < deadline:
+                time.sleep(0.02)
+            index.flush()
+
+        self.assertEqual(replace.call_count, 1)
+        self.assertEqual(sorted(self._read_index()), ['v0.mp4', 'v1.mp4'])
+        self.assertFalse([name for name in os.listdir(self.cache_dir) if name.endswith('.tmp')])
+
+
+if __name__ == '__main__':
+    unittest.main()
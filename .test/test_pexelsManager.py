@@ -0,0 +1,349 @@
+"""
+Pexels管理器测试用例（使用本地HTTP服务代替Pexels API）
+"""
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core.pexelsManager import PexelsManager
+from JianYingDraft.core.pexelsCacheIndex import PexelsCacheIndex
+from JianYingDraft.core.overlayPrefetcher import OverlayPrefetcher
+
+
+class _FakePexelsHandler(BaseHTTPRequestHandler):
+    """模拟Pexels视频接口，记录请求次数和客户端端口"""
+
+    protocol_version = 'HTTP/1.1'
+    requests_log = []
+
+    def do_GET(self):
+        self.requests_log.append((self.path, self.client_address[1]))
+        body = json.dumps({
+            'page': 1,
+            'videos': [{'id': len(self.requests_log), 'duration': 10, 'video_files': []}]
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _RangeFileHandler(BaseHTTPRequestHandler):
+    """支持Range请求的文件服务，可模拟传输中断"""
+
+    protocol_version = 'HTTP/1.1'
+    content = bytes(range(256)) * 4096  # 1MB
+    range_headers = []
+    truncate_next = False
+
+    def _parse_range(self):
+        range_header = self.headers.get('Range')
+        self.range_headers.append(range_header)
+        if not range_header:
+            return None
+        start, end = range_header.replace('bytes=', '').split('-')
+        start = int(start)
+        end = int(end) if end else len(self.content) - 1
+        return start, end
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(self.content)))
+        self.end_headers()
+
+    def do_GET(self):
+        byte_range = self._parse_range()
+        if byte_range:
+            start, end = byte_range
+            body = self.content[start:end + 1]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(self.content)}')
+        else:
+            body = self.content
+            self.send_response(200)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if _RangeFileHandler.truncate_next:
+            # 只发送一半内容后断开连接
+            _RangeFileHandler.truncate_next = False
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPexelsManager(unittest.TestCase):
+    """Pexels管理器测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        """启动本地HTTP服务"""
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _FakePexelsHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}/videos"
+
+    @classmethod
+    def tearDownClass(cls):
+        """关闭本地HTTP服务"""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """每个用例使用独立的缓存目录"""
+        self.cache_dir = tempfile.mkdtemp()
+        _FakePexelsHandler.requests_log.clear()
+        PexelsManager._memory_cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _create_manager(self, search_cache_ttl=3600):
+        manager = PexelsManager(api_key='test-key', cache_dir=self.cache_dir, search_cache_ttl=search_cache_ttl)
+        manager.base_url = self.base_url
+        return manager
+
+    def test_search_results_are_cached(self):
+        """相同的(关键词, 页码, 每页数量)只请求一次"""
+        manager = self._create_manager()
+
+        first = manager.search_videos('nature', per_page=10)
+        second = manager.search_videos('nature', per_page=10)
+        manager.search_videos('nature', per_page=10, page=2)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(_FakePexelsHandler.requests_log), 2)
+
+    def test_disk_cache_shared_between_managers(self):
+        """内存缓存清空后，新的管理器从磁盘缓存读取"""
+        self._create_manager().search_videos('ocean')
+        PexelsManager._memory_cache.clear()
+
+        data = self._create_manager().search_videos('ocean')
+
+        self.assertIsNotNone(data)
+        self.assertEqual(len(_FakePexelsHandler.requests_log), 1)
+
+    def test_expired_cache_is_refreshed(self):
+        """缓存过期后重新请求"""
+        manager = self._create_manager(search_cache_ttl=1)
+        manager.search_videos('forest')
+        time.sleep(1.1)
+        manager.search_videos('forest')
+
+        self.assertEqual(len(_FakePexelsHandler.requests_log), 2)
+
+    def test_session_is_shared_and_reuses_connections(self):
+        """所有管理器共享同一个会话，多次请求复用同一个连接"""
+        first_manager = self._create_manager(search_cache_ttl=0)
+        second_manager = self._create_manager(search_cache_ttl=0)
+        self.assertIs(first_manager.get_session(), second_manager.get_session())
+
+        first_manager.search_videos('clouds')
+        second_manager.search_videos('sunset')
+        first_manager.get_popular_videos(per_page=5)
+
+        client_ports = {port for _, port in _FakePexelsHandler.requests_log}
+        self.assertEqual(len(_FakePexelsHandler.requests_log), 3)
+        self.assertEqual(len(client_ports), 1)
+
+
+class TestPexelsDownload(unittest.TestCase):
+    """Pexels视频下载测试类（本地Range服务）"""
+
+    @classmethod
+    def setUpClass(cls):
+        """启动本地Range服务"""
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _RangeFileHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.video_url = f"http://127.0.0.1:{cls.server.server_address[1]}/video.mp4"
+
+    @classmethod
+    def tearDownClass(cls):
+        """关闭本地Range服务"""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.manager = PexelsManager(api_key='test-key', cache_dir=self.cache_dir, search_cache_ttl=0)
+        _RangeFileHandler.range_headers.clear()
+        _RangeFileHandler.truncate_next = False
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_cache_filename_is_stable(self):
+        """缓存文件名只取决于URL"""
+        self.assertEqual(self.manager.get_cache_filename(self.video_url),
+                         PexelsManager(api_key='other', cache_dir=self.cache_dir, search_cache_ttl=0)
+                         .get_cache_filename(self.video_url))
+        self.assertNotEqual(self.manager.get_cache_filename(self.video_url),
+                            self.manager.get_cache_filename(self.video_url + '?v=2'))
+
+    def test_interrupted_download_resumes_with_range(self):
+        """中断的下载不会留下最终文件，再次下载从断点继续"""
+        _RangeFileHandler.truncate_next = True
+        self.assertIsNone(self.manager.download_video(self.video_url, 'video.mp4', chunk_size=65536, parallel=1))
+
+        file_path = os.path.join(self.cache_dir, 'video.mp4')
+        part_path = f"{file_path}.part"
+        self.assertFalse(os.path.exists(file_path))
+        partial_size = os.path.getsize(part_path)
+        self.assertGreater(partial_size, 0)
+
+        result = self.manager.download_video(self.video_url, 'video.mp4', chunk_size=65536, parallel=1)
+
+        self.assertEqual(result, file_path)
+        self.assertEqual(self._read(file_path), _RangeFileHandler.content)
+        self.assertFalse(os.path.exists(part_path))
+        self.assertEqual(_RangeFileHandler.range_headers[-1], f'bytes={partial_size}-')
+
+    def test_parallel_range_download(self):
+        """分段并行下载后内容完整"""
+        result = self.manager.download_video(self.video_url, 'parallel.mp4', chunk_size=65536, parallel=4)
+
+        self.assertEqual(self._read(result), _RangeFileHandler.content)
+        self.assertEqual(len([header for header in _RangeFileHandler.range_headers if header]), 4)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ['cache_index.json', 'parallel.mp4', 'search'])
+
+    def test_cache_eviction_is_lru_and_skips_subdirectories(self):
+        """超过容量上限时按最近访问时间淘汰，搜索缓存目录和.part文件保留"""
+        index = PexelsCacheIndex(self.cache_dir, max_bytes=3000, max_age_seconds=0, flush_delay=0)
+        for i in range(4):
+            if i == 3:
+                # 最早加入的v0被再次访问，淘汰时应删除v1
+                index.touch('v0.mp4')
+            with open(os.path.join(self.cache_dir, f'v{i}.mp4'), 'wb') as f:
+                f.write(b'x' * 1000)
+            index.add(f'v{i}.mp4')
+            index._evict_thread.join()
+            time.sleep(0.01)
+        with open(os.path.join(self.cache_dir, 'v4.mp4.part'), 'wb') as f:
+            f.write(b'x' * 1000)
+
+        self.assertEqual(index.evict()['removed_count'], 0)
+        self.assertEqual(index.get_info()['total_size'], 3000)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)),
+                         ['cache_index.json', 'search', 'v0.mp4', 'v2.mp4', 'v3.mp4', 'v4.mp4.part'])
+
+
+class TestOverlayPrefetcher(unittest.TestCase):
+    """覆盖视频预取池测试类"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.manager = PexelsManager(api_key='test-key', cache_dir=self.cache_dir, search_cache_ttl=0)
+        self.prefetcher = OverlayPrefetcher(self.manager, pool_size=0,
+                                            probe=lambda path: {'duration': 1000000, 'width': 1920, 'height': 1080})
+
+    def tearDown(self):
+        self.prefetcher.stop()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _add_clip(self, sha256, size=1000, **fields):
+        """直接向池中放入一个覆盖视频"""
+        with open(os.path.join(self.prefetcher.pool_dir, f'{sha256}.mp4'), 'wb') as f:
+            f.write(b'x' * size)
+        info = {'sha256': sha256, 'duration': 1000000, 'width': 1920, 'height': 1080, 'size': size}
+        info.update(fields)
+        with open(os.path.join(self.prefetcher.pool_dir, f'{sha256}.json'), 'w', encoding='utf-8') as f:
+            json.dump(info, f)
+
+    def test_taken_overlay_stays_in_pool_and_is_reused(self):
+        """取用的覆盖视频留在池中且不参与缓存淘汰，没有新视频时复用已取用过的视频"""
+        self._add_clip('a' * 64)
+        clip = self.prefetcher.take()
+        self.assertEqual(clip['path'], os.path.join(self.prefetcher.pool_dir, 'a' * 64 + '.mp4'))
+        self.assertEqual(self.prefetcher.get_fresh_clips(), [])
+
+        index = PexelsCacheIndex(self.cache_dir, max_bytes=1, max_age_seconds=1, flush_delay=0)
+        index.rebuild()
+        time.sleep(1.1)
+        index.evict()
+        self.assertTrue(os.path.exists(clip['path']))
+
+        # 新视频优先，池中没有新视频时复用
+        self._add_clip('b' * 64)
+        self.assertEqual(self.prefetcher.take()['sha256'], 'b' * 64)
+        reused = self.prefetcher.take()
+        self.assertIsNotNone(reused)
+        self.assertEqual(sum(clip['use_count'] for clip in self.prefetcher.get_ready_clips()), 3)
+
+    def test_used_overlays_are_evicted_by_size_and_age(self):
+        """取用过的覆盖视频按最近取用时间淘汰，未被取用过的视频保留"""
+        now = time.time()
+        self._add_clip('a' * 64, use_count=2, last_used=now - 30)
+        self._add_clip('b' * 64, use_count=1, last_used=now - 20)
+        self._add_clip('c' * 64, use_count=1, last_used=now - 10)
+        self._add_clip('d' * 64, use_count=0, last_used=now - 100)
+
+        self.prefetcher.max_bytes = 2500
+        self.prefetcher.max_age_seconds = 0
+        self.assertEqual(self.prefetcher.evict(), {'removed_count': 2, 'freed_bytes': 2000})
+        self.assertEqual(sorted(clip['sha256'][0] for clip in self.prefetcher.get_ready_clips()), ['c', 'd'])
+
+        self.prefetcher.max_bytes = 0
+        self.prefetcher.max_age_seconds = 5
+        self.assertEqual(self.prefetcher.evict()['removed_count'], 1)
+        self.assertEqual(sorted(os.listdir(self.prefetcher.pool_dir)), ['d' * 64 + '.json', 'd' * 64 + '.mp4'])
+
+    def test_refill_skips_known_videos_before_downloading(self):
+        """补充时跳过池中已有的Pexels视频，在多个页码中随机搜索"""
+        self._add_clip('a' * 64, pexels_id=1)
+        pages = []
+        downloads = []
+
+        def search_videos(keyword, per_page=10, page=1):
+            pages.append(page)
+            return {'videos': [{'id': 1}, {'id': 2}]}
+
+        def download_video(url, filename):
+            downloads.append(filename)
+            path = os.path.join(self.cache_dir, filename)
+            with open(path, 'wb') as f:
+                f.write(b'new clip')
+            return path
+
+        self.manager.search_videos = search_videos
+        self.manager.get_best_video_file = lambda video: {'link': f"http://example.com/{video['id']}.mp4"}
+        self.manager.download_video = download_video
+
+        self.assertTrue(self.prefetcher.refill_once())
+        self.assertEqual(downloads, ['overlay_video_2.mp4'])
+        self.assertFalse(self.prefetcher.refill_once())
+        self.assertEqual(len(downloads), 1)
+        self.assertEqual(len(self.prefetcher.get_fresh_clips()), 2)
+
+        for _ in range(50):
+            self.prefetcher.refill_once()
+        self.assertGreater(len(set(pages)), 1)
+        self.assertTrue(all(1 <= page <= OverlayPrefetcher.SEARCH_PAGES for page in pages))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+素材探测结果缓存测试用例
+"""
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pyJianYingDraft import Video_material, Audio_material, Media_probe_cache, probe_cache
+
+
+class _CountingProbe:
+    """记录调用次数的探测函数"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, path):
+        self.calls.append(path)
+        return {'material_type': 'video', 'duration': 1000000 * len(self.calls), 'width': 1080, 'height': 1920}
+
+
+class TestProbeCache(unittest.TestCase):
+    """素材探测结果缓存测试类"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.media_file = os.path.join(self.test_dir, 'clip.mp4')
+        self._write_media(b'x' * 100)
+        self.cache = Media_probe_cache()
+        self.probe = _CountingProbe()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _write_media(self, content, mtime_ns=None):
+        with open(self.media_file, 'wb') as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(self.media_file, ns=(mtime_ns, mtime_ns))
+
+    def test_unchanged_file_is_probed_once(self):
+        """文件未变化时只探测一次，之后的请求命中缓存"""
+        first = self.cache.get_or_probe(self.media_file, self.probe)
+        second = self.cache.get_or_probe(os.path.relpath(self.media_file), self.probe)
+
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.probe.calls), 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_follows_size_and_mtime(self):
+        """文件大小或修改时间变化时重新探测，同一文件作为视频和音频分别缓存"""
+        mtime_ns = os.stat(self.media_file).st_mtime_ns
+        self.cache.get_or_probe(self.media_file, self.probe)
+
+        # 大小不变、修改时间变化
+        self._write_media(b'y' * 100, mtime_ns=mtime_ns + 1000)
+        self.assertEqual(self.cache.get_or_probe(self.media_file, self.probe)['duration'], 2000000)
+
+        # 修改时间不变、大小变化
+        self._write_media(b'y' * 200, mtime_ns=mtime_ns + 1000)
+        self.assertEqual(self.cache.get_or_probe(self.media_file, self.probe)['duration'], 3000000)
+
+        self.cache.get_or_probe(self.media_file, self.probe, kind='audio')
+        self.assertEqual(len(self.probe.calls), 4)
+        self.assertEqual(self.cache.get_or_probe(self.media_file, self.probe)['duration'], 3000000)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 4))
+
+    def test_failed_probe_is_not_cached(self):
+        """探测失败时异常向上抛出且不写入缓存，文件不存在时抛出FileNotFoundError"""
+        def failing_probe(path):
+            raise ValueError('unsupported')
+
+        with self.assertRaises(ValueError):
+            self.cache.get_or_probe(self.media_file, failing_probe)
+        self.assertIsNone(self.cache.get(self.media_file))
+        with self.assertRaises(FileNotFoundError):
+            self.cache.get_or_probe(os.path.join(self.test_dir, 'missing.mp4'), self.probe)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """超出条目上限时淘汰最久未使用的条目"""
+        cache = Media_probe_cache(max_entries=2)
+        paths = []
+        for name in ('a.mp4', 'b.mp4', 'c.mp4'):
+            path = os.path.join(self.test_dir, name)
+            with open(path, 'wb') as f:
+                f.write(b'x')
+            paths.append(path)
+
+        cache.put(paths[0], {'duration': 1})
+        cache.put(paths[1], {'duration': 2})
+        cache.get(paths[0])
+        cache.put(paths[2], {'duration': 3})
+
+        self.assertEqual([cache.get(path) is not None for path in paths], [True, False, True])
+
+    def test_concurrent_lookups_count_every_call(self):
+        """并发请求时命中与未命中计数之和等于请求次数"""
+        self.cache.put(self.media_file, {'duration': 1})
+
+        def worker():
+            for _ in range(500):
+                self.cache.get_or_probe(self.media_file, self.probe)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (4000, 0))
+
+    def test_metadata_bypasses_cache(self):
+        """传入metadata时素材直接使用该信息，既不探测也不写入共享缓存"""
+        hits, misses = probe_cache.hits, probe_cache.misses
+        with patch.object(Video_material, 'probe', side_effect=AssertionError('probed')), \
+                patch.object(Audio_material, 'probe', side_effect=AssertionError('probed')):
+            video = Video_material(self.media_file, metadata={'duration': 5000000, 'width': 720, 'height': 1280})
+            audio = Audio_material(self.media_file, metadata={'duration': 3000000})
+
+        self.assertEqual((video.material_type, video.duration, video.width, video.height),
+                         ('video', 5000000, 720, 1280))
+        self.assertEqual(audio.duration, 3000000)
+        self.assertEqual((probe_cache.hits, probe_cache.misses), (hits, misses))
+        self.assertIsNone(probe_cache.get(self.media_file))
+        self.assertIsNone(probe_cache.get(self.media_file, 'audio'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+进度事件总线测试用例
+"""
+import unittest
+import os
+import sys
+import queue
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core.progressBus import ProgressBus
+
+
+def _drain(subscriber):
+    """取出队列中的全部事件"""
+    events = []
+    while True:
+        try:
+            events.append(subscriber.get_nowait())
+        except queue.Empty:
+            return events
+
+
+class TestProgressBus(unittest.TestCase):
+    """进度事件总线测试类"""
+
+    def test_finished_job_is_not_replayed(self):
+        """任务结束后新订阅者不会收到该任务的旧事件"""
+        bus = ProgressBus()
+        bus.publish('progress', job_id='a', percent=50.0)
+        bus.publish('job_finished', job_id='a', success=True)
+
+        self.assertEqual(_drain(bus.subscribe()), [])
+        self.assertEqual(bus.get_latest()['type'], 'job_finished')
+
+    def test_running_jobs_are_replayed(self):
+        """新订阅者收到每个运行中任务的最近一个事件，按发布顺序排列"""
+        bus = ProgressBus()
+        bus.publish('progress', job_id='a', percent=10.0)
+        bus.publish('progress', job_id='b', percent=20.0)
+        bus.publish('progress', job_id='a', percent=30.0)
+        bus.publish('progress', job_id='c', percent=40.0)
+        bus.publish('job_finished', job_id='c', success=False)
+
+        events = _drain(bus.subscribe())
+        self.assertEqual([(event['job_id'], event['percent']) for event in events], [('b', 20.0), ('a', 30.0)])
+
+    def test_slow_subscriber_drops_oldest_events(self):
+        """队列已满时丢弃订阅者最旧的事件，不阻塞发布方"""
+        bus = ProgressBus(max_queue_size=2)
+        subscriber = bus.subscribe()
+        for percent in (10.0, 20.0, 30.0):
+            bus.publish('progress', job_id='a', percent=percent)
+
+        self.assertEqual([event['percent'] for event in _drain(subscriber)], [20.0, 30.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+随机数流测试用例
+"""
+import unittest
+import os
+import sys
+import json
+import random
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core.randomStreams import create_rng, derive_seed
+from JianYingDraft.core.durationController import DurationController
+from JianYingDraft.core.randomEffectEngine import RandomEffectEngine
+from JianYingDraft.core.pexelsManager import PexelsManager
+from JianYingDraft.core.overlayPrefetcher import OverlayPrefetcher
+
+
+class _FakeConfig:
+    """固定配置"""
+
+    @staticmethod
+    def get_video_duration_range():
+        return 30000000, 40000000
+
+    @staticmethod
+    def get_use_vip_effects():
+        return True
+
+    @staticmethod
+    def get_transition_probability():
+        return 0.8
+
+
+class _FakeMetadataManager:
+    """固定的效果目录"""
+
+    def __init__(self):
+        self.filters = [SimpleNamespace(name=f'filter{i}', params=[]) for i in range(20)]
+        self.transitions = [SimpleNamespace(name=f'transition{i}', default_duration=800000) for i in range(20)]
+        self.effects = [SimpleNamespace(name=f'effect{i}', params=[SimpleNamespace(name='强度')]) for i in range(20)]
+
+    def get_available_filters(self, **kwargs):
+        return list(self.filters)
+
+    def get_available_transitions(self, **kwargs):
+        return list(self.transitions)
+
+    def get_available_effects(self, **kwargs):
+        return list(self.effects)
+
+
+class TestRandomStreams(unittest.TestCase):
+    """随机数流测试类"""
+
+    def _run_pipeline(self, seed):
+        rng = create_rng(seed)
+        engine = RandomEffectEngine(_FakeMetadataManager(), _FakeConfig, rng)
+        controller = DurationController(_FakeConfig, rng)
+
+        segment = {'duration': 5000000}
+        choices = []
+        for _ in range(15):
+            effect = engine.select_effect_for_segment(segment)
+            transition = engine.select_transition_between_segments(segment, segment)
+            choices.append((
+                engine.select_filter_for_segment(segment).name,
+                effect.name,
+                engine.generate_random_parameters(effect),
+                transition and (transition[0].name, transition[1])
+            ))
+        choices.append(controller.calculate_segment_durations([{'duration': 10000000}] * 6))
+        return choices
+
+    def test_derived_seeds_are_stable_and_distinct(self):
+        """派生种子只取决于批量种子和草稿序号"""
+        self.assertEqual(derive_seed(123, 1), derive_seed(123, 1))
+        self.assertEqual(len({derive_seed(123, index) for index in range(1, 101)}), 100)
+        self.assertNotEqual(derive_seed(123, 1), derive_seed(124, 1))
+
+    def _run_with_overlay_pool(self, seed, clip_count):
+        """以指定数量的池中覆盖视频添加覆盖层，再做主随机流上的时长、滤镜、特效与画面调整选择"""
+        from JianYingDraft.core.standardAutoMix import StandardAutoMix
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            manager = PexelsManager(api_key='test-key', cache_dir=cache_dir, search_cache_ttl=0)
+            prefetcher = OverlayPrefetcher(manager, pool_size=0)
+            for i in range(clip_count):
+                sha256 = f'{i:064x}'
+                with open(os.path.join(prefetcher.pool_dir, f'{sha256}.mp4'), 'wb') as f:
+                    f.write(b'clip %d' % i)
+                with open(os.path.join(prefetcher.pool_dir, f'{sha256}.json'), 'w', encoding='utf-8') as f:
+                    json.dump({'sha256': sha256, 'material_type': 'video', 'duration': 20000000,
+                               'width': 1920, 'height': 1080}, f)
+
+            try:
+                with patch.object(OverlayPrefetcher, 'get_default', return_value=prefetcher):
+                    automix = StandardAutoMix('test_draft', seed=seed)
+                automix.config_manager = Mock(wraps=automix.config_manager)
+                automix.config_manager.is_pexels_overlay_enabled.return_value = True
+                automix.config_manager.get_material_path.return_value = cache_dir
+
+                automix._create_tracks()
+                automix._add_anti_detection_overlay(30000000)
+                overlay = automix.statistics.get('anti_detection_overlay')
+            finally:
+                prefetcher.stop()
+
+        candidates = [f'meta{i}' for i in range(30)]
+        choices = [automix._calculate_segment_durations(6, 30000000)]
+        for i in range(6):
+            choices.append((
+                automix._choose_effect_meta(candidates, 'filters', i, 0),
+                automix._choose_effect_meta(candidates, 'effects', i, 0),
+                automix._create_video_clip_settings(i * 5000000)[1]
+            ))
+        return overlay, choices
+
+    def test_overlay_pool_does_not_shift_main_stream(self):
+        """覆盖视频从独立的子流中选取，池中视频数量不同时主随机流的选择完全相同"""
+        seed = derive_seed(42, 3)
+        self.assertEqual(derive_seed(seed, 'overlay'), derive_seed(seed, 'overlay'))
+        self.assertNotEqual(derive_seed(seed, 'overlay'), seed)
+
+        overlay, without_pool = self._run_with_overlay_pool(seed, 0)
+        self.assertIsNone(overlay)
+        results = [self._run_with_overlay_pool(seed, count) for count in (1, 5)]
+
+        for overlay, choices in results:
+            self.assertTrue(overlay['enabled'])
+            self.assertEqual(choices, without_pool)
+        self.assertNotEqual(without_pool, self._run_with_overlay_pool(derive_seed(42, 4), 5)[1])
+
+    def test_same_seed_reproduces_choices(self):
+        """相同种子得到完全相同的选择，且不受全局random状态影响"""
+        random.seed(1)
+        first = self._run_pipeline(derive_seed(42, 3))
+        random.seed(2)
+        second = self._run_pipeline(derive_seed(42, 3))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, self._run_pipeline(derive_seed(42, 4)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+"""
+草稿增量导出测试用例
+"""
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pyJianYingDraft import Script_file, Draft_folder, Audio_material, Track_type
+from pyJianYingDraft.exceptions import MaterialNotFound
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+TEMPLATE_FILE = os.path.join(ROOT, '.draftDemo', 'Temp', 'T2', 'draft_content.json')
+AUDIO_FILE = os.path.join(ROOT, '.test', '_res', 'my-audio.mp3')
+TEXT_TEMPLATE_FILE = os.path.join(ROOT, '.test', '_res', 'text_template', 'draft_content.json')
+
+
+class TestScriptExport(unittest.TestCase):
+    """草稿增量导出测试类"""
+
+    def setUp(self):
+        self.script = Script_file.load_template(TEMPLATE_FILE)
+
+    def _expected_tracks(self):
+        tracks = sorted(list(self.script.tracks.values()) + self.script.imported_tracks,
+                        key=lambda track: track.render_index)
+        return [track.export_json() for track in tracks]
+
+    def test_repeated_dumps_reuse_fragments(self):
+        """内容未变化时重复导出结果相同，且全部复用缓存"""
+        first = self.script.dumps()
+        misses = self.script._export_cache.misses
+
+        self.assertEqual(self.script.dumps(), first)
+        self.assertEqual(self.script._export_cache.misses, misses)
+        self.assertEqual(json.loads(first)['tracks'], self._expected_tracks())
+
+    def test_changed_segment_is_reexported(self):
+        """修改片段时间范围后只重新序列化该片段"""
+        self.script.dumps()
+        misses = self.script._export_cache.misses
+
+        track = self.script.get_imported_track(Track_type.audio, index=0)
+        track.segments[0].duration -= 1000
+        exported = json.loads(self.script.dumps())
+
+        self.assertEqual(self.script._export_cache.misses, misses + 1)
+        self.assertEqual(exported['tracks'], self._expected_tracks())
+
+    def test_modified_materials_are_reexported(self):
+        """replace_*修改的素材和手动标记的素材重新序列化"""
+        self.script.dumps()
+        audio = self.script.imported_materials['audios'][0]
+
+        self.script.replace_material_by_name(audio['name'], Audio_material(AUDIO_FILE))
+        exported = json.loads(self.script.dumps())
+        self.assertEqual(exported['materials']['audios'][0]['path'], os.path.abspath(AUDIO_FILE))
+
+        self.script.imported_materials['audios'][1]['name'] = 'changed.mp3'
+        self.script.mark_material_dirty(self.script.imported_materials['audios'][1])
+        exported = json.loads(self.script.dumps())
+        self.assertEqual(exported['materials']['audios'][1]['name'], 'changed.mp3')
+
+    def test_material_index_follows_renames(self):
+        """按名称替换素材后，索引随之更新为新名称"""
+        audio = self.script.imported_materials['audios'][0]
+        old_name = audio['name']
+        new_material = Audio_material(AUDIO_FILE)
+
+        self.script.replace_material_by_name(old_name, new_material)
+        self.script.replace_material_by_name(new_material.material_name, new_material)
+        with self.assertRaises(MaterialNotFound):
+            self.script.replace_material_by_name(old_name, new_material)
+
+    def test_fork_is_independent(self):
+        """派生草稿的修改不影响基础草稿，未修改的部分复用基础草稿的缓存"""
+        base_text = self.script.dumps()
+        forked = self.script.fork()
+        self.assertEqual(forked.dumps(), base_text)
+        self.assertEqual(forked._export_cache.misses, 0)
+
+        audio = forked.imported_materials['audios'][0]
+        forked.replace_material_by_name(audio['name'], Audio_material(AUDIO_FILE))
+        track = forked.get_imported_track(Track_type.audio, index=0)
+        track.segments[0].duration -= 1000
+        exported = json.loads(forked.dumps())
+
+        self.assertEqual(exported['materials']['audios'][0]['path'], os.path.abspath(AUDIO_FILE))
+        self.assertEqual(self.script.dumps(), base_text)
+
+    def test_instantiate_template(self):
+        """实例化模板时复制元数据文件，链接其余文件，并复用已解析的模板"""
+        with tempfile.TemporaryDirectory() as folder:
+            shutil.copytree(os.path.dirname(TEMPLATE_FILE), os.path.join(folder, 'T2'))
+            with open(os.path.join(folder, 'T2', 'cache.bin'), 'wb') as f:
+                f.write(b'cache')
+            draft_folder = Draft_folder(folder)
+
+            first = draft_folder.instantiate_template('T2', 'D1')
+            second = draft_folder.instantiate_template('T2', 'D2')
+            self.assertIs(draft_folder.get_template_base('T2'), draft_folder.get_template_base('T2'))
+
+            second.save()
+            self.assertEqual(first.dumps(), second.dumps())
+            self.assertEqual(os.path.getsize(second.save_path), len(second.dumps().encode('utf-8')))
+            self.assertTrue(os.path.samefile(os.path.join(folder, 'T2', 'cache.bin'),
+                                             os.path.join(folder, 'D1', 'cache.bin')))
+            self.assertFalse(os.path.samefile(os.path.join(folder, 'T2', 'draft_content.json'),
+                                              os.path.join(folder, 'D1', 'draft_content.json')))
+
+
+class TestTextReplacement(unittest.TestCase):
+    """文本替换导出测试类"""
+
+    def setUp(self):
+        self.script = Script_file.load_template(TEXT_TEMPLATE_FILE)
+        self.track = self.script.get_imported_track(Track_type.text, index=0)
+
+    @staticmethod
+    def _texts(script):
+        materials = json.loads(script.dumps())['materials']['texts']
+        return {material['id']: json.loads(material['content']) for material in materials}
+
+    def test_repeated_replace_text(self):
+        """多次替换同一片段时以最后一次为准，字体样式分布按上一次的结果重新计算"""
+        self.script.replace_text(self.track, 0, '标题')
+        self.script.replace_text(self.track, 3, ['主1', '次1'])
+        texts = self._texts(self.script)
+        self.assertEqual(texts['text-title']['text'], '标题')
+        self.assertEqual([style['range'] for style in texts['text-title']['styles']], [[0, 1], [1, 2]])
+        self.assertEqual((texts['text-template-main']['text'], texts['text-template-sub']['text']), ('主1', '次1'))
+
+        # 导出之后再次替换，已缓存的素材重新序列化
+        self.script.replace_text(self.track, 0, '新的标题文字')
+        self.script.replace_text(self.track, 0, '新标题')
+        self.script.replace_text(self.track, 3, '只替换主文本')
+        texts = self._texts(self.script)
+        self.assertEqual(texts['text-title']['text'], '新标题')
+        self.assertEqual([style['range'] for style in texts['text-title']['styles']], [[0, 2], [2, 3]])
+        self.assertEqual((texts['text-template-main']['text'], texts['text-template-sub']['text']),
+                         ('只替换主文本', '次1'))
+        self.assertEqual(texts['text-subtitle']['text'], '副标题')
+        self.assertEqual(self._texts(self.script), texts)
+
+        with self.assertRaises(ValueError):
+            self.script.replace_text(self.track, 3, ['一', '二', '三'])
+
+    def test_fork_with_unflushed_edits(self):
+        """派生草稿包含基础草稿尚未导出的修改，之后两者的修改互不影响"""
+        self.script.replace_text(self.track, 0, '基础标题')
+        self.script.replace_text(self.track, 3, ['基础主', '基础次'])
+        forked = self.script.fork()
+
+        forked_track = forked.get_imported_track(Track_type.text, index=0)
+        forked.replace_text(forked_track, 0, '派生标题')
+        forked.replace_text(forked_track, 1, '派生副标题')
+        self.script.replace_text(self.track, 2, '基础页脚')
+
+        base_texts = self._texts(self.script)
+        forked_texts = self._texts(forked)
+        self.assertEqual(base_texts['text-title']['text'], '基础标题')
+        self.assertEqual(base_texts['text-subtitle']['text'], '副标题')
+        self.assertEqual(base_texts['text-footer']['text'], '基础页脚')
+        self.assertEqual(forked_texts['text-title']['text'], '派生标题')
+        self.assertEqual(forked_texts['text-subtitle']['text'], '派生副标题')
+        self.assertEqual(forked_texts['text-footer']['text'], '页脚')
+        self.assertEqual(forked_texts['text-template-sub']['text'], '基础次')
+
+    def test_import_track_with_unflushed_edits(self):
+        """从有未导出修改的草稿导入轨道时，导入的是修改后的文本素材"""
+        self.script.replace_text(self.track, 0, '导入前修改')
+        self.script.replace_text(self.track, 3, ['模板主', '模板次'])
+
+        target = Script_file(1920, 1080)
+        target.import_track(self.script, self.track)
+        target_track = target.get_imported_track(Track_type.text, index=0)
+        target.replace_text(target_track, 1, '导入后修改')
+
+        target_texts = self._texts(target)
+        self.assertEqual(target_texts['text-title']['text'], '导入前修改')
+        self.assertEqual(target_texts['text-subtitle']['text'], '导入后修改')
+        self.assertEqual((target_texts['text-template-main']['text'], target_texts['text-template-sub']['text']),
+                         ('模板主', '模板次'))
+        self.assertEqual(self._texts(self.script)['text-subtitle']['text'], '副标题')
+        self.assertEqual(json.loads(target.dumps())['materials']['text_templates'][0]['id'], 'template-1')
+
+
+if __name__ == '__main__':
+    unittest.main()
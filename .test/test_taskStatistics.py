@@ -0,0 +1,121 @@
+"""
+任务统计存储测试用例
+"""
+import unittest
+import os
+import sys
+import json
+import datetime
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core.taskStatistics import TaskStatisticsStore
+
+
+def _day(offset):
+    """相对今天偏移offset天的日期键"""
+    return (datetime.date.today() + datetime.timedelta(days=offset)).strftime('%Y-%m-%d')
+
+
+class TestTaskStatistics(unittest.TestCase):
+    """任务统计存储测试类"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.statistics_file = os.path.join(self.test_dir, 'data', 'task_statistics.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _read_file(self):
+        with open(self.statistics_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_concurrent_increments_are_flushed_once(self):
+        """多线程并发累加不丢计数，防抖期间的累加合并为一次写盘"""
+        store = TaskStatisticsStore(self.statistics_file, flush_delay=0.3)
+        store.flush()
+
+        with patch.object(store, '_write_atomic', wraps=store._write_atomic) as write:
+            def worker():
+                for _ in range(100):
+                    store.add(completed=1)
+                    store.add(errors=1)
+
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(write.call_count, 0)
+
+            deadline = time.time() + 5
+            while write.call_count == 0 and time.time() < deadline:
+                time.sleep(0.02)
+            time.sleep(0.1)
+
+        self.assertEqual(write.call_count, 1)
+        data = self._read_file()
+        self.assertEqual((data['completed_today'], data['error_count_today']), (800, 800))
+        self.assertEqual(data['history'][_day(0)], {'completed': 800, 'errors': 800})
+        self.assertEqual(data['last_increment']['new_count'], 800)
+
+    def test_concurrent_flushes_keep_latest_snapshot(self):
+        """累加与显式写盘并发时，文件最终保存的是最新的计数"""
+        store = TaskStatisticsStore(self.statistics_file, flush_delay=0)
+
+        def worker():
+            for _ in range(50):
+                store.add(completed=1)
+                store.flush()
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self._read_file()['completed_today'], 300)
+
+    def test_atomic_write_leaves_no_temp_file(self):
+        """写盘通过临时文件原子替换，完成后不留下临时文件"""
+        store = TaskStatisticsStore(self.statistics_file, flush_delay=0)
+        store.add(completed=2, errors=1)
+
+        self.assertEqual(os.listdir(os.path.dirname(self.statistics_file)), ['task_statistics.json'])
+        self.assertEqual(self._read_file()['completed_today'], 2)
+        self.assertEqual(TaskStatisticsStore(self.statistics_file).get_snapshot()['completed_today'], 2)
+
+    def test_roll_over_keeps_history_days(self):
+        """跨天时重置今日计数，旧文件的当天计数补入历史，超出保留天数的历史被清理"""
+        os.makedirs(os.path.dirname(self.statistics_file))
+        with open(self.statistics_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'completed_today': 4,
+                'error_count_today': 1,
+                'last_reset_date': _day(-1),
+                'history': {_day(-100): {'completed': 9, 'errors': 0}, _day(-10): {'completed': 3, 'errors': 2}}
+            }, f)
+
+        store = TaskStatisticsStore(self.statistics_file, flush_delay=0)
+        snapshot = store.get_snapshot()
+        self.assertEqual((snapshot['completed_today'], snapshot['error_count_today']), (0, 0))
+        self.assertEqual(snapshot['last_reset_date'], _day(0))
+        self.assertEqual(sorted(snapshot['history']), [_day(-10), _day(-1)])
+        self.assertEqual(snapshot['history'][_day(-1)], {'completed': 4, 'errors': 1})
+
+        store.add(completed=5)
+        history = store.get_history(days=3)
+        self.assertEqual([entry['date'] for entry in history], [_day(-2), _day(-1), _day(0)])
+        self.assertEqual([entry['completed'] for entry in history], [0, 4, 5])
+        self.assertEqual(self._read_file()['history'][_day(0)], {'completed': 5, 'errors': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
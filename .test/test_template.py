@@ -0,0 +1,50 @@
+"""
+模板对象工厂测试用例
+"""
+import unittest
+import os
+import sys
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core import template
+
+
+class TestTemplateFactory(unittest.TestCase):
+    """模板对象工厂测试类"""
+
+    def test_instances_do_not_share_nested_objects(self):
+        """修改一个实例的嵌套字段不影响模板和其他实例"""
+        first = template.get_segment()
+        first['clip']['scale']['x'] = 2.0
+        first['extra_material_refs'].append('speed')
+        first['target_timerange']['duration'] = 100
+
+        second = template.get_segment()
+        self.assertEqual(second['clip']['scale']['x'], 1.0)
+        self.assertEqual(second['extra_material_refs'], [])
+        self.assertEqual(second['target_timerange']['duration'], 0)
+        self.assertNotEqual(first['id'], second['id'])
+
+        effect = template.get_video_effect()
+        effect['adjust_params'][0]['value'] = 0.9
+        self.assertEqual(template.get_video_effect()['adjust_params'][0]['value'], 0.33)
+
+    def test_fields_are_patched(self):
+        """指定的id和字段写入新实例，未指定id时生成新id"""
+        transition = template.get_transition('T-1', resource_id='123', name='叠化', duration=300_000)
+        self.assertEqual(transition['id'], 'T-1')
+        self.assertEqual(transition['resource_id'], '123')
+        self.assertEqual(transition['name'], '叠化')
+        self.assertEqual(transition['duration'], 300_000)
+        self.assertEqual(template.get_transition()['duration'], 500_000)
+
+        audio = template.get_audio()
+        self.assertTrue(audio['id'])
+        self.assertNotEqual(audio['music_id'], template.get_audio()['music_id'])
+        self.assertEqual(template.get_video('')['id'], '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+模板批量填充测试用例
+"""
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pyJianYingDraft import Template_batch_filler, Material_slot, Text_slot
+from pyJianYingDraft.exceptions import MaterialNotFound, TrackNotFound
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+TEMPLATE_DIR = os.path.join(ROOT, '.draftDemo', 'Temp', 'T2')
+TEXT_TEMPLATE_DIR = os.path.join(ROOT, '.test', '_res', 'text_template')
+AUDIO_FILE = os.path.abspath(os.path.join(ROOT, '.test', '_res', 'my-audio.mp3'))
+
+
+class TestTemplateBatch(unittest.TestCase):
+    """模板批量填充测试类"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        shutil.copytree(TEMPLATE_DIR, os.path.join(self.folder, 'T2'))
+        shutil.copytree(TEXT_TEMPLATE_DIR, os.path.join(self.folder, 'Text'))
+        with open(os.path.join(TEMPLATE_DIR, 'draft_content.json'), 'r', encoding='utf-8') as f:
+            self.audio_name = json.load(f)['materials']['audios'][0]['name']
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_fill_jsonl_rows(self):
+        """逐行生成草稿，空单元格保留模板内容，失败的行不中断批次"""
+        rows_path = os.path.join(self.folder, 'rows.jsonl')
+        with open(rows_path, 'w', encoding='utf-8') as f:
+            for row in [{'bgm': AUDIO_FILE}, {'bgm': ''}, {'bgm': os.path.join(self.folder, 'missing.mp3')}]:
+                f.write(json.dumps(row) + '\n')
+
+        filler = Template_batch_filler(self.folder, 'T2', {'bgm': Material_slot(self.audio_name)},
+                                       draft_name='out_{index}')
+        results = list(filler.fill_jsonl(rows_path))
+
+        self.assertEqual([result.index for result in results], [0, 1, 2])
+        self.assertTrue(results[0].ok and results[1].ok)
+        self.assertFalse(results[2].ok)
+
+        def audio_path(draft_name):
+            with open(os.path.join(self.folder, draft_name, 'draft_content.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)['materials']['audios'][0]['path']
+        self.assertEqual(audio_path('out_0'), AUDIO_FILE)
+        self.assertEqual(audio_path('out_1'), audio_path('T2'))
+        self.assertFalse(os.path.exists(os.path.join(self.folder, 'out_2')))
+
+        # 失败的行没有留下文件夹，修正后可以直接重新生成
+        results = list(Template_batch_filler(self.folder, 'T2', {'bgm': Material_slot(self.audio_name)},
+                                             draft_name='out_2').fill([{'bgm': AUDIO_FILE}]))
+        self.assertTrue(results[0].ok)
+
+    def _texts(self, draft_name):
+        with open(os.path.join(self.folder, draft_name, 'draft_content.json'), 'r', encoding='utf-8') as f:
+            materials = json.load(f)['materials']['texts']
+        return {material['id']: json.loads(material['content'])['text'] for material in materials}
+
+    def _text_rows(self, count):
+        return [{'name': f'row{i}', 'title': f'标题{i}', 'pair': f'主{i}|次{i}'} for i in range(count)]
+
+    def test_fill_text_slots(self):
+        """文本槽位替换普通文本，按分隔符拆分后替换文本模板的多段文字"""
+        filler = Template_batch_filler(self.folder, 'Text', {
+            'title': Text_slot(0, track_index=0),
+            'pair': Text_slot(3, track_name='文本', separator='|')
+        }, draft_name='{row[name]}')
+        results = list(filler.fill(self._text_rows(2)))
+
+        self.assertTrue(all(result.ok for result in results))
+        texts = self._texts('row1')
+        self.assertEqual(texts['text-title'], '标题1')
+        self.assertEqual((texts['text-template-main'], texts['text-template-sub']), ('主1', '次1'))
+        self.assertEqual(texts['text-subtitle'], self._texts('Text')['text-subtitle'])
+
+    def test_fill_in_process_pool(self):
+        """多进程填充时按数据行的顺序返回结果，内容与逐行填充相同"""
+        slots = {'title': Text_slot(0, track_index=0), 'pair': Text_slot(3, track_index=0, separator='|')}
+        rows = self._text_rows(6)
+        serial = list(Template_batch_filler(self.folder, 'Text', slots, draft_name='serial_{index}').fill(rows))
+        parallel = list(Template_batch_filler(self.folder, 'Text', slots, draft_name='parallel_{index}',
+                                              max_workers=2, max_pending=3).fill(rows))
+
+        self.assertEqual([result.index for result in parallel], list(range(6)))
+        self.assertEqual([result.draft_name for result in parallel], [f'parallel_{i}' for i in range(6)])
+        self.assertTrue(all(result.ok for result in serial + parallel))
+        for i in range(6):
+            self.assertEqual(self._texts(f'parallel_{i}'), self._texts(f'serial_{i}'))
+
+    def test_slots_are_bound_on_creation(self):
+        """无法在模板中定位的槽位在创建时即报错"""
+        with self.assertRaises(MaterialNotFound):
+            Template_batch_filler(self.folder, 'T2', {'bgm': Material_slot('no-such-material')})
+        with self.assertRaises(TrackNotFound):
+            Template_batch_filler(self.folder, 'T2', {'title': Text_slot(0, track_index=0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
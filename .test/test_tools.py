@@ -0,0 +1,85 @@
+"""
+草稿文件写入工具测试用例
+"""
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+from unittest.mock import patch
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.utils import tools
+from JianYingDraft.core.draft import Draft
+
+
+class TestWriteJson(unittest.TestCase):
+    """json写入与草稿文件夹测试类"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.json_file = os.path.join(self.test_dir, 'draft_content.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _mtime(self, path):
+        return os.stat(path).st_mtime_ns
+
+    def test_identical_save_is_skipped(self):
+        """内容相同的重复写入返回False，文件修改时间不变，也不留下临时文件"""
+        data = {'id': 'A', 'tracks': [1, 2, 3], 'name': '草稿'}
+        self.assertTrue(tools.write_json(self.json_file, data))
+        mtime = self._mtime(self.json_file)
+
+        self.assertFalse(tools.write_json(self.json_file, dict(data)))
+        self.assertEqual(self._mtime(self.json_file), mtime)
+        self.assertEqual(os.listdir(self.test_dir), ['draft_content.json'])
+        self.assertEqual(tools.read_json(self.json_file), data)
+
+    def test_changed_content_is_replaced(self):
+        """内容变化或文件被外部修改后重新写入，写入通过临时文件原子替换"""
+        tools.write_json(self.json_file, {'id': 'A'})
+
+        with patch('JianYingDraft.utils.tools.os.replace', wraps=os.replace) as replace:
+            self.assertTrue(tools.write_json(self.json_file, {'id': 'B'}))
+        replace.assert_called_once_with(f"{self.json_file}.tmp", self.json_file)
+        self.assertEqual(tools.read_json(self.json_file), {'id': 'B'})
+
+        # 剪映修改了文件后，即使要写入的内容与上次相同也要重新写入
+        with open(self.json_file, 'w', encoding='utf-8') as f:
+            json.dump({'id': 'B', 'edited': True}, f)
+        self.assertTrue(tools.write_json(self.json_file, {'id': 'B'}))
+        self.assertEqual(tools.read_json(self.json_file), {'id': 'B'})
+        self.assertFalse(os.path.exists(f"{self.json_file}.tmp"))
+
+    def test_resave_keeps_files_added_by_jianying(self):
+        """重复保存草稿时保留剪映在草稿文件夹中生成的文件，未变化的草稿文件不重写"""
+        with patch('JianYingDraft.core.draft.ConfigHelper.get_item', return_value=self.test_dir):
+            draft = Draft('Resave')
+        draft.save()
+
+        draft_folder = os.path.join(self.test_dir, 'Resave')
+        content_file = os.path.join(draft_folder, 'draft_content.json')
+        mtime = self._mtime(content_file)
+
+        # 模拟剪映打开草稿后生成的文件
+        tools.create_folder(os.path.join(draft_folder, 'Resources'))
+        with open(os.path.join(draft_folder, 'Resources', 'cover.jpg'), 'wb') as f:
+            f.write(b'jpg')
+        with open(os.path.join(draft_folder, 'draft_settings'), 'w', encoding='utf-8') as f:
+            f.write('[General]\n')
+
+        draft.save()
+
+        self.assertEqual(self._mtime(content_file), mtime)
+        self.assertEqual(sorted(os.listdir(draft_folder)),
+                         ['Resources', 'draft_content.json', 'draft_meta_info.json', 'draft_settings'])
+        self.assertTrue(os.path.exists(os.path.join(draft_folder, 'Resources', 'cover.jpg')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Web界面接口测试用例（Flask测试客户端）
+"""
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import web_interface
+from JianYingDraft.core.configManager import SimpleConfigHelper, AutoMixConfigManager
+
+
+class TestConfigEtag(unittest.TestCase):
+    """配置接口ETag测试类"""
+
+    def setUp(self):
+        """每个用例使用独立的配置文件和data目录"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, '_projectConfig.ini')
+        self._write_config(batch_count=5)
+
+        self._saved = (SimpleConfigHelper._config_file, SimpleConfigHelper._config,
+                       SimpleConfigHelper._config_mtime, AutoMixConfigManager._snapshot,
+                       web_interface._web_interface)
+        SimpleConfigHelper._config_file = self.config_file
+        SimpleConfigHelper._config = None
+        SimpleConfigHelper._config_mtime = None
+        AutoMixConfigManager._snapshot = None
+
+        self.interface = web_interface.OptimizedWebInterface(data_dir=os.path.join(self.test_dir, 'data'))
+        web_interface._web_interface = self.interface
+        self.client = web_interface.app.test_client()
+
+    def tearDown(self):
+        self.interface.config_watcher.unsubscribe(self.interface._on_config_changed)
+        (SimpleConfigHelper._config_file, SimpleConfigHelper._config,
+         SimpleConfigHelper._config_mtime, AutoMixConfigManager._snapshot,
+         web_interface._web_interface) = self._saved
+        shutil.rmtree(self.test_dir)
+
+    def _write_config(self, **values):
+        """外部修改配置文件，并确保修改时间发生变化"""
+        values.setdefault('enable_pexels_overlay', False)
+        lines = [f"[{AutoMixConfigManager.SECTION_NAME}]"] + [f"{key} = {value}" for key, value in values.items()]
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        stat = os.stat(self.config_file)
+        os.utime(self.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+    def _get_config(self, etag=None):
+        headers = {'If-None-Match': f'"{etag}"'} if etag else {}
+        return self.client.get('/api/config', headers=headers)
+
+    def test_matching_etag_returns_304(self):
+        """GET返回ETag，带上该ETag的条件请求返回304且不重建快照"""
+        response = self._get_config()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['batch_count'], 5)
+        etag, _ = response.get_etag()
+        self.assertTrue(etag)
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+
+        response = self._get_config(etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(self.interface.config_snapshot.build_count, 1)
+
+    def test_config_file_write_changes_etag(self):
+        """配置文件被外部修改后ETag变化，旧ETag的条件请求返回200和新配置"""
+        etag, _ = self._get_config().get_etag()
+
+        self._write_config(batch_count=8)
+        response = self._get_config(etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['batch_count'], 8)
+        self.assertNotEqual(response.get_etag()[0], etag)
+
+    def test_config_update_bumps_generation(self):
+        """通过接口更新配置会使快照失效，旧ETag的条件请求返回200；内容不变的重建仍返回304"""
+        etag, _ = self._get_config().get_etag()
+
+        self.interface.config_snapshot.invalidate()
+        response = self._get_config(etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.interface.config_snapshot.build_count, 2)
+
+        result = self.client.post('/api/config', json={'batch_count': 12}).get_json()
+        self.assertTrue(result['success'], result)
+        response = self._get_config(etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['batch_count'], 12)
+        new_etag, _ = response.get_etag()
+        self.assertNotEqual(new_etag, etag)
+        self.assertEqual(self._get_config(new_etag).status_code, 304)
+
+
+if __name__ == '__main__':
+    unittest.main()
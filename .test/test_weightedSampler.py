@@ -0,0 +1,69 @@
+"""
+加权随机采样器测试用例
+"""
+import unittest
+import os
+import sys
+import random
+from collections import Counter
+from types import SimpleNamespace
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from JianYingDraft.core.weightedSampler import WeightedSampler
+
+
+def _items(*names):
+    return [SimpleNamespace(name=name) for name in names]
+
+
+class TestWeightedSampler(unittest.TestCase):
+    """加权随机采样器测试类"""
+
+    def test_sample_follows_weights(self):
+        """抽样频率与权重成正比，权重为0的项不会被抽中"""
+        sampler = WeightedSampler(_items('a', 'b', 'c', 'd'), {'a': 1.0, 'b': 3.0, 'c': 0.0})
+        rng = random.Random(7)
+
+        counts = Counter(sampler.sample(rng).name for _ in range(20000))
+
+        self.assertNotIn('c', counts)
+        self.assertAlmostEqual(counts['b'] / counts['a'], 3.0, delta=0.3)
+        self.assertAlmostEqual(counts['d'] / counts['a'], 1.0, delta=0.15)
+
+    def test_draw_does_not_repeat_within_a_round(self):
+        """一轮内每项只抽中一次，全部用过后开始新一轮"""
+        names = [f'item{i}' for i in range(37)]
+        sampler = WeightedSampler(_items(*names), {'item0': 0.0})
+        rng = random.Random(1)
+
+        first_round = [sampler.draw(rng).name for _ in range(len(names))]
+        self.assertEqual(sorted(first_round), sorted(names))
+        self.assertEqual(sampler.available_count, 0)
+
+        sampler.draw(rng)
+        self.assertEqual(len(sampler.used_names), 1)
+
+    def test_weight_update_and_reset(self):
+        """调整权重立即生效，清空使用记录后恢复全部候选项"""
+        sampler = WeightedSampler(_items('a', 'b', 'c'))
+        rng = random.Random(3)
+
+        sampler.set_weight('a', 0.0)
+        sampler.set_weight('b', 0.0)
+        self.assertEqual({sampler.sample(rng).name for _ in range(50)}, {'c'})
+
+        sampler.mark_used('c')
+        # 剩余候选项权重都为0时均匀抽取
+        self.assertEqual({sampler.sample(rng).name for _ in range(50)}, {'a', 'b'})
+
+        sampler.reset_usage()
+        sampler.set_weight('a', 5.0)
+        self.assertEqual(sampler.available_count, 3)
+        self.assertEqual(sampler.get_weight('a'), 5.0)
+        self.assertFalse(sampler.set_weight('missing', 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
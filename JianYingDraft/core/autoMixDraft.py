@@ -18,7 +18,9 @@ from JianYingDraft.core.videoProcessor import VideoProcessor
 from JianYingDraft.core.dualAudioManager import DualAudioManager
 from JianYingDraft.core.srtProcessor import SRTProcessor
 from JianYingDraft.core.durationController import DurationController
-from JianYingDraft.core.configManager import AutoMixConfigManager
+from JianYingDraft.core.configManager import AutoMixConfigManager, AutoMixConfigSnapshot
+from JianYingDraft.core.configWatcher import default_config_watcher
+from JianYingDraft.core.randomStreams import create_rng, derive_seed, new_batch_seed
 
 
 class AutoMixDraft(Draft):
@@ -27,27 +29,32 @@ class AutoMixDraft(Draft):
     继承Draft类，集成所有功能模块，实现完整的自动混剪流程
     """
     
-    def __init__(self, name: str = "", config_manager: AutoMixConfigManager = None):
+    def __init__(self, name: str = "", config_manager: AutoMixConfigManager = None, seed: int = None):
         """
         初始化自动混剪引擎
         
         Args:
             name: 草稿名称
-            config_manager: 配置管理器实例
+            config_manager: 配置管理器实例或配置快照，为None时使用当前配置快照
+            seed: 草稿随机种子，各功能模块共享由它创建的随机数生成器；为None时随机
         """
         super().__init__(name)
         
-        # 配置管理器
-        self.config_manager = config_manager or AutoMixConfigManager
+        # 配置管理器（默认使用不可变配置快照，各模块共享同一份已解析的配置）
+        self.config_manager = config_manager or AutoMixConfigManager.get_snapshot()
+        
+        # 草稿独立的随机数生成器（不使用全局random，批量并行时互不干扰）
+        self.seed = seed
+        self.rng = create_rng(seed)
         
         # 初始化功能模块
-        self.material_scanner = MaterialScanner()
+        self.material_scanner = MaterialScanner(self.rng)
         self.metadata_manager = MetadataManager()
-        self.random_effect_engine = RandomEffectEngine(self.metadata_manager, self.config_manager)
-        self.video_processor = VideoProcessor()
-        self.dual_audio_manager = DualAudioManager()
+        self.random_effect_engine = RandomEffectEngine(self.metadata_manager, self.config_manager, self.rng)
+        self.video_processor = VideoProcessor(self.config_manager, self.rng)
+        self.dual_audio_manager = DualAudioManager(self.config_manager)
         self.srt_processor = SRTProcessor()
-        self.duration_controller = DurationController(self.config_manager)
+        self.duration_controller = DurationController(self.config_manager, self.rng)
         
         # 进度回调函数
         self.progress_callback: Optional[Callable[[str, float], None]] = None
@@ -217,20 +224,11 @@ class AutoMixDraft(Draft):
         try:
             segment_durations = duration_result['segment_durations']
             processed_videos = []
-            
+
             for i, (material, duration) in enumerate(zip(materials, segment_durations)):
                 # 使用视频处理器处理片段
                 media_info, segment_info = self.video_processor.process_video_segment(material, duration)
 
-                # 添加视频到草稿（静音处理，并应用处理后的设置）
-                self.add_media_with_settings(
-                    material['path'],
-                    start_at_track=0,
-                    duration=duration,
-                    bgm_mute=True,
-                    segment_info=segment_info
-                )
-
                 processed_videos.append({
                     'material': material,
                     'media_info': media_info,
@@ -238,7 +236,37 @@ class AutoMixDraft(Draft):
                     'duration': duration,
                     'index': i
                 })
-            
+
+            paths = [video_data['material']['path'] for video_data in processed_videos]
+            durations = [video_data['duration'] for video_data in processed_videos]
+
+            if any(self._has_blur_background(video_data['segment_info']) for video_data in processed_videos):
+                # 模糊背景需要为一个文件创建双轨道，逐个添加；先并发探测全部文件，逐个添加时直接命中探测缓存
+                from JianYingDraft.core.mediaFactory import MediaFactory
+                MediaFactory.probe_many(paths)
+
+                for video_data in processed_videos:
+                    self.add_media_with_settings(
+                        video_data['material']['path'],
+                        start_at_track=0,
+                        duration=video_data['duration'],
+                        bgm_mute=True,
+                        segment_info=video_data['segment_info']
+                    )
+            else:
+                # 批量添加视频到草稿（并发探测，静音处理，并应用处理后的设置）
+                medias = self.add_media_many(
+                    paths,
+                    durations=durations,
+                    before_insert=lambda i, media: self._apply_segment_settings(
+                        media, processed_videos[i]['segment_info']),
+                    add_to_meta_info=False,
+                    bgm_mute=True
+                )
+                failed = [path for path, media in zip(paths, medias) if media is None]
+                if failed:
+                    raise ValueError(f"无法读取视频媒体信息: {', '.join(failed)}")
+
             return processed_videos
             
         except Exception as e:
@@ -390,7 +418,6 @@ class AutoMixDraft(Draft):
         添加音频到指定轨道 - 参考demo直接设置音量
         """
         from JianYingDraft.core.mediaFactory import MediaFactory
-        from JianYingDraft.core import template
 
         # 创建音频媒体对象，不在这里设置音量，而是在segment中设置
         media = MediaFactory.create(audio_file, duration=duration)
@@ -403,21 +430,12 @@ class AutoMixDraft(Draft):
         # 将媒体信息添加到draft的素材库
         self._Draft__add_media_to_content_materials(media)
 
-        # 确保有足够的音频轨道
-        all_tracks = self._tracks_in_draft_content
-        audio_tracks = [track for track in all_tracks if track["type"] == "audio"]
-
-        # 创建足够的音频轨道
-        while len(audio_tracks) <= track_index:
-            new_track = template.get_track()
-            new_track["type"] = "audio"
-            if track_name:
-                new_track["_track_name"] = track_name  # 添加轨道标识
-            all_tracks.append(new_track)
-            audio_tracks.append(new_track)
+        # 确保有足够的音频轨道（通过轨道索引创建，保持索引与轨道列表一致）
+        while len(self._get_tracks_by_type("audio")) <= track_index:
+            self._append_track("audio", track_name)
 
         # 使用指定的音频轨道
-        target_track = audio_tracks[track_index]
+        target_track = self._get_tracks_by_type("audio")[track_index]
 
         # 设置音频片段的时间范围
         segment_target_timerange = media.segment_data_for_content["target_timerange"]
@@ -501,7 +519,7 @@ class AutoMixDraft(Draft):
         from JianYingDraft.core.mediaFactory import MediaFactory
 
         # 检查是否有模糊背景效果
-        if segment_info and '_blur_background' in segment_info and segment_info['_blur_background']['enabled']:
+        if self._has_blur_background(segment_info):
             print(f"  🌫️  检测到模糊背景效果，创建双轨道结构...")
             self._add_blur_background_tracks(file_path, start_at_track, duration, bgm_mute, segment_info)
             return
@@ -511,54 +529,8 @@ class AutoMixDraft(Draft):
         if media is None:
             return
 
-        # 应用视频处理设置 - 参考demo的clip_settings方式
-        if segment_info and hasattr(media, 'segment_data_for_content'):
-            segment_data = media.segment_data_for_content
-
-            # 确保clip结构存在，参考demo的Clip_settings结构
-            if 'clip' not in segment_data:
-                segment_data['clip'] = {
-                    "alpha": 1.0,
-                    "flip": {"horizontal": False, "vertical": False},
-                    "rotation": 0.0,
-                    "scale": {"x": 1.0, "y": 1.0},
-                    "transform": {"x": 0.0, "y": 0.0}
-                }
-
-            # 关键修复：直接设置缩放值，确保在剪映界面显示正确
-            if 'clip' in segment_info and 'scale' in segment_info['clip']:
-                # 直接复制缩放设置，确保数据结构完整
-                segment_data['clip']['scale']['x'] = segment_info['clip']['scale']['x']
-                segment_data['clip']['scale']['y'] = segment_info['clip']['scale']['y']
-                print(f"    🔍 应用缩放: {segment_info['clip']['scale']['x']:.2f}x")
-
-            # 关键修复：直接设置位置变换，确保9:16居中对齐
-            if 'clip' in segment_info and 'transform' in segment_info['clip']:
-                segment_data['clip']['transform']['x'] = segment_info['clip']['transform']['x']
-                segment_data['clip']['transform']['y'] = segment_info['clip']['transform']['y']
-                print(f"    📍 应用位置: x={segment_info['clip']['transform']['x']:.1f}, y={segment_info['clip']['transform']['y']:.1f}")
-
-            # 应用色彩调整
-            if '_color_adjustments' in segment_info:
-                color_adj = segment_info['_color_adjustments']
-                segment_data['enable_adjust'] = True
-                segment_data['enable_color_curves'] = True
-                segment_data['enable_color_wheels'] = True
-
-                # 设置HDR亮度
-                if 'hdr_settings' in segment_info:
-                    segment_data['hdr_settings'] = segment_info['hdr_settings'].copy()
-
-                print(f"    🎨 应用色彩调整: 对比度{color_adj['contrast']:.2f}, 亮度{color_adj['brightness']:.2f}")
-
-            # 应用其他视频设置
-            for key in ['enable_adjust', 'enable_color_curves', 'enable_color_wheels', 'cartoon']:
-                if key in segment_info:
-                    segment_data[key] = segment_info[key]
-
-            # 确保segment有必要的属性
-            if 'extra_material_refs' not in segment_data:
-                segment_data['extra_material_refs'] = []
+        # 应用视频处理设置
+        self._apply_segment_settings(media, segment_info)
 
         # 将媒体信息添加到draft的素材库
         self._Draft__add_media_to_content_materials(media)
@@ -566,6 +538,66 @@ class AutoMixDraft(Draft):
         # 将媒体信息添加到draft的轨道库
         self._Draft__add_media_to_content_tracks(media, start=0)
 
+    @staticmethod
+    def _has_blur_background(segment_info: Optional[Dict[str, Any]]) -> bool:
+        """片段是否启用了模糊背景效果（需要双轨道处理）"""
+        return bool(segment_info and '_blur_background' in segment_info
+                    and segment_info['_blur_background']['enabled'])
+
+    def _apply_segment_settings(self, media, segment_info: Optional[Dict[str, Any]]):
+        """
+        应用视频处理设置（缩放、位置、色彩调整等）- 参考demo的clip_settings方式
+        """
+        if not segment_info or not hasattr(media, 'segment_data_for_content'):
+            return
+
+        segment_data = media.segment_data_for_content
+
+        # 确保clip结构存在，参考demo的Clip_settings结构
+        if 'clip' not in segment_data:
+            segment_data['clip'] = {
+                "alpha": 1.0,
+                "flip": {"horizontal": False, "vertical": False},
+                "rotation": 0.0,
+                "scale": {"x": 1.0, "y": 1.0},
+                "transform": {"x": 0.0, "y": 0.0}
+            }
+
+        # 关键修复：直接设置缩放值，确保在剪映界面显示正确
+        if 'clip' in segment_info and 'scale' in segment_info['clip']:
+            # 直接复制缩放设置，确保数据结构完整
+            segment_data['clip']['scale']['x'] = segment_info['clip']['scale']['x']
+            segment_data['clip']['scale']['y'] = segment_info['clip']['scale']['y']
+            print(f"    🔍 应用缩放: {segment_info['clip']['scale']['x']:.2f}x")
+
+        # 关键修复：直接设置位置变换，确保9:16居中对齐
+        if 'clip' in segment_info and 'transform' in segment_info['clip']:
+            segment_data['clip']['transform']['x'] = segment_info['clip']['transform']['x']
+            segment_data['clip']['transform']['y'] = segment_info['clip']['transform']['y']
+            print(f"    📍 应用位置: x={segment_info['clip']['transform']['x']:.1f}, y={segment_info['clip']['transform']['y']:.1f}")
+
+        # 应用色彩调整
+        if '_color_adjustments' in segment_info:
+            color_adj = segment_info['_color_adjustments']
+            segment_data['enable_adjust'] = True
+            segment_data['enable_color_curves'] = True
+            segment_data['enable_color_wheels'] = True
+
+            # 设置HDR亮度
+            if 'hdr_settings' in segment_info:
+                segment_data['hdr_settings'] = segment_info['hdr_settings'].copy()
+
+            print(f"    🎨 应用色彩调整: 对比度{color_adj['contrast']:.2f}, 亮度{color_adj['brightness']:.2f}")
+
+        # 应用其他视频设置
+        for key in ['enable_adjust', 'enable_color_curves', 'enable_color_wheels', 'cartoon']:
+            if key in segment_info:
+                segment_data[key] = segment_info[key]
+
+        # 确保segment有必要的属性
+        if 'extra_material_refs' not in segment_data:
+            segment_data['extra_material_refs'] = []
+
     def add_effect_with_metadata(self, resource_id: str, name: str, start: int = 0,
                                 duration: int = 0, index: int = 0):
         """
@@ -640,6 +672,7 @@ class AutoMixDraft(Draft):
             count: 生成数量
             **kwargs: 传递给auto_mix的参数
                 target_duration_range: (min, max) 时长范围元组
+                batch_seed: 批量种子，第i个草稿的种子由derive_seed(batch_seed, i)得到；为None时随机
 
         Returns:
             List[Dict[str, Any]]: 批量生成结果列表
@@ -649,38 +682,58 @@ class AutoMixDraft(Draft):
         # 提取时长范围参数
         target_duration_range = kwargs.pop('target_duration_range', None)
 
-        for i in range(count):
-            try:
-                # 为每个草稿生成唯一名称
-                timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime())
-                draft_name = f"AutoMix_{timestamp}_{i+1:03d}"
-
-                # 创建新的AutoMixDraft实例
-                auto_draft = AutoMixDraft(draft_name, self.config_manager)
-                auto_draft.set_progress_callback(self.progress_callback)
-
-                # 设置随机时长（如果提供了范围）
-                current_kwargs = kwargs.copy()
-                if target_duration_range:
-                    import random
-                    min_duration, max_duration = target_duration_range
-                    current_kwargs['target_duration'] = random.randint(min_duration, max_duration)
-
-                # 执行自动混剪
-                result = auto_draft.auto_mix(**current_kwargs)
-                result['batch_index'] = i + 1
-                result['draft_name'] = draft_name
-
-                results.append(result)
-
-            except Exception as e:
-                error_result = {
-                    'success': False,
-                    'batch_index': i + 1,
-                    'draft_name': f"AutoMix_Error_{i+1:03d}",
-                    'error': str(e)
-                }
-                results.append(error_result)
+        # 批量种子：草稿时长取自批量随机流，草稿内部的随机选择取自各自派生的随机流
+        batch_seed = kwargs.pop('batch_seed', None)
+        if batch_seed is None:
+            batch_seed = new_batch_seed()
+        batch_rng = create_rng(batch_seed)
+
+        # 批量过程中配置文件被修改时，后续草稿使用新的配置快照
+        def on_config_changed(event):
+            self.config_manager = event['snapshot']
+
+        watch_config = isinstance(self.config_manager, AutoMixConfigSnapshot)
+        if watch_config:
+            default_config_watcher.subscribe(on_config_changed)
+            default_config_watcher.start()
+
+        try:
+            for i in range(count):
+                try:
+                    # 为每个草稿生成唯一名称
+                    timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime())
+                    draft_name = f"AutoMix_{timestamp}_{i+1:03d}"
+
+                    # 创建新的AutoMixDraft实例
+                    draft_seed = derive_seed(batch_seed, i + 1)
+                    auto_draft = AutoMixDraft(draft_name, self.config_manager, draft_seed)
+                    auto_draft.set_progress_callback(self.progress_callback)
+
+                    # 设置随机时长（如果提供了范围）
+                    current_kwargs = kwargs.copy()
+                    if target_duration_range:
+                        min_duration, max_duration = target_duration_range
+                        current_kwargs['target_duration'] = batch_rng.randint(min_duration, max_duration)
+
+                    # 执行自动混剪
+                    result = auto_draft.auto_mix(**current_kwargs)
+                    result['batch_index'] = i + 1
+                    result['draft_name'] = draft_name
+                    result['seed'] = draft_seed
+
+                    results.append(result)
+
+                except Exception as e:
+                    error_result = {
+                        'success': False,
+                        'batch_index': i + 1,
+                        'draft_name': f"AutoMix_Error_{i+1:03d}",
+                        'error': str(e)
+                    }
+                    results.append(error_result)
+        finally:
+            if watch_config:
+                default_config_watcher.unsubscribe(on_config_changed)
 
         return results
     
@@ -8,7 +8,9 @@
 """
 import os
 import configparser
-from typing import Any, Dict
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Optional
 
 
 class SimpleConfigHelper:
@@ -16,15 +18,44 @@ class SimpleConfigHelper:
 
     _config = None
     _config_file = "_projectConfig.ini"
+    _config_mtime = None
 
     @classmethod
     def _load_config(cls):
         """加载配置文件"""
         if cls._config is None:
             cls._config = configparser.ConfigParser()
+            cls._config_mtime = cls.get_config_mtime()
             if os.path.exists(cls._config_file):
                 cls._config.read(cls._config_file, encoding='utf-8')
 
+    @classmethod
+    def get_config_file(cls) -> str:
+        """获取配置文件路径"""
+        return cls._config_file
+
+    @classmethod
+    def get_config_mtime(cls):
+        """获取配置文件的修改时间（纳秒），文件不存在时返回None"""
+        try:
+            return os.stat(cls._config_file).st_mtime_ns
+        except OSError:
+            return None
+
+    @classmethod
+    def reload_if_changed(cls) -> bool:
+        """
+        配置文件在外部被修改时重新加载
+
+        Returns:
+            bool: 是否重新加载
+        """
+        if cls._config is not None and cls.get_config_mtime() == cls._config_mtime:
+            return False
+        cls._config = None
+        cls._load_config()
+        return True
+
     @classmethod
     def get_item(cls, section: str, key: str, default_value: Any = None) -> Any:
         """获取配置项"""
@@ -48,17 +79,106 @@ class SimpleConfigHelper:
     @classmethod
     def set_item(cls, section: str, key: str, value: Any) -> bool:
         """设置配置项"""
+        return cls.set_items(section, {key: value})
+
+    @classmethod
+    def set_items(cls, section: str, values: Dict[str, Any]) -> bool:
+        """
+        批量设置配置项，只写一次配置文件
+
+        Args:
+            section: 配置节名称
+            values: 配置键值
+
+        Returns:
+            bool: 是否写入成功
+        """
         cls._load_config()
         try:
             if not cls._config.has_section(section):
                 cls._config.add_section(section)
-            cls._config.set(section, key, str(value))
-            with open(cls._config_file, 'w', encoding='utf-8') as f:
-                cls._config.write(f)
+            for key, value in values.items():
+                cls._config.set(section, key, str(value))
+            cls._write_config()
             return True
         except Exception:
             return False
 
+    @classmethod
+    def _write_config(cls):
+        """原子写入配置文件（临时文件+os.replace，写入中断不会留下半截的配置文件）"""
+        temp_file = f"{cls._config_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            cls._config.write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, cls._config_file)
+        cls._config_mtime = cls.get_config_mtime()
+
+
+class AutoMixConfigSnapshot:
+    """
+    自动混剪配置快照（不可变）
+    配置文件每个版本只解析一次，所有值按DEFAULT_CONFIG中默认值的类型转换好；
+    提供与AutoMixConfigManager相同的get_*/is_*读取方法，混剪流程可以直接替换使用
+    """
+
+    def __init__(self, values: Dict[str, Any], version: Optional[int] = None):
+        """
+        初始化配置快照
+
+        Args:
+            values: 已转换类型的配置值
+            version: 对应配置文件的修改时间（纳秒），文件不存在时为None
+        """
+        object.__setattr__(self, '_values', MappingProxyType(dict(values)))
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, '_bound_getters', {})
+
+    def __setattr__(self, key: str, value: Any):
+        raise AttributeError("配置快照不可修改，请使用AutoMixConfigManager.update()")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+
+    def __getattr__(self, name: str) -> Any:
+        # 只代理读取方法，写入方法不可用
+        if not name.startswith(('get_', 'is_')) or name == 'get_snapshot':
+            raise AttributeError(name)
+
+        getter = self._bound_getters.get(name)
+        if getter is None:
+            method = getattr(AutoMixConfigManager, name)
+            function = getattr(method, '__func__', None)
+            if function is None:
+                raise AttributeError(name)
+            getter = function.__get__(self, AutoMixConfigSnapshot)
+            self._bound_getters[name] = getter
+        return getter
+
+    @property
+    def DEFAULT_CONFIG(self) -> Dict[str, Any]:
+        """默认配置值（供代理的读取方法使用）"""
+        return AutoMixConfigManager.DEFAULT_CONFIG
+
+    def get(self, key: str, default_value: Any = None) -> Any:
+        """获取配置值"""
+        return self._values.get(key, default_value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """导出为普通字典"""
+        return dict(self._values)
+
+    def _get_config_value(self, key: str, default_value: Any) -> Any:
+        """从快照读取配置值（供代理的读取方法使用）"""
+        return self._values.get(key, default_value)
+
+    def _set_config_value(self, key: str, value: Any) -> bool:
+        raise AttributeError("配置快照不可修改，请使用AutoMixConfigManager.update()")
+
 
 class AutoMixConfigManager:
     """
@@ -95,6 +215,12 @@ class AutoMixConfigManager:
         'pexels_api_key': 'rwDQTKgarldHRe2MUQGbtUB95E59p7csmYSSIis1qRxOqVpHjAOadPTD',  # Pexels API密钥 (内置默认)
         'pexels_overlay_opacity': 0.05,     # 防审核覆盖层不透明度 (5%)
         'enable_pexels_overlay': True,      # 是否启用Pexels防审核覆盖层
+        'pexels_search_cache_ttl': 3600,    # Pexels搜索结果缓存有效期（秒）
+        'overlay_pool_size': 3,             # 后台预取的防审核覆盖视频数量
+        'pexels_download_chunk_size': 1048576,  # 视频下载读取块大小（字节）
+        'pexels_download_parallel': 1,      # 视频分段并行下载数量（1为顺序下载）
+        'pexels_cache_max_mb': 2048,        # Pexels视频缓存容量上限（MB，0为不限制）
+        'pexels_cache_max_age_days': 30,    # Pexels视频缓存最长保留天数（按最近访问，0为不限制）
 
         # 新增防审核技术配置（强制执行模式）
         'flip_probability': 1.0,            # 镜像翻转概率 (100% - 强制执行)
@@ -115,8 +241,88 @@ class AutoMixConfigManager:
         'enable_frame_manipulation': True,  # 启用抽帧/补帧（强制执行）
         'frame_drop_probability': 1.0,     # 抽帧概率 (100% - 强制执行)
         'frame_drop_interval': 5.0,        # 抽帧间隔（秒）
-        'max_frame_drops_per_segment': 3   # 每个片段最大抽帧次数
+        'max_frame_drops_per_segment': 3,  # 每个片段最大抽帧次数
+
+        # Web任务队列
+        'max_concurrent_jobs': 2            # 同时运行的混剪任务数量
     }
+
+    # 当前配置快照（配置文件修改时间变化时重建）
+    _snapshot: Optional[AutoMixConfigSnapshot] = None
+    _snapshot_lock = threading.Lock()
+
+    @classmethod
+    def get_snapshot(cls) -> AutoMixConfigSnapshot:
+        """
+        获取当前配置快照
+        配置文件没有变化时直接返回同一个快照对象，只在修改时间变化时重新解析
+
+        Returns:
+            AutoMixConfigSnapshot: 不可变的配置快照
+        """
+        snapshot = cls._snapshot
+        mtime = SimpleConfigHelper.get_config_mtime()
+        if snapshot is not None and snapshot.version == mtime:
+            return snapshot
+
+        with cls._snapshot_lock:
+            snapshot = cls._snapshot
+            if snapshot is not None and snapshot.version == mtime:
+                return snapshot
+
+            SimpleConfigHelper.reload_if_changed()
+            values = {
+                key: SimpleConfigHelper.get_item(cls.SECTION_NAME, key, default_value)
+                for key, default_value in cls.DEFAULT_CONFIG.items()
+            }
+            snapshot = AutoMixConfigSnapshot(values, mtime)
+            cls._snapshot = snapshot
+            return snapshot
+
+    @classmethod
+    def update(cls, **values) -> tuple[bool, list[str]]:
+        """
+        批量更新配置：先校验并转换所有值，全部有效时只写一次配置文件
+
+        Args:
+            **values: 配置键值（已知配置项按默认值类型转换，概率类配置需在0.0-1.0范围内）
+
+        Returns:
+            tuple[bool, list[str]]: (是否成功, 错误信息列表)
+        """
+        errors = []
+        converted = {}
+        for key, value in values.items():
+            default_value = cls.DEFAULT_CONFIG.get(key)
+            try:
+                if isinstance(default_value, bool):
+                    if isinstance(value, str):
+                        value = value.lower() in ('true', '1', 'yes', 'on')
+                    else:
+                        value = bool(value)
+                elif isinstance(default_value, int):
+                    value = int(value)
+                elif isinstance(default_value, float):
+                    value = float(value)
+            except (TypeError, ValueError):
+                errors.append(f"{key}: 无效的值 {value!r}")
+                continue
+
+            if key.endswith('_probability') and not 0.0 <= float(value) <= 1.0:
+                errors.append(f"{key}: {value} 应在0.0-1.0范围内")
+                continue
+            converted[key] = value
+
+        if errors:
+            return False, errors
+        if not converted:
+            return True, []
+
+        if not SimpleConfigHelper.set_items(cls.SECTION_NAME, converted):
+            return False, ["写入配置文件失败"]
+        cls._snapshot = None
+        print(f"批量设置配置项 {cls.SECTION_NAME}: {', '.join(converted)}")
+        return True, []
     
     @classmethod
     def get_material_path(cls) -> str:
@@ -308,6 +514,9 @@ class AutoMixConfigManager:
             配置值
         """
         try:
+            snapshot = cls.get_snapshot()
+            if key in snapshot:
+                return snapshot[key]
             return SimpleConfigHelper.get_item(cls.SECTION_NAME, key, default_value)
         except Exception as e:
             print(f"读取配置项 {cls.SECTION_NAME}.{key} 失败: {str(e)}")
@@ -327,6 +536,7 @@ class AutoMixConfigManager:
         """
         try:
             result = SimpleConfigHelper.set_item(cls.SECTION_NAME, key, value)
+            cls._snapshot = None
             if result:
                 print(f"设置配置项 {cls.SECTION_NAME}.{key} = {value}")
             return result
@@ -371,6 +581,66 @@ class AutoMixConfigManager:
         """设置Pexels API密钥"""
         return cls._set_config_value('pexels_api_key', api_key)
 
+    @classmethod
+    def get_pexels_search_cache_ttl(cls) -> int:
+        """获取Pexels搜索结果缓存有效期（秒）"""
+        return max(0, int(cls._get_config_value('pexels_search_cache_ttl', cls.DEFAULT_CONFIG['pexels_search_cache_ttl'])))
+
+    @classmethod
+    def set_pexels_search_cache_ttl(cls, ttl: int) -> bool:
+        """设置Pexels搜索结果缓存有效期（秒）"""
+        return cls._set_config_value('pexels_search_cache_ttl', ttl)
+
+    @classmethod
+    def get_pexels_download_chunk_size(cls) -> int:
+        """获取视频下载读取块大小（字节）"""
+        return max(8192, int(cls._get_config_value('pexels_download_chunk_size', cls.DEFAULT_CONFIG['pexels_download_chunk_size'])))
+
+    @classmethod
+    def set_pexels_download_chunk_size(cls, chunk_size: int) -> bool:
+        """设置视频下载读取块大小（字节）"""
+        return cls._set_config_value('pexels_download_chunk_size', chunk_size)
+
+    @classmethod
+    def get_pexels_download_parallel(cls) -> int:
+        """获取视频分段并行下载数量"""
+        return max(1, int(cls._get_config_value('pexels_download_parallel', cls.DEFAULT_CONFIG['pexels_download_parallel'])))
+
+    @classmethod
+    def set_pexels_download_parallel(cls, parallel: int) -> bool:
+        """设置视频分段并行下载数量"""
+        return cls._set_config_value('pexels_download_parallel', parallel)
+
+    @classmethod
+    def get_pexels_cache_max_mb(cls) -> int:
+        """获取Pexels视频缓存容量上限（MB）"""
+        return max(0, int(cls._get_config_value('pexels_cache_max_mb', cls.DEFAULT_CONFIG['pexels_cache_max_mb'])))
+
+    @classmethod
+    def set_pexels_cache_max_mb(cls, max_mb: int) -> bool:
+        """设置Pexels视频缓存容量上限（MB）"""
+        return cls._set_config_value('pexels_cache_max_mb', max_mb)
+
+    @classmethod
+    def get_pexels_cache_max_age_days(cls) -> int:
+        """获取Pexels视频缓存最长保留天数"""
+        return max(0, int(cls._get_config_value('pexels_cache_max_age_days', cls.DEFAULT_CONFIG['pexels_cache_max_age_days'])))
+
+    @classmethod
+    def set_pexels_cache_max_age_days(cls, max_age_days: int) -> bool:
+        """设置Pexels视频缓存最长保留天数"""
+        return cls._set_config_value('pexels_cache_max_age_days', max_age_days)
+
+    @classmethod
+    def get_overlay_pool_size(cls) -> int:
+        """获取后台预取的防审核覆盖视频数量"""
+        return max(0, int(cls._get_config_value('overlay_pool_size', cls.DEFAULT_CONFIG['overlay_pool_size'])))
+
+    @classmethod
+    def set_overlay_pool_size(cls, pool_size: int) -> bool:
+        """设置后台预取的防审核覆盖视频数量"""
+        return cls._set_config_value('overlay_pool_size', pool_size)
+
     @classmethod
     def get_pexels_overlay_opacity(cls) -> float:
         """获取Pexels防审核覆盖层不透明度"""
@@ -538,6 +808,17 @@ class AutoMixConfigManager:
         """设置每个片段最大抽帧次数"""
         return cls._set_config_value('max_frame_drops_per_segment', max_drops)
 
+    # Web任务队列配置方法
+    @classmethod
+    def get_max_concurrent_jobs(cls) -> int:
+        """获取同时运行的混剪任务数量"""
+        return max(1, int(cls._get_config_value('max_concurrent_jobs', cls.DEFAULT_CONFIG['max_concurrent_jobs'])))
+
+    @classmethod
+    def set_max_concurrent_jobs(cls, max_jobs: int) -> bool:
+        """设置同时运行的混剪任务数量"""
+        return cls._set_config_value('max_concurrent_jobs', max_jobs)
+
 
 # 为了向后兼容，提供一个简化的别名
 ConfigManager = AutoMixConfigManager
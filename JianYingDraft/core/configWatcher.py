@@ -0,0 +1,132 @@
+"""
+配置文件监视器 - 轮询_projectConfig.ini的修改时间，内容变化时重新加载并通知订阅者
+"""
+import threading
+from typing import Callable, Dict, Any, List, Optional
+
+from JianYingDraft.core.configManager import AutoMixConfigManager, AutoMixConfigSnapshot, SimpleConfigHelper
+
+
+class ConfigWatcher:
+    """
+    配置文件监视器
+    后台线程按固定间隔检查配置文件的修改时间；文件变化后重新生成配置快照，
+    只有配置值真正发生变化时才递增版本号并通知订阅者（只touch文件不会触发通知）
+    """
+
+    def __init__(self, interval: float = 1.0):
+        """
+        初始化配置文件监视器
+
+        Args:
+            interval: 轮询间隔（秒）
+        """
+        self.interval = interval
+        self.version = 0
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        self._snapshot: Optional[AutoMixConfigSnapshot] = None
+        self._mtime = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        订阅配置变化
+
+        Args:
+            callback: 回调函数，接收事件字典：version、changed_keys、snapshot
+        """
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """取消订阅"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def get_snapshot(self) -> AutoMixConfigSnapshot:
+        """获取监视器最近一次加载的配置快照"""
+        with self._lock:
+            self._ensure_baseline()
+            return self._snapshot
+
+    def _ensure_baseline(self):
+        """首次使用时记录当前配置作为比较基准（调用方持有锁）"""
+        if self._snapshot is None:
+            self._mtime = SimpleConfigHelper.get_config_mtime()
+            self._snapshot = AutoMixConfigManager.get_snapshot()
+
+    def check(self) -> Optional[Dict[str, Any]]:
+        """
+        检查一次配置文件
+
+        Returns:
+            Optional[Dict]: 配置发生变化时返回通知事件，否则返回None
+        """
+        mtime = SimpleConfigHelper.get_config_mtime()
+        with self._lock:
+            if self._snapshot is None:
+                self._ensure_baseline()
+                return None
+            if mtime == self._mtime:
+                return None
+            self._mtime = mtime
+
+            old_values = self._snapshot.to_dict()
+            snapshot = AutoMixConfigManager.get_snapshot()
+            new_values = snapshot.to_dict()
+            changed_keys = sorted(
+                key for key in set(old_values) | set(new_values)
+                if old_values.get(key) != new_values.get(key)
+            )
+            self._snapshot = snapshot
+            if not changed_keys:
+                return None
+
+            self.version += 1
+            event = {
+                'version': self.version,
+                'changed_keys': changed_keys,
+                'snapshot': snapshot
+            }
+            subscribers = list(self._subscribers)
+
+        print(f"🔄 配置文件已更新 (版本 {event['version']}): {', '.join(changed_keys)}")
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"⚠️ 配置变化通知失败: {e}")
+        return event
+
+    def start(self):
+        """启动后台轮询线程（重复调用无副作用）"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._ensure_baseline()
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._watch_loop, name="config-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """停止后台轮询线程"""
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.interval + 1)
+
+    def _watch_loop(self):
+        """后台轮询主循环"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"⚠️ 检查配置文件失败: {e}")
+
+
+# 进程内共享的默认配置监视器（由使用方调用start()启动）
+default_config_watcher = ConfigWatcher()
@@ -0,0 +1,148 @@
+"""
+批量多样性规划器 - 批量生成前统一为每个草稿分配视频素材和特效组合，使同一批草稿之间差异最大
+"""
+import random
+from typing import List, Dict, Any, Sequence
+
+
+class DiversityPlanner:
+    """
+    批量多样性规划器
+    逐个为草稿规划：按"使用次数越少越容易被选中"的权重生成若干候选方案（低差异采样），
+    再用贪心最大最小距离从中选出与已规划草稿的最小距离最大的一个。
+    距离为视频、滤镜、特效、转场四类集合Jaccard距离的加权平均
+    """
+
+    # 各维度在距离中的权重（素材视频最影响观感）
+    DIMENSION_WEIGHTS = {
+        'videos': 2.0,
+        'filters': 1.0,
+        'effects': 1.0,
+        'transitions': 1.0
+    }
+
+    def __init__(self, videos: List[Dict[str, Any]], filters: Sequence[str] = (), effects: Sequence[str] = (),
+                 transitions: Sequence[str] = (), candidates: int = 8, rng: random.Random = None):
+        """
+        初始化批量多样性规划器
+
+        Args:
+            videos: 视频素材列表（MaterialScanner扫描结果，包含path和folder_name）
+            filters: 可用滤镜名称（已排除用户屏蔽的滤镜）
+            effects: 可用特效名称（已排除用户屏蔽的特效）
+            transitions: 可用转场名称（已排除弹幕类和用户屏蔽的转场）
+            candidates: 每个草稿生成的候选方案数量
+            rng: 随机数生成器，默认新建
+        """
+        self.videos_by_folder: Dict[str, List[str]] = {}
+        self.video_folders: Dict[str, str] = {}
+        for video in videos:
+            folder = video.get('folder_name', 'root')
+            self.videos_by_folder.setdefault(folder, []).append(video['path'])
+            self.video_folders[video['path']] = folder
+        self.catalogs = {
+            'filters': list(dict.fromkeys(filters)),
+            'effects': list(dict.fromkeys(effects)),
+            'transitions': list(dict.fromkeys(transitions))
+        }
+        self.candidates = max(1, candidates)
+        self.rng = rng or random.Random()
+
+        # 批量内各素材/效果的使用次数
+        self._usage: Dict[str, Dict[str, int]] = {
+            'folders': {}, 'videos': {}, 'filters': {}, 'effects': {}, 'transitions': {}
+        }
+
+    def plan(self, video_counts: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        为一批草稿规划素材与特效
+
+        Args:
+            video_counts: 每个草稿需要的视频片段数量
+
+        Returns:
+            List[Dict]: 每个草稿的方案，包含videos（视频路径，按片段顺序）、
+                        filters/effects（每个片段一个名称）、transitions（每个片段间一个名称）、min_distance
+        """
+        plans = []
+        for video_count in video_counts:
+            best_plan, best_distance = None, -1.0
+            for _ in range(self.candidates):
+                candidate = self._generate_candidate(video_count)
+                distance = min((self.distance(candidate, plan) for plan in plans), default=1.0)
+                if distance > best_distance:
+                    best_plan, best_distance = candidate, distance
+
+            best_plan['min_distance'] = round(best_distance, 4)
+            self._record_usage(best_plan)
+            plans.append(best_plan)
+
+        if len(plans) > 1:
+            distances = [plan['min_distance'] for plan in plans[1:]]
+            print(f"🧭 批量多样性规划完成: {len(plans)}个草稿，最小差异度 {min(distances):.2f}，"
+                  f"平均 {sum(distances) / len(distances):.2f}")
+        return plans
+
+    @classmethod
+    def distance(cls, first: Dict[str, Any], second: Dict[str, Any]) -> float:
+        """两个方案之间的距离（0表示完全相同，1表示完全不同）"""
+        total_weight = 0.0
+        total_distance = 0.0
+        for dimension, weight in cls.DIMENSION_WEIGHTS.items():
+            first_set, second_set = set(first.get(dimension, [])), set(second.get(dimension, []))
+            union = first_set | second_set
+            if not union:
+                continue
+            total_distance += weight * (1.0 - len(first_set & second_set) / len(union))
+            total_weight += weight
+        return total_distance / total_weight if total_weight else 0.0
+
+    def _generate_candidate(self, video_count: int) -> Dict[str, Any]:
+        """生成一个候选方案：每个文件夹最多一个视频，效果在本草稿内尽量不重复"""
+        folders = self._weighted_sample(list(self.videos_by_folder), 'folders',
+                                        min(video_count, len(self.videos_by_folder)))
+        videos = [self._weighted_sample(self.videos_by_folder[folder], 'videos', 1)[0] for folder in folders]
+        self.rng.shuffle(videos)
+
+        segment_count = len(videos)
+        return {
+            'videos': videos,
+            'filters': self._sample_sequence('filters', segment_count),
+            'effects': self._sample_sequence('effects', segment_count),
+            'transitions': self._sample_sequence('transitions', max(0, segment_count - 1))
+        }
+
+    def _sample_sequence(self, dimension: str, count: int) -> List[str]:
+        """抽取count个效果名称，数量超过目录大小时循环使用"""
+        catalog = self.catalogs[dimension]
+        names: List[str] = []
+        while catalog and len(names) < count:
+            names.extend(self._weighted_sample(catalog, dimension, min(len(catalog), count - len(names))))
+        return names
+
+    def _weighted_sample(self, items: List[str], dimension: str, count: int) -> List[str]:
+        """
+        按使用次数加权的不放回抽样（Efraimidis-Spirakis算法），用得越少越容易被选中
+
+        Args:
+            items: 候选项
+            dimension: 使用次数统计维度
+            count: 抽取数量
+        """
+        usage = self._usage[dimension]
+        keyed = [
+            (self.rng.random() ** ((1 + usage.get(item, 0)) ** 2), item)
+            for item in items
+        ]
+        keyed.sort(reverse=True)
+        return [item for _, item in keyed[:count]]
+
+    def _record_usage(self, plan: Dict[str, Any]):
+        """登记方案中各素材/效果的使用次数"""
+        for video_path in plan['videos']:
+            folder = self.video_folders[video_path]
+            self._usage['folders'][folder] = self._usage['folders'].get(folder, 0) + 1
+            self._usage['videos'][video_path] = self._usage['videos'].get(video_path, 0) + 1
+        for dimension in ('filters', 'effects', 'transitions'):
+            for name in plan[dimension]:
+                self._usage[dimension][name] = self._usage[dimension].get(name, 0) + 1
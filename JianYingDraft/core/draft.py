@@ -60,6 +60,13 @@ class Draft:
         self._audios_material_in_draft_meta_info = self._materials_in_draft_meta_info[6]['value']  # type为8的那条
 
         self._tracks_in_draft_content: [] = self._draft_content_data['tracks']  # 草稿内容库的轨道
+
+        # 轨道索引（类型 -> 该类型的轨道列表）和各类型首条轨道的结束时间（类型 -> (片段数, 结束时间)）
+        # 避免每次添加媒体都线性扫描轨道、重新计算时长
+        self._tracks_by_type: dict = {}
+        self._indexed_track_count = 0
+        self._track_end_times: dict = {}
+        self._rebuild_track_index()
         pass
 
     def add_media(self, media_file_full_name: str, start_at_track=0, duration=0, index=0, **kwargs):
@@ -84,6 +91,58 @@ class Draft:
         self.__add_media_to_meta_info(media)
         pass
 
+    def add_media_many(self, media_file_full_names: list, start_at_track=0, durations: list = None,
+                       media_kwargs: list = None, before_insert=None, add_to_meta_info=True, max_workers=8,
+                       **kwargs) -> list:
+        """
+        批量添加媒体到草稿
+        先在线程池中并发探测全部文件的媒体信息（复用探测缓存），再按顺序创建媒体并写入素材库、轨道和元数据库
+        @param media_file_full_names: 媒体文件全路径列表
+        @param start_at_track: 与add_media相同，为0时依次接在轨道末尾
+        @param durations: 每个媒体的时长（微秒），为None或某项为0时使用媒体自身时长
+        @param media_kwargs: 每个媒体单独的创建参数，与公共的kwargs合并
+        @param before_insert: 媒体创建后、写入草稿前的回调 before_insert(index, media)，可在此修改片段设置
+        @param add_to_meta_info: 是否写入草稿的元数据库
+        @param max_workers: 并发探测的线程数
+        @return: 创建的媒体列表，与输入顺序一致，探测失败的位置为None
+        """
+        media_infos = MediaFactory.probe_many(media_file_full_names, max_workers=max_workers)
+
+        medias = []
+        for i, (media_file_full_name, media_info) in enumerate(zip(media_file_full_names, media_infos)):
+            if media_info is None:
+                medias.append(None)
+                continue
+            pass
+
+            _kwargs = dict(kwargs)
+            if media_kwargs and media_kwargs[i]:
+                _kwargs.update(media_kwargs[i])
+            pass
+
+            duration = durations[i] if durations else 0
+            media = MediaFactory.create_from_media_info(media_file_full_name, media_info, duration=duration,
+                                                        **_kwargs)
+            if media is None:
+                medias.append(None)
+                continue
+            pass
+
+            if before_insert:
+                before_insert(i, media)
+            pass
+
+            self.__add_media_to_content_materials(media)
+            self.__add_media_to_content_tracks(media, start=start_at_track)
+            if add_to_meta_info:
+                self.__add_media_to_meta_info(media)
+            pass
+
+            medias.append(media)
+        pass
+
+        return medias
+
     def add_effect(self, effect_name_or_resource_id: str | int, start=0, duration=0, index=0, **kwargs):
         """
         添加特效到草稿
@@ -162,10 +221,10 @@ class Draft:
         # 校准时长信息
         self.__calc_duration()
 
-        # 新建项目文件夹
+        # 确保项目文件夹存在（重复保存时不删除文件夹，保留剪映生成的其他文件）
         tools.create_folder(self._draft_folder)
 
-        # 持久化草稿
+        # 持久化草稿（原子替换写入，内容未变化的文件跳过）
         draft_content_file_full_name = os.path.join(self._draft_folder, self._draft_content_file_base_name)
         draft_meta_info_file_full_name = os.path.join(self._draft_folder, self._draft_meta_info_file_base_name)
         tools.write_json(draft_content_file_full_name, self._draft_content_data)
@@ -191,20 +250,7 @@ class Draft:
         """
         添加媒体信息到素材内容库的轨道部分：
         """
-        all_tracks = self._tracks_in_draft_content
-        target_track = None
-        for _track in all_tracks:
-            if _track["type"] == media.category_type:
-                target_track = _track
-                break
-            pass
-        pass
-
-        if target_track is None:
-            target_track = template.get_track()
-            target_track["type"] = media.category_type
-            self._tracks_in_draft_content.append(target_track)
-        pass
+        target_track = self._get_or_create_track(media.category_type)
 
         if not start:
             # 添加新片段之前轨道总时长
@@ -214,31 +260,83 @@ class Draft:
         # 设置新segment的在轨道上的开始时间
         segment_target_timerange = media.segment_data_for_content["target_timerange"]
         segment_target_timerange["start"] = start
-        target_track["segments"].append(media.segment_data_for_content)
+        self.__append_segment(media.category_type, target_track, media.segment_data_for_content)
 
     def __add_subtitle_to_track(self, media: Media, start_time=0):
         """
         添加字幕到指定轨道，确保所有字幕在同一轨道
         """
-        all_tracks = self._tracks_in_draft_content
-        subtitle_track = None
-
-        # 查找现有的字幕轨道
-        for _track in all_tracks:
-            if _track["type"] == "text":
-                subtitle_track = _track
-                break
-
-        # 如果没有字幕轨道，创建一个
-        if subtitle_track is None:
-            subtitle_track = template.get_track()
-            subtitle_track["type"] = "text"
-            self._tracks_in_draft_content.append(subtitle_track)
+        # 查找现有的字幕轨道，没有则创建一个
+        subtitle_track = self._get_or_create_track("text")
 
         # 设置字幕片段的开始时间
         segment_target_timerange = media.segment_data_for_content["target_timerange"]
         segment_target_timerange["start"] = start_time
-        subtitle_track["segments"].append(media.segment_data_for_content)
+        self.__append_segment("text", subtitle_track, media.segment_data_for_content)
+
+    def _get_tracks_by_type(self, track_type: str) -> list:
+        """
+        获取某类型的全部轨道（按在草稿中的先后顺序）
+        如果轨道列表在索引之外被直接追加过，先重建索引
+        """
+        if len(self._tracks_in_draft_content) != self._indexed_track_count:
+            self._rebuild_track_index()
+        pass
+
+        return self._tracks_by_type.get(track_type, [])
+
+    def _get_or_create_track(self, track_type: str, track_name: str = ""):
+        """
+        获取某类型的第一条轨道，不存在时创建
+        """
+        tracks = self._get_tracks_by_type(track_type)
+        if tracks:
+            return tracks[0]
+        pass
+
+        return self._append_track(track_type, track_name)
+
+    def _append_track(self, track_type: str, track_name: str = ""):
+        """
+        新建一条轨道追加到草稿，并登记到轨道索引
+        """
+        if len(self._tracks_in_draft_content) != self._indexed_track_count:
+            self._rebuild_track_index()
+        pass
+
+        new_track = template.get_track()
+        new_track["type"] = track_type
+        if track_name:
+            new_track["_track_name"] = track_name  # 添加轨道标识
+        pass
+
+        self._tracks_in_draft_content.append(new_track)
+        self._tracks_by_type.setdefault(track_type, []).append(new_track)
+        self._indexed_track_count += 1
+        return new_track
+
+    def _rebuild_track_index(self):
+        """
+        根据草稿当前的轨道列表重建轨道索引
+        """
+        self._tracks_by_type = {}
+        for _track in self._tracks_in_draft_content:
+            self._tracks_by_type.setdefault(_track["type"], []).append(_track)
+        pass
+
+        self._indexed_track_count = len(self._tracks_in_draft_content)
+        self._track_end_times = {}
+
+    def __append_segment(self, track_type: str, track: dict, segment: dict):
+        """
+        追加片段到轨道，并累计该类型首条轨道的结束时间
+        """
+        track["segments"].append(segment)
+
+        if track is self._tracks_by_type[track_type][0]:
+            timerange = segment["target_timerange"]
+            self._track_end_times[track_type] = (len(track["segments"]), timerange["start"] + timerange["duration"])
+        pass
 
     def __add_media_to_meta_info(self, media: Media):
         """
@@ -270,43 +368,33 @@ class Draft:
         self._draft_meta_info_data['tm_duration'] = video_durations
 
     def __get_track_duration(self, track_type: str):
-        all_tracks = self._tracks_in_draft_content
-        target_track = None
-        for _track in all_tracks:
-            if _track["type"] == track_type:
-                target_track = _track
-                break
-            pass
+        tracks = self._get_tracks_by_type(track_type)
+        if not tracks:
+            return 0
         pass
 
-        if not target_track:
+        segments = tracks[0]['segments']
+        if len(segments) == 0:
             return 0
         pass
 
-        if len(target_track['segments']) == 0:
-            return 0
+        # 片段数与记录一致时直接使用累计的结束时间；片段在索引之外被追加过时，按最后一个片段重新计算
+        segment_count, track_duration = self._track_end_times.get(track_type, (-1, 0))
+        if segment_count != len(segments):
+            last_segment_timerange = segments[-1]['target_timerange']
+            track_duration = last_segment_timerange['start'] + last_segment_timerange['duration']
+            self._track_end_times[track_type] = (len(segments), track_duration)
         pass
 
-        # 轨道总时长
-        last_segment = target_track['segments'][-1]
-        last_segment_timerange = last_segment['target_timerange']
-        track_duration = last_segment_timerange['start'] + last_segment_timerange['duration']
         return track_duration
 
     def __set_track_duration(self, track_type: str, duration: int):
-        all_tracks = self._tracks_in_draft_content
-        target_track = None
-        for _track in all_tracks:
-            if _track["type"] == track_type:
-                target_track = _track
-                break
-            pass
-        pass
-
-        if not target_track:
+        tracks = self._get_tracks_by_type(track_type)
+        if not tracks:
             return
         pass
 
+        target_track = tracks[0]
         segments = target_track['segments']
 
         done = False
@@ -332,3 +420,6 @@ class Draft:
                 pass
             pass
         pass
+
+        # 片段时长被截断，结束时间需要重新计算
+        self._track_end_times.pop(track_type, None)
@@ -21,9 +21,14 @@ class DualAudioManager:
     实现双轨音频处理，包括解说音频100%音量和背景音频10%音量的管理
     """
     
-    def __init__(self):
-        """初始化双轨音频管理器"""
-        self.config_manager = AutoMixConfigManager
+    def __init__(self, config_manager: AutoMixConfigManager = None):
+        """
+        初始化双轨音频管理器
+
+        Args:
+            config_manager: 配置管理器或配置快照，为None时使用当前配置快照
+        """
+        self.config_manager = config_manager or AutoMixConfigManager.get_snapshot()
         self.narration_tracks = []  # 解说音频轨道列表
         self.background_tracks = []  # 背景音频轨道列表
     
@@ -10,6 +10,7 @@ import random
 import math
 from typing import List, Dict, Any, Optional, Tuple
 from JianYingDraft.core.configManager import AutoMixConfigManager
+from JianYingDraft.core.randomStreams import create_rng
 
 
 class DurationController:
@@ -18,14 +19,16 @@ class DurationController:
     实现30-40秒总时长的精确控制和智能分配算法
     """
     
-    def __init__(self, config_manager: AutoMixConfigManager = None):
+    def __init__(self, config_manager: AutoMixConfigManager = None, rng: random.Random = None):
         """
         初始化时长控制器
         
         Args:
             config_manager: 配置管理器实例
+            rng: 随机数生成器（由草稿种子创建），为None时新建独立的生成器
         """
         self.config_manager = config_manager or AutoMixConfigManager
+        self.rng = rng or create_rng()
         
         # 获取配置参数
         self.min_total_duration, self.max_total_duration = self.config_manager.get_video_duration_range()
@@ -56,7 +59,7 @@ class DurationController:
         
         # 确定目标总时长
         if target_duration is None:
-            target_duration = random.randint(self.min_total_duration, self.max_total_duration)
+            target_duration = self.rng.randint(self.min_total_duration, self.max_total_duration)
         
         # 确保目标时长在合理范围内
         target_duration = max(self.min_total_duration, min(self.max_total_duration, target_duration))
@@ -164,7 +167,7 @@ class DurationController:
         if self.duration_variance > 0:
             for i in range(len(durations)):
                 variance = durations[i] * self.duration_variance
-                random_change = random.randint(int(-variance), int(variance))
+                random_change = self.rng.randint(int(-variance), int(variance))
                 durations[i] += random_change
 
         # 第三轮：调整总时长以匹配目标
@@ -279,7 +282,7 @@ class DurationController:
             return segment_durations, current_total
         
         # 计算目标片段总时长
-        target_total = random.randint(self.min_total_duration, self.max_total_duration)
+        target_total = self.rng.randint(self.min_total_duration, self.max_total_duration)
         target_segment_duration = target_total - total_transition_duration
         
         if target_segment_duration <= 0:
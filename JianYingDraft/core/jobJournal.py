@@ -0,0 +1,200 @@
+"""
+混剪任务日志 - 以追加写入的JSONL记录任务计划与每个草稿的完成状态，进程重启后可续跑未完成的批量任务
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, List
+
+
+class JobJournal:
+    """
+    混剪任务日志
+    每行一条记录，记录类型：
+        job_planned    任务计划（任务类型、产品、每个草稿的序号/时长/随机种子）
+        draft_finished 单个草稿结束（状态、草稿名称、输出路径或错误）
+        job_finished   任务结束（completed/failed/cancelled）
+    只追加不改写，崩溃时最多丢失最后一行未写完的记录
+    """
+
+    def __init__(self, journal_file: str):
+        """
+        初始化任务日志
+
+        Args:
+            journal_file: 日志文件路径
+        """
+        self.journal_file = journal_file
+        self._lock = threading.Lock()
+
+        journal_dir = os.path.dirname(self.journal_file)
+        if journal_dir and not os.path.exists(journal_dir):
+            os.makedirs(journal_dir)
+
+    def record_job_planned(self, job_id: str, job_type: str, product: str,
+                           drafts: List[Dict[str, Any]], params: Dict[str, Any] = None):
+        """
+        记录任务计划
+
+        Args:
+            job_id: 任务ID
+            job_type: 任务类型（single/batch）
+            product: 产品型号
+            drafts: 草稿计划列表，每项包含index、duration、seed
+            params: 任务的原始参数
+        """
+        self._append({
+            'event': 'job_planned',
+            'job_id': job_id,
+            'job_type': job_type,
+            'product': product,
+            'params': params or {},
+            'drafts': drafts
+        })
+
+    def record_draft_finished(self, job_id: str, index: int, status: str,
+                              draft_name: str = None, draft_path: str = None,
+                              error: str = None, extra: Dict[str, Any] = None):
+        """
+        记录单个草稿结束
+
+        Args:
+            job_id: 任务ID
+            index: 草稿序号（从1开始）
+            status: success/failed
+            draft_name: 草稿名称
+            draft_path: 草稿输出路径
+            error: 失败原因
+            extra: 其他需要恢复的结果字段（如统计数量）
+        """
+        record = {
+            'event': 'draft_finished',
+            'job_id': job_id,
+            'index': index,
+            'status': status,
+            'draft_name': draft_name,
+            'draft_path': draft_path,
+            'error': error
+        }
+        if extra:
+            record['extra'] = extra
+        self._append(record)
+
+    def record_job_finished(self, job_id: str, status: str):
+        """
+        记录任务结束
+
+        Args:
+            job_id: 任务ID
+            status: completed/failed/cancelled
+        """
+        self._append({
+            'event': 'job_finished',
+            'job_id': job_id,
+            'status': status
+        })
+
+    def load_jobs(self) -> Dict[str, Dict[str, Any]]:
+        """
+        回放日志，重建每个任务的状态
+
+        Returns:
+            Dict: job_id -> 任务状态（包含drafts计划、finished草稿记录与结束状态）
+        """
+        jobs: Dict[str, Dict[str, Any]] = {}
+        if not os.path.exists(self.journal_file):
+            return jobs
+
+        with self._lock:
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 崩溃时写了一半的最后一行，忽略
+                continue
+
+            job_id = record.get('job_id')
+            event = record.get('event')
+            if event == 'job_planned':
+                jobs[job_id] = {
+                    'job_id': job_id,
+                    'job_type': record.get('job_type'),
+                    'product': record.get('product'),
+                    'params': record.get('params', {}),
+                    'drafts': record.get('drafts', []),
+                    'finished': {},
+                    'status': None,
+                    'planned_at': record.get('timestamp')
+                }
+            elif job_id in jobs:
+                if event == 'draft_finished':
+                    jobs[job_id]['finished'][record.get('index')] = record
+                elif event == 'job_finished':
+                    jobs[job_id]['status'] = record.get('status')
+
+        return jobs
+
+    def load_unfinished_jobs(self) -> List[Dict[str, Any]]:
+        """
+        获取被中断（没有job_finished记录）的任务，按计划时间排序
+
+        Returns:
+            List[Dict]: 未完成任务列表，每项额外包含pending_drafts（尚未完成的草稿计划）
+        """
+        unfinished = []
+        for job in self.load_jobs().values():
+            if job['status'] is not None:
+                continue
+            job['pending_drafts'] = [
+                draft for draft in job['drafts']
+                if draft.get('index') not in job['finished']
+            ]
+            unfinished.append(job)
+
+        unfinished.sort(key=lambda job: job.get('planned_at') or 0)
+        return unfinished
+
+    def compact(self):
+        """
+        压缩日志：只保留未完成任务的记录
+        重写通过临时文件+os.replace完成，避免压缩过程中崩溃损坏日志
+        """
+        unfinished = self.load_unfinished_jobs()
+        temp_file = f"{self.journal_file}.tmp"
+
+        with self._lock:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                for job in unfinished:
+                    records = [{
+                        'event': 'job_planned',
+                        'job_id': job['job_id'],
+                        'job_type': job['job_type'],
+                        'product': job['product'],
+                        'params': job['params'],
+                        'drafts': job['drafts'],
+                        'timestamp': job.get('planned_at')
+                    }]
+                    records.extend(job['finished'][index] for index in sorted(job['finished']))
+                    for record in records:
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.journal_file)
+
+    def _append(self, record: Dict[str, Any]):
+        """追加一条记录并落盘"""
+        record.setdefault('timestamp', time.time())
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
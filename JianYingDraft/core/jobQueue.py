@@ -0,0 +1,297 @@
+"""
+混剪任务队列 - 为Web界面提供多任务排队、并发执行与取消
+"""
+import copy
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, Any, Optional, List, Callable
+
+
+class JobCancelledError(Exception):
+    """任务已被取消"""
+    pass
+
+
+class AutoMixJob:
+    """
+    混剪任务记录
+    所有字段读写都经过任务自身的锁，后台线程与Web请求线程可以安全并发访问
+    """
+
+    # 任务状态
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
+
+    FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_FAILED, STATUS_CANCELLED)
+
+    def __init__(self, job_type: str, params: Dict[str, Any], total_count: int = 1, job_id: str = None):
+        """
+        初始化任务记录
+
+        Args:
+            job_type: 任务类型（single/batch）
+            params: 任务参数
+            total_count: 需要生成的草稿数量
+            job_id: 任务ID，为None时自动生成（续跑任务沿用原ID）
+        """
+        self.job_id = job_id or self.new_job_id()
+        self.job_type = job_type
+        self.params = dict(params)
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self._fields = {
+            'status': self.STATUS_QUEUED,
+            'progress': '排队等待中...',
+            'percent': 0.0,
+            'stage': None,
+            'error': None,
+            'result': None,
+            'current_count': 0,
+            'total_count': total_count,
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None
+        }
+
+    @staticmethod
+    def new_job_id() -> str:
+        """生成新的任务ID"""
+        return uuid.uuid4().hex[:12]
+
+    def update(self, **fields):
+        """更新任务字段"""
+        with self._lock:
+            self._fields.update(fields)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """读取单个任务字段"""
+        with self._lock:
+            return self._fields.get(key, default)
+
+    @property
+    def status(self) -> str:
+        """任务状态"""
+        return self.get('status')
+
+    @property
+    def is_finished(self) -> bool:
+        """任务是否已结束"""
+        return self.status in self.FINISHED_STATUSES
+
+    def request_cancel(self):
+        """请求取消任务（运行中的任务在下一个检查点停止）"""
+        self._cancel_event.set()
+
+    def is_cancel_requested(self) -> bool:
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """检查点：如果已请求取消则抛出JobCancelledError"""
+        if self._cancel_event.is_set():
+            raise JobCancelledError(f"任务 {self.job_id} 已取消")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """导出任务快照"""
+        with self._lock:
+            snapshot = dict(self._fields)
+            snapshot['result'] = copy.deepcopy(snapshot['result'])
+        snapshot['job_id'] = self.job_id
+        snapshot['job_type'] = self.job_type
+        snapshot['params'] = dict(self.params)
+        snapshot['running'] = snapshot['status'] in (self.STATUS_QUEUED, self.STATUS_RUNNING)
+        snapshot['cancel_requested'] = self.is_cancel_requested()
+        return snapshot
+
+
+class AutoMixJobQueue:
+    """
+    混剪任务队列
+    任务按提交顺序进入队列，由max_workers个工作线程并发执行
+    """
+
+    IDLE_CHECK_INTERVAL = 0.5  # 空闲工作线程检查线程数量是否被调低的间隔（秒）
+
+    def __init__(self, max_workers: int = 2, max_history: int = 100):
+        """
+        初始化任务队列
+
+        Args:
+            max_workers: 并发工作线程数量
+            max_history: 保留的已结束任务记录数量
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.max_history = max_history
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, AutoMixJob] = {}
+        self._order: List[str] = []
+        self._runners: Dict[str, Callable[[AutoMixJob], None]] = {}
+        self._pending: queue.Queue = queue.Queue()
+        self._workers: List[threading.Thread] = []
+
+    def submit(self, job_type: str, runner: Callable[[AutoMixJob], None],
+               params: Dict[str, Any] = None, total_count: int = 1,
+               job_id: str = None) -> AutoMixJob:
+        """
+        提交任务
+
+        Args:
+            job_type: 任务类型
+            runner: 执行函数，接收AutoMixJob，负责写入进度与结果
+            params: 任务参数
+            total_count: 需要生成的草稿数量
+            job_id: 任务ID，为None时自动生成
+
+        Returns:
+            AutoMixJob: 新建的任务记录
+        """
+        job = AutoMixJob(job_type, params or {}, total_count, job_id)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._order.append(job.job_id)
+            self._runners[job.job_id] = runner
+            self._trim_history()
+            self._ensure_workers()
+        self._pending.put(job.job_id)
+        return job
+
+    def add_finished_job(self, job_type: str, fields: Dict[str, Any],
+                         params: Dict[str, Any] = None) -> AutoMixJob:
+        """
+        登记一个已结束的任务记录（不进入执行队列，用于测试和导入历史结果）
+
+        Args:
+            job_type: 任务类型
+            fields: 任务字段（status、progress、result等）
+            params: 任务参数
+
+        Returns:
+            AutoMixJob: 新建的任务记录
+        """
+        job = AutoMixJob(job_type, params or {}, fields.get('total_count', 1))
+        job.update(**fields)
+        job.update(finished_at=time.time())
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._order.append(job.job_id)
+            self._trim_history()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[AutoMixJob]:
+        """获取任务记录"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """获取所有任务快照（最新提交的在前）"""
+        with self._lock:
+            jobs = [self._jobs[job_id] for job_id in reversed(self._order)]
+        return [job.to_dict() for job in jobs]
+
+    def get_latest_job(self) -> Optional[AutoMixJob]:
+        """获取最近提交的任务"""
+        with self._lock:
+            if not self._order:
+                return None
+            return self._jobs[self._order[-1]]
+
+    def get_active_jobs(self) -> List[AutoMixJob]:
+        """获取排队中和运行中的任务"""
+        with self._lock:
+            jobs = [self._jobs[job_id] for job_id in self._order]
+        return [job for job in jobs if not job.is_finished]
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        取消任务
+        排队中的任务立即取消；运行中的任务在下一个检查点停止
+
+        Returns:
+            bool: 任务存在且尚未结束时返回True
+        """
+        job = self.get_job(job_id)
+        if job is None or job.is_finished:
+            return False
+
+        job.request_cancel()
+        if job.status == AutoMixJob.STATUS_QUEUED:
+            job.update(status=AutoMixJob.STATUS_CANCELLED, progress='任务已取消', finished_at=time.time())
+        else:
+            job.update(progress='正在取消任务...')
+        return True
+
+    def set_max_workers(self, max_workers: int):
+        """
+        调整并发工作线程数量
+        增加时立即启动新线程；减少时多余的线程在完成手头的任务后退出，此后同时运行的任务不超过新的数量
+        """
+        with self._lock:
+            self.max_workers = max(1, int(max_workers))
+            self._ensure_workers()
+
+    def _ensure_workers(self):
+        """按需启动工作线程（调用方持有锁）"""
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"automix-worker-{len(self._workers) + 1}",
+                daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _trim_history(self):
+        """清理超出保留数量的已结束任务（调用方持有锁）"""
+        finished = [job_id for job_id in self._order if self._jobs[job_id].is_finished]
+        overflow = len(finished) - self.max_history
+        for job_id in finished[:max(overflow, 0)]:
+            self._order.remove(job_id)
+            self._jobs.pop(job_id, None)
+            self._runners.pop(job_id, None)
+
+    def _retire_if_surplus(self) -> bool:
+        """工作线程数量超过max_workers时让当前线程退出（调用方持有锁）"""
+        current = threading.current_thread()
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        if len(self._workers) <= self.max_workers or current not in self._workers:
+            return False
+        self._workers.remove(current)
+        return True
+
+    def _worker_loop(self):
+        """工作线程主循环"""
+        while True:
+            with self._lock:
+                if self._retire_if_surplus():
+                    return
+            try:
+                # 定时醒来检查线程数量是否被调低
+                job_id = self._pending.get(timeout=self.IDLE_CHECK_INTERVAL)
+            except queue.Empty:
+                continue
+            with self._lock:
+                job = self._jobs.get(job_id)
+                runner = self._runners.pop(job_id, None)
+
+            if job is None or runner is None or job.is_finished:
+                continue
+
+            job.update(status=AutoMixJob.STATUS_RUNNING, started_at=time.time())
+            try:
+                runner(job)
+                if job.is_cancel_requested():
+                    job.update(status=AutoMixJob.STATUS_CANCELLED, progress='任务已取消')
+                elif job.status == AutoMixJob.STATUS_RUNNING:
+                    job.update(status=AutoMixJob.STATUS_COMPLETED)
+            except JobCancelledError:
+                job.update(status=AutoMixJob.STATUS_CANCELLED, progress='任务已取消')
+            except Exception as e:
+                job.update(status=AutoMixJob.STATUS_FAILED, error=str(e))
+            finally:
+                job.update(finished_at=time.time())
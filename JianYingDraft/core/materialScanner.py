@@ -14,6 +14,7 @@ try:
 except ImportError:
     MediaInfo = None
 from JianYingDraft.core.mediaFactory import MediaFactory
+from JianYingDraft.core.randomStreams import create_rng
 
 
 class MaterialScanner:
@@ -27,8 +28,14 @@ class MaterialScanner:
     AUDIO_EXTENSIONS = {'.mp3', '.wav', '.aac', '.flac', '.ogg', '.wma', '.m4a', '.opus'}
     SUBTITLE_EXTENSIONS = {'.srt', '.ass', '.ssa', '.vtt', '.sub', '.idx'}
     
-    def __init__(self):
-        """初始化素材扫描器"""
+    def __init__(self, rng: random.Random = None):
+        """
+        初始化素材扫描器
+
+        Args:
+            rng: 随机数生成器（由草稿种子创建），为None时新建独立的生成器
+        """
+        self.rng = rng or create_rng()
         self.videos: List[Dict] = []
         self.audios: List[Dict] = []
         self.subtitles: List[Dict] = []
@@ -241,7 +248,7 @@ class MaterialScanner:
             print(f"警告：可用视频数量({len(filtered_videos)})少于请求数量({count})")
             return filtered_videos
         
-        return random.sample(filtered_videos, count)
+        return self.rng.sample(filtered_videos, count)
     
     def get_random_audios(self, count: int, min_duration: int = 0, max_duration: int = None) -> List[Dict]:
         """随机选择指定数量的音频文件"""
@@ -251,7 +258,7 @@ class MaterialScanner:
             print(f"警告：可用音频数量({len(filtered_audios)})少于请求数量({count})")
             return filtered_audios
         
-        return random.sample(filtered_audios, count)
+        return self.rng.sample(filtered_audios, count)
     
     def get_random_subtitles(self, count: int) -> List[Dict]:
         """随机选择指定数量的字幕文件"""
@@ -259,7 +266,7 @@ class MaterialScanner:
             print(f"警告：可用字幕数量({len(self.subtitles)})少于请求数量({count})")
             return self.subtitles
         
-        return random.sample(self.subtitles, count)
+        return self.rng.sample(self.subtitles, count)
     
     def filter_videos_by_duration(self, min_duration: int = 0, max_duration: int = None) -> List[Dict]:
         """根据时长过滤视频文件"""
@@ -414,7 +421,8 @@ class MaterialScanner:
             }
 
             # 扫描每个子文件夹
-            for item in os.listdir(product_path):
+            # 按名称排序，同一种子在不同文件系统上得到相同的选择
+            for item in sorted(os.listdir(product_path)):
                 folder_path = os.path.join(product_path, item)
                 if os.path.isdir(folder_path):
                     folder_materials = self._scan_folder_materials(folder_path, item)
@@ -461,14 +469,14 @@ class MaterialScanner:
                 raise ValueError(f"素材库路径不存在: {base_path}")
 
             # 获取所有子目录作为产品型号
-            products = [item for item in os.listdir(base_path)
+            products = [item for item in sorted(os.listdir(base_path))
                        if os.path.isdir(os.path.join(base_path, item))]
 
             if not products:
                 raise ValueError("素材库中没有找到产品型号目录")
 
             # 随机选择一个产品型号
-            selected_product = random.choice(products)
+            selected_product = self.rng.choice(products)
             print(f"随机选择产品型号: {selected_product}")
             return selected_product
 
@@ -487,7 +495,7 @@ class MaterialScanner:
         }
 
         try:
-            for file_name in os.listdir(folder_path):
+            for file_name in sorted(os.listdir(folder_path)):
                 file_path = os.path.join(folder_path, file_name)
                 if os.path.isfile(file_path):
                     file_ext = os.path.splitext(file_name)[1].lower()
@@ -520,7 +528,7 @@ class MaterialScanner:
         background_audios = []
 
         try:
-            for file_name in os.listdir(audio_path):
+            for file_name in sorted(os.listdir(audio_path)):
                 file_path = os.path.join(audio_path, file_name)
                 if os.path.isfile(file_path):
                     file_ext = os.path.splitext(file_name)[1].lower()
@@ -577,7 +585,7 @@ class MaterialScanner:
                 # 第一轮：从每个文件夹选择一个视频
                 for folder in folders:
                     if videos_by_folder[folder]:
-                        video = random.choice(videos_by_folder[folder])
+                        video = self.rng.choice(videos_by_folder[folder])
                         selected_videos.append(video)
                         videos_by_folder[folder].remove(video)
                         print(f"  从文件夹 '{folder}' 选择视频: {video['filename']}")
@@ -592,7 +600,7 @@ class MaterialScanner:
 
                     folder = available_folders[i % len(available_folders)]
                     if videos_by_folder[folder]:
-                        video = random.choice(videos_by_folder[folder])
+                        video = self.rng.choice(videos_by_folder[folder])
                         selected_videos.append(video)
                         videos_by_folder[folder].remove(video)
                         print(f"  额外从文件夹 '{folder}' 选择视频: {video['filename']}")
@@ -613,14 +621,14 @@ class MaterialScanner:
                                if a.get('folder_name') in selected_folders]
 
                 if folder_audios:
-                    selected_materials['narration_audio'] = random.choice(folder_audios)['path']
+                    selected_materials['narration_audio'] = self.rng.choice(folder_audios)['path']
                 else:
-                    selected_materials['narration_audio'] = random.choice(available_audios)['path']
+                    selected_materials['narration_audio'] = self.rng.choice(available_audios)['path']
 
             # 3. 选择背景音效
             background_audios = product_materials['background_audios']
             if background_audios:
-                selected_materials['background_audio'] = random.choice(background_audios)['path']
+                selected_materials['background_audio'] = self.rng.choice(background_audios)['path']
 
             # 4. 选择字幕文件
             available_subtitles = product_materials['subtitles']
@@ -632,9 +640,9 @@ class MaterialScanner:
                                   if s.get('folder_name') in selected_folders]
 
                 if folder_subtitles:
-                    selected_materials['subtitle_file'] = random.choice(folder_subtitles)['path']
+                    selected_materials['subtitle_file'] = self.rng.choice(folder_subtitles)['path']
                 else:
-                    selected_materials['subtitle_file'] = random.choice(available_subtitles)['path']
+                    selected_materials['subtitle_file'] = self.rng.choice(available_subtitles)['path']
 
             print(f"素材选择完成:")
             print(f"  视频: {len(selected_materials['videos'])}个")
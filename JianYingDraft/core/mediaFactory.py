@@ -7,17 +7,40 @@
  * @company: HiLand & RainyTop
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 from BasicLibrary.data.stringHelper import StringHelper
 from BasicLibrary.environment.dynamicImporter import DynamicImporter
 from pymediainfo import MediaInfo
 
+from JianYingDraft.core.mediaAudio import MediaAudio
+from JianYingDraft.core.mediaImage import MediaImage
+from JianYingDraft.core.mediaPhoto import MediaPhoto
+from JianYingDraft.core.mediaText import MediaText
+from JianYingDraft.core.mediaVideo import MediaVideo
+from pyJianYingDraft.local_materials import probe_cache
+
 
 class MediaFactory:
     """
     媒体工厂
     """
 
+    # 素材类型 -> 媒体类（静态注册，避免每个文件都按字符串动态导入）；未注册的类型仍按命名约定动态加载
+    media_classes = {
+        "Video": MediaVideo,
+        "Audio": MediaAudio,
+        "Image": MediaImage,
+        "Photo": MediaPhoto,
+        "Text": MediaText,
+    }
+
+    photo_extensions = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp")
+
+    # 探测结果在进程内共享的缓存中的种类名
+    probe_kind = "mediainfo"
+
     @staticmethod
     def create(media_full_name: str, **kwargs):
         """
@@ -28,32 +51,74 @@ class MediaFactory:
         if  os.path.isfile(media_full_name) and not os.path.exists(media_full_name):
             return None
         pass
-        
 
-                
+        media_info = MediaFactory.probe(media_full_name)
+        return MediaFactory.create_from_media_info(media_full_name, media_info, **kwargs)
 
-        media_info = MediaInfo.parse(media_full_name).to_data()["tracks"][1]
-        
-        
+    @classmethod
+    def create_from_media_info(cls, media_full_name: str, media_info: Dict[str, Any], **kwargs):
+        """
+        根据已探测的媒体信息创建素材实体
+        :param media_full_name: 媒体文件全路径
+        :param media_info: pymediainfo解析出的第一条媒体轨道信息
+        :return:
+        """
         material_type = media_info['track_type'].lower()
         material_type = StringHelper.upper_first_char(material_type)
-        
-        if media_full_name.endswith((".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp")):
-
-            material_type ="Photo"
-            
-  
-        package_name = f"JianYingDraft.core.media{material_type}"
-        class_name = f"Media{material_type}"
 
+        if media_full_name.endswith(cls.photo_extensions):
+            material_type = "Photo"
+        pass
 
-        kwargs["mediaInfo"] = media_info
+        # 缓存中的探测结果为多个实体共享，传入副本
+        kwargs["mediaInfo"] = dict(media_info)
         kwargs["mediaFileFullName"] = media_full_name
 
-        material = DynamicImporter.load_class(package_name, class_name, **kwargs)
+        media_class = cls.media_classes.get(material_type)
+        if media_class is None:
+            package_name = f"JianYingDraft.core.media{material_type}"
+            class_name = f"Media{material_type}"
+            return DynamicImporter.load_class(package_name, class_name, **kwargs)
+        pass
+
+        return media_class(**kwargs)
+
+    @classmethod
+    def probe(cls, media_full_name: str) -> Dict[str, Any]:
+        """
+        探测媒体信息（文件未变化时直接使用缓存的结果）
+        :param media_full_name: 媒体文件全路径
+        :return: 第一条媒体轨道（tracks[1]）的信息
+        """
+        return probe_cache.get_or_probe(media_full_name, cls._parse_media_info, cls.probe_kind)
+
+    @classmethod
+    def probe_many(cls, media_full_names: List[str], max_workers: int = 8) -> List[Optional[Dict[str, Any]]]:
+        """
+        并发探测多个媒体文件，结果顺序与输入一致
+        :param media_full_names: 媒体文件全路径列表
+        :param max_workers: 并发线程数
+        :return: 媒体信息列表，文件不存在或探测失败的位置为None
+        """
+        def _probe_or_none(media_full_name: str) -> Optional[Dict[str, Any]]:
+            try:
+                return cls.probe(media_full_name)
+            except Exception as e:
+                print(f"⚠️ 探测媒体信息失败 {media_full_name}: {e}")
+                return None
 
-        return material
-    
+        unique_names = list(dict.fromkeys(media_full_names))
+        worker_count = max(1, min(max_workers, len(unique_names)))
+        if worker_count == 1:
+            probed = [_probe_or_none(name) for name in unique_names]
+        else:
+            with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                probed = list(executor.map(_probe_or_none, unique_names))
+        pass
 
-        
-        
+        results = dict(zip(unique_names, probed))
+        return [results[name] for name in media_full_names]
+
+    @staticmethod
+    def _parse_media_info(media_full_name: str) -> Dict[str, Any]:
+        return MediaInfo.parse(media_full_name).to_data()["tracks"][1]
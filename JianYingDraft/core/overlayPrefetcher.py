@@ -0,0 +1,324 @@
+"""
+防审核覆盖层预取器 - 后台维护一个按内容寻址的覆盖视频池，草稿生成时直接取用，不等待网络
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, Any, List, Optional, Callable
+
+from JianYingDraft.core.configManager import AutoMixConfigManager
+from JianYingDraft.core.pexelsManager import PexelsManager
+from JianYingDraft.core.randomStreams import create_rng
+
+
+class OverlayPrefetcher:
+    """
+    防审核覆盖层预取器
+    后台线程保持池中有pool_size个未被取用过的覆盖视频：搜索 → 下载 → 计算SHA-256 → 探测一次时长/分辨率，
+    视频以<sha256>.mp4存放在池目录中，旁边的<sha256>.json记录探测结果与取用次数（json存在即表示视频可用）。
+    池是各草稿共享的：取用时视频留在池中（草稿直接引用池中的路径），优先取未被取用过的视频，
+    没有新视频时复用已取用过的视频，因此网络异常或搜索结果用尽时草稿仍有覆盖层可用。
+    取用过的视频按最近取用时间做LRU淘汰，容量上限和最长保留时间默认与Pexels缓存相同（单独计算）
+    """
+
+    # 默认搜索关键词（风景类视频适合作为覆盖层）
+    DEFAULT_KEYWORDS = ["landscape", "nature", "scenery", "mountains", "ocean", "forest", "sunset", "clouds"]
+
+    SEARCH_PAGES = 10  # 每个关键词随机搜索的页数范围
+
+    _default: Optional['OverlayPrefetcher'] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, pexels_manager: PexelsManager = None, pool_size: int = 3,
+                 pool_dir: str = None, keywords: List[str] = None,
+                 probe: Callable[[str], Dict[str, Any]] = None,
+                 max_bytes: int = None, max_age_seconds: float = None):
+        """
+        初始化覆盖层预取器
+
+        Args:
+            pexels_manager: Pexels管理器，为None时新建
+            pool_size: 池中保持的可用视频数量
+            pool_dir: 池目录，为None时使用Pexels缓存目录下的overlay_pool
+            keywords: 搜索关键词列表
+            probe: 探测视频信息的函数，返回duration/width/height，为None时使用pyJianYingDraft探测
+            max_bytes: 池容量上限（字节，0表示不限制），为None时与Pexels缓存相同
+            max_age_seconds: 取用过的视频最长保留时间（秒，按最近取用时间计算，0表示不限制），为None时与Pexels缓存相同
+        """
+        self.pexels_manager = pexels_manager or PexelsManager()
+        self.pool_size = max(0, int(pool_size))
+        self.output_dir = self.pexels_manager.cache_dir
+        self.pool_dir = pool_dir or os.path.join(self.output_dir, "overlay_pool")
+        self.keywords = keywords or list(self.DEFAULT_KEYWORDS)
+        self.probe = probe or self._probe_video
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        # 后台补充线程使用自己的随机数生成器，不影响草稿的随机流
+        self.rng = create_rng()
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+
+        os.makedirs(self.pool_dir, exist_ok=True)
+
+    @classmethod
+    def get_default(cls) -> 'OverlayPrefetcher':
+        """获取进程内共享的预取器（池大小取自配置）"""
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls(pool_size=AutoMixConfigManager.get_overlay_pool_size())
+        return cls._default
+
+    def get_ready_clips(self) -> List[Dict[str, Any]]:
+        """
+        获取池中可用的覆盖视频
+
+        Returns:
+            List[Dict]: 每项包含sha256、path、duration、width、height、use_count等
+        """
+        clips = []
+        for filename in os.listdir(self.pool_dir):
+            if not filename.endswith('.json'):
+                continue
+            info_path = os.path.join(self.pool_dir, filename)
+            try:
+                with open(info_path, 'r', encoding='utf-8') as f:
+                    info = json.load(f)
+            except (OSError, ValueError):
+                continue
+            video_path = os.path.join(self.pool_dir, f"{info.get('sha256')}.mp4")
+            if os.path.exists(video_path):
+                info['path'] = video_path
+                clips.append(info)
+        return clips
+
+    def get_fresh_clips(self) -> List[Dict[str, Any]]:
+        """获取池中还未被草稿取用过的覆盖视频"""
+        return [clip for clip in self.get_ready_clips() if not clip.get('use_count')]
+
+    def take(self, rng: random.Random = None) -> Optional[Dict[str, Any]]:
+        """
+        取用一个覆盖视频（不等待网络，池为空时返回None）
+        优先取未被取用过的视频，没有时复用已取用过的视频
+
+        Args:
+            rng: 随机数生成器（由草稿种子创建），默认使用random模块
+
+        Returns:
+            Optional[Dict]: 覆盖视频信息，path为池中的视频路径
+        """
+        self.start()
+        try:
+            with self._lock:
+                # 按内容哈希排序后再选取，同一个池和种子总是取到同一个视频
+                clips = sorted(self.get_ready_clips(), key=lambda clip: clip['sha256'])
+                if not clips:
+                    return None
+                fresh_clips = [clip for clip in clips if not clip.get('use_count')]
+                clip = (rng or random).choice(fresh_clips or clips)
+                clip['use_count'] = clip.get('use_count', 0) + 1
+                clip['last_used'] = time.time()
+                self._write_info(clip)
+                self._register_probe(clip)
+                return clip
+        finally:
+            self._wakeup.set()
+
+    def set_pool_size(self, pool_size: int):
+        """调整池大小并触发补充"""
+        self.pool_size = max(0, int(pool_size))
+        self._wakeup.set()
+
+    def start(self):
+        """启动后台补充线程（重复调用无副作用）"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._refill_loop, name="overlay-prefetcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """停止后台补充线程"""
+        self._stop_event.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    def evict(self) -> Dict[str, int]:
+        """
+        淘汰取用过的覆盖视频：先删除超过最长保留时间未被取用的，再按最近取用时间从旧到新删除，
+        直到池的总大小不超过容量上限。未被取用过的视频不参与淘汰（数量由pool_size限制）
+
+        Returns:
+            Dict: removed_count、freed_bytes
+        """
+        cache_index = self.pexels_manager.cache_index
+        max_bytes = cache_index.max_bytes if self.max_bytes is None else self.max_bytes
+        max_age_seconds = cache_index.max_age_seconds if self.max_age_seconds is None else self.max_age_seconds
+
+        now = time.time()
+        removed_count = 0
+        freed_bytes = 0
+        with self._lock:
+            clips = self.get_ready_clips()
+            total_size = sum(clip.get('size', 0) for clip in clips)
+            used_clips = sorted((clip for clip in clips if clip.get('use_count')),
+                                key=lambda clip: clip.get('last_used', 0))
+            for clip in used_clips:
+                expired = max_age_seconds and now - clip.get('last_used', 0) > max_age_seconds
+                over_size = max_bytes and total_size > max_bytes
+                if not expired and not over_size:
+                    break
+                # 先删除记录文件，视频随即不再可用
+                self._remove_quietly(os.path.join(self.pool_dir, f"{clip['sha256']}.json"))
+                self._remove_quietly(clip['path'])
+                total_size -= clip.get('size', 0)
+                freed_bytes += clip.get('size', 0)
+                removed_count += 1
+
+        if removed_count:
+            print(f"🧹 覆盖视频池淘汰 {removed_count} 个视频，释放 {freed_bytes/(1024*1024):.1f}MB")
+        return {'removed_count': removed_count, 'freed_bytes': freed_bytes}
+
+    def refill_once(self) -> bool:
+        """
+        下载一个覆盖视频放入池中
+
+        Returns:
+            bool: 是否成功加入一个新视频
+        """
+        # 随机选择关键词和页码，可选的视频不局限于每个关键词的第一页
+        keyword = self.rng.choice(self.keywords)
+        page = self.rng.randint(1, self.SEARCH_PAGES)
+        video_data = self.pexels_manager.search_videos(keyword, per_page=10, page=page)
+        if not video_data or not video_data.get('videos'):
+            return False
+
+        # 下载前跳过池中已有的视频
+        known_ids = {clip.get('pexels_id') for clip in self.get_ready_clips()}
+        videos = [video for video in video_data['videos'] if video.get('id') not in known_ids]
+        if not videos:
+            return False
+
+        selected_video = self.rng.choice(videos)
+        best_file = self.pexels_manager.get_best_video_file(selected_video)
+        if not best_file:
+            return False
+
+        download_path = self.pexels_manager.download_video(
+            best_file['link'], f"overlay_video_{selected_video['id']}.mp4"
+        )
+        if not download_path:
+            return False
+
+        sha256 = self._hash_file(download_path)
+        pool_video_path = os.path.join(self.pool_dir, f"{sha256}.mp4")
+        if os.path.exists(pool_video_path):
+            # 内容相同的视频已在池中（Pexels id不同），下载的文件留在缓存中，再次选中时不重新下载
+            return False
+
+        try:
+            info = self.probe(download_path)
+        except Exception as e:
+            print(f"⚠️  覆盖视频探测失败，丢弃: {e}")
+            self.pexels_manager.cache_index.remove(os.path.basename(download_path))
+            self._remove_quietly(download_path)
+            return False
+
+        now = time.time()
+        info.update({
+            'sha256': sha256,
+            'pexels_id': selected_video.get('id'),
+            'keyword': keyword,
+            'size': os.path.getsize(download_path),
+            'added': now,
+            'last_used': now,
+            'use_count': 0
+        })
+
+        self.pexels_manager.cache_index.remove(os.path.basename(download_path))
+        os.replace(download_path, pool_video_path)
+        self._write_info(info)
+
+        print(f"🎞️  覆盖视频已加入预取池: {sha256[:12]} ({info.get('duration', 0)/1000000:.1f}s)")
+        return True
+
+    def _refill_loop(self):
+        """后台补充主循环"""
+        while not self._stop_event.is_set():
+            wait_seconds = 60
+            try:
+                self.evict()
+                while not self._stop_event.is_set() and len(self.get_fresh_clips()) < self.pool_size:
+                    if self.refill_once():
+                        self._failures = 0
+                    else:
+                        # 失败后退避重试，避免网络异常时频繁请求
+                        self._failures += 1
+                        wait_seconds = min(300, 5 * 2 ** min(self._failures, 6))
+                        break
+            except Exception as e:
+                self._failures += 1
+                wait_seconds = min(300, 5 * 2 ** min(self._failures, 6))
+                print(f"⚠️  覆盖视频预取失败: {e}")
+
+            self._wakeup.wait(wait_seconds)
+            self._wakeup.clear()
+
+    def _write_info(self, clip: Dict[str, Any]):
+        """原子写入视频旁的记录文件（path由池目录推导，不写入）"""
+        info = {key: value for key, value in clip.items() if key != 'path'}
+        info_path = os.path.join(self.pool_dir, f"{clip['sha256']}.json")
+        temp_path = f"{info_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(info, f, ensure_ascii=False)
+        os.replace(temp_path, info_path)
+
+    @staticmethod
+    def _probe_video(path: str) -> Dict[str, Any]:
+        """探测视频类型、时长与分辨率"""
+        from pyJianYingDraft import Video_material
+
+        return Video_material.probe(path)
+
+    @staticmethod
+    def _register_probe(clip: Dict[str, Any]):
+        """把池中记录的探测结果登记到素材探测缓存，创建Video_material时不再重新解析视频"""
+        from pyJianYingDraft import probe_cache
+
+        try:
+            probe_cache.put(clip['path'], {
+                'material_type': clip.get('material_type', 'video'),
+                'duration': clip['duration'],
+                'width': clip['width'],
+                'height': clip['height']
+            })
+        except (KeyError, OSError):
+            # 旧版本的记录文件缺少探测信息时，由Video_material自行探测
+            pass
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        """计算文件SHA-256"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _remove_quietly(path: str):
+        """删除文件，忽略不存在等错误"""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
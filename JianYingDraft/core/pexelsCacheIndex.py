@@ -0,0 +1,261 @@
+"""
+Pexels缓存索引 - 记录缓存视频的大小与最近访问时间，按容量上限和最长保留时间做LRU淘汰
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+class PexelsCacheIndex:
+    """
+    Pexels缓存索引
+    索引文件（cache_index.json）记录缓存目录顶层每个视频文件的大小、创建时间和最近访问时间，
+    get_info直接读取内存中的索引，不再逐个stat缓存文件；
+    新文件加入后在后台线程中淘汰：先删除超过最长保留时间未访问的文件，再按最近访问时间从旧到新删除，
+    直到总大小不超过容量上限。子目录（搜索缓存、覆盖视频池）和下载中的.part文件不参与淘汰
+    """
+
+    INDEX_FILENAME = "cache_index.json"
+
+    _instances: Dict[str, 'PexelsCacheIndex'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, cache_dir: str, max_bytes: int, max_age_seconds: float, flush_delay: float = 2.0):
+        """
+        初始化缓存索引
+
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存容量上限（字节），0表示不限制
+            max_age_seconds: 最长保留时间（秒，按最近访问时间计算），0表示不限制
+            flush_delay: 索引防抖写盘延迟（秒）
+        """
+        self.cache_dir = cache_dir
+        self.index_file = os.path.join(cache_dir, self.INDEX_FILENAME)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.flush_delay = flush_delay
+
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._evict_thread: Optional[threading.Thread] = None
+        self._dirty = False
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+        atexit.register(self.flush)
+
+    @classmethod
+    def for_directory(cls, cache_dir: str, max_bytes: int, max_age_seconds: float) -> 'PexelsCacheIndex':
+        """
+        获取缓存目录对应的共享索引（同一进程内同一目录只有一个索引实例）
+
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存容量上限（字节）
+            max_age_seconds: 最长保留时间（秒）
+
+        Returns:
+            PexelsCacheIndex: 缓存索引
+        """
+        key = os.path.abspath(cache_dir)
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                index = cls(cache_dir, max_bytes, max_age_seconds)
+                cls._instances[key] = index
+            else:
+                index.max_bytes = max_bytes
+                index.max_age_seconds = max_age_seconds
+            return index
+
+    def touch(self, filename: str):
+        """记录一次缓存命中"""
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is None:
+                self._add_entry(filename)
+            else:
+                entry['last_access'] = time.time()
+            self._schedule_flush()
+        if self.flush_delay <= 0:
+            self.flush()
+
+    def add(self, filename: str):
+        """登记新加入缓存的文件，并在后台检查是否需要淘汰"""
+        with self._lock:
+            self._add_entry(filename)
+            self._schedule_flush()
+        if self.flush_delay <= 0:
+            self.flush()
+        self.schedule_eviction()
+
+    def remove(self, filename: str):
+        """从索引中移除文件记录（文件已被移走或删除）"""
+        with self._lock:
+            if self._entries.pop(filename, None) is None:
+                return
+            self._schedule_flush()
+        if self.flush_delay <= 0:
+            self.flush()
+
+    def reset(self):
+        """清空索引（缓存目录被整体清理后调用）"""
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+        self.flush()
+
+    def get_info(self) -> Dict[str, Any]:
+        """
+        获取缓存信息（只读取索引）
+
+        Returns:
+            Dict: file_count、total_size、total_size_mb、max_size_mb、oldest_access
+        """
+        with self._lock:
+            total_size = sum(entry['size'] for entry in self._entries.values())
+            oldest_access = min((entry['last_access'] for entry in self._entries.values()), default=None)
+            return {
+                "file_count": len(self._entries),
+                "total_size": total_size,
+                "total_size_mb": total_size / (1024 * 1024),
+                "max_size_mb": self.max_bytes / (1024 * 1024) if self.max_bytes else None,
+                "max_age_days": self.max_age_seconds / 86400 if self.max_age_seconds else None,
+                "oldest_access": oldest_access
+            }
+
+    def schedule_eviction(self):
+        """在后台线程中执行一次淘汰（已有淘汰线程在运行时不重复启动）"""
+        with self._lock:
+            if self._evict_thread is not None and self._evict_thread.is_alive():
+                return
+            self._evict_thread = threading.Thread(target=self.evict, name="pexels-cache-evict", daemon=True)
+            self._evict_thread.start()
+
+    def evict(self) -> Dict[str, int]:
+        """
+        按最长保留时间和容量上限淘汰缓存文件
+
+        Returns:
+            Dict: removed_count、freed_bytes
+        """
+        now = time.time()
+        with self._lock:
+            candidates = sorted(self._entries.items(), key=lambda item: item[1]['last_access'])
+            total_size = sum(entry['size'] for entry in self._entries.values())
+
+        removed_count = 0
+        freed_bytes = 0
+        for filename, entry in candidates:
+            expired = self.max_age_seconds and now - entry['last_access'] > self.max_age_seconds
+            over_size = self.max_bytes and total_size > self.max_bytes
+            if not expired and not over_size:
+                # 按访问时间从旧到新排序，后面的文件都不会过期
+                break
+
+            try:
+                os.remove(os.path.join(self.cache_dir, filename))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # 文件被占用等情况，保留索引记录，下次再试
+                print(f"⚠️  淘汰缓存文件失败: {filename} - {e}")
+                continue
+
+            with self._lock:
+                self._entries.pop(filename, None)
+                self._dirty = True
+            total_size -= entry['size']
+            freed_bytes += entry['size']
+            removed_count += 1
+
+        if removed_count:
+            print(f"🧹 Pexels缓存淘汰 {removed_count} 个文件，释放 {freed_bytes/(1024*1024):.1f}MB")
+            self.flush()
+        return {'removed_count': removed_count, 'freed_bytes': freed_bytes}
+
+    def rebuild(self):
+        """扫描缓存目录重建索引（保留已有的访问时间）"""
+        with self._lock:
+            entries = {}
+            for filename in os.listdir(self.cache_dir):
+                if not self._is_cacheable(filename):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, filename))
+                except OSError:
+                    continue
+                old_entry = self._entries.get(filename, {})
+                entries[filename] = {
+                    'size': stat.st_size,
+                    'created': old_entry.get('created', stat.st_mtime),
+                    'last_access': old_entry.get('last_access', stat.st_mtime)
+                }
+            self._entries = entries
+            self._dirty = True
+        self.flush()
+
+    def flush(self):
+        """立即把索引写入文件"""
+        # 快照在写锁内获取：并发的flush按取快照的顺序写盘，旧快照不会覆盖新快照
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._dirty or not os.path.isdir(self.cache_dir):
+                    # 缓存目录已被整体删除时无需保存
+                    return
+                data = {'version': 1, 'entries': {name: dict(entry) for name, entry in self._entries.items()}}
+                self._dirty = False
+
+            try:
+                temp_file = f"{self.index_file}.tmp"
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(temp_file, self.index_file)
+            except Exception as e:
+                print(f"⚠️  保存Pexels缓存索引失败: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    def _add_entry(self, filename: str):
+        """登记文件大小与访问时间（调用方持有锁）"""
+        try:
+            size = os.path.getsize(os.path.join(self.cache_dir, filename))
+        except OSError:
+            return
+        now = time.time()
+        entry = self._entries.get(filename, {'created': now})
+        entry.update({'size': size, 'last_access': now})
+        self._entries[filename] = entry
+
+    def _schedule_flush(self):
+        """安排一次防抖写盘（调用方持有锁）"""
+        self._dirty = True
+        if self.flush_delay > 0 and self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _is_cacheable(self, filename: str) -> bool:
+        """是否是参与淘汰的缓存文件"""
+        if filename.startswith(self.INDEX_FILENAME) or '.part' in filename or filename.endswith('.tmp'):
+            # 索引文件、下载中的.part/.partN/.part.merge文件和临时文件
+            return False
+        return os.path.isfile(os.path.join(self.cache_dir, filename))
+
+    def _load(self):
+        """加载索引文件，并与缓存目录核对一次（其他进程可能增删过文件）"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f).get('entries', {})
+        except (OSError, ValueError):
+            self._entries = {}
+        self.rebuild()
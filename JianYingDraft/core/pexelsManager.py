@@ -2,70 +2,210 @@
 Pexels API管理器 - 用于下载热门视频作为背景
 """
 import os
+import hashlib
+import random
 import requests
 import json
+import shutil
 import tempfile
+import threading
+import time
 from typing import Dict, List, Optional, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .configManager import AutoMixConfigManager
+from .pexelsCacheIndex import PexelsCacheIndex
 
 
 class PexelsManager:
     """Pexels API管理器"""
-    
-    def __init__(self, api_key: str = None):
+
+    # 进程内共享的HTTP会话（连接池复用TCP/TLS连接）
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+
+    # 进程内的搜索结果缓存：缓存键 -> (写入时间, 响应数据)
+    _memory_cache: Dict[str, tuple] = {}
+    _memory_cache_lock = threading.Lock()
+
+    # 每个目标文件的下载锁
+    _download_locks: Dict[str, threading.Lock] = {}
+    _download_locks_lock = threading.Lock()
+
+    # 下载请求头（identity编码保证Range偏移与文件大小一致）
+    DOWNLOAD_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept': 'video/mp4,video/*;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'identity',
+        'Connection': 'keep-alive',
+    }
+
+    def __init__(self, api_key: str = None, cache_dir: str = None, search_cache_ttl: int = None):
         """
         初始化Pexels管理器
         
         Args:
             api_key: Pexels API密钥，如果为None则从配置中获取
+            cache_dir: 缓存目录，如果为None则使用系统临时目录下的pexels_cache
+            search_cache_ttl: 搜索结果缓存有效期（秒），如果为None则从配置中获取，0表示不缓存
         """
         self.api_key = api_key or AutoMixConfigManager.get_pexels_api_key()
         self.base_url = "https://api.pexels.com/videos"
         self.headers = {
             "Authorization": self.api_key
         }
-        self.cache_dir = os.path.join(tempfile.gettempdir(), "pexels_cache")
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "pexels_cache")
+        self.search_cache_dir = os.path.join(self.cache_dir, "search")
+        if search_cache_ttl is None:
+            search_cache_ttl = AutoMixConfigManager.get_pexels_search_cache_ttl()
+        self.search_cache_ttl = search_cache_ttl
         self._ensure_cache_dir()
+
+        # 缓存索引：记录访问时间，按容量上限和最长保留时间淘汰
+        self.cache_index = PexelsCacheIndex.for_directory(
+            self.cache_dir,
+            AutoMixConfigManager.get_pexels_cache_max_mb() * 1024 * 1024,
+            AutoMixConfigManager.get_pexels_cache_max_age_days() * 86400
+        )
     
     def _ensure_cache_dir(self):
         """确保缓存目录存在"""
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
+        for directory in (self.cache_dir, self.search_cache_dir):
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """
+        获取进程内共享的HTTP会话（带连接池和重试策略）
+
+        Returns:
+            requests.Session: 共享会话
+        """
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    retry_strategy = Retry(
+                        total=3,  # 总重试次数
+                        backoff_factor=1,  # 重试间隔
+                        status_forcelist=[429, 500, 502, 503, 504],  # 需要重试的状态码
+                        allowed_methods=["HEAD", "GET", "OPTIONS"]  # 允许重试的方法
+                    )
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry_strategy)
+
+                    session = requests.Session()
+                    session.verify = True  # 启用SSL验证
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    cls._session = session
+        return cls._session
+
+    def _get_search_cache_key(self, endpoint: str, params: Dict[str, Any]) -> str:
+        """根据接口和参数计算搜索缓存键"""
+        raw_key = json.dumps([self.base_url, endpoint, params], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(raw_key.encode('utf-8')).hexdigest()
+
+    def _load_cached_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """读取未过期的搜索缓存（先查内存，再查磁盘）"""
+        now = time.time()
+        with self._memory_cache_lock:
+            cached = self._memory_cache.get(cache_key)
+        if cached and now - cached[0] < self.search_cache_ttl:
+            return cached[1]
+
+        cache_file = os.path.join(self.search_cache_dir, f"{cache_key}.json")
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached_file = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        timestamp = cached_file.get('timestamp', 0)
+        if now - timestamp >= self.search_cache_ttl:
+            return None
+
+        with self._memory_cache_lock:
+            self._memory_cache[cache_key] = (timestamp, cached_file.get('data'))
+        return cached_file.get('data')
+
+    def _save_cached_response(self, cache_key: str, data: Dict[str, Any]):
+        """写入搜索缓存（磁盘写入使用临时文件+os.replace）"""
+        timestamp = time.time()
+        with self._memory_cache_lock:
+            self._memory_cache[cache_key] = (timestamp, data)
+
+        cache_file = os.path.join(self.search_cache_dir, f"{cache_key}.json")
+        temp_file = f"{cache_file}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({'timestamp': timestamp, 'data': data}, f, ensure_ascii=False)
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            print(f"⚠️  写入搜索缓存失败: {e}")
+
+    def _api_get(self, endpoint: str, params: Dict[str, Any], use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        请求Pexels API（带TTL缓存）
+
+        Args:
+            endpoint: 接口名称（popular/search）
+            params: 请求参数
+            use_cache: 是否使用搜索结果缓存
+
+        Returns:
+            Dict: API响应数据，失败返回None
+        """
+        use_cache = use_cache and self.search_cache_ttl > 0
+        cache_key = self._get_search_cache_key(endpoint, params)
+        if use_cache:
+            cached = self._load_cached_response(cache_key)
+            if cached is not None:
+                print(f"📁 使用缓存的Pexels响应: {endpoint} {params}")
+                return cached
+
+        url = f"{self.base_url}/{endpoint}"
+        response = self.get_session().get(url, headers=self.headers, params=params, timeout=30)
+
+        if response.status_code == 200:
+            data = response.json()
+            if use_cache:
+                self._save_cached_response(cache_key, data)
+            return data
+
+        print(f"❌ Pexels API请求失败: {response.status_code} - {response.text}")
+        return None
     
-    def get_popular_videos(self, per_page: int = 20, page: int = 1) -> Optional[Dict[str, Any]]:
+    def get_popular_videos(self, per_page: int = 20, page: int = 1, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         获取热门视频列表
         
         Args:
             per_page: 每页视频数量 (最大80)
             page: 页码
+            use_cache: 是否使用缓存的响应
             
         Returns:
             Dict: API响应数据，包含视频列表
         """
         try:
-            url = f"{self.base_url}/popular"
             params = {
                 "per_page": min(per_page, 80),
                 "page": page
             }
             
-            print(f"🌐 请求Pexels热门视频: {url}")
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            print(f"🌐 请求Pexels热门视频: {self.base_url}/popular")
+            data = self._api_get("popular", params, use_cache)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 print(f"✅ 获取到 {len(data.get('videos', []))} 个热门视频")
-                return data
-            else:
-                print(f"❌ Pexels API请求失败: {response.status_code} - {response.text}")
-                return None
+            return data
                 
         except Exception as e:
             print(f"❌ 获取热门视频失败: {str(e)}")
             return None
     
-    def search_videos(self, query: str, per_page: int = 20, page: int = 1) -> Optional[Dict[str, Any]]:
+    def search_videos(self, query: str, per_page: int = 20, page: int = 1, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         搜索视频
         
@@ -73,12 +213,12 @@ class PexelsManager:
             query: 搜索关键词
             per_page: 每页视频数量
             page: 页码
+            use_cache: 是否使用缓存的搜索结果（按关键词、页码、每页数量缓存）
             
         Returns:
             Dict: API响应数据，包含视频列表
         """
         try:
-            url = f"{self.base_url}/search"
             params = {
                 "query": query,
                 "per_page": min(per_page, 80),
@@ -86,15 +226,11 @@ class PexelsManager:
             }
             
             print(f"🔍 搜索Pexels视频: {query}")
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            data = self._api_get("search", params, use_cache)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 print(f"✅ 搜索到 {len(data.get('videos', []))} 个相关视频")
-                return data
-            else:
-                print(f"❌ Pexels搜索失败: {response.status_code} - {response.text}")
-                return None
+            return data
                 
         except Exception as e:
             print(f"❌ 搜索视频失败: {str(e)}")
@@ -131,84 +267,53 @@ class PexelsManager:
         # 最后返回第一个文件
         return video_files[0] if video_files else None
     
-    def download_video(self, video_url: str, filename: str = None) -> Optional[str]:
+    def get_cache_filename(self, video_url: str) -> str:
+        """
+        根据视频URL生成稳定的缓存文件名（进程重启后仍能命中缓存）
+
+        Args:
+            video_url: 视频下载URL
+
+        Returns:
+            str: 缓存文件名
         """
-        下载视频文件（带重试机制和SSL错误处理）
+        url_hash = hashlib.sha1(video_url.encode('utf-8')).hexdigest()[:16]
+        return f"pexels_video_{url_hash}.mp4"
+
+    def download_video(self, video_url: str, filename: str = None, chunk_size: int = None,
+                       parallel: int = None) -> Optional[str]:
+        """
+        下载视频文件（断点续传、可选分段并行、大小校验后原子重命名）
+        下载内容先写入<文件名>.part，中断后再次调用会用HTTP Range从已下载的位置继续，
+        只有完整且大小校验通过的文件才会重命名为最终的缓存文件
 
         Args:
             video_url: 视频下载URL
-            filename: 保存的文件名，如果为None则自动生成
+            filename: 保存的文件名，如果为None则根据URL哈希生成
+            chunk_size: 读取块大小（字节），如果为None则从配置中获取
+            parallel: 并行分段数量，如果为None则从配置中获取，1表示顺序下载
 
         Returns:
             str: 下载的文件路径，失败返回None
         """
         try:
             if not filename:
-                filename = f"pexels_video_{hash(video_url) % 1000000}.mp4"
+                filename = self.get_cache_filename(video_url)
 
             file_path = os.path.join(self.cache_dir, filename)
 
-            # 如果文件已存在，直接返回
+            # 如果文件已存在，直接返回（只有校验通过的完整文件才会出现在最终路径）
             if os.path.exists(file_path):
                 print(f"📁 使用缓存视频: {filename}")
+                self.cache_index.touch(filename)
                 return file_path
 
             print(f"⬇️  下载Pexels视频: {filename}")
+            self._download_to_path(video_url, file_path, chunk_size, parallel)
 
-            # 配置请求会话，处理SSL问题
-            session = requests.Session()
-            session.verify = True  # 启用SSL验证
-
-            # 设置重试适配器
-            from requests.adapters import HTTPAdapter
-            from urllib3.util.retry import Retry
-
-            retry_strategy = Retry(
-                total=3,  # 总重试次数
-                backoff_factor=1,  # 重试间隔
-                status_forcelist=[429, 500, 502, 503, 504],  # 需要重试的状态码
-                allowed_methods=["HEAD", "GET", "OPTIONS"]  # 允许重试的方法
-            )
-
-            adapter = HTTPAdapter(max_retries=retry_strategy)
-            session.mount("http://", adapter)
-            session.mount("https://", adapter)
-
-            # 设置请求头，模拟浏览器
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'video/mp4,video/*;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-
-            # 尝试下载
-            response = session.get(video_url, stream=True, timeout=120, headers=headers)
-
-            if response.status_code == 200:
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded_size = 0
-
-                with open(file_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded_size += len(chunk)
-
-                            # 显示下载进度
-                            if total_size > 0:
-                                progress = (downloaded_size / total_size) * 100
-                                if downloaded_size % (1024 * 1024) == 0:  # 每MB显示一次
-                                    print(f"  📊 下载进度: {progress:.1f}% ({downloaded_size/(1024*1024):.1f}MB/{total_size/(1024*1024):.1f}MB)")
-
-                file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
-                print(f"✅ 视频下载完成: {filename} ({file_size:.1f}MB)")
-                return file_path
-            else:
-                print(f"❌ 视频下载失败: HTTP {response.status_code}")
-                return None
+            file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
+            print(f"✅ 视频下载完成: {filename} ({file_size:.1f}MB)")
+            return file_path
 
         except requests.exceptions.SSLError as e:
             print(f"❌ SSL连接错误: {str(e)}")
@@ -217,12 +322,12 @@ class PexelsManager:
 
         except requests.exceptions.ConnectionError as e:
             print(f"❌ 网络连接错误: {str(e)}")
-            print("💡 请检查网络连接或稍后重试")
+            print("💡 请检查网络连接或稍后重试，已下载的部分会在下次继续")
             return None
 
         except requests.exceptions.Timeout as e:
             print(f"❌ 下载超时: {str(e)}")
-            print("💡 网络较慢，建议稍后重试")
+            print("💡 网络较慢，建议稍后重试，已下载的部分会在下次继续")
             return None
 
         except Exception as e:
@@ -247,53 +352,199 @@ class PexelsManager:
             file_path = os.path.join(self.cache_dir, filename)
 
             print(f"🔄 尝试备用下载方法（禁用SSL验证）...")
+            self._download_to_path(video_url, file_path, verify=False)
 
-            # 禁用SSL验证的请求
-            response = requests.get(
-                video_url,
-                stream=True,
-                timeout=120,
-                verify=False,  # 禁用SSL验证
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
+            file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
+            print(f"✅ 备用方法下载完成: {filename} ({file_size:.1f}MB)")
+            return file_path
 
-            if response.status_code == 200:
-                with open(file_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+        except Exception as e:
+            print(f"❌ 备用下载异常: {str(e)}")
+            return None
 
-                file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
-                print(f"✅ 备用方法下载完成: {filename} ({file_size:.1f}MB)")
-                return file_path
+    def _download_to_path(self, video_url: str, file_path: str, chunk_size: int = None,
+                          parallel: int = None, verify: bool = True):
+        """
+        下载到指定路径（失败时抛出异常，.part文件保留用于续传）
+
+        Args:
+            video_url: 视频下载URL
+            file_path: 最终文件路径
+            chunk_size: 读取块大小（字节）
+            parallel: 并行分段数量
+            verify: 是否验证SSL证书
+        """
+        chunk_size = chunk_size or AutoMixConfigManager.get_pexels_download_chunk_size()
+        parallel = parallel or AutoMixConfigManager.get_pexels_download_parallel()
+        part_path = f"{file_path}.part"
+
+        with self._get_download_lock(file_path):
+            if os.path.exists(file_path):
+                return
+
+            total_size = None
+            segment_count = 0
+            if parallel > 1 and not os.path.exists(part_path):
+                # 服务器支持Range时按大小分段并行下载（分段文件各自可以续传）
+                total_size = self._get_range_size(video_url, verify)
+                if total_size:
+                    segment_count = min(parallel, max(1, total_size // chunk_size))
+
+            if segment_count > 1:
+                self._download_segments(video_url, part_path, total_size, segment_count, chunk_size, verify)
             else:
-                print(f"❌ 备用下载也失败: HTTP {response.status_code}")
-                return None
+                total_size = self._download_range(video_url, part_path, 0, None, chunk_size, verify)
+
+            # 大小校验：偏大说明内容已损坏，删除后重新下载；偏小保留用于续传
+            actual_size = os.path.getsize(part_path)
+            if total_size is not None and actual_size != total_size:
+                if actual_size > total_size:
+                    os.remove(part_path)
+                raise IOError(f"下载大小校验失败: {actual_size} / {total_size} 字节")
+
+            os.replace(part_path, file_path)
+            self.cache_index.add(os.path.basename(file_path))
+
+    def _download_segments(self, video_url: str, part_path: str, total_size: int, segment_count: int,
+                           chunk_size: int, verify: bool):
+        """分段并行下载后按顺序合并到.part文件"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        segment_size = -(-total_size // segment_count)
+        segments = []
+        for index in range(segment_count):
+            start = index * segment_size
+            end = min(total_size, start + segment_size) - 1
+            segments.append((f"{part_path}{index}", start, end))
+
+        print(f"  🧩 分{segment_count}段并行下载 ({total_size/(1024*1024):.1f}MB)")
+        with ThreadPoolExecutor(max_workers=segment_count) as executor:
+            futures = [
+                executor.submit(self._download_range, video_url, segment_path, start, end, chunk_size, verify)
+                for segment_path, start, end in segments
+            ]
+            for future in futures:
+                future.result()
+
+        for segment_path, start, end in segments:
+            if os.path.getsize(segment_path) != end - start + 1:
+                raise IOError(f"分段下载不完整: {os.path.basename(segment_path)}")
+
+        temp_path = f"{part_path}.merge"
+        with open(temp_path, 'wb') as output:
+            for segment_path, _, _ in segments:
+                with open(segment_path, 'rb') as segment:
+                    shutil.copyfileobj(segment, output, chunk_size)
+        os.replace(temp_path, part_path)
+        for segment_path, _, _ in segments:
+            os.remove(segment_path)
+
+    def _download_range(self, video_url: str, part_path: str, start: int, end: Optional[int],
+                        chunk_size: int, verify: bool) -> Optional[int]:
+        """
+        下载[start, end]字节范围到part_path，part_path已有内容时从断点继续
 
-        except Exception as e:
-            print(f"❌ 备用下载异常: {str(e)}")
+        Returns:
+            Optional[int]: 服务器报告的完整文件大小，未知时返回None
+        """
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if end is not None and offset >= end - start + 1:
             return None
 
-    def get_anti_detection_overlay_video(self, keywords: List[str] = None) -> Optional[str]:
+        headers = dict(self.DOWNLOAD_HEADERS)
+        if start + offset > 0 or end is not None:
+            headers['Range'] = f"bytes={start + offset}-{'' if end is None else end}"
+
+        response = self.get_session().get(video_url, stream=True, timeout=120, headers=headers, verify=verify)
+        with response:
+            if response.status_code == 416 and offset > 0 and end is None:
+                # 已下载的部分就是完整文件
+                return offset
+            if response.status_code == 206:
+                mode = 'ab'
+                total_size = self._parse_content_range_total(response.headers.get('Content-Range'))
+            elif response.status_code == 200:
+                if start > 0 or end is not None:
+                    raise IOError("服务器不支持Range请求")
+                # 服务器忽略了Range，从头开始下载
+                mode = 'wb'
+                offset = 0
+                content_length = response.headers.get('Content-Length')
+                total_size = int(content_length) if content_length else None
+            else:
+                response.raise_for_status()
+                raise IOError(f"HTTP {response.status_code}")
+
+            if offset:
+                print(f"  ⏩ 断点续传: 从 {offset/(1024*1024):.1f}MB 继续")
+
+            downloaded_size = offset
+            next_report = (downloaded_size // (10 * 1024 * 1024) + 1) * 10 * 1024 * 1024
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        downloaded_size += len(chunk)
+
+                        # 每10MB显示一次下载进度
+                        if total_size and end is None and downloaded_size >= next_report:
+                            progress = downloaded_size / total_size * 100
+                            print(f"  📊 下载进度: {progress:.1f}% ({downloaded_size/(1024*1024):.1f}MB/{total_size/(1024*1024):.1f}MB)")
+                            next_report += 10 * 1024 * 1024
+
+        return total_size
+
+    def _get_range_size(self, video_url: str, verify: bool) -> Optional[int]:
+        """服务器支持Range请求时返回文件大小，否则返回None"""
+        try:
+            response = self.get_session().head(
+                video_url, headers=self.DOWNLOAD_HEADERS, timeout=30, allow_redirects=True, verify=verify
+            )
+            if response.status_code != 200 or response.headers.get('Accept-Ranges', '').lower() != 'bytes':
+                return None
+            content_length = response.headers.get('Content-Length')
+            return int(content_length) if content_length else None
+        except Exception:
+            return None
+
+    @staticmethod
+    def _parse_content_range_total(content_range: Optional[str]) -> Optional[int]:
+        """解析Content-Range头中的完整大小（bytes 0-99/1000 -> 1000）"""
+        if not content_range or '/' not in content_range:
+            return None
+        total = content_range.rsplit('/', 1)[1].strip()
+        return int(total) if total.isdigit() else None
+
+    @classmethod
+    def _get_download_lock(cls, file_path: str) -> threading.Lock:
+        """获取同一目标文件的下载锁，避免多个线程写同一个.part文件"""
+        with cls._download_locks_lock:
+            lock = cls._download_locks.get(file_path)
+            if lock is None:
+                lock = threading.Lock()
+                cls._download_locks[file_path] = lock
+            return lock
+
+    def get_anti_detection_overlay_video(self, keywords: List[str] = None,
+                                         rng: random.Random = None) -> Optional[str]:
         """
         获取防审核覆盖层视频
 
         Args:
             keywords: 搜索关键词列表，如果为None则搜索风景视频
+            rng: 随机数生成器（由草稿种子创建），默认使用random模块
 
         Returns:
             str: 下载的视频文件路径
         """
+        rng = rng or random
         try:
             # 默认搜索风景类视频，适合作为覆盖层
             if not keywords:
                 keywords = ["landscape", "nature", "scenery", "mountains", "ocean", "forest", "sunset", "clouds"]
 
             # 随机选择一个关键词进行搜索
-            import random
-            keyword = random.choice(keywords)
+            keyword = rng.choice(keywords)
             print(f"🔍 搜索关键词: {keyword}")
             video_data = self.search_videos(keyword, per_page=10)
             
@@ -302,9 +553,8 @@ class PexelsManager:
                 return None
             
             # 随机选择一个视频
-            import random
             videos = video_data['videos']
-            selected_video = random.choice(videos)
+            selected_video = rng.choice(videos)
             
             print(f"🎬 选择视频: {selected_video.get('id')} - 时长: {selected_video.get('duration', 0)}秒")
             
@@ -335,7 +585,7 @@ class PexelsManager:
             url = f"{self.base_url}/popular"
             params = {"per_page": 1}
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self.get_session().get(url, headers=self.headers, params=params, timeout=10)
             
             if response.status_code == 200:
                 print("✅ Pexels API密钥验证成功")
@@ -354,35 +604,24 @@ class PexelsManager:
     def clear_cache(self):
         """清理缓存目录"""
         try:
-            import shutil
             if os.path.exists(self.cache_dir):
                 shutil.rmtree(self.cache_dir)
                 self._ensure_cache_dir()
-                print("✅ Pexels缓存已清理")
+            self.cache_index.reset()
+            with self._memory_cache_lock:
+                self._memory_cache.clear()
+            print("✅ Pexels缓存已清理")
         except Exception as e:
             print(f"❌ 清理缓存失败: {str(e)}")
     
     def get_cache_info(self) -> Dict[str, Any]:
-        """获取缓存信息"""
+        """获取缓存信息（读取缓存索引，不逐个统计文件）"""
         try:
-            if not os.path.exists(self.cache_dir):
-                return {"file_count": 0, "total_size": 0}
-            
-            file_count = 0
-            total_size = 0
-            
-            for filename in os.listdir(self.cache_dir):
-                file_path = os.path.join(self.cache_dir, filename)
-                if os.path.isfile(file_path):
-                    file_count += 1
-                    total_size += os.path.getsize(file_path)
-            
-            return {
-                "file_count": file_count,
-                "total_size": total_size,
-                "total_size_mb": total_size / (1024 * 1024)
-            }
-            
+            return self.cache_index.get_info()
         except Exception as e:
             print(f"❌ 获取缓存信息失败: {str(e)}")
             return {"file_count": 0, "total_size": 0}
+
+    def evict_cache(self) -> Dict[str, int]:
+        """按容量上限和最长保留时间立即淘汰缓存文件"""
+        return self.cache_index.evict()
@@ -0,0 +1,128 @@
+"""
+进度事件总线 - 以结构化事件发布混剪进度，供Web端SSE推送使用
+"""
+import queue
+import threading
+import time
+from typing import Dict, Any, Optional, List
+
+
+class ProgressBus:
+    """
+    进度事件总线
+    混剪流程通过publish发布结构化进度事件，订阅者各自持有一个有界队列，
+    消费慢的订阅者只会丢弃自己最旧的事件，不会阻塞发布方
+    新订阅者立即收到每个运行中任务的最近一个事件，已结束的任务不再回放
+    """
+
+    # 混剪阶段定义（与StandardAutoMix.auto_mix中的步骤一一对应）
+    STAGES = [
+        '初始化',
+        '扫描素材',
+        '选择素材',
+        '创建轨道',
+        '添加视频',
+        '防审核覆盖层',
+        '添加转场',
+        '添加特效滤镜',
+        '添加音频',
+        '添加字幕',
+        '保存草稿',
+        '完成'
+    ]
+
+    def __init__(self, max_queue_size: int = 200):
+        """
+        初始化进度事件总线
+
+        Args:
+            max_queue_size: 每个订阅者队列的最大长度
+        """
+        self.max_queue_size = max_queue_size
+        self._lock = threading.Lock()
+        self._subscribers: List[queue.Queue] = []
+        self._sequence = 0
+        self._latest: Optional[Dict[str, Any]] = None
+        self._running_latest: Dict[Any, Dict[str, Any]] = {}  # job_id -> 运行中任务的最近一个事件
+
+    def publish(self, event_type: str = 'progress', **fields) -> Dict[str, Any]:
+        """
+        发布进度事件
+
+        Args:
+            event_type: 事件类型（progress/draft_started/draft_finished/job_finished等）
+            **fields: 事件字段，如stage、percent、message、draft_index、draft_total
+
+        Returns:
+            Dict: 实际发布的事件
+        """
+        with self._lock:
+            self._sequence += 1
+            event = {
+                'id': self._sequence,
+                'type': event_type,
+                'timestamp': time.time()
+            }
+            event.update(fields)
+            self._latest = event
+            if event_type == 'job_finished':
+                self._running_latest.pop(event.get('job_id'), None)
+            else:
+                self._running_latest[event.get('job_id')] = event
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # 丢弃最旧的事件，为新事件腾出空间
+                try:
+                    subscriber.get_nowait()
+                    subscriber.put_nowait(event)
+                except (queue.Empty, queue.Full):
+                    pass
+
+        return event
+
+    def subscribe(self) -> queue.Queue:
+        """
+        订阅进度事件
+
+        Returns:
+            queue.Queue: 事件队列，订阅者从中读取事件
+        """
+        subscriber = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers.append(subscriber)
+            # 新订阅者立即收到运行中任务的当前状态
+            for event in sorted(self._running_latest.values(), key=lambda event: event['id'])[-self.max_queue_size:]:
+                subscriber.put_nowait(event)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        """取消订阅"""
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def get_latest(self) -> Optional[Dict[str, Any]]:
+        """获取最近一次发布的事件"""
+        with self._lock:
+            return dict(self._latest) if self._latest else None
+
+    def get_subscriber_count(self) -> int:
+        """获取当前订阅者数量"""
+        with self._lock:
+            return len(self._subscribers)
+
+    @classmethod
+    def get_stage_index(cls, stage_name: str) -> int:
+        """获取阶段序号，未知阶段返回-1"""
+        try:
+            return cls.STAGES.index(stage_name)
+        except ValueError:
+            return -1
+
+
+# 进程内共享的默认进度总线
+default_progress_bus = ProgressBus()
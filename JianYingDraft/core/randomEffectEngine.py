@@ -10,29 +10,30 @@ import random
 from typing import List, Dict, Any, Optional, Tuple, Set
 from JianYingDraft.core.metadataManager import MetadataManager
 from JianYingDraft.core.configManager import AutoMixConfigManager
+from JianYingDraft.core.weightedSampler import WeightedSampler
+from JianYingDraft.core.randomStreams import create_rng
 
 
 class RandomEffectEngine:
     """
     随机效果引擎
-    基于元数据管理器实现智能的随机特效、滤镜、转场选择和参数调整
+    基于元数据管理器实现智能的随机特效、滤镜、转场选择和参数调整；
+    每类效果由一个加权采样器负责抽取，已用过的效果在本轮内不再被抽中，全部用过后重新开始一轮
     """
     
-    def __init__(self, metadata_manager: MetadataManager, config_manager: AutoMixConfigManager = None):
+    def __init__(self, metadata_manager: MetadataManager, config_manager: AutoMixConfigManager = None,
+                 rng: random.Random = None):
         """
         初始化随机效果引擎
         
         Args:
             metadata_manager: 元数据管理器实例
             config_manager: 配置管理器实例
+            rng: 随机数生成器（由草稿种子创建），为None时新建独立的生成器
         """
         self.metadata_manager = metadata_manager
         self.config_manager = config_manager or AutoMixConfigManager
-        
-        # 效果使用历史，用于避免重复
-        self.used_filters: Set[str] = set()
-        self.used_transitions: Set[str] = set()
-        self.used_effects: Set[str] = set()
+        self.rng = rng or create_rng()
         
         # 效果权重配置
         self.filter_weights = {}
@@ -41,6 +42,29 @@ class RandomEffectEngine:
         
         # 初始化权重
         self._initialize_weights()
+
+        # 加权采样器（候选列表只构建一次，使用记录和权重调整都在采样器内完成）
+        self.filter_sampler = WeightedSampler(self.metadata_manager.get_available_filters(), self.filter_weights)
+        self.transition_sampler = WeightedSampler(
+            self._filter_transitions(self.metadata_manager.get_available_transitions()),
+            self.transition_weights
+        )
+        self.effect_sampler = WeightedSampler(self.metadata_manager.get_available_effects(), self.effect_weights)
+
+    @property
+    def used_filters(self) -> Set[str]:
+        """本轮已使用的滤镜名称"""
+        return self.filter_sampler.used_names
+
+    @property
+    def used_transitions(self) -> Set[str]:
+        """本轮已使用的转场名称"""
+        return self.transition_sampler.used_names
+
+    @property
+    def used_effects(self) -> Set[str]:
+        """本轮已使用的特效名称"""
+        return self.effect_sampler.used_names
     
     def _initialize_weights(self):
         """初始化效果权重"""
@@ -74,31 +98,8 @@ class RandomEffectEngine:
         Returns:
             Optional[Any]: 选择的滤镜元数据，如果不应用滤镜则返回None
         """
-        # 获取可用滤镜（使用VIP资源，100%概率确保每个片段都有滤镜）
-        available_filters = self.metadata_manager.get_available_filters()
-        
-        if not available_filters:
-            return None
-        
-        # 应用多样性策略
-        diverse_filters = self._ensure_filter_diversity(available_filters)
-        
-        if not diverse_filters:
-            # 如果所有滤镜都用过了，重置历史
-            self.used_filters.clear()
-            diverse_filters = available_filters
-        
-        # 基于权重选择滤镜
-        selected_filter = self._weighted_random_choice(
-            diverse_filters, 
-            self.filter_weights
-        )
-        
-        if selected_filter:
-            filter_name = getattr(selected_filter, 'name', '')
-            self.used_filters.add(filter_name)
-        
-        return selected_filter
+        # 在可用滤镜中按权重抽取本轮未用过的滤镜（使用VIP资源，100%概率确保每个片段都有滤镜）
+        return self.filter_sampler.draw(self.rng)
     
     def select_transition_between_segments(self, prev_segment: Dict[str, Any], 
                                          next_segment: Dict[str, Any]) -> Optional[Tuple[Any, int]]:
@@ -114,36 +115,13 @@ class RandomEffectEngine:
         """
         # 检查是否应该应用转场
         transition_probability = self.config_manager.get_transition_probability()
-        if random.random() > transition_probability:
-            return None
-        
-        # 获取可用转场（使用VIP资源）
-        all_transitions = self.metadata_manager.get_available_transitions()
-
-        # 过滤掉弹幕类转场特效
-        available_transitions = self._filter_transitions(all_transitions)
-        
-        if not available_transitions:
+        if self.rng.random() > transition_probability:
             return None
         
-        # 应用多样性策略
-        diverse_transitions = self._ensure_transition_diversity(available_transitions)
-        
-        if not diverse_transitions:
-            # 如果所有转场都用过了，重置历史
-            self.used_transitions.clear()
-            diverse_transitions = available_transitions
-        
-        # 基于权重选择转场
-        selected_transition = self._weighted_random_choice(
-            diverse_transitions, 
-            self.transition_weights
-        )
+        # 在已排除弹幕类的可用转场中按权重抽取本轮未用过的转场（使用VIP资源）
+        selected_transition = self.transition_sampler.draw(self.rng)
         
         if selected_transition:
-            transition_name = getattr(selected_transition, 'name', '')
-            self.used_transitions.add(transition_name)
-            
             # 计算转场时长
             duration = self._calculate_transition_duration(selected_transition, prev_segment, next_segment)
             
@@ -161,31 +139,8 @@ class RandomEffectEngine:
         Returns:
             Optional[Any]: 选择的特效元数据，如果不应用特效则返回None
         """
-        # 获取可用特效（使用VIP资源，100%概率确保每个片段都有特效）
-        available_effects = self.metadata_manager.get_available_effects()
-        
-        if not available_effects:
-            return None
-        
-        # 应用多样性策略
-        diverse_effects = self._ensure_effect_diversity(available_effects)
-        
-        if not diverse_effects:
-            # 如果所有特效都用过了，重置历史
-            self.used_effects.clear()
-            diverse_effects = available_effects
-        
-        # 基于权重选择特效
-        selected_effect = self._weighted_random_choice(
-            diverse_effects, 
-            self.effect_weights
-        )
-        
-        if selected_effect:
-            effect_name = getattr(selected_effect, 'name', '')
-            self.used_effects.add(effect_name)
-        
-        return selected_effect
+        # 在可用特效中按权重抽取本轮未用过的特效（使用VIP资源，100%概率确保每个片段都有特效）
+        return self.effect_sampler.draw(self.rng)
     
     def generate_random_parameters(self, effect_meta: Any) -> List[Optional[float]]:
         """
@@ -210,40 +165,40 @@ class RandomEffectEngine:
 
             if any(keyword in param_name for keyword in ['亮度', 'brightness', '明度']):
                 # 亮度参数：轻微调整，范围15-35（避免过亮或过暗）
-                value = random.uniform(15, 35)
+                value = self.rng.uniform(15, 35)
             elif any(keyword in param_name for keyword in ['对比度', 'contrast', '对比']):
                 # 对比度参数：轻微调整，范围20-40
-                value = random.uniform(20, 40)
+                value = self.rng.uniform(20, 40)
             elif any(keyword in param_name for keyword in ['饱和度', 'saturation', '饱和']):
                 # 饱和度参数：轻微调整，范围25-45
-                value = random.uniform(25, 45)
+                value = self.rng.uniform(25, 45)
             elif any(keyword in param_name for keyword in ['大小', 'size', '尺寸', '缩放', 'scale']):
                 # 大小/缩放参数：轻微调整，范围10-30
-                value = random.uniform(10, 30)
+                value = self.rng.uniform(10, 30)
             elif any(keyword in param_name for keyword in ['速度', 'speed', '快慢']):
                 # 速度参数：轻微调整，范围25-45
-                value = random.uniform(25, 45)
+                value = self.rng.uniform(25, 45)
             elif any(keyword in param_name for keyword in ['强度', 'intensity', '程度']):
                 # 强度参数：轻微效果，范围10-25
-                value = random.uniform(10, 25)
+                value = self.rng.uniform(10, 25)
             elif any(keyword in param_name for keyword in ['透明度', 'opacity', 'alpha']):
                 # 透明度参数：轻微调整，范围20-40
-                value = random.uniform(20, 40)
+                value = self.rng.uniform(20, 40)
             elif any(keyword in param_name for keyword in ['模糊', 'blur', '虚化']):
                 # 模糊参数：轻微模糊，范围5-20
-                value = random.uniform(5, 20)
+                value = self.rng.uniform(5, 20)
             elif any(keyword in param_name for keyword in ['旋转', 'rotation', 'rotate']):
                 # 旋转参数：轻微旋转，范围10-30
-                value = random.uniform(10, 30)
+                value = self.rng.uniform(10, 30)
             elif any(keyword in param_name for keyword in ['纹理', 'texture', '质感']):
                 # 纹理参数：轻微纹理效果，范围15-35
-                value = random.uniform(15, 35)
+                value = self.rng.uniform(15, 35)
             elif any(keyword in param_name for keyword in ['滤镜', 'filter', '滤波']):
                 # 滤镜参数：轻微滤镜效果，范围20-40
-                value = random.uniform(20, 40)
+                value = self.rng.uniform(20, 40)
             else:
                 # 其他参数：使用轻微的正态分布，中心在25，标准差为8
-                value = random.normalvariate(25, 8)
+                value = self.rng.normalvariate(25, 8)
 
             # 确保值在0-100范围内
             value = max(0, min(100, value))
@@ -251,49 +206,6 @@ class RandomEffectEngine:
 
         return random_params
     
-    def _ensure_filter_diversity(self, available_filters: List[Any]) -> List[Any]:
-        """确保滤镜多样性"""
-        return [f for f in available_filters 
-                if getattr(f, 'name', '') not in self.used_filters]
-    
-    def _ensure_transition_diversity(self, available_transitions: List[Any]) -> List[Any]:
-        """确保转场多样性"""
-        return [t for t in available_transitions 
-                if getattr(t, 'name', '') not in self.used_transitions]
-    
-    def _ensure_effect_diversity(self, available_effects: List[Any]) -> List[Any]:
-        """确保特效多样性"""
-        return [e for e in available_effects 
-                if getattr(e, 'name', '') not in self.used_effects]
-    
-    def _weighted_random_choice(self, items: List[Any], weights: Dict[str, float]) -> Optional[Any]:
-        """
-        基于权重的随机选择
-        
-        Args:
-            items: 候选项列表
-            weights: 权重字典
-            
-        Returns:
-            Optional[Any]: 选择的项目
-        """
-        if not items:
-            return None
-        
-        # 计算权重
-        item_weights = []
-        for item in items:
-            name = getattr(item, 'name', '')
-            weight = weights.get(name, 1.0)
-            item_weights.append(weight)
-        
-        # 如果所有权重都为0，使用均匀分布
-        if sum(item_weights) == 0:
-            return random.choice(items)
-        
-        # 基于权重随机选择
-        return random.choices(items, weights=item_weights)[0]
-
     def _filter_transitions(self, transitions):
         """过滤转场，排除弹幕类和不适合的转场特效"""
         # 定义要排除的转场关键词
@@ -338,7 +250,7 @@ class RandomEffectEngine:
         default_duration = getattr(transition_meta, 'default_duration', 1000000)  # 默认1秒
         
         # 添加一些随机变化（±20%）
-        variation = random.uniform(0.8, 1.2)
+        variation = self.rng.uniform(0.8, 1.2)
         duration = int(default_duration * variation)
         
         # 确保转场时长在合理范围内（0.2秒到3秒）
@@ -359,20 +271,23 @@ class RandomEffectEngine:
             effect_type: 效果类型 ('filter', 'transition', 'effect')
         """
         if effect_type == 'filter':
-            if effect_name in self.filter_weights:
-                self.filter_weights[effect_name] *= weight_multiplier
+            weights, sampler = self.filter_weights, self.filter_sampler
         elif effect_type == 'transition':
-            if effect_name in self.transition_weights:
-                self.transition_weights[effect_name] *= weight_multiplier
+            weights, sampler = self.transition_weights, self.transition_sampler
         elif effect_type == 'effect':
-            if effect_name in self.effect_weights:
-                self.effect_weights[effect_name] *= weight_multiplier
+            weights, sampler = self.effect_weights, self.effect_sampler
+        else:
+            return
+
+        if effect_name in weights:
+            weights[effect_name] *= weight_multiplier
+            sampler.set_weight(effect_name, weights[effect_name])
     
     def reset_usage_history(self):
         """重置使用历史"""
-        self.used_filters.clear()
-        self.used_transitions.clear()
-        self.used_effects.clear()
+        self.filter_sampler.reset_usage()
+        self.transition_sampler.reset_usage()
+        self.effect_sampler.reset_usage()
     
     def get_usage_statistics(self) -> Dict[str, Any]:
         """获取使用统计"""
@@ -0,0 +1,41 @@
+"""
+随机数流 - 由批量种子派生每个草稿独立的随机数生成器，使草稿可以按种子重新生成
+"""
+import hashlib
+import random
+import secrets
+from typing import Optional, Union
+
+
+def new_batch_seed() -> int:
+    """生成新的批量种子（取自系统熵源，不消耗全局random的状态）"""
+    return secrets.randbits(63)
+
+
+def derive_seed(batch_seed: int, draft_index: Union[int, str]) -> int:
+    """
+    由批量种子和草稿序号派生草稿种子
+    使用哈希而不是顺序调用同一个生成器，任意一个草稿都能单独重新生成，且相邻草稿的随机序列互不相关
+
+    Args:
+        batch_seed: 批量种子
+        draft_index: 草稿序号（从1开始），也可以是子流名称（如'overlay'），用于从草稿种子派生独立的随机流
+
+    Returns:
+        int: 草稿种子（63位非负整数）
+    """
+    digest = hashlib.sha256(f"{batch_seed}:{draft_index}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') >> 1
+
+
+def create_rng(seed: Optional[int] = None) -> random.Random:
+    """
+    创建独立的随机数生成器
+
+    Args:
+        seed: 种子，为None时使用系统熵源初始化（每个实例仍然独立，不与全局random共享状态）
+
+    Returns:
+        random.Random: 随机数生成器
+    """
+    return random.Random(seed)
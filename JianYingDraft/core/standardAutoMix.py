@@ -16,7 +16,8 @@ from pyJianYingDraft import (
     trange, SEC,
     Filter_type, Video_scene_effect_type, Transition_type,
     Text_style, Clip_settings,
-    Effect_segment, Filter_segment
+    Effect_segment, Filter_segment,
+    Sequential_id_provider
 )
 
 from JianYingDraft.core.configManager import AutoMixConfigManager
@@ -24,7 +25,10 @@ from JianYingDraft.core.materialScanner import MaterialScanner
 from JianYingDraft.core.srtProcessor import SRTProcessor
 from JianYingDraft.core.metadataManager import MetadataManager
 from JianYingDraft.core.effectExclusionManager import EffectExclusionManager
-from JianYingDraft.core.pexelsManager import PexelsManager
+from JianYingDraft.core.overlayPrefetcher import OverlayPrefetcher
+from JianYingDraft.core.diversityPlanner import DiversityPlanner
+from JianYingDraft.core.randomStreams import create_rng, derive_seed
+from JianYingDraft.core.progressBus import ProgressBus, default_progress_bus
 
 
 class StandardAutoMix:
@@ -32,21 +36,46 @@ class StandardAutoMix:
     标准化自动混剪类 - 基于pyJianYingDraft标准API
     """
     
-    def __init__(self, draft_name: str):
-        """初始化标准化自动混剪"""
+    def __init__(self, draft_name: str, seed: int = None):
+        """
+        初始化标准化自动混剪
+
+        Args:
+            draft_name: 草稿名称
+            seed: 草稿随机种子，相同种子、素材和配置生成相同的选择；为None时随机
+        """
         self.draft_name = draft_name
-        self.config_manager = AutoMixConfigManager
-        self.material_scanner = MaterialScanner()
+        # 草稿独立的随机数生成器，所有随机选择都从这里取，不使用全局random
+        self.seed = seed
+        self.rng = create_rng(seed)
+        # 覆盖视频从预取池中取用，池的大小取决于后台下载进度，使用独立的随机流，不影响后续选择
+        self.overlay_rng = create_rng(derive_seed(seed, 'overlay') if seed is not None else None)
+        # 配置快照：整个混剪过程读取同一份已解析的配置
+        self.config_manager = AutoMixConfigManager.get_snapshot()
+        self.material_scanner = MaterialScanner(self.rng)
         self.srt_processor = SRTProcessor()
         self.metadata_manager = MetadataManager()  # 初始化元数据管理器
         self.exclusion_manager = EffectExclusionManager()  # 初始化特效排除管理器
-        self.pexels_manager = PexelsManager()  # 初始化Pexels管理器
+        self.overlay_prefetcher = OverlayPrefetcher.get_default()  # 防审核覆盖视频预取池
+        if self.config_manager.is_pexels_overlay_enabled():
+            self.overlay_prefetcher.start()
         
         # 创建标准Script_file实例 - 9:16竖屏格式
-        self.script = Script_file(1080, 1920)  # 宽度1080, 高度1920 (9:16)
+        # 使用顺序id生成器：避免每个对象都调用uuid4，且相同种子生成相同的id
+        self.script = Script_file(1080, 1920, id_provider=Sequential_id_provider(seed))  # 宽度1080, 高度1920 (9:16)
         
         # 进度回调
         self.progress_callback: Optional[Callable[[str, float], None]] = None
+
+        # 结构化进度事件总线（批量任务通过draft_index/draft_total标识当前草稿）
+        self.progress_bus: ProgressBus = default_progress_bus
+        self.job_id: Optional[str] = None
+        self.draft_index = 0
+        self.draft_total = 1
+        self._start_time = None
+
+        # 批量多样性规划给出的本草稿方案（视频、滤镜、特效、转场），为None时独立随机选择
+        self.draft_plan: Optional[Dict[str, Any]] = None
         
         # 统计信息
         self.statistics = {
@@ -57,14 +86,60 @@ class StandardAutoMix:
             'applied_transitions': 0,
             'audio_tracks': 0,
             'subtitle_count': 0,
-            'product_model': ''
+            'product_model': '',
+            'seed': seed
         }
         
     def set_progress_callback(self, callback: Callable[[str, float], None]):
         """设置进度回调函数"""
         self.progress_callback = callback
 
-    def _clean_enum_name(self, name: str) -> str:
+    @classmethod
+    def plan_batch(cls, target_durations: List[int], product_model: str = None,
+                   rng: random.Random = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        为一批草稿统一规划素材与特效组合，使批量内草稿之间差异最大
+
+        Args:
+            target_durations: 每个草稿的目标时长（微秒）
+            product_model: 产品型号，为None时每个草稿随机选择产品，不做规划
+            rng: 随机数生成器
+
+        Returns:
+            List[Optional[Dict]]: 每个草稿的方案，赋值给draft_plan；无法规划时为None
+        """
+        if product_model is None or len(target_durations) < 2:
+            return [None] * len(target_durations)
+
+        try:
+            config = AutoMixConfigManager.get_snapshot()
+            materials = MaterialScanner().scan_product_materials(config.get_material_path(), product_model)
+            exclusion_manager = EffectExclusionManager()
+
+            def compatible_names(metas, enum_class):
+                return [meta.name for meta in metas
+                        if getattr(enum_class, cls._clean_enum_name(meta.name), None) is not None]
+
+            planner = DiversityPlanner(
+                materials.get('videos', []),
+                filters=compatible_names(exclusion_manager.get_filtered_filters(), Filter_type),
+                effects=compatible_names(exclusion_manager.get_filtered_effects(), Video_scene_effect_type),
+                transitions=compatible_names(exclusion_manager.get_filtered_transitions(), Transition_type),
+                rng=rng
+            )
+            return planner.plan([cls.get_target_video_count(duration) for duration in target_durations])
+        except Exception as e:
+            print(f"⚠️  批量多样性规划失败，各草稿将独立随机选择: {e}")
+            return [None] * len(target_durations)
+
+    @staticmethod
+    def get_target_video_count(target_duration: int) -> int:
+        """根据目标时长计算需要的视频数量（平均4秒每段，3-10段）"""
+        avg_segment_duration = 4 * SEC
+        return max(3, min(10, target_duration // avg_segment_duration))
+
+    @staticmethod
+    def _clean_enum_name(name: str) -> str:
         """清理枚举名称，移除特殊字符和空格"""
         import re
         # 移除特殊字符，只保留中文、英文、数字和下划线
@@ -99,10 +174,34 @@ class StandardAutoMix:
         print(f"  📊 转场过滤: 从{len(transitions)}个转场过滤到{len(filtered_transitions)}个（排除弹幕类）")
         return filtered_transitions
         
-    def _update_progress(self, message: str, progress: float):
-        """更新进度"""
+    def _update_progress(self, message: str, progress: float, stage: str = None):
+        """
+        更新进度
+
+        Args:
+            message: 进度描述
+            progress: 进度（0.0-1.0，失败为-1）
+            stage: 阶段名称（见ProgressBus.STAGES）
+        """
         if self.progress_callback:
             self.progress_callback(message, progress)
+
+        if self.progress_bus is not None:
+            if self._start_time is None:
+                self._start_time = time.time()
+            self.progress_bus.publish(
+                'progress' if progress >= 0 else 'failed',
+                job_id=self.job_id,
+                draft_name=self.draft_name,
+                draft_index=self.draft_index,
+                draft_total=self.draft_total,
+                stage=ProgressBus.get_stage_index(stage) if stage else -1,
+                stage_name=stage,
+                stage_count=len(ProgressBus.STAGES),
+                percent=round(max(progress, 0.0) * 100, 1),
+                message=message,
+                elapsed=round(time.time() - self._start_time, 3)
+            )
             
     def auto_mix(self, target_duration: int = 35000000, product_model: str = None) -> Dict[str, Any]:
         """
@@ -115,65 +214,69 @@ class StandardAutoMix:
         Returns:
             Dict: 混剪结果
         """
-        try:
-            self._update_progress("开始标准化自动混剪", 0.0)
+        self._start_time = time.time()
+        self.config_manager = AutoMixConfigManager.get_snapshot()
+        # 混剪过程中创建的轨道、片段、特效等对象都使用本草稿的id生成器
+        with self.script.id_scope():
+            try:
+                self._update_progress("开始标准化自动混剪", 0.0, "初始化")
             
-            # 1. 扫描素材
-            self._update_progress("扫描产品素材库", 0.1)
-            materials = self._scan_materials(product_model)
+                # 1. 扫描素材
+                self._update_progress("扫描产品素材库", 0.1, "扫描素材")
+                materials = self._scan_materials(product_model)
             
-            # 2. 选择素材
-            self._update_progress("智能选择素材", 0.2)
-            selected_materials = self._select_materials(materials, target_duration)
+                # 2. 选择素材
+                self._update_progress("智能选择素材", 0.2, "选择素材")
+                selected_materials = self._select_materials(materials, target_duration)
             
-            # 3. 创建轨道
-            self._update_progress("创建轨道结构", 0.3)
-            self._create_tracks()
+                # 3. 创建轨道
+                self._update_progress("创建轨道结构", 0.3, "创建轨道")
+                self._create_tracks()
             
-            # 4. 添加视频片段
-            self._update_progress("添加视频片段", 0.4)
-            video_segments = self._add_video_segments(selected_materials['videos'], target_duration)
+                # 4. 添加视频片段
+                self._update_progress("添加视频片段", 0.4, "添加视频")
+                video_segments = self._add_video_segments(selected_materials['videos'], target_duration)
 
-            # 4.5. 添加防审核覆盖层
-            self._update_progress("添加防审核覆盖层", 0.45)
-            self._add_anti_detection_overlay(target_duration)
+                # 4.5. 添加防审核覆盖层
+                self._update_progress("添加防审核覆盖层", 0.45, "防审核覆盖层")
+                self._add_anti_detection_overlay(target_duration)
 
-            # 5. 添加转场
-            self._update_progress("添加转场效果", 0.5)
-            self._add_transitions(video_segments)
+                # 5. 添加转场
+                self._update_progress("添加转场效果", 0.5, "添加转场")
+                self._add_transitions(video_segments)
             
-            # 6. 添加特效和滤镜
-            self._update_progress("添加特效滤镜", 0.6)
-            self._add_effects_and_filters(video_segments)
+                # 6. 添加特效和滤镜
+                self._update_progress("添加特效滤镜", 0.6, "添加特效滤镜")
+                self._add_effects_and_filters(video_segments)
             
-            # 7. 添加音频
-            self._update_progress("添加音频轨道", 0.7)
-            self._add_audio_tracks(selected_materials, target_duration)
+                # 7. 添加音频
+                self._update_progress("添加音频轨道", 0.7, "添加音频")
+                self._add_audio_tracks(selected_materials, target_duration)
             
-            # 8. 添加字幕
-            self._update_progress("添加字幕", 0.8)
-            self._add_subtitles(selected_materials.get('subtitle_file'), target_duration)
+                # 8. 添加字幕
+                self._update_progress("添加字幕", 0.8, "添加字幕")
+                self._add_subtitles(selected_materials.get('subtitle_file'), target_duration)
             
-            # 9. 保存草稿
-            self._update_progress("保存草稿文件", 0.9)
-            draft_path = self._save_draft()
+                # 9. 保存草稿
+                self._update_progress("保存草稿文件", 0.9, "保存草稿")
+                draft_path = self._save_draft()
             
-            self._update_progress("标准化自动混剪完成", 1.0)
+                self._update_progress("标准化自动混剪完成", 1.0, "完成")
             
-            return {
-                'success': True,
-                'draft_path': draft_path,
-                'duration': target_duration,
-                'statistics': self.statistics
-            }
+                return {
+                    'success': True,
+                    'draft_path': draft_path,
+                    'duration': target_duration,
+                    'statistics': self.statistics
+                }
             
-        except Exception as e:
-            self._update_progress(f"混剪失败: {str(e)}", -1)
-            return {
-                'success': False,
-                'error': str(e),
-                'statistics': self.statistics
-            }
+            except Exception as e:
+                self._update_progress(f"混剪失败: {str(e)}", -1)
+                return {
+                    'success': False,
+                    'error': str(e),
+                    'statistics': self.statistics
+                }
             
     def _scan_materials(self, product_model: str = None) -> Dict[str, Any]:
         """扫描素材库"""
@@ -197,8 +300,7 @@ class StandardAutoMix:
             raise ValueError("未找到视频素材")
             
         # 计算需要的视频数量（基于目标时长）
-        avg_segment_duration = 4 * SEC  # 平均4秒每段
-        target_video_count = max(3, min(10, target_duration // avg_segment_duration))
+        target_video_count = self.get_target_video_count(target_duration)
         
         # 智能选择视频（确保子文件夹覆盖）
         selected_videos = self._smart_select_videos(videos, target_video_count)
@@ -226,6 +328,12 @@ class StandardAutoMix:
         
     def _smart_select_videos(self, videos: List[Dict], target_count: int) -> List[Dict]:
         """智能选择视频，确保每个文件夹最多选择1个视频"""
+        planned_videos = self._get_planned_videos(videos)
+        if planned_videos:
+            print(f"按批量多样性规划选择 {len(planned_videos)} 个视频（与已规划草稿的最小差异度 "
+                  f"{self.draft_plan.get('min_distance', 0):.2f}）")
+            return planned_videos
+
         # 按文件夹分组（修复：使用正确的属性名folder_name）
         videos_by_folder = {}
         for video in videos:
@@ -243,13 +351,13 @@ class StandardAutoMix:
 
         # 策略：每个文件夹最多选择1个视频，确保内容多样性
         available_folders = folders.copy()
-        random.shuffle(available_folders)  # 随机打乱文件夹顺序
+        self.rng.shuffle(available_folders)  # 随机打乱文件夹顺序
 
         for folder in available_folders:
             if len(selected_videos) >= target_count:
                 break
             if folder not in used_folders and videos_by_folder[folder]:
-                video = random.choice(videos_by_folder[folder])
+                video = self.rng.choice(videos_by_folder[folder])
                 selected_videos.append(video)
                 used_folders.add(folder)
                 print(f"  从文件夹 '{folder}' 选择视频: {os.path.basename(video['path'])}")
@@ -262,6 +370,35 @@ class StandardAutoMix:
 
         return selected_videos
         
+    def _get_planned_videos(self, videos: List[Dict]) -> List[Dict]:
+        """取出批量规划中指定的视频，素材库已变化（视频不存在）时放弃规划"""
+        if not self.draft_plan or not self.draft_plan.get('videos'):
+            return []
+        videos_by_path = {video['path']: video for video in videos}
+        planned_videos = [videos_by_path.get(path) for path in self.draft_plan['videos']]
+        if None in planned_videos:
+            print("  ⚠️  批量规划中的视频已不在素材库中，改为随机选择")
+            return []
+        return planned_videos
+
+    def _choose_effect_meta(self, available: List[Any], dimension: str, index: int, attempt: int) -> Any:
+        """
+        选择效果元数据：首次尝试使用批量规划指定的效果，其余情况随机选择
+
+        Args:
+            available: 可用效果元数据列表
+            dimension: 规划中的维度（filters/effects/transitions）
+            index: 片段（或片段间隔）序号
+            attempt: 当前尝试次数
+        """
+        if attempt == 0 and self.draft_plan:
+            planned = self.draft_plan.get(dimension, [])
+            if index < len(planned):
+                for meta in available:
+                    if meta.name == planned[index]:
+                        return meta
+        return self.rng.choice(available)
+
     def _select_narration_audio(self, audios: List[Dict]) -> Optional[str]:
         """选择解说音频"""
         if not audios:
@@ -271,19 +408,19 @@ class StandardAutoMix:
             if '解说' in os.path.basename(audio['path']):
                 return audio['path']
         # 否则随机选择
-        return random.choice(audios)['path']
+        return self.rng.choice(audios)['path']
         
     def _select_background_audio(self, environment_audios: List[Dict]) -> Optional[str]:
         """选择背景音频"""
         if not environment_audios:
             return None
-        return random.choice(environment_audios)['path']
+        return self.rng.choice(environment_audios)['path']
         
     def _select_subtitle_file(self, subtitles: List[Dict]) -> Optional[str]:
         """选择字幕文件"""
         if not subtitles:
             return None
-        return random.choice(subtitles)['path']
+        return self.rng.choice(subtitles)['path']
 
     def _create_tracks(self):
         """创建标准轨道结构"""
@@ -364,7 +501,7 @@ class StandardAutoMix:
 
         # 添加随机变化（±20%）
         for i in range(len(durations)):
-            variation = random.uniform(0.8, 1.2)
+            variation = self.rng.uniform(0.8, 1.2)
             durations[i] = int(durations[i] * variation)
 
         # 确保最小时长
@@ -379,14 +516,13 @@ class StandardAutoMix:
         scale_factor = 1.1  # 固定110%，符合用户要求
 
         # 随机调整亮度和对比度（10-15范围）
-        import random
-        contrast = random.uniform(0.10, 0.15)  # 10%-15%对比度调整
-        brightness = random.uniform(0.10, 0.15)  # 10%-15%亮度调整
+        contrast = self.rng.uniform(0.10, 0.15)  # 10%-15%对比度调整
+        brightness = self.rng.uniform(0.10, 0.15)  # 10%-15%亮度调整
 
         # 随机决定正负方向
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             contrast = -contrast
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             brightness = -brightness
 
         print(f"    🎨 时间{current_time//SEC:.1f}s: 对比度{contrast:+.2f}, 亮度{brightness:+.2f}")
@@ -440,7 +576,7 @@ class StandardAutoMix:
             # 尝试多次选择，直到找到兼容的转场
             max_attempts = 10
             for attempt in range(max_attempts):
-                transition_meta = random.choice(available_transitions)
+                transition_meta = self._choose_effect_meta(available_transitions, 'transitions', i, attempt)
 
                 # 清理转场名称，移除特殊字符
                 clean_name = self._clean_enum_name(transition_meta.name)
@@ -496,13 +632,13 @@ class StandardAutoMix:
         filter_track_name = "filter_track"
         self.script.add_track(Track_type.filter, filter_track_name)
 
-        for segment in video_segments:
+        for segment_index, segment in enumerate(video_segments):
             # 添加滤镜（100%概率 - 确保每个片段都有滤镜）
             # 尝试多次选择，直到找到兼容的滤镜
             filter_added = False
             max_attempts = 10
-            for _ in range(max_attempts):
-                filter_meta = random.choice(available_filters)
+            for attempt in range(max_attempts):
+                filter_meta = self._choose_effect_meta(available_filters, 'filters', segment_index, attempt)
                 # 清理滤镜名称，移除特殊字符
                 clean_name = self._clean_enum_name(filter_meta.name)
                 filter_type = getattr(Filter_type, clean_name, None)
@@ -510,7 +646,7 @@ class StandardAutoMix:
                 if filter_type is not None:
                     # 从配置管理器获取滤镜强度范围
                     min_intensity, max_intensity = self.config_manager.get_filter_intensity_range()
-                    intensity = random.randint(min_intensity, max_intensity)
+                    intensity = self.rng.randint(min_intensity, max_intensity)
                     try:
                         # 使用script.add_filter()方法添加滤镜到滤镜轨道
                         self.script.add_filter(
@@ -536,7 +672,7 @@ class StandardAutoMix:
                     if filter_type is not None:
                         # 从配置管理器获取滤镜强度范围
                         min_intensity, max_intensity = self.config_manager.get_filter_intensity_range()
-                        intensity = random.randint(min_intensity, max_intensity)
+                        intensity = self.rng.randint(min_intensity, max_intensity)
                         try:
                             self.script.add_filter(
                                 filter_type,
@@ -553,8 +689,8 @@ class StandardAutoMix:
             # 添加特效（100%概率 - 确保每个片段都有特效）
             # 尝试多次选择，直到找到兼容的特效
             effect_added = False
-            for _ in range(max_attempts):
-                effect_meta = random.choice(available_effects)
+            for attempt in range(max_attempts):
+                effect_meta = self._choose_effect_meta(available_effects, 'effects', segment_index, attempt)
                 # 清理特效名称，移除特殊字符
                 clean_name = self._clean_enum_name(effect_meta.name)
                 effect_type = getattr(Video_scene_effect_type, clean_name, None)
@@ -760,7 +896,7 @@ class StandardAutoMix:
             # 检查常见的本地视频目录
             fallback_dirs = [
                 os.path.join(os.path.dirname(__file__), "..", "..", "fallback_videos"),
-                os.path.join(self.config_manager.get_material_library_path(), "fallback_videos"),
+                os.path.join(self.config_manager.get_material_path(), "fallback_videos"),
                 "fallback_videos"
             ]
 
@@ -843,11 +979,12 @@ class StandardAutoMix:
         try:
             print("  🛡️  准备添加防审核覆盖层...")
 
-            # 获取防审核覆盖视频
-            overlay_video_path = self.pexels_manager.get_anti_detection_overlay_video()
+            # 从预取池取用防审核覆盖视频（不等待网络）
+            overlay_clip = self.overlay_prefetcher.take(self.overlay_rng)
+            overlay_video_path = overlay_clip['path'] if overlay_clip else None
 
             if not overlay_video_path:
-                print("  ⚠️  无法获取Pexels覆盖视频，尝试使用本地备用视频...")
+                print("  ⚠️  预取池暂无可用的Pexels覆盖视频，尝试使用本地备用视频...")
                 overlay_video_path = self._get_local_fallback_video()
 
                 if not overlay_video_path:
@@ -900,8 +1037,16 @@ class StandardAutoMix:
         draft_folder_name = f"{self.draft_name}_{timestamp}"
         draft_folder_path = os.path.join(draft_output_path, draft_folder_name)
 
-        if not os.path.exists(draft_folder_path):
-            os.makedirs(draft_folder_path)
+        # 同名文件夹已存在时追加序号，并发生成的草稿不会互相覆盖
+        os.makedirs(draft_output_path, exist_ok=True)
+        suffix = 1
+        while True:
+            try:
+                os.mkdir(draft_folder_path)
+                break
+            except FileExistsError:
+                suffix += 1
+                draft_folder_path = os.path.join(draft_output_path, f"{draft_folder_name}_{suffix}")
 
         # 1. 保存draft_content.json（时间线素材信息）
         draft_content_path = os.path.join(draft_folder_path, "draft_content.json")
@@ -0,0 +1,192 @@
+"""
+任务统计存储 - 内存计数 + 防抖原子落盘，并保留按天的历史吞吐
+"""
+import atexit
+import datetime
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+class TaskStatisticsStore:
+    """
+    任务统计存储
+    计数在内存中加锁累加，写盘通过防抖定时器合并：一段时间内的多次累加只写一次文件，
+    写入使用临时文件+fsync+os.replace，进程崩溃时不会留下半截的统计文件
+    """
+
+    def __init__(self, statistics_file: str, flush_delay: float = 2.0, history_days: int = 90):
+        """
+        初始化任务统计存储
+
+        Args:
+            statistics_file: 统计文件路径
+            flush_delay: 防抖写盘延迟（秒），0表示每次累加立即写盘
+            history_days: 保留的按天历史天数
+        """
+        self.statistics_file = statistics_file
+        self.flush_delay = flush_delay
+        self.history_days = history_days
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self._data = self._load()
+        self._roll_over_if_needed()
+        atexit.register(self.flush)
+
+    def add(self, completed: int = 0, errors: int = 0) -> Dict[str, Any]:
+        """
+        批量累加计数
+
+        Args:
+            completed: 新增完成任务数
+            errors: 新增错误数
+
+        Returns:
+            Dict: 累加后的统计快照
+        """
+        with self._lock:
+            self._roll_over_if_needed()
+            today_key = self._data['last_reset_date']
+            history = self._data['history'].setdefault(today_key, {'completed': 0, 'errors': 0})
+
+            if completed:
+                old_count = self._data['completed_today']
+                self._data['completed_today'] += completed
+                history['completed'] += completed
+                # 记录计数变化用于Web端显示
+                self._data['last_increment'] = {
+                    'old_count': old_count,
+                    'new_count': self._data['completed_today'],
+                    'timestamp': time.time()
+                }
+            if errors:
+                self._data['error_count_today'] += errors
+                history['errors'] += errors
+
+            self._schedule_flush()
+            snapshot = self.get_snapshot()
+
+        if self.flush_delay <= 0:
+            self.flush()
+        return snapshot
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """获取统计快照（跨天时先重置今日计数）"""
+        with self._lock:
+            self._roll_over_if_needed()
+            snapshot = dict(self._data)
+            snapshot['history'] = {day: dict(counts) for day, counts in self._data['history'].items()}
+            if 'last_increment' in snapshot:
+                snapshot['last_increment'] = dict(snapshot['last_increment'])
+            return snapshot
+
+    def get_history(self, days: int = 30) -> list:
+        """
+        获取按天的历史吞吐（最近的在后）
+
+        Args:
+            days: 返回的天数
+
+        Returns:
+            list: [{'date': 'YYYY-MM-DD', 'completed': n, 'errors': n}, ...]
+        """
+        with self._lock:
+            self._roll_over_if_needed()
+            today = datetime.date.today()
+            history = []
+            for offset in range(days - 1, -1, -1):
+                day_key = (today - datetime.timedelta(days=offset)).strftime('%Y-%m-%d')
+                counts = self._data['history'].get(day_key, {})
+                history.append({
+                    'date': day_key,
+                    'completed': counts.get('completed', 0),
+                    'errors': counts.get('errors', 0)
+                })
+            return history
+
+    def flush(self):
+        """立即把未写盘的统计写入文件"""
+        # 快照在写锁内获取：并发的flush（防抖定时器与显式调用）按取快照的顺序写盘，旧快照不会覆盖新快照
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._dirty:
+                    return
+                data = self.get_snapshot()
+                self._dirty = False
+
+            try:
+                self._write_atomic(data)
+            except Exception as e:
+                print(f"⚠️ 保存统计数据失败: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    def _schedule_flush(self):
+        """安排一次防抖写盘（调用方持有锁）"""
+        self._dirty = True
+        if self.flush_delay > 0 and self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _roll_over_if_needed(self):
+        """如果是新的一天，重置今日计数（调用方持有锁）"""
+        today_key = datetime.date.today().strftime('%Y-%m-%d')
+        if self._data.get('last_reset_date') == today_key:
+            return
+
+        print(f"🔄 重置统计数据: {self._data.get('last_reset_date')} → {today_key}")
+        self._data['completed_today'] = 0
+        self._data['error_count_today'] = 0
+        self._data['last_reset_date'] = today_key
+
+        # 清理超出保留天数的历史
+        cutoff = (datetime.date.today() - datetime.timedelta(days=self.history_days)).strftime('%Y-%m-%d')
+        for day_key in [day for day in self._data['history'] if day < cutoff]:
+            del self._data['history'][day_key]
+
+        self._dirty = True
+
+    def _load(self) -> Dict[str, Any]:
+        """从文件加载统计数据（兼容没有history字段的旧文件）"""
+        data = {
+            'completed_today': 0,
+            'error_count_today': 0,
+            'last_reset_date': None,
+            'history': {}
+        }
+        try:
+            if os.path.exists(self.statistics_file):
+                with open(self.statistics_file, 'r', encoding='utf-8') as f:
+                    data.update(json.load(f))
+        except Exception as e:
+            print(f"❌ 加载统计数据失败: {e}")
+
+        # 旧文件只有当天计数，把它补进历史
+        last_reset_date = data.get('last_reset_date')
+        if last_reset_date and last_reset_date not in data['history']:
+            data['history'][last_reset_date] = {
+                'completed': data.get('completed_today', 0),
+                'errors': data.get('error_count_today', 0)
+            }
+        return data
+
+    def _write_atomic(self, data: Dict[str, Any]):
+        """原子写入统计文件"""
+        data_dir = os.path.dirname(self.statistics_file)
+        if data_dir and not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+
+        temp_file = f"{self.statistics_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.statistics_file)
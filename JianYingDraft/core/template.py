@@ -7,19 +7,91 @@
  * @company: HiLand & RainyTop
 """
 import time
+from typing import Any, Callable, Dict, Optional
+
 from JianYingDraft.utils import tools
 
 
-def get_canvas(guid: str = None):
-    if guid is None:
-        guid = tools.generate_id()
-    pass
+class TemplateFactory:
+    """
+    模板对象工厂
+    每个模板的字面量只构建一次，之后按模板的结构编译出专用的复制函数：
+    没有嵌套容器的字典直接浅复制，只对嵌套的字典和列表逐层复制，再填入新的id等字段
+    """
 
+    def __init__(self):
+        # 构建函数 -> (模板对象, 复制函数)
+        self._templates: Dict[Callable[[], Dict[str, Any]], tuple] = {}
+
+    def create(self, builder: Callable[[], Dict[str, Any]], guid: Optional[str] = None, **fields) -> Dict[str, Any]:
+        """
+        由模板生成新的对象
+
+        @param builder: 模板的构建函数（返回模板字面量，id等字段留空）
+        @param guid: 对象的id，为None时生成新的id
+        @param fields: 需要覆盖的顶层字段
+        @return: 与模板互不共享可变子对象的新字典
+        """
+        entry = self._templates.get(builder)
+        if entry is None:
+            template = builder()
+            entry = (template, self.compile_copier(template))
+            self._templates[builder] = entry
+        pass
+
+        template, copier = entry
+        result = copier(template)
+        result["id"] = guid if guid is not None else tools.generate_id()
+        if fields:
+            result.update(fields)
+        pass
+
+        return result
+
+    @classmethod
+    def compile_copier(cls, value: Any) -> Optional[Callable[[Any], Any]]:
+        """
+        按模板的结构生成复制函数，不可变的值返回None（直接共享）
+        """
+        if isinstance(value, dict):
+            nested = [(key, cls.compile_copier(item)) for key, item in value.items() if isinstance(item, (dict, list))]
+            if not nested:
+                return dict.copy
+            pass
+
+            def copy_dict(source: dict) -> dict:
+                result = source.copy()
+                for key, copier in nested:
+                    result[key] = copier(source[key])
+                return result
+
+            return copy_dict
+        pass
+
+        if isinstance(value, list):
+            copiers = [cls.compile_copier(item) for item in value]
+            if not any(copiers):
+                return list.copy
+            pass
+
+            def copy_list(source: list) -> list:
+                return [copier(item) if copier else item for copier, item in zip(copiers, source)]
+
+            return copy_list
+        pass
+
+        return None
+
+
+template_factory = TemplateFactory()
+
+
+def _build_canvas():
     return {
         "album_image": "",
         "blur": 0.0,
         "color": "",
-        "id": guid,
+        "id": "",
         "image": "",
         "image_id": "",
         "image_name": "",
@@ -29,52 +101,47 @@ def get_canvas(guid: str = None):
     }
 
 
-def get_sound_channel_mapping(guid: str = None):
-    if guid is None:
-        guid = tools.generate_id()
-    pass
+def get_canvas(guid: str = None):
+    return template_factory.create(_build_canvas, guid)
+
 
+def _build_sound_channel_mapping():
     return {
         "audio_channel_mapping": 0,
-        "id": guid,
+        "id": "",
         "is_config_open": False,
         "type": "none"
     }
 
 
-def get_speed(guid: str = None):
-    if guid is None:
-        guid = tools.generate_id()
-    pass
+def get_sound_channel_mapping(guid: str = None):
+    return template_factory.create(_build_sound_channel_mapping, guid)
 
+
+def _build_speed():
     return {
         "curve_speed": None,
-        "id": guid,
+        "id": "",
         "mode": 0,
         "speed": 1.0,
         "type": "speed"
     }
 
 
-def get_material_for_meta_info(guid: str = None):
-    """
-    获取素材信息
-    :param guid: 素材id
-    :return:
-    """
-    if guid is None:
-        guid = tools.generate_id()
-    pass
+def get_speed(guid: str = None):
+    return template_factory.create(_build_speed, guid)
 
+
+def _build_material_for_meta_info():
     return {
-        "create_time": int(time.time()),
+        "create_time": 0,
         "duration": 0,
         "extra_info": "",
         "file_Path": "",
         "height": 0,
-        "id": guid,
-        "import_time": int(time.time()),
-        "import_time_ms": int(time.time()) * 10 ^ 6,
+        "id": "",
+        "import_time": 0,
+        "import_time_ms": 0,
         "md5": "",
         "metetype": "",  # meta or mate?? 估计剪映开发人员最初拼写错误，以后大家就以讹传讹将错就错了。
         "roughcut_time_range": {"duration": 0, "start": 0},
@@ -84,6 +151,17 @@ def get_material_for_meta_info(guid: str = None):
     }
 
 
+def get_material_for_meta_info(guid: str = None):
+    """
+    获取素材信息
+    :param guid: 素材id
+    :return:
+    """
+    now = int(time.time())
+    return template_factory.create(_build_material_for_meta_info, guid,
+                                   create_time=now, import_time=now, import_time_ms=now * 10 ^ 6)
+
+
 def get_track(guid: str = None, track_type: str = ""):
     if guid is None:
         guid = tools.generate_id()
@@ -98,11 +176,7 @@ def get_track(guid: str = None, track_type: str = ""):
     }
 
 
-def get_segment(guid: str = None):
-    if guid is None:
-        guid = tools.generate_id()
-    pass
-
+def _build_segment():
     return {
         "cartoon": False,
         "clip": {
@@ -122,7 +196,7 @@ def get_segment(guid: str = None):
         ],
         "group_id": "",
         "hdr_settings": {"intensity": 1.0, "mode": 1, "nits": 1000},
-        "id": guid,
+        "id": "",
         "intensifies_audio": False,
         "is_placeholder": False,
         "is_tone_modify": False,
@@ -144,11 +218,11 @@ def get_segment(guid: str = None):
     }
 
 
-def get_beat(guid: str = None):
-    if guid is None:
-        guid = tools.generate_id()
-    pass
+def get_segment(guid: str = None):
+    return template_factory.create(_build_segment, guid)
+
 
+def _build_beat():
     return {
         "ai_beats": {
             "beats_path": "",
@@ -159,7 +233,7 @@ def get_beat(guid: str = None):
         },
         "enable_ai_beats": False,
         "gear": 404,
-        "id": guid,
+        "id": "",
         "mode": 404,
         "type": "beats",
         "user_beats": [],
@@ -167,11 +241,11 @@ def get_beat(guid: str = None):
     }
 
 
-def get_video(guid: str = None):
-    if guid is None:
-        guid = tools.generate_id()
-    pass
+def get_beat(guid: str = None):
+    return template_factory.create(_build_beat, guid)
 
+
+def _build_video():
     return {
         "audio_fade": None,
         "cartoon_path": "",
@@ -197,7 +271,7 @@ def get_video(guid: str = None):
         "gameplay": None,
         "has_audio": True,
         "height": 0,
-        "id": guid,
+        "id": "",
         "intensifies_audio_path": "",
         "intensifies_path": "",
         "is_ai_generate_content": False,
@@ -243,11 +317,11 @@ def get_video(guid: str = None):
     }
 
 
-def get_audio(guid: str = None):
-    if guid is None:
-        guid = tools.generate_id()
-    pass
+def get_video(guid: str = None):
+    return template_factory.create(_build_video, guid)
 
+
+def _build_audio():
     return {
         "app_id": 0,
         "category_id": "",
@@ -256,10 +330,10 @@ def get_audio(guid: str = None):
         "duration": 0,
         "effect_id": "",
         "formula_id": "",
-        "id": guid,
+        "id": "",
         "intensifies_path": "",
         "local_material_id": "",
-        "music_id": tools.generate_id(),
+        "music_id": "",
         "name": "Krubb Wenkroist - Bleach.mp3",
         "path": "D:/Music/Krubb Wenkroist - Bleach.mp3",
         "request_id": "",
@@ -279,11 +353,11 @@ def get_audio(guid: str = None):
     }
 
 
-def get_text(guid: str = None):
-    if guid is None:
-        guid = tools.generate_id()
-    pass
+def get_audio(guid: str = None):
+    return template_factory.create(_build_audio, guid, music_id=tools.generate_id())
+
 
+def _build_text():
     return {
         "add_type": 0,
         "alignment": 1,
@@ -316,7 +390,7 @@ def get_text(guid: str = None):
         "global_alpha": 1.0,
         "group_id": "",
         "has_shadow": False,
-        "id": guid,
+        "id": "",
         "initial_scale": 1.0,
         "is_rich_text": False,
         "italic_degree": 0,
@@ -360,6 +434,10 @@ def get_text(guid: str = None):
     }
 
 
+def get_text(guid: str = None):
+    return template_factory.create(_build_text, guid)
+
+
 def get_material_animation(guid: str = None):
     if guid is None:
         guid = tools.generate_id()
@@ -413,19 +491,7 @@ def get_audio_fade(guid: str = None, fade_in_duration: int = 0, fade_out_duratio
     }
 
 
-def get_video_effect(guid: str = None, resource_id: str = "", name=""):
-    """
-    添加视频特效
-
-    @param guid: 特效的资源id
-    @param name: 特效的名称
-    @param resource_id: 特效资源在剪映的资源库中的id（非常重要，剪映通过这个id来自动获取特效的各种资源）
-    @return:
-    """
-    if guid is None:
-        guid = tools.generate_id()
-    pass
-
+def _build_video_effect():
     return {
         "adjust_params": [
             {
@@ -448,13 +514,13 @@ def get_video_effect(guid: str = None, resource_id: str = "", name=""):
         "disable_effect_faces": [],
         "effect_id": "1039448",
         "formula_id": "",
-        "id": guid,
-        "name": name,
+        "id": "",
+        "name": "",
         "path": "",
         "platform": "all",
         "render_index": 0,
         "request_id": "",
-        "resource_id": resource_id,  # 特效的资源id（剪映通过这个id来自动获取特效的各种资源）
+        "resource_id": "",  # 特效的资源id（剪映通过这个id来自动获取特效的各种资源）
         "source_platform": 0,
         "time_range": {"duration": 0, "start": 0},
         "track_render_index": 0,
@@ -464,31 +530,44 @@ def get_video_effect(guid: str = None, resource_id: str = "", name=""):
     }
 
 
-def get_transition(guid: str = None, resource_id: str = "", name="", duration: int = 500_000):
+def get_video_effect(guid: str = None, resource_id: str = "", name=""):
     """
     添加视频特效
 
-    @param duration: 转场的持续时间（单位微秒）
-    @param guid: 转场的资源id
-    @param name: 转场的名称
-    @param resource_id: 转场资源在剪映的资源库中的id（非常重要，剪映通过这个id来自动获取转场的各种资源）
+    @param guid: 特效的资源id
+    @param name: 特效的名称
+    @param resource_id: 特效资源在剪映的资源库中的id（非常重要，剪映通过这个id来自动获取特效的各种资源）
     @return:
     """
-    if guid is None:
-        guid = tools.generate_id()
-    pass
+    return template_factory.create(_build_video_effect, guid, resource_id=resource_id, name=name)
 
+
+def _build_transition():
     return {
         "category_id": "39862",
         "category_name": "叠化",
-        "duration": duration,
+        "duration": 500_000,
         "effect_id": "321493",
-        "id": guid,
+        "id": "",
         "is_overlap": False,
-        "name": name,
+        "name": "",
         "path": "",
         "platform": "all",
         "request_id": "202404100726237F33ED27AE329CF48C4E",
-        "resource_id": resource_id,
+        "resource_id": "",
         "type": "transition"
     }
+
+
+def get_transition(guid: str = None, resource_id: str = "", name="", duration: int = 500_000):
+    """
+    添加视频特效
+
+    @param duration: 转场的持续时间（单位微秒）
+    @param guid: 转场的资源id
+    @param name: 转场的名称
+    @param resource_id: 转场资源在剪映的资源库中的id（非常重要，剪映通过这个id来自动获取转场的各种资源）
+    @return:
+    """
+    return template_factory.create(_build_transition, guid, resource_id=resource_id, name=name,
+                                   duration=duration)
@@ -0,0 +1,76 @@
+"""
+版本化快照 - 只在数据源（配置文件、排除列表文件等）变化时重建派生数据，并提供稳定的ETag
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+
+def file_version(*paths: str) -> Tuple:
+    """
+    计算文件版本（mtime_ns与大小），文件不存在时对应位置为None
+
+    Args:
+        *paths: 文件路径
+
+    Returns:
+        Tuple: 每个文件的(mtime_ns, size)
+    """
+    versions = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            versions.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            versions.append(None)
+    return tuple(versions)
+
+
+class VersionedSnapshot:
+    """
+    版本化快照
+    version_func返回数据源的当前版本，版本不变时直接返回上次构建的结果；
+    invalidate()用于进程内修改后强制下一次重建
+    """
+
+    def __init__(self, builder: Callable[[], Any], version_func: Callable[[], Any]):
+        """
+        初始化版本化快照
+
+        Args:
+            builder: 构建快照数据的函数（返回可JSON序列化的数据）
+            version_func: 返回数据源当前版本的函数
+        """
+        self.builder = builder
+        self.version_func = version_func
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._version: Optional[Tuple] = None
+        self._data: Any = None
+        self._etag: Optional[str] = None
+        self.build_count = 0
+
+    def get(self) -> Tuple[Any, str]:
+        """
+        获取快照数据与ETag（必要时重建）
+
+        Returns:
+            Tuple[Any, str]: (快照数据, ETag)
+        """
+        with self._lock:
+            version = (self.version_func(), self._generation)
+            if version != self._version:
+                data = self.builder()
+                payload = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+                self._data = data
+                self._etag = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+                self._version = version
+                self.build_count += 1
+            return self._data, self._etag
+
+    def invalidate(self):
+        """标记快照失效，下一次get时重建"""
+        with self._lock:
+            self._generation += 1
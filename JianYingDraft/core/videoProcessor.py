@@ -9,6 +9,7 @@
 import random
 from typing import Dict, Any, Optional, Tuple
 from JianYingDraft.core.configManager import AutoMixConfigManager
+from JianYingDraft.core.randomStreams import create_rng
 
 
 class VideoProcessor:
@@ -17,9 +18,16 @@ class VideoProcessor:
     实现视频的预处理功能，包括去掉前3秒、画面扩大5%、随机调整对比度和亮度
     """
     
-    def __init__(self):
-        """初始化视频预处理器"""
-        self.config_manager = AutoMixConfigManager
+    def __init__(self, config_manager: AutoMixConfigManager = None, rng: random.Random = None):
+        """
+        初始化视频预处理器
+
+        Args:
+            config_manager: 配置管理器或配置快照，为None时使用当前配置快照
+            rng: 随机数生成器（由草稿种子创建），为None时新建独立的生成器
+        """
+        self.config_manager = config_manager or AutoMixConfigManager.get_snapshot()
+        self.rng = rng or create_rng()
     
     def trim_start(self, media_info: Dict[str, Any], duration: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -159,12 +167,10 @@ class VideoProcessor:
         Returns:
             Dict[str, Any]: 更新后的片段信息
         """
-        import random
-
         # 获取翻转概率配置（如果是100%则强制执行）
         flip_probability = self.config_manager.get_flip_probability()
 
-        if flip_probability >= 1.0 or random.random() < flip_probability:
+        if flip_probability >= 1.0 or self.rng.random() < flip_probability:
             # 确保clip结构存在
             if 'clip' not in segment:
                 segment['clip'] = {
@@ -191,8 +197,6 @@ class VideoProcessor:
         Returns:
             Dict[str, Any]: 更新后的片段信息
         """
-        import random
-
         # 检查是否启用变速处理
         if not self.config_manager.is_speed_variation_enabled():
             return segment
@@ -210,7 +214,7 @@ class VideoProcessor:
             current += 0.05
 
         if speed_options:
-            speed = random.choice(speed_options)
+            speed = self.rng.choice(speed_options)
 
             # 简化：直接设置速度值，避免复杂的对象依赖
             segment['_speed_variation'] = {
@@ -234,7 +238,6 @@ class VideoProcessor:
         Returns:
             tuple: (背景片段, 前景片段)
         """
-        import random
         import copy
 
         # 检查是否启用模糊背景
@@ -243,7 +246,7 @@ class VideoProcessor:
 
         # 检查概率（如果是100%则强制执行）
         blur_probability = self.config_manager.get_blur_background_probability()
-        if blur_probability < 1.0 and random.random() > blur_probability:
+        if blur_probability < 1.0 and self.rng.random() > blur_probability:
             return None, segment
 
         print(f"  🌫️  创建模糊背景效果（防审核 - {'强制执行' if blur_probability >= 1.0 else f'{blur_probability:.1%}概率'}）")
@@ -324,15 +327,13 @@ class VideoProcessor:
         Returns:
             Dict[str, Any]: 更新后的片段信息
         """
-        import random
-
         # 检查是否启用抽帧/补帧
         if not self.config_manager.is_frame_manipulation_enabled():
             return segment
 
         # 检查概率（如果是100%则强制执行）
         frame_drop_prob = self.config_manager.get_frame_drop_probability()
-        if frame_drop_prob < 1.0 and random.random() > frame_drop_prob:
+        if frame_drop_prob < 1.0 and self.rng.random() > frame_drop_prob:
             return segment
 
         print(f"  🎞️  应用抽帧处理（实验性防审核 - {'强制执行' if frame_drop_prob >= 1.0 else f'{frame_drop_prob:.1%}概率'}）")
@@ -364,7 +365,7 @@ class VideoProcessor:
         for i in range(actual_drops):
             # 在可用时间范围内随机选择抽帧点
             if start_time < end_time:
-                drop_time = random.uniform(start_time, end_time)
+                drop_time = self.rng.uniform(start_time, end_time)
                 drop_points.append(drop_time)
                 # 更新下一个抽帧点的最小时间
                 start_time = drop_time + drop_interval
@@ -402,8 +403,8 @@ class VideoProcessor:
         (contrast_min, contrast_max), (brightness_min, brightness_max) = self.config_manager.get_color_adjustment_ranges()
         
         # 随机生成对比度和亮度值
-        contrast_value = random.uniform(contrast_min, contrast_max)
-        brightness_value = random.uniform(brightness_min, brightness_max)
+        contrast_value = self.rng.uniform(contrast_min, contrast_max)
+        brightness_value = self.rng.uniform(brightness_min, brightness_max)
         
         # 启用色彩调整功能
         segment['enable_color_curves'] = True
@@ -0,0 +1,189 @@
+"""
+加权随机采样器 - 基于树状数组（Fenwick树）的加权抽样，抽样与权重更新均为O(log n)
+"""
+import random
+from typing import List, Dict, Any, Optional, Callable, Set
+
+
+class WeightedSampler:
+    """
+    加权随机采样器
+    用两棵树状数组分别维护候选项的有效权重与未使用标记：
+    抽样时按权重前缀和二分定位，调整权重或标记"最近已用"只更新一条树路径，不需要重建候选列表；
+    所有候选项都用过后自动清空使用记录，保证在整个周期内不重复
+    """
+
+    def __init__(self, items: List[Any], weights: Dict[str, float] = None,
+                 key: Callable[[Any], str] = None):
+        """
+        初始化加权随机采样器
+
+        Args:
+            items: 候选项列表
+            weights: 权重字典（名称 → 权重），未配置的候选项权重为1.0
+            key: 获取候选项名称的函数，默认取name属性
+        """
+        self.key = key or (lambda item: getattr(item, 'name', ''))
+        self._items: List[Any] = list(items)
+        self._positions: Dict[str, int] = {}
+        for position, item in enumerate(self._items):
+            self._positions.setdefault(self.key(item), position)
+
+        weights = weights or {}
+        self._weights: List[float] = [max(0.0, float(weights.get(self.key(item), 1.0))) for item in self._items]
+        self._used: List[bool] = [False] * len(self._items)
+        self._used_count = 0
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def used_names(self) -> Set[str]:
+        """当前周期内已使用的候选项名称"""
+        return {self.key(item) for item, used in zip(self._items, self._used) if used}
+
+    @property
+    def available_count(self) -> int:
+        """当前周期内尚未使用的候选项数量"""
+        return len(self._items) - self._used_count
+
+    def get_weight(self, name: str) -> Optional[float]:
+        """获取候选项权重，不存在时返回None"""
+        position = self._positions.get(name)
+        return None if position is None else self._weights[position]
+
+    def set_weight(self, name: str, weight: float) -> bool:
+        """
+        设置候选项权重
+
+        Returns:
+            bool: 候选项是否存在
+        """
+        position = self._positions.get(name)
+        if position is None:
+            return False
+        weight = max(0.0, float(weight))
+        if not self._used[position]:
+            self._add(self._weight_tree, position, weight - self._weights[position])
+        self._weights[position] = weight
+        return True
+
+    def mark_used(self, name: str) -> bool:
+        """
+        标记候选项在当前周期内已使用（不再被抽中，直到使用记录被清空）
+
+        Returns:
+            bool: 是否新标记了一个候选项
+        """
+        position = self._positions.get(name)
+        if position is None or self._used[position]:
+            return False
+        self._used[position] = True
+        self._used_count += 1
+        self._add(self._weight_tree, position, -self._weights[position])
+        self._add(self._count_tree, position, -1)
+        return True
+
+    def reset_usage(self):
+        """清空使用记录"""
+        self._used = [False] * len(self._items)
+        self._used_count = 0
+        self._rebuild()
+
+    def sample(self, rng: random.Random = None) -> Optional[Any]:
+        """
+        在未使用的候选项中按权重抽取一项（不改变使用记录）
+
+        Args:
+            rng: 随机数生成器，默认使用random模块
+
+        Returns:
+            Optional[Any]: 抽中的候选项，没有未使用的候选项时返回None
+        """
+        if self.available_count <= 0:
+            return None
+        rng = rng or random
+
+        total_weight = self._prefix_sum(self._weight_tree)
+        if total_weight > 0:
+            position = self._find(self._weight_tree, rng.random() * total_weight)
+            if self._used[position] or self._weights[position] <= 0:
+                # 浮点累计误差可能定位到边界上的零权重项，改为向前找最近的有效项
+                position = self._nearest_weighted(position)
+            if position is not None:
+                return self._items[position]
+
+        # 所有未使用候选项权重都为0时，在其中均匀选择
+        position = self._find(self._count_tree, rng.randrange(self.available_count))
+        return self._items[position]
+
+    def draw(self, rng: random.Random = None) -> Optional[Any]:
+        """
+        抽取一项并标记为已使用；当前周期内所有候选项都用过时先清空使用记录
+
+        Args:
+            rng: 随机数生成器，默认使用random模块
+
+        Returns:
+            Optional[Any]: 抽中的候选项，没有候选项时返回None
+        """
+        if not self._items:
+            return None
+        if self.available_count <= 0:
+            self.reset_usage()
+        item = self.sample(rng)
+        if item is not None:
+            self.mark_used(self.key(item))
+        return item
+
+    def _rebuild(self):
+        """按当前权重和使用记录以O(n)重建两棵树状数组"""
+        size = len(self._items)
+        self._weight_tree = [0.0] * (size + 1)
+        self._count_tree = [0] * (size + 1)
+        for position in range(size):
+            if self._used[position]:
+                continue
+            self._weight_tree[position + 1] += self._weights[position]
+            self._count_tree[position + 1] += 1
+        for index in range(1, size + 1):
+            parent = index + (index & -index)
+            if parent <= size:
+                self._weight_tree[parent] += self._weight_tree[index]
+                self._count_tree[parent] += self._count_tree[index]
+
+    def _add(self, tree: list, position: int, delta):
+        """树状数组单点更新"""
+        index = position + 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def _prefix_sum(self, tree: list, count: int = None) -> float:
+        """前count项之和，默认求全部"""
+        index = len(tree) - 1 if count is None else count
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def _find(self, tree: list, target: float) -> int:
+        """找到前缀和首次大于target的位置"""
+        index = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            next_index = index + step
+            if next_index < len(tree) and tree[next_index] <= target:
+                index = next_index
+                target -= tree[next_index]
+            step >>= 1
+        return min(index, len(self._items) - 1)
+
+    def _nearest_weighted(self, position: int) -> Optional[int]:
+        """从position向前查找最近的未使用且权重为正的候选项"""
+        for candidate in list(range(position, -1, -1)) + list(range(position + 1, len(self._items))):
+            if not self._used[candidate] and self._weights[candidate] > 0:
+                return candidate
+        return None
@@ -1,7 +1,6 @@
 import os
-import shutil
-import uuid
 import json
+import hashlib
 import sys
 import time
 # sys.path.append(r"scripts\JianyingDraft")
@@ -9,13 +8,14 @@ import time
 # from BasicLibrary.io.dirHelper import DirHelper
 from JianYingDraft.utils.innerBizTypes import *
 from JianYingDraft.utils.dataStruct import TransitionData, EffectData, AnimationData, AnimationTypes
+from pyJianYingDraft.id_provider import get_id_provider
 
 
 def generate_id() -> str:
     """
-    生成uuid
+    生成uuid（由当前生效的id生成器生成，默认为随机uuid4，可通过pyJianYingDraft.set_id_provider切换为顺序id）
     """
-    return str(uuid.uuid4()).upper()
+    return get_id_provider().new_uuid()
 
 
 def read_json(path):
@@ -28,30 +28,70 @@ def read_json(path):
     pass
 
 
-def write_json(path, data):
+def write_json(path, data) -> bool:
     """
     写入json文件
+    先写入临时文件并fsync，再原子替换目标文件，写入中途崩溃不会损坏已有的文件；
+    内容与已有文件相同时（按内容哈希比较）跳过写入
     :param path: 文件路径
     :param data: 数据
+    :return: 是否实际写入了文件
     """
-    with open(path, 'w') as file:
-        # 给json.dump添加参数 ensure_ascii=false可以保证汉字不被编码
-        json.dump(data, file)
+    # 给json.dump添加参数 ensure_ascii=false可以保证汉字不被编码
+    content = json.dumps(data).encode("utf-8")
+    digest = hashlib.sha256(content).hexdigest()
+
+    if _get_file_digest(path) == digest:
+        return False
     pass
 
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(content)
+        file.flush()
+        os.fsync(file.fileno())
+    pass
+    os.replace(temp_path, path)
 
-def create_folder(folder_path):
+    stat = os.stat(path)
+    _file_digests[os.path.abspath(path)] = (stat.st_size, stat.st_mtime_ns, digest)
+    return True
+
+
+# 已写入文件的内容哈希：绝对路径 -> (文件大小, 修改时间, 哈希)，文件未被外部修改时不必重新读取计算
+_file_digests = {}
+
+
+def _get_file_digest(path):
     """
-    创建文件夹
-    :param folder_path: 文件夹路径
+    获取已有文件的内容哈希，文件不存在时返回None
     """
-    if os.path.exists(folder_path):
-        shutil.rmtree(folder_path)
-       
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    pass
+
+    abs_path = os.path.abspath(path)
+    cached = _file_digests.get(abs_path)
+    if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+        return cached[2]
+    pass
+
+    with open(path, 'rb') as file:
+        digest = hashlib.sha256(file.read()).hexdigest()
     pass
 
-    # DirHelper.ensure_exist(folder_path)
-    os.mkdir(folder_path)
+    _file_digests[abs_path] = (stat.st_size, stat.st_mtime_ns, digest)
+    return digest
+
+
+def create_folder(folder_path):
+    """
+    创建文件夹（已存在时保留，不删除其中剪映生成的其他文件）
+    :param folder_path: 文件夹路径
+    """
+    os.makedirs(folder_path, exist_ok=True)
 
 
 def generate_effect_data(name_or_resource_id: str | int) -> EffectData:
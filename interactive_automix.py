@@ -870,14 +870,22 @@ class InteractiveAutoMix:
 
     def standard_batch_generate(self, count: int, product_model: str, min_seconds: int, max_seconds: int):
         """执行批量生成"""
-        import random
+        from JianYingDraft.core.randomStreams import create_rng, derive_seed, new_batch_seed
 
         results = []
 
+        # 生成随机时长，并统一规划整批草稿的素材与特效组合（都由批量种子决定，可按种子重新生成）
+        batch_seed = new_batch_seed()
+        batch_rng = create_rng(batch_seed)
+        print(f"🎲 批量种子: {batch_seed}")
+        target_seconds_list = [batch_rng.randint(min_seconds, max_seconds) for _ in range(count)]
+        draft_plans = StandardAutoMix.plan_batch(
+            [seconds * 1000000 for seconds in target_seconds_list], product_model, rng=batch_rng
+        )
+
         for i in range(count):
             try:
-                # 生成随机时长
-                target_seconds = random.randint(min_seconds, max_seconds)
+                target_seconds = target_seconds_list[i]
                 target_duration = target_seconds * 1000000
 
                 # 生成草稿名称
@@ -889,8 +897,9 @@ class InteractiveAutoMix:
                 print(f"  ⏱️  目标时长: {target_seconds}秒")
 
                 # 创建自动混剪实例
-                auto_mix = StandardAutoMix(draft_name)
+                auto_mix = StandardAutoMix(draft_name, seed=derive_seed(batch_seed, i + 1))
                 auto_mix.set_progress_callback(self.progress_callback)
+                auto_mix.draft_plan = draft_plans[i]
 
                 # 执行混剪
                 result = auto_mix.auto_mix(
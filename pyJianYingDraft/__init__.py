@@ -1,4 +1,5 @@
-from .local_materials import Crop_settings, Video_material, Audio_material
+from .local_materials import Crop_settings, Video_material, Audio_material, Media_probe_cache, probe_cache
+from .id_provider import Id_provider, Sequential_id_provider, get_id_provider, set_id_provider, id_scope
 from .keyframe import Keyframe_property
 
 from .time_util import Timerange
@@ -19,10 +20,20 @@ from .track import Track_type
 from .template_mode import Shrink_mode, Extend_mode
 from .script_file import Script_file
 from .draft_folder import Draft_folder
-from .jianying_controller import Jianying_controller, Export_resolution, Export_framerate
+from .template_batch import Template_batch_filler, Text_slot, Material_slot, Fill_result
 
 from .time_util import SEC, tim, trange
 
+_LAZY_CONTROLLER_NAMES = ("Jianying_controller", "Export_resolution", "Export_framerate")
+
+def __getattr__(name: str):
+    # 剪映控制器依赖仅Windows可用的uiautomation, 首次访问时才导入,
+    # 只使用草稿/素材/id生成器等模块时不需要安装uiautomation
+    if name in _LAZY_CONTROLLER_NAMES:
+        from . import jianying_controller
+        return getattr(jianying_controller, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
 __all__ = [
     "Font_type",
     "Mask_type",
@@ -42,6 +53,13 @@ __all__ = [
     "Crop_settings",
     "Video_material",
     "Audio_material",
+    "Media_probe_cache",
+    "probe_cache",
+    "Id_provider",
+    "Sequential_id_provider",
+    "get_id_provider",
+    "set_id_provider",
+    "id_scope",
     "Keyframe_property",
     "Timerange",
     "Audio_segment",
@@ -59,6 +77,10 @@ __all__ = [
     "Extend_mode",
     "Script_file",
     "Draft_folder",
+    "Template_batch_filler",
+    "Text_slot",
+    "Material_slot",
+    "Fill_result",
     "Jianying_controller",
     "Export_resolution",
     "Export_framerate",
@@ -1,10 +1,10 @@
 """定义视频/文本动画相关类"""
 
-import uuid
 
 from typing import Union, Optional
 from typing import Literal, Dict, List, Any
 
+from .id_provider import new_id
 from .time_util import Timerange
 
 from .metadata.animation_meta import Animation_meta
@@ -104,7 +104,7 @@ class Segment_animations:
     """动画列表"""
 
     def __init__(self):
-        self.animation_id = uuid.uuid4().hex
+        self.animation_id = new_id()
         self.animations = []
 
     def get_animation_trange(self, animation_type: Literal["in", "out", "group", "loop"]) -> Optional[Timerange]:
@@ -3,12 +3,12 @@
 包含淡入淡出效果、音频特效等相关类
 """
 
-import uuid
 from copy import deepcopy
 
 from typing import Optional, Literal, Union
 from typing import Dict, List, Any
 
+from .id_provider import new_id
 from .time_util import tim, Timerange
 from .segment import Media_segment
 from .local_materials import Audio_material
@@ -31,7 +31,7 @@ class Audio_fade:
     def __init__(self, in_duration: int, out_duration: int):
         """根据给定的淡入/淡出时长构造一个淡入淡出效果"""
 
-        self.fade_id = uuid.uuid4().hex
+        self.fade_id = new_id()
         self.in_duration = in_duration
         self.out_duration = out_duration
 
@@ -65,7 +65,7 @@ class Audio_effect:
         """根据给定的音效元数据及参数列表构造一个音频特效对象, params的范围是0~100"""
 
         self.name = effect_meta.value.name
-        self.effect_id = uuid.uuid4().hex
+        self.effect_id = new_id()
         self.resource_id = effect_meta.value.resource_id
         self.audio_adjust_params = []
 
@@ -3,16 +3,35 @@
 import os
 import shutil
 
-from typing import List
+from typing import List, Dict, Tuple
 
 from .script_file import Script_file
 
+COPIED_SUFFIXES = (".json", ".bak")
+"""实例化模板时总是复制而非硬链接的文件后缀, 这些草稿元数据文件会被剪映就地改写"""
+
+def _link_or_copy(src: str, dst: str) -> str:
+    """以硬链接的方式"复制"文件, 草稿元数据文件或不支持硬链接时退回到复制"""
+    # 先删除已有的文件, 以免写穿之前链接到模板的文件
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if not src.endswith(COPIED_SUFFIXES):
+        try:
+            os.link(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst)
+
 class Draft_folder:
     """管理一个文件夹及其内的一系列草稿"""
 
     folder_path: str
     """根路径"""
 
+    _template_bases: Dict[str, Tuple[int, Script_file]]
+    """已解析的模板草稿及其草稿文件的修改时间, 供`instantiate_template`复用"""
+
     def __init__(self, folder_path: str):
         """初始化草稿文件夹管理器
 
@@ -23,6 +42,7 @@ class Draft_folder:
             `FileNotFoundError`: 路径不存在
         """
         self.folder_path = folder_path
+        self._template_bases = {}
 
         if not os.path.exists(self.folder_path):
             raise FileNotFoundError(f"根文件夹 {self.folder_path} 不存在")
@@ -110,3 +130,61 @@ class Draft_folder:
 
         # 打开草稿
         return self.load_template(new_draft_name)
+
+    def instantiate_template(self, template_name: str, new_draft_name: str, allow_replace: bool = False) -> Script_file:
+        """以给定的草稿为模板实例化一份新草稿并在其上进行编辑, 适用于由同一模板批量生成大量草稿
+
+        与`duplicate_as_template`不同, 模板只在首次使用或其草稿文件变化时解析一次并作为不可变的基础保留,
+        新草稿由`Script_file.fork`派生, 只复制被修改的素材和文本, 导出时也只重新序列化这部分内容.
+        新草稿文件夹中的json等元数据文件被复制, 其余文件(如素材缓存)以硬链接的方式与模板共享, 不支持硬链接时退回到复制.
+
+        注意: 硬链接的文件与模板中的文件是同一份数据, 不应就地修改它们
+
+        Args:
+            template_name (`str`): 模板草稿名称
+            new_draft_name (`str`): 新草稿名称
+            allow_replace (`bool`, optional): 是否允许覆盖与`new_draft_name`重名的草稿. 默认为否.
+
+        Returns:
+            `Script_file`: 以模板模式打开的新草稿对象, 保存时写入新草稿的文件夹
+
+        Raises:
+            `FileNotFoundError`: 模板草稿不存在
+            `FileExistsError`: 已存在与`new_draft_name`重名的草稿, 但不允许覆盖.
+        """
+        template_path = os.path.join(self.folder_path, template_name)
+        new_draft_path = os.path.join(self.folder_path, new_draft_name)
+        if not os.path.exists(template_path):
+            raise FileNotFoundError(f"模板草稿 {template_name} 不存在")
+        if os.path.exists(new_draft_path) and not allow_replace:
+            raise FileExistsError(f"新草稿 {new_draft_name} 已存在且不允许覆盖")
+
+        base = self.get_template_base(template_name)
+
+        # 链接或复制草稿文件夹
+        shutil.copytree(template_path, new_draft_path, copy_function=_link_or_copy, dirs_exist_ok=allow_replace)
+
+        return base.fork(os.path.join(new_draft_path, "draft_content.json"))
+
+    def get_template_base(self, template_name: str) -> Script_file:
+        """获取`instantiate_template`所用的已解析的模板草稿, 未解析过或草稿文件已变化时重新加载
+
+        返回的草稿是派生新草稿的基础, 只应读取而不应修改或保存它
+
+        Args:
+            template_name (`str`): 模板草稿名称
+
+        Raises:
+            `FileNotFoundError`: 模板草稿不存在
+        """
+        content_path = os.path.join(self.folder_path, template_name, "draft_content.json")
+        mtime = os.stat(content_path).st_mtime_ns
+        cached = self._template_bases.get(template_name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        base = self.load_template(template_name)
+        base.save_path = None  # 基础草稿不应被保存
+        base.dumps()  # 预先填充导出缓存, 供派生的草稿共享
+        self._template_bases[template_name] = (mtime, base)
+        return base
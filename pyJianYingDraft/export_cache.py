@@ -0,0 +1,87 @@
+"""草稿导出时JSON文本片段的缓存, 重复保存时只重新序列化发生变化的对象"""
+
+import json
+
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+INDENT = 4
+"""导出JSON的缩进空格数, 与`json.dumps(..., indent=4)`一致"""
+
+def dumps_at_level(data: Any, level: int) -> str:
+    """将数据序列化为位于第`level`层缩进处的JSON文本, 拼接后与整体`json.dumps(..., indent=4)`的结果相同"""
+    text = json.dumps(data, ensure_ascii=False, indent=INDENT)
+    if level == 0 or "\n" not in text:
+        return text
+    return text.replace("\n", "\n" + " " * (INDENT * level))
+
+def join_list(fragments: List[str], level: int) -> str:
+    """将若干已序列化的元素拼接为位于第`level`层的JSON数组"""
+    if not fragments:
+        return "[]"
+    item_pad = " " * (INDENT * (level + 1))
+    return "[\n" + ",\n".join(item_pad + fragment for fragment in fragments) + "\n" + " " * (INDENT * level) + "]"
+
+def join_object(items: List[Tuple[str, str]], level: int) -> str:
+    """将若干(键, 已序列化的值)拼接为位于第`level`层的JSON对象"""
+    if not items:
+        return "{}"
+    item_pad = " " * (INDENT * (level + 1))
+    return "{\n" + ",\n".join(item_pad + json.dumps(key, ensure_ascii=False) + ": " + fragment
+                             for key, fragment in items) + "\n" + " " * (INDENT * level) + "}"
+
+class Json_fragment_cache:
+    """对象导出的JSON文本片段缓存
+
+    以对象本身为键, 同时记录对象的导出版本(由对象的状态或修改计数组成)及缩进层级,
+    二者均未变化时直接复用上次的文本. 版本为None的对象每次都重新序列化.
+    """
+
+    hits: int
+    """缓存命中次数"""
+    misses: int
+    """重新序列化的次数"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._fragments: Dict[int, Tuple[Any, Hashable, int, str]] = {}
+
+    def fragment(self, obj: Any, version: Optional[Hashable], level: int, export: Callable[[], Any]) -> str:
+        """获取对象在第`level`层的JSON文本片段
+
+        Args:
+            obj: 被导出的对象, 缓存期间保持对它的引用以免id被复用
+            version: 对象的导出版本, 为None时不缓存
+            level (`int`): 缩进层级
+            export: 导出函数, 返回可序列化的数据
+        """
+        if version is None:
+            self.misses += 1
+            return dumps_at_level(export(), level)
+
+        key = id(obj)
+        cached = self._fragments.get(key)
+        if cached is not None and cached[0] is obj and cached[1] == version and cached[2] == level:
+            self.hits += 1
+            return cached[3]
+
+        self.misses += 1
+        text = dumps_at_level(export(), level)
+        self._fragments[key] = (obj, version, level, text)
+        return text
+
+    def copy(self) -> "Json_fragment_cache":
+        """复制一份缓存, 新缓存与原缓存共享已缓存的文本但此后互不影响"""
+        ret = Json_fragment_cache()
+        ret._fragments = self._fragments.copy()
+        return ret
+
+    def invalidate(self, obj: Any) -> None:
+        """将对象标记为已修改, 下次导出时重新序列化"""
+        self._fragments.pop(id(obj), None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._fragments.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,91 @@
+"""草稿对象id的生成策略, 可在全局或单个草稿范围内切换"""
+
+import uuid
+import random
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+from typing import Iterator, Optional
+
+class Id_provider:
+    """随机id生成器, 每个id都是一个新的uuid4, 与切换前的行为一致"""
+
+    def new_hex(self) -> str:
+        """生成32位小写十六进制id, 用于轨道、片段、特效、关键帧等对象"""
+        return uuid.uuid4().hex
+
+    def new_uuid(self) -> str:
+        """生成带连字符的大写uuid格式id, 用于旧版草稿构建器"""
+        return str(uuid.uuid4()).upper()
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def material_id(material_name: str) -> str:
+        """根据素材名称生成素材id, 同名素材id相同"""
+        return uuid.uuid3(uuid.NAMESPACE_DNS, material_name).hex
+
+class Sequential_id_provider(Id_provider):
+    """顺序id生成器: 随机前缀+单调递增计数器, 按uuid4的布局（版本号与变体位）排列
+
+    同一生成器产生的id互不重复, 不同生成器的前缀随机, 且无需每次调用`os.urandom`; 指定种子时生成的id序列可复现
+    """
+
+    seed: Optional[int]
+    """生成前缀使用的种子, 为None时前缀随机"""
+    prefix: int
+    """64位随机前缀, 占id的高64位"""
+
+    _VERSION_MASK = ~(0xf000 << 64) & ~(0xc000 << 48)
+    _VERSION_BITS = (0x4000 << 64) | (0x8000 << 48)
+
+    def __init__(self, seed: Optional[int] = None):
+        """创建顺序id生成器
+
+        Args:
+            seed (`int`, optional): 前缀的随机种子. 默认为None, 即每个生成器使用不同的随机前缀.
+        """
+        self.seed = seed
+        self.prefix = random.Random(seed).getrandbits(64)
+        self._counter = itertools.count()
+
+    def _next_int(self) -> int:
+        # 计数器占低62位, 不会与变体位冲突
+        value = (self.prefix << 64) | (next(self._counter) & 0x3fff_ffff_ffff_ffff)
+        return (value & self._VERSION_MASK) | self._VERSION_BITS
+
+    def new_hex(self) -> str:
+        return "%032x" % self._next_int()
+
+    def new_uuid(self) -> str:
+        hex_id = "%032X" % self._next_int()
+        return f"{hex_id[:8]}-{hex_id[8:12]}-{hex_id[12:16]}-{hex_id[16:20]}-{hex_id[20:]}"
+
+_global_provider: Id_provider = Id_provider()
+_scoped_provider: ContextVar[Optional[Id_provider]] = ContextVar("scoped_id_provider", default=None)
+
+def get_id_provider() -> Id_provider:
+    """获取当前生效的id生成器: 优先使用`id_scope`指定的生成器, 否则使用全局生成器"""
+    return _scoped_provider.get() or _global_provider
+
+def set_id_provider(provider: Optional[Id_provider]) -> None:
+    """设置全局id生成器, 传入None时恢复为随机id生成器"""
+    global _global_provider
+    _global_provider = provider if provider is not None else Id_provider()
+
+@contextmanager
+def id_scope(provider: Optional[Id_provider]) -> Iterator[Optional[Id_provider]]:
+    """在with语句范围内（当前线程或协程）使用指定的id生成器, 传入None时不做改变"""
+    if provider is None:
+        yield None
+        return
+    token = _scoped_provider.set(provider)
+    try:
+        yield provider
+    finally:
+        _scoped_provider.reset(token)
+
+def new_id() -> str:
+    """使用当前生效的id生成器生成32位十六进制id"""
+    return get_id_provider().new_hex()
@@ -1,8 +1,8 @@
-import uuid
-
 from enum import Enum
 from typing import Dict, List, Any
 
+from .id_provider import new_id
+
 class Keyframe:
     """一个关键帧（关键点）, 目前只支持线性插值"""
 
@@ -15,7 +15,7 @@ class Keyframe:
 
     def __init__(self, time_offset: int, value: float):
         """给定时间偏移量及关键值, 初始化关键帧"""
-        self.kf_id = uuid.uuid4().hex
+        self.kf_id = new_id()
 
         self.time_offset = time_offset
         self.values = [value]
@@ -74,7 +74,7 @@ class Keyframe_list:
 
     def __init__(self, keyframe_property: Keyframe_property):
         """为给定的关键帧属性初始化关键帧列表"""
-        self.list_id = uuid.uuid4().hex
+        self.list_id = new_id()
 
         self.keyframe_property = keyframe_property
         self.keyframes = []
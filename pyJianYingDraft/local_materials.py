@@ -1,10 +1,13 @@
 import os
-import uuid
+import threading
 import pymediainfo
 
-from typing import Optional, Literal
+from collections import OrderedDict
+from typing import Optional, Literal, Callable, Tuple
 from typing import Dict, Any
 
+from .id_provider import get_id_provider
+
 class Crop_settings:
     """素材的裁剪设置, 各属性均在0-1之间, 注意素材的坐标原点在左上角"""
 
@@ -43,6 +46,78 @@ class Crop_settings:
             "lower_right_y": self.lower_right_y
         }
 
+class Media_probe_cache:
+    """素材探测结果缓存, 以(素材种类, 绝对路径, 文件大小, 修改时间)为键, 文件未变化时不再重复调用pymediainfo"""
+
+    max_entries: int
+    """最多缓存的条目数, 超出时淘汰最久未使用的条目"""
+    hits: int
+    """缓存命中次数"""
+    misses: int
+    """缓存未命中（实际探测）次数"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str, int, int], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(path: str, kind: str) -> Tuple[str, str, int, int]:
+        """生成缓存键, 文件被替换或修改后键随之变化; 同一文件作为视频和音频素材的探测结果分开缓存
+
+        Raises:
+            `FileNotFoundError`: 素材文件不存在.
+        """
+        stat = os.stat(path)
+        return kind, os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+    def get(self, path: str, kind: str = "video") -> Optional[Dict[str, Any]]:
+        """获取已缓存的探测结果, 不存在时返回None"""
+        key = self.make_key(path, kind)
+        with self._lock:
+            return self._lookup(key)
+
+    def _lookup(self, key: Tuple[str, str, int, int]) -> Optional[Dict[str, Any]]:
+        """查找缓存条目并标记为最近使用（调用方持有锁）"""
+        metadata = self._entries.get(key)
+        if metadata is not None:
+            self._entries.move_to_end(key)
+        return metadata
+
+    def put(self, path: str, metadata: Dict[str, Any], kind: str = "video") -> None:
+        """写入探测结果, 例如已由其他途径（如覆盖视频池的记录文件）得到的时长与分辨率"""
+        key = self.make_key(path, kind)
+        with self._lock:
+            self._entries[key] = dict(metadata)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_probe(self, path: str, probe: Callable[[str], Dict[str, Any]], kind: str = "video") -> Dict[str, Any]:
+        """获取探测结果, 未缓存时调用`probe`探测并缓存, 探测失败时抛出的异常不会被缓存"""
+        key = self.make_key(path, kind)
+        with self._lock:
+            metadata = self._lookup(key)
+            if metadata is not None:
+                self.hits += 1
+                return metadata
+            self.misses += 1
+        metadata = probe(path)
+        self.put(path, metadata, kind)
+        return metadata
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+probe_cache = Media_probe_cache()
+"""进程内共享的素材探测结果缓存"""
+
 class Video_material:
     """本地视频素材（视频或图片）, 一份素材可以在多个片段中使用"""
 
@@ -65,29 +140,45 @@ class Video_material:
     material_type: Literal["video", "photo"]
     """素材类型: 视频或图片"""
 
-    def __init__(self, path: str, material_name: Optional[str] = None, crop_settings: Crop_settings = Crop_settings()):
+    def __init__(self, path: str, material_name: Optional[str] = None, crop_settings: Crop_settings = Crop_settings(),
+                 metadata: Optional[Dict[str, Any]] = None):
         """从指定位置加载视频（或图片）素材
 
         Args:
             path (`str`): 素材文件路径, 支持mp4, mov, avi等常见视频文件及jpg, jpeg, png等图片文件.
             material_name (`str`, optional): 素材名称, 如果不指定, 默认使用文件名作为素材名称.
             crop_settings (`Crop_settings`, optional): 素材裁剪设置, 默认不裁剪.
+            metadata (`Dict[str, Any]`, optional): 预先探测得到的素材信息, 包含duration, width, height及可选的material_type.
+                如果不指定, 从共享的`probe_cache`中获取, 同一文件只探测一次.
 
         Raises:
             `FileNotFoundError`: 素材文件不存在.
             `ValueError`: 不支持的素材文件类型.
         """
         path = os.path.abspath(path)
-        postfix = os.path.splitext(path)[1]
         if not os.path.exists(path):
             raise FileNotFoundError(f"找不到 {path}")
 
         self.material_name = material_name if material_name else os.path.basename(path)
-        self.material_id = uuid.uuid3(uuid.NAMESPACE_DNS, self.material_name).hex
+        self.material_id = get_id_provider().material_id(self.material_name)
         self.path = path
         self.crop_settings = crop_settings
         self.local_material_id = ""
 
+        if metadata is None:
+            metadata = probe_cache.get_or_probe(path, self.probe)
+        self.material_type = metadata.get("material_type", "video")
+        self.duration = int(metadata["duration"])
+        self.width, self.height = metadata["width"], metadata["height"]
+
+    @staticmethod
+    def probe(path: str) -> Dict[str, Any]:
+        """使用pymediainfo探测视频（或图片）素材的类型、时长与分辨率
+
+        Raises:
+            `ValueError`: 不支持的素材文件类型.
+        """
+        postfix = os.path.splitext(path)[1]
         if not pymediainfo.MediaInfo.can_parse():
             raise ValueError(f"不支持的视频素材类型 '{postfix}'")
 
@@ -95,22 +186,31 @@ class Video_material:
             pymediainfo.MediaInfo.parse(path, mediainfo_options={"File_TestContinuousFileNames": "0"})  # type: ignore
         # 有视频轨道的视为视频素材
         if len(info.video_tracks):
-            self.material_type = "video"
-            self.duration = int(info.video_tracks[0].duration * 1e3)  # type: ignore
-            self.width, self.height = info.video_tracks[0].width, info.video_tracks[0].height  # type: ignore
+            return {
+                "material_type": "video",
+                "duration": int(info.video_tracks[0].duration * 1e3),  # type: ignore
+                "width": info.video_tracks[0].width,  # type: ignore
+                "height": info.video_tracks[0].height  # type: ignore
+            }
         # gif文件使用imageio库获取长度
         elif postfix.lower() == ".gif":
             import imageio
             gif = imageio.get_reader(path)
-
-            self.material_type = "video"
-            self.duration = int(round(gif.get_meta_data()['duration'] * gif.get_length() * 1e3))
-            self.width, self.height = info.image_tracks[0].width, info.image_tracks[0].height  # type: ignore
+            duration = int(round(gif.get_meta_data()['duration'] * gif.get_length() * 1e3))
             gif.close()
+            return {
+                "material_type": "video",
+                "duration": duration,
+                "width": info.image_tracks[0].width,  # type: ignore
+                "height": info.image_tracks[0].height  # type: ignore
+            }
         elif len(info.image_tracks):
-            self.material_type = "photo"
-            self.duration = 10800000000  # 相当于3h
-            self.width, self.height = info.image_tracks[0].width, info.image_tracks[0].height  # type: ignore
+            return {
+                "material_type": "photo",
+                "duration": 10800000000,  # 相当于3h
+                "width": info.image_tracks[0].width,  # type: ignore
+                "height": info.image_tracks[0].height  # type: ignore
+            }
         else:
             raise ValueError(f"输入的素材文件 {path} 没有视频轨道或图片轨道")
 
@@ -149,12 +249,14 @@ class Audio_material:
     duration: int
     """素材时长, 单位为微秒"""
 
-    def __init__(self, path: str, material_name: Optional[str] = None):
+    def __init__(self, path: str, material_name: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None):
         """从指定位置加载音频素材, 注意视频文件不应该作为音频素材使用
 
         Args:
             path (`str`): 素材文件路径, 支持mp3, wav等常见音频文件.
             material_name (`str`, optional): 素材名称, 如果不指定, 默认使用文件名作为素材名称.
+            metadata (`Dict[str, Any]`, optional): 预先探测得到的素材信息, 包含duration.
+                如果不指定, 从共享的`probe_cache`中获取, 同一文件只探测一次.
 
         Raises:
             `FileNotFoundError`: 素材文件不存在.
@@ -165,9 +267,20 @@ class Audio_material:
             raise FileNotFoundError(f"找不到 {path}")
 
         self.material_name = material_name if material_name else os.path.basename(path)
-        self.material_id = uuid.uuid3(uuid.NAMESPACE_DNS, self.material_name).hex
+        self.material_id = get_id_provider().material_id(self.material_name)
         self.path = path
 
+        if metadata is None:
+            metadata = probe_cache.get_or_probe(path, self.probe, "audio")
+        self.duration = int(metadata["duration"])
+
+    @staticmethod
+    def probe(path: str) -> Dict[str, Any]:
+        """使用pymediainfo探测音频素材的时长
+
+        Raises:
+            `ValueError`: 不支持的素材文件类型.
+        """
         if not pymediainfo.MediaInfo.can_parse():
             raise ValueError("不支持的音频素材类型 %s" % os.path.splitext(path)[1])
         info: pymediainfo.MediaInfo = pymediainfo.MediaInfo.parse(path)  # type: ignore
@@ -175,7 +288,7 @@ class Audio_material:
             raise ValueError("音频素材不应包含视频轨道")
         if not len(info.audio_tracks):
             raise ValueError(f"给定的素材文件 {path} 没有音频轨道")
-        self.duration = int(info.audio_tracks[0].duration * 1e3)  # type: ignore
+        return {"duration": int(info.audio_tracks[0].duration * 1e3)}  # type: ignore
 
     def export_json(self) -> Dict[str, Any]:
         return {
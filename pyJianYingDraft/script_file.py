@@ -4,11 +4,11 @@ import math
 from copy import deepcopy
 
 from typing import Optional, Literal, Union, overload
-from typing import Type, Dict, List, Any
+from typing import Type, Dict, List, Set, Any
 
 from . import util
 from . import exceptions
-from .template_mode import ImportedTrack, EditableTrack, ImportedMediaTrack, ImportedTextTrack, Shrink_mode, Extend_mode, import_track
+from .template_mode import ImportedTrack, EditableTrack, ImportedMediaTrack, ImportedTextTrack, ImportedMaterialIndex, Shrink_mode, Extend_mode, import_track
 from .time_util import Timerange, tim, srt_tstamp
 from .local_materials import Video_material, Audio_material
 from .segment import Base_segment, Speed, Clip_settings
@@ -17,6 +17,8 @@ from .video_segment import Video_segment, Sticker_segment, Segment_animations, V
 from .effect_segment import Effect_segment, Filter_segment
 from .text_segment import Text_segment, Text_style, TextBubble
 from .track import Track_type, Base_track, Track
+from .id_provider import Id_provider, id_scope
+from .export_cache import Json_fragment_cache, dumps_at_level, join_list, join_object
 
 from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type
 
@@ -172,17 +174,23 @@ class Script_file:
     imported_tracks: List[ImportedTrack]
     """导入的轨道信息"""
 
+    id_provider: Optional[Id_provider]
+    """本草稿使用的id生成器, 为None时使用全局的id生成器"""
+
     TEMPLATE_FILE = "draft_content_template.json"
 
-    def __init__(self, width: int, height: int, fps: int = 30):
+    def __init__(self, width: int, height: int, fps: int = 30, id_provider: Optional[Id_provider] = None):
         """创建一个剪映草稿
 
         Args:
             width (int): 视频宽度, 单位为像素
             height (int): 视频高度, 单位为像素
             fps (int, optional): 视频帧率. 默认为30.
+            id_provider (`Id_provider`, optional): 本草稿使用的id生成器, 如`Sequential_id_provider(seed)`.
+                草稿方法内部创建的轨道和片段自动使用它, 自行创建的片段需在`id_scope()`范围内创建. 默认使用全局的id生成器.
         """
         self.save_path = None
+        self.id_provider = id_provider
 
         self.width = width
         self.height = height
@@ -194,6 +202,10 @@ class Script_file:
 
         self.imported_materials = {}
         self.imported_tracks = []
+        self._export_cache = Json_fragment_cache()
+        self._shared_materials: Set[int] = set()
+        self._material_index = ImportedMaterialIndex(self.imported_materials)
+        self._text_contents: Dict[str, Dict[str, Any]] = {}
 
         with open(os.path.join(os.path.dirname(__file__), self.TEMPLATE_FILE), "r", encoding="utf-8") as f:
             self.content = json.load(f)
@@ -218,11 +230,59 @@ class Script_file:
         util.assign_attr_with_json(obj, ["fps", "duration"], obj.content)
         util.assign_attr_with_json(obj, ["width", "height"], obj.content["canvas_config"])
 
-        obj.imported_materials = deepcopy(obj.content["materials"])
+        # 解析出的json对象只有一份, 由导入的素材和轨道直接持有; content中的相应部分在导出时被替换, 不会被重复导出
+        obj.imported_materials = obj.content["materials"]
         obj.imported_tracks = [import_track(track_data) for track_data in obj.content["tracks"]]
+        obj._material_index = ImportedMaterialIndex(obj.imported_materials)
 
         return obj
 
+    def fork(self, save_path: Optional[str] = None) -> "Script_file":
+        """以本草稿为不可变的基础, 派生出一个可独立编辑的草稿, 适用于由同一模板批量生成草稿
+
+        派生的草稿与本草稿共享导入的素材和轨道的json数据以及已序列化的文本, 仅在被`replace_*`方法修改时才复制相应素材,
+        因此不需要重新解析模板, 导出时也只重新序列化发生变化的部分. 派生后不应再直接修改二者的`raw_data`或`imported_materials`中的json对象.
+
+        Args:
+            save_path (`str`, optional): 派生草稿的保存路径, 默认为None, 即只能通过`dump`导出.
+        """
+        self._flush_text_contents()
+
+        forked = Script_file.__new__(Script_file)
+        forked.save_path = save_path
+        forked.id_provider = self.id_provider
+
+        forked.width, forked.height = self.width, self.height
+        forked.fps, forked.duration = self.fps, self.duration
+
+        # 非模板模式下添加的素材和轨道一般很少, 直接深拷贝
+        forked.materials = deepcopy(self.materials)
+        forked.tracks = deepcopy(self.tracks)
+
+        forked.imported_materials = {material_type: list(material_list)
+                                     for material_type, material_list in self.imported_materials.items()}
+        forked.imported_tracks = [track.fork() for track in self.imported_tracks]
+        forked.content = dict(self.content)
+
+        # 素材在两个草稿中都标记为共享, 任何一方修改前都先复制
+        for material_list in self.imported_materials.values():
+            self._shared_materials.update(map(id, material_list))
+        forked._shared_materials = set(self._shared_materials)
+        forked._export_cache = self._export_cache.copy()
+        forked._material_index = self._material_index.copy()
+        forked._text_contents = {}
+
+        return forked
+
+    def id_scope(self):
+        """返回一个上下文管理器, 在其范围内创建的片段、特效、关键帧等对象使用本草稿的id生成器
+
+        Example:
+            >>> with script.id_scope():
+            ...     script.add_segment(Video_segment(material, trange(0, SEC)))
+        """
+        return id_scope(self.id_provider)
+
     def add_material(self, material: Union[Video_material, Audio_material]) -> "Script_file":
         """向草稿文件中添加一个素材"""
         if material in self.materials:  # 素材已存在
@@ -267,7 +327,8 @@ class Script_file:
         if absolute_index is not None:
             render_index = absolute_index
 
-        self.tracks[track_name] = Track(track_type, track_name, render_index, mute)
+        with self.id_scope():
+            self.tracks[track_name] = Track(track_type, track_name, render_index, mute)
         return self
 
     def _get_track(self, segment_type: Type[Base_segment], track_name: Optional[str]) -> Track:
@@ -376,7 +437,8 @@ class Script_file:
         target = self._get_track(Effect_segment, track_name)
 
         # 加入轨道并更新时长
-        segment = Effect_segment(effect, t_range, params)
+        with self.id_scope():
+            segment = Effect_segment(effect, t_range, params)
         target.add_segment(segment)
         self.duration = max(self.duration, t_range.start + t_range.duration)
 
@@ -403,7 +465,8 @@ class Script_file:
         target = self._get_track(Filter_segment, track_name)
 
         # 加入轨道并更新时长
-        segment = Filter_segment(filter_meta, t_range, intensity / 100.0)  # 转换为0-1范围
+        with self.id_scope():
+            segment = Filter_segment(filter_meta, t_range, intensity / 100.0)  # 转换为0-1范围
         target.add_segment(segment)
         self.duration = max(self.duration, t_range.end)
 
@@ -443,12 +506,13 @@ class Script_file:
             lines = srt_file.readlines()
 
         def __add_text_segment(text: str, t_range: Timerange) -> None:
-            if style_reference:
-                seg = Text_segment.create_from_template(text, t_range, style_reference)
-                if clip_settings is not None:
-                    seg.clip_settings = deepcopy(clip_settings)
-            else:
-                seg = Text_segment(text, t_range, style=text_style, clip_settings=clip_settings)
+            with self.id_scope():
+                if style_reference:
+                    seg = Text_segment.create_from_template(text, t_range, style_reference)
+                    if clip_settings is not None:
+                        seg.clip_settings = deepcopy(clip_settings)
+                else:
+                    seg = Text_segment(text, t_range, style=text_style, clip_settings=clip_settings)
             self.add_segment(seg, track_name)
 
         index = 0
@@ -567,13 +631,21 @@ class Script_file:
             extra_refs: List[str] = segment.get("extra_material_refs", [])
             material_ids.update(extra_refs)
 
+        # 文本模板引用的各段文本素材
+        for template in source_file.imported_materials.get("text_templates", []):
+            if template.get("id") in material_ids:
+                material_ids.update(res["text_material_id"] for res in template.get("text_info_resources", []))
+
         # 复制素材
+        source_file._flush_text_contents()
         for material_type, material_list in source_file.imported_materials.items():
             for material in material_list:
                 if material.get("id") in material_ids:
                     if material_type not in self.imported_materials:
                         self.imported_materials[material_type] = []
-                    self.imported_materials[material_type].append(deepcopy(material))
+                    target_list = self.imported_materials[material_type]
+                    target_list.append(deepcopy(material))
+                    self._material_index.add(material_type, len(target_list) - 1, target_list[-1])
                     material_ids.remove(material.get("id"))
 
         assert len(material_ids) == 0, "未找到以下素材: %s" % material_ids
@@ -600,19 +672,18 @@ class Script_file:
         """
         video_mode = isinstance(material, Video_material)
         # 查找素材
-        target_json_obj: Optional[Dict[str, Any]] = None
-        target_material_list = self.imported_materials["videos" if video_mode else "audios"]
-        name_key = "material_name" if video_mode else "name"
-        for mat in target_material_list:
-            if mat[name_key] == material_name:
-                if target_json_obj is not None:
-                    raise exceptions.AmbiguousMaterial(
-                        "找到多个名为 '%s', 类型为 '%s' 的素材" % (material_name, type(material)))
-                target_json_obj = mat
-        if target_json_obj is None:
+        material_type = "videos" if video_mode else "audios"
+        name_key = ImportedMaterialIndex.NAME_KEYS[material_type]
+        target_indices = self._material_index.find_by_name(self.imported_materials, material_type, material_name)
+        if len(target_indices) > 1:
+            raise exceptions.AmbiguousMaterial(
+                "找到多个名为 '%s', 类型为 '%s' 的素材" % (material_name, type(material)))
+        if len(target_indices) == 0:
             raise exceptions.MaterialNotFound("没有找到名为 '%s', 类型为 '%s' 的素材" % (material_name, type(material)))
 
         # 更新素材信息
+        target_json_obj = self._writable_material(material_type, target_indices[0])
+        self._material_index.rename(material_type, target_indices[0], material_name, material.material_name)
         target_json_obj.update({name_key: material.material_name, "path": material.path, "duration": material.duration})
         if video_mode:
             target_json_obj.update({"width": material.width, "height": material.height, "material_type": material.material_type})
@@ -671,6 +742,8 @@ class Script_file:
                      recalc_style: bool = True) -> "Script_file":
         """替换指定文本轨道上指定片段的文字内容, 支持普通文本片段或文本模板片段
 
+        修改后的文字内容以解析后的形式保留, 直到导出时才写回`imported_materials`中的文本素材
+
         Args:
             track (`Editable_track`): 要替换文字的文本轨道, 由`get_imported_track`获取
             segment_index (`int`): 要替换文字的片段下标, 从0开始
@@ -698,60 +771,47 @@ class Script_file:
                     new_styles.append(style)
             return new_styles
 
-        replaced: bool = False
         material_id: str = track.segments[segment_index].material_id
         # 尝试在文本素材中替换
-        for mat in self.imported_materials["texts"]:
-            if mat["id"] != material_id:
-                continue
-
+        index = self._material_index.find(self.imported_materials, "texts", material_id)
+        if index is not None:
             if isinstance(text, list):
                 if len(text) != 1:
                     raise ValueError(f"正常文本片段只能有一个文字内容, 但替换内容是 {text}")
                 text = text[0]
 
-            content = json.loads(mat["content"])
+            content = self._text_content(index)
             if recalc_style:
                 content["styles"] = __recalc_style_range(len(content["text"]), len(text), content["styles"])
             content["text"] = text
-            mat["content"] = json.dumps(content, ensure_ascii=False)
-            replaced = True
-            break
-        if replaced:
+            self._text_contents[material_id] = content
             return self
 
         # 尝试在文本模板中替换
-        for template in self.imported_materials["text_templates"]:
-            if template["id"] != material_id:
+        index = self._material_index.find(self.imported_materials, "text_templates", material_id)
+        assert index is not None, f"未找到指定片段的素材 {material_id}"
+        template = self.imported_materials["text_templates"][index]
+
+        resources = template["text_info_resources"]
+        if isinstance(text, str):
+            text = [text]
+        if len(text) > len(resources):
+            raise ValueError(f"文字模板'{template['name']}'只有{len(resources)}段文本, 但提供了{len(text)}段替换内容")
+
+        for sub_material_id, new_text in zip(map(lambda x: x["text_material_id"], resources), text):
+            index = self._material_index.find(self.imported_materials, "texts", sub_material_id)
+            if index is None:
                 continue
 
-            resources = template["text_info_resources"]
-            if isinstance(text, str):
-                text = [text]
-            if len(text) > len(resources):
-                raise ValueError(f"文字模板'{template['name']}'只有{len(resources)}段文本, 但提供了{len(text)}段替换内容")
-
-            for sub_material_id, new_text in zip(map(lambda x: x["text_material_id"], resources), text):
-                for mat in self.imported_materials["texts"]:
-                    if mat["id"] != sub_material_id:
-                        continue
-
-                    try:
-                        content = json.loads(mat["content"])
-                        if recalc_style:
-                            content["styles"] = __recalc_style_range(len(content["text"]), len(new_text), content["styles"])
-                        content["text"] = new_text
-                        mat["content"] = json.dumps(content, ensure_ascii=False)
-                    except json.JSONDecodeError:
-                        mat["content"] = new_text
-                    except TypeError:
-                        mat["content"] = new_text
-
-                    break
-            replaced = True
-            break
-
-        assert replaced, f"未找到指定片段的素材 {material_id}"
+            try:
+                content = self._text_content(index)
+                if recalc_style:
+                    content["styles"] = __recalc_style_range(len(content["text"]), len(new_text), content["styles"])
+                content["text"] = new_text
+                self._text_contents[sub_material_id] = content
+            except (json.JSONDecodeError, TypeError):
+                self._text_contents.pop(sub_material_id, None)
+                self._writable_material("texts", index)["content"] = new_text
 
         return self
 
@@ -772,27 +832,102 @@ class Script_file:
             if effect["type"] == "text_effect":
                 print("\tResource id: %s '%s'" % (effect["resource_id"], effect.get("name", "")))
 
+    def _text_content(self, index: int) -> Dict[str, Any]:
+        """获取第`index`个文本素材解析后的内容, 已被`replace_text`修改过的素材直接返回尚未写回的内容"""
+        material = self.imported_materials["texts"][index]
+        content = self._text_contents.get(material["id"])
+        if content is None:
+            content = json.loads(material["content"])
+        return content
+
+    def _flush_text_contents(self) -> None:
+        """将`replace_text`修改后的文本内容序列化并写回相应的文本素材"""
+        for material_id, content in self._text_contents.items():
+            index = self._material_index.find(self.imported_materials, "texts", material_id)
+            self._writable_material("texts", index)["content"] = json.dumps(content, ensure_ascii=False)
+        self._text_contents.clear()
+
+    def _writable_material(self, material_type: str, index: int) -> Dict[str, Any]:
+        """获取可修改的导入素材, 与派生草稿共享的素材先复制一份, 并使其导出缓存失效"""
+        material = self.imported_materials[material_type][index]
+        if id(material) in self._shared_materials:
+            material = dict(material)
+            self.imported_materials[material_type][index] = material
+        self.mark_material_dirty(material)
+        return material
+
+    def mark_material_dirty(self, material: Dict[str, Any]) -> "Script_file":
+        """标记一个导入的素材(`imported_materials`中的json对象)已被修改, 下次导出时重新序列化
+
+        通过`replace_*`方法进行的修改会自动标记, 仅在直接修改`imported_materials`时需要调用
+        """
+        self._export_cache.invalidate(material)
+        return self
+
     def dumps(self) -> str:
-        """将草稿文件内容导出为JSON字符串"""
+        """将草稿文件内容导出为JSON字符串
+
+        导入的素材、轨道及片段会缓存序列化后的文本, 重复导出时只重新序列化发生变化的部分
+        """
+        self._flush_text_contents()
+
         self.content["fps"] = self.fps
         self.content["duration"] = self.duration
         self.content["canvas_config"] = {"width": self.width, "height": self.height, "ratio": "original"}
-        self.content["materials"] = self.materials.export_json()
 
-        # 合并导入的素材
+        # 导出素材, 并合并导入的素材
+        material_fragments: Dict[str, List[str]] = {
+            material_type: [dumps_at_level(material, 3) for material in material_list]
+            for material_type, material_list in self.materials.export_json().items()
+        }
         for material_type, material_list in self.imported_materials.items():
-            if material_type not in self.content["materials"]:
-                self.content["materials"][material_type] = material_list
-            else:
-                self.content["materials"][material_type].extend(material_list)
+            material_fragments.setdefault(material_type, []).extend(
+                self._export_cache.fragment(material, 0, 3, lambda material=material: material)
+                for material in material_list
+            )
 
         # 对轨道排序并导出
         track_list: List[Base_track] = list(self.tracks.values())
         track_list.extend(self.imported_tracks)
         track_list.sort(key=lambda track: track.render_index)
-        self.content["tracks"] = [track.export_json() for track in track_list]
 
-        return json.dumps(self.content, ensure_ascii=False, indent=4)
+        # 素材和轨道部分先以占位符序列化, 再替换为拼接好的片段
+        fragments = {
+            "materials": join_object([(material_type, join_list(items, 2))
+                                      for material_type, items in material_fragments.items()], 1),
+            "tracks": join_list([self._dump_track(track, 2) for track in track_list], 1)
+        }
+        content = dict(self.content)
+        for key in fragments:
+            content[key] = self.__placeholder(key)
+        ret = json.dumps(content, ensure_ascii=False, indent=4)
+        for key, fragment in fragments.items():
+            ret = ret.replace(json.dumps(self.__placeholder(key)), fragment, 1)
+        return ret
+
+    @staticmethod
+    def __placeholder(key: str) -> str:
+        return "\0%s\0" % key
+
+    def _dump_track(self, track: Base_track, level: int) -> str:
+        """序列化一条轨道, 导入的轨道和片段未变化时复用缓存的文本
+
+        导入的轨道和片段以其`raw_data`为缓存的键, 以便派生的草稿复用基础草稿的缓存
+        """
+        cache = self._export_cache
+        if isinstance(track, EditableTrack):
+            # 片段的render_index取自所在轨道
+            segment_fragments = [
+                cache.fragment(seg.raw_data, seg.export_version() + (track.render_index,), level + 2,
+                               lambda seg=seg: dict(seg.export_json_view(), render_index=track.render_index))
+                for seg in track.segments
+            ]
+            header = cache.fragment(track.raw_data, track.export_version(), level,
+                                    lambda: dict(track.export_json_view(), segments=self.__placeholder("segments")))
+            return header.replace(json.dumps(self.__placeholder("segments")), join_list(segment_fragments, level + 1), 1)
+        if isinstance(track, ImportedTrack):
+            return cache.fragment(track.raw_data, track.export_version(), level, track.export_json_view)
+        return dumps_at_level(track.export_json(), level)
 
     def dump(self, file_path: str) -> None:
         """将草稿文件内容写入文件"""
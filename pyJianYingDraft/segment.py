@@ -1,8 +1,8 @@
 """定义片段基类及部分比较通用的属性类"""
 
-import uuid
 from typing import Optional, Dict, List, Any, Union
 
+from .id_provider import new_id
 from .animation import Segment_animations
 from .time_util import Timerange, tim
 from .keyframe import Keyframe_list, Keyframe_property
@@ -21,7 +21,7 @@ class Base_segment:
     """各属性的关键帧列表"""
 
     def __init__(self, material_id: str, target_timerange: Timerange):
-        self.segment_id = uuid.uuid4().hex
+        self.segment_id = new_id()
         self.material_id = material_id
         self.target_timerange = target_timerange
 
@@ -85,7 +85,7 @@ class Speed:
     """播放速度"""
 
     def __init__(self, speed: float):
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.speed = speed
 
     def export_json(self) -> Dict[str, Any]:
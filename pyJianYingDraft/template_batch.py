@@ -0,0 +1,271 @@
+"""以同一草稿为模板, 按数据表的每一行批量填充并生成草稿"""
+
+import os
+import csv
+import json
+import time
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+
+from typing import Optional, Union, Any, Dict, List, Tuple, Iterable, Iterator, Deque
+
+from . import exceptions
+from .track import Track_type
+from .draft_folder import Draft_folder
+from .script_file import Script_file
+from .template_mode import ImportedMaterialIndex
+from .local_materials import Video_material, Audio_material
+
+class Text_slot:
+    """文本槽位, 以数据表中对应列的值替换指定文本片段的文字内容"""
+
+    segment_index: int
+    """要替换文字的片段下标, 从0开始"""
+    track_name: Optional[str]
+    """文本轨道名称, 为None时不根据名称筛选"""
+    track_index: Optional[int]
+    """文本轨道在导入的文本轨道中的下标, 为None时不根据下标筛选"""
+    separator: Optional[str]
+    """文本模板片段的多段文字在单元格中的分隔符, 为None时不拆分"""
+    recalc_style: bool
+    """是否重新计算字体样式分布"""
+
+    def __init__(self, segment_index: int, track_name: Optional[str] = None, track_index: Optional[int] = None, *,
+                 separator: Optional[str] = None, recalc_style: bool = True):
+        """创建文本槽位
+
+        Args:
+            segment_index (`int`): 要替换文字的片段下标, 从0开始
+            track_name (`str`, optional): 文本轨道名称, 与`Script_file.get_imported_track`的筛选方式相同.
+            track_index (`int`, optional): 文本轨道在导入的文本轨道中的下标.
+            separator (`str`, optional): 文本模板片段的多段文字在单元格中的分隔符, 如`"|"`. 默认不拆分.
+            recalc_style (`bool`, optional): 是否重新计算字体样式分布, 默认开启.
+        """
+        self.segment_index = segment_index
+        self.track_name = track_name
+        self.track_index = track_index
+        self.separator = separator
+        self.recalc_style = recalc_style
+
+    def bind(self, script: Script_file) -> int:
+        """在模板草稿中定位槽位, 返回文本轨道在`imported_tracks`中的下标
+
+        Raises:
+            `TrackNotFound`: 未找到满足条件的轨道
+            `AmbiguousTrack`: 找到多个满足条件的轨道
+            `IndexError`: `segment_index`越界
+        """
+        track = script.get_imported_track(Track_type.text, name=self.track_name, index=self.track_index)
+        if not 0 <= self.segment_index < len(track):
+            raise IndexError("片段下标 %d 超出 [0, %d) 的范围" % (self.segment_index, len(track)))
+        return script.imported_tracks.index(track)
+
+    def apply(self, script: Script_file, target: int, value: Any) -> None:
+        """以单元格的值填充派生自模板的草稿"""
+        if isinstance(value, str) and self.separator is not None:
+            value = value.split(self.separator)
+        script.replace_text(script.imported_tracks[target], self.segment_index, value, self.recalc_style)
+
+class Material_slot:
+    """素材槽位, 以数据表中对应列的值(素材文件路径)替换指定名称的视频或音频素材"""
+
+    material_name: str
+    """模板中被替换的素材名称"""
+    replace_crop: bool
+    """是否替换原素材的裁剪设置"""
+
+    def __init__(self, material_name: str, *, replace_crop: bool = False):
+        """创建素材槽位
+
+        Args:
+            material_name (`str`): 模板中被替换的素材名称
+            replace_crop (`bool`, optional): 是否替换原素材的裁剪设置, 默认为否. 仅对视频素材有效.
+        """
+        self.material_name = material_name
+        self.replace_crop = replace_crop
+
+    def bind(self, script: Script_file) -> str:
+        """在模板草稿中定位槽位, 返回素材所属的类型(`"videos"`或`"audios"`)
+
+        Raises:
+            `MaterialNotFound`: 模板中没有该名称的视频或音频素材
+        """
+        for material_type, name_key in ImportedMaterialIndex.NAME_KEYS.items():
+            if any(mat.get(name_key) == self.material_name for mat in script.imported_materials.get(material_type, [])):
+                return material_type
+        raise exceptions.MaterialNotFound("没有找到名为 '%s' 的视频或音频素材" % self.material_name)
+
+    def apply(self, script: Script_file, target: str, value: Any) -> None:
+        """以单元格的值填充派生自模板的草稿"""
+        material = Video_material(value) if target == "videos" else Audio_material(value)
+        script.replace_material_by_name(self.material_name, material, self.replace_crop)
+
+Slot = Union[Text_slot, Material_slot]
+
+class Fill_result:
+    """一行数据的填充结果"""
+
+    index: int
+    """数据行的下标, 从0开始"""
+    draft_name: str
+    """生成的草稿名称"""
+    fill_time: float
+    """实例化模板并填充数据的耗时, 单位为秒"""
+    save_time: float
+    """保存草稿的耗时, 单位为秒"""
+    error: Optional[str]
+    """填充失败时的错误信息, 成功时为None"""
+
+    def __init__(self, index: int, draft_name: str, fill_time: float = 0.0, save_time: float = 0.0,
+                 error: Optional[str] = None):
+        self.index = index
+        self.draft_name = draft_name
+        self.fill_time = fill_time
+        self.save_time = save_time
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """是否填充成功"""
+        return self.error is None
+
+    @property
+    def total_time(self) -> float:
+        """总耗时, 单位为秒"""
+        return self.fill_time + self.save_time
+
+    def __repr__(self) -> str:
+        return "Fill_result(index=%d, draft_name=%r, total_time=%.4f, error=%r)" % (
+            self.index, self.draft_name, self.total_time, self.error)
+
+def iter_csv_rows(csv_path: str, encoding: str = "utf-8-sig") -> Iterator[Dict[str, str]]:
+    """逐行读取CSV文件, 以首行为列名"""
+    with open(csv_path, "r", encoding=encoding, newline="") as f:
+        yield from csv.DictReader(f)
+
+def iter_jsonl_rows(jsonl_path: str, encoding: str = "utf-8") -> Iterator[Dict[str, Any]]:
+    """逐行读取JSON Lines文件, 忽略空行"""
+    with open(jsonl_path, "r", encoding=encoding) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+class Template_batch_filler:
+    """以同一草稿为模板, 按数据表的每一行填充文本和素材并生成新草稿
+
+    模板只解析一次, 各槽位在模板中的位置也只定位一次; 每行数据的草稿由模板派生(见`Draft_folder.instantiate_template`),
+    只复制被替换的素材和文本. 数据行被逐行读取, 同时处理中的行数有上限, 因此数据表的大小不影响内存占用.
+    """
+
+    draft_folder: Draft_folder
+    """模板及生成的草稿所在的草稿文件夹"""
+    template_name: str
+    """模板草稿名称"""
+    slots: Dict[str, Slot]
+    """数据表列名 -> 槽位"""
+    draft_name: str
+    """生成的草稿名称格式, 可使用`template`、`index`及`row`字段"""
+    allow_replace: bool
+    """是否允许覆盖重名的草稿"""
+    max_workers: int
+    """并行的进程数, 为0时在当前进程中逐行处理"""
+
+    def __init__(self, draft_folder: Union[str, Draft_folder], template_name: str, slots: Dict[str, Slot], *,
+                 draft_name: str = "{template}_{index:04d}", allow_replace: bool = False,
+                 max_workers: int = 0, max_pending: Optional[int] = None):
+        """创建批量填充器, 并在模板中定位全部槽位
+
+        Args:
+            draft_folder (`str` or `Draft_folder`): 模板及生成的草稿所在的草稿文件夹
+            template_name (`str`): 模板草稿名称
+            slots (`Dict[str, Text_slot | Material_slot]`): 数据表列名到槽位的映射, 值为空的单元格保留模板原有的内容
+            draft_name (`str`, optional): 生成的草稿名称格式, 如`"{row[title]}"`. 默认为`"{template}_{index:04d}"`.
+            allow_replace (`bool`, optional): 是否允许覆盖重名的草稿. 默认为否.
+            max_workers (`int`, optional): 并行的进程数, 默认为0, 即在当前进程中逐行处理.
+            max_pending (`int`, optional): 同时处理中的最大行数, 默认为进程数的两倍.
+
+        Raises:
+            `FileNotFoundError`: 模板草稿不存在
+            `TrackNotFound`, `AmbiguousTrack`, `MaterialNotFound`, `IndexError`: 槽位无法在模板中定位
+        """
+        if isinstance(draft_folder, str):
+            draft_folder = Draft_folder(draft_folder)
+        self.draft_folder = draft_folder
+        self.template_name = template_name
+        self.slots = slots
+        self.draft_name = draft_name
+        self.allow_replace = allow_replace
+        self.max_workers = max_workers
+        self._max_pending = max_pending if max_pending is not None else max(1, 2 * max_workers)
+
+        if not os.path.exists(os.path.join(draft_folder.folder_path, template_name)):
+            raise FileNotFoundError(f"模板草稿 {template_name} 不存在")
+        base = draft_folder.get_template_base(template_name)
+        self._bindings: List[Tuple[str, Slot, Any]] = [(column, slot, slot.bind(base)) for column, slot in slots.items()]
+
+    def fill(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Fill_result]:
+        """按数据行依次生成草稿, 按行的顺序逐个返回填充结果
+
+        单行失败不会中断整个批次, 其错误信息记录在相应结果的`error`中
+        """
+        if self.max_workers <= 0:
+            for index, row in enumerate(rows):
+                yield self.fill_row(index, row)
+            return
+
+        pending: Deque[Future] = deque()
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(self.draft_folder.folder_path, self.template_name, self.slots,
+                                           self.draft_name, self.allow_replace)) as executor:
+            for index, row in enumerate(rows):
+                if len(pending) >= self._max_pending:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(_fill_row_in_worker, index, row))
+            while pending:
+                yield pending.popleft().result()
+
+    def fill_csv(self, csv_path: str, encoding: str = "utf-8-sig") -> Iterator[Fill_result]:
+        """以CSV文件的每一行生成草稿"""
+        return self.fill(iter_csv_rows(csv_path, encoding))
+
+    def fill_jsonl(self, jsonl_path: str, encoding: str = "utf-8") -> Iterator[Fill_result]:
+        """以JSON Lines文件的每一行生成草稿"""
+        return self.fill(iter_jsonl_rows(jsonl_path, encoding))
+
+    def fill_row(self, index: int, row: Dict[str, Any]) -> Fill_result:
+        """以一行数据生成草稿, 失败时删除本次创建的草稿文件夹"""
+        draft_name = ""
+        draft_path: Optional[str] = None
+        start = time.perf_counter()
+        try:
+            draft_name = self.draft_name.format(template=self.template_name, index=index, row=row)
+            if not os.path.exists(os.path.join(self.draft_folder.folder_path, draft_name)):
+                draft_path = os.path.join(self.draft_folder.folder_path, draft_name)
+            script = self.draft_folder.instantiate_template(self.template_name, draft_name, self.allow_replace)
+            for column, slot, target in self._bindings:
+                value = row.get(column)
+                if value is None or value == "":
+                    continue
+                slot.apply(script, target, value)
+            filled = time.perf_counter()
+
+            script.save()
+            return Fill_result(index, draft_name, filled - start, time.perf_counter() - filled)
+        except Exception as e:
+            if draft_path is not None:
+                shutil.rmtree(draft_path, ignore_errors=True)
+            return Fill_result(index, draft_name, time.perf_counter() - start, error="%s: %s" % (type(e).__name__, e))
+
+_worker_filler: Optional[Template_batch_filler] = None
+"""工作进程中的批量填充器, 每个进程只解析一次模板"""
+
+def _init_worker(folder_path: str, template_name: str, slots: Dict[str, Slot],
+                 draft_name: str, allow_replace: bool) -> None:
+    global _worker_filler
+    _worker_filler = Template_batch_filler(folder_path, template_name, slots,
+                                           draft_name=draft_name, allow_replace=allow_replace)
+
+def _fill_row_in_worker(index: int, row: Dict[str, Any]) -> Fill_result:
+    assert _worker_filler is not None
+    return _worker_filler.fill_row(index, row)
@@ -1,7 +1,7 @@
 """与模板模式相关的类及函数等"""
 
 from enum import Enum
-from copy import deepcopy
+from copy import copy, deepcopy
 
 from . import util
 from . import exceptions
@@ -10,7 +10,7 @@ from .segment import Base_segment
 from .track import Base_track, Track_type
 from .local_materials import Video_material, Audio_material
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 class Shrink_mode(Enum):
     """处理替换素材时素材变短情况的方法"""
@@ -44,14 +44,38 @@ class ImportedSegment(Base_segment):
     """导入的片段"""
 
     raw_data: Dict[str, Any]
-    """原始json数据"""
+    """原始json数据, 即构造时传入的json对象本身"""
+    revision: int
+    """`raw_data`的修改计数, 直接修改`raw_data`后需调用`mark_dirty`"""
 
     __DATA_ATTRS = ["material_id", "target_timerange"]
     def __init__(self, json_data: Dict[str, Any]):
-        self.raw_data = deepcopy(json_data)
+        """从json数据构造片段, 片段取得`json_data`的所有权而不复制它, 调用方此后不应再修改它"""
+        self.raw_data = json_data
+        self.revision = 0
 
         util.assign_attr_with_json(self, self.__DATA_ATTRS, json_data)
 
+    def mark_dirty(self) -> None:
+        """标记`raw_data`已被修改, 下次导出时重新序列化"""
+        self.revision += 1
+
+    def export_version(self) -> Tuple[Any, ...]:
+        """导出版本: 素材id、时间范围及修改计数, 未变化时可复用上次导出的结果"""
+        return (self.revision, self.material_id, self.target_timerange.start, self.target_timerange.duration)
+
+    def export_json_view(self) -> Dict[str, Any]:
+        """导出用于序列化的json数据, 与`raw_data`共享嵌套对象, 调用方不应修改其内容"""
+        json_data = dict(self.raw_data)
+        json_data.update(util.export_attr_to_json(self, self.__DATA_ATTRS))
+        return json_data
+
+    def fork(self) -> "ImportedSegment":
+        """复制出一个可独立修改时间范围和素材的片段, `raw_data`与原片段共享"""
+        ret = copy(self)
+        ret.target_timerange = Timerange(self.target_timerange.start, self.target_timerange.duration)
+        return ret
+
     def export_json(self) -> Dict[str, Any]:
         json_data = deepcopy(self.raw_data)
         json_data.update(util.export_attr_to_json(self, self.__DATA_ATTRS))
@@ -69,6 +93,19 @@ class ImportedMediaSegment(ImportedSegment):
 
         util.assign_attr_with_json(self, self.__DATA_ATTRS, json_data)
 
+    def export_version(self) -> Tuple[Any, ...]:
+        return super().export_version() + (self.source_timerange.start, self.source_timerange.duration)
+
+    def export_json_view(self) -> Dict[str, Any]:
+        json_data = super().export_json_view()
+        json_data.update(util.export_attr_to_json(self, self.__DATA_ATTRS))
+        return json_data
+
+    def fork(self) -> "ImportedMediaSegment":
+        ret = super().fork()
+        ret.source_timerange = Timerange(self.source_timerange.start, self.source_timerange.duration)
+        return ret
+
     def export_json(self) -> Dict[str, Any]:
         json_data = super().export_json()
         json_data.update(util.export_attr_to_json(self, self.__DATA_ATTRS))
@@ -79,15 +116,40 @@ class ImportedTrack(Base_track):
     """模板模式下导入的轨道"""
 
     raw_data: Dict[str, Any]
-    """原始轨道数据"""
+    """原始轨道数据, 即构造时传入的json对象本身"""
+    revision: int
+    """`raw_data`的修改计数, 直接修改`raw_data`后需调用`mark_dirty`"""
 
     def __init__(self, json_data: Dict[str, Any]):
+        """从json数据构造轨道, 轨道取得`json_data`的所有权而不复制它, 调用方此后不应再修改它"""
         self.track_type = Track_type.from_name(json_data["type"])
         self.name = json_data["name"]
         self.track_id = json_data["id"]
         self.render_index = max([int(seg["render_index"]) for seg in json_data["segments"]], default=0)
 
-        self.raw_data = deepcopy(json_data)
+        self.raw_data = json_data
+        self.revision = 0
+
+    def mark_dirty(self) -> None:
+        """标记`raw_data`已被修改, 下次导出时重新序列化"""
+        self.revision += 1
+
+    def export_version(self) -> Tuple[Any, ...]:
+        """导出版本: 轨道名称、id、渲染顺序及修改计数, 未变化时可复用上次导出的结果"""
+        return (self.revision, self.name, self.track_id, self.render_index)
+
+    def export_json_view(self) -> Dict[str, Any]:
+        """导出用于序列化的json数据, 与`raw_data`共享嵌套对象, 调用方不应修改其内容"""
+        ret = dict(self.raw_data)
+        ret.update({
+            "name": self.name,
+            "id": self.track_id
+        })
+        return ret
+
+    def fork(self) -> "ImportedTrack":
+        """复制出一个可独立修改的轨道, `raw_data`与原轨道共享"""
+        return copy(self)
 
     def export_json(self) -> Dict[str, Any]:
         ret = deepcopy(self.raw_data)
@@ -120,6 +182,11 @@ class EditableTrack(ImportedTrack):
             return 0
         return self.segments[-1].target_timerange.end
 
+    def fork(self) -> "EditableTrack":
+        ret = copy(self)
+        ret.segments = [seg.fork() for seg in self.segments]
+        return ret
+
     def export_json(self) -> Dict[str, Any]:
         ret = super().export_json()
         # 为每个片段写入render_index
@@ -211,8 +278,87 @@ class ImportedMediaTrack(EditableTrack):
         # 写入素材时间范围
         seg.source_timerange = src_timerange
 
+class ImportedMaterialIndex:
+    """导入素材的索引, 按素材类型记录素材id及名称到其在素材列表中下标的映射
+
+    素材列表只会追加元素或原位替换元素, 因此记录的下标始终有效; 检测到素材列表被直接修改过时自动重建索引
+    """
+
+    NAME_KEYS: Dict[str, str] = {"videos": "material_name", "audios": "name"}
+    """建立名称索引的素材类型及其名称字段"""
+
+    positions: Dict[str, Dict[str, int]]
+    """素材类型 -> 素材id -> 下标"""
+    names: Dict[str, Dict[str, List[int]]]
+    """素材类型 -> 素材名称 -> 下标列表"""
+    counts: Dict[str, int]
+    """建立索引时各类素材的数量, 用于检测素材列表是否被直接修改"""
+
+    def __init__(self, materials: Dict[str, List[Dict[str, Any]]]):
+        self.rebuild(materials)
+
+    def rebuild(self, materials: Dict[str, List[Dict[str, Any]]]) -> None:
+        """重新为全部素材建立索引"""
+        self.positions = {}
+        self.names = {}
+        self.counts = {}
+        for material_type, material_list in materials.items():
+            for index, material in enumerate(material_list):
+                self.add(material_type, index, material)
+            self.counts[material_type] = len(material_list)
+
+    def add(self, material_type: str, index: int, material: Dict[str, Any]) -> None:
+        """记录追加到素材列表中第`index`个位置的素材"""
+        positions = self.positions.setdefault(material_type, {})
+        if "id" in material:
+            positions.setdefault(material["id"], index)
+        name_key = self.NAME_KEYS.get(material_type)
+        if name_key is not None and name_key in material:
+            self.names.setdefault(material_type, {}).setdefault(material[name_key], []).append(index)
+        self.counts[material_type] = max(self.counts.get(material_type, 0), index + 1)
+
+    def rename(self, material_type: str, index: int, old_name: str, new_name: str) -> None:
+        """更新素材名称的索引"""
+        names = self.names.setdefault(material_type, {})
+        names[old_name].remove(index)
+        if not names[old_name]:
+            del names[old_name]
+        names.setdefault(new_name, []).append(index)
+
+    def _check(self, materials: Dict[str, List[Dict[str, Any]]], material_type: str) -> None:
+        if len(materials.get(material_type, [])) != self.counts.get(material_type, 0):
+            self.rebuild(materials)
+
+    def find(self, materials: Dict[str, List[Dict[str, Any]]], material_type: str, material_id: str) -> Optional[int]:
+        """根据素材id查找素材的下标, 未找到时返回None"""
+        self._check(materials, material_type)
+        index = self.positions.get(material_type, {}).get(material_id)
+        if index is not None and materials[material_type][index].get("id") != material_id:
+            self.rebuild(materials)
+            index = self.positions.get(material_type, {}).get(material_id)
+        return index
+
+    def find_by_name(self, materials: Dict[str, List[Dict[str, Any]]], material_type: str, name: str) -> List[int]:
+        """根据素材名称查找所有同名素材的下标"""
+        self._check(materials, material_type)
+        name_key = self.NAME_KEYS[material_type]
+        indices = self.names.get(material_type, {}).get(name, [])
+        if any(materials[material_type][index].get(name_key) != name for index in indices):
+            self.rebuild(materials)
+            indices = self.names.get(material_type, {}).get(name, [])
+        return list(indices)
+
+    def copy(self) -> "ImportedMaterialIndex":
+        """复制索引, 供派生的草稿使用"""
+        ret = ImportedMaterialIndex.__new__(ImportedMaterialIndex)
+        ret.positions = {material_type: positions.copy() for material_type, positions in self.positions.items()}
+        ret.names = {material_type: {name: indices.copy() for name, indices in names.items()}
+                     for material_type, names in self.names.items()}
+        ret.counts = self.counts.copy()
+        return ret
+
 def import_track(json_data: Dict[str, Any]) -> ImportedTrack:
-    """导入轨道"""
+    """导入轨道, 导入的轨道及其片段直接持有`json_data`中的对象"""
     track_type = Track_type.from_name(json_data["type"])
     if not track_type.value.allow_modify:
         return ImportedTrack(json_data)
@@ -1,12 +1,12 @@
 """定义文本片段及其相关类"""
 
 import json
-import uuid
 from copy import deepcopy
 
 from typing import Dict, Tuple, Any
 from typing import Union, Optional, Literal
 
+from .id_provider import new_id
 from .time_util import Timerange, tim
 from .segment import Clip_settings, Visual_segment
 from .animation import Segment_animations, Text_animation
@@ -174,7 +174,7 @@ class TextBubble:
     resource_id: str
 
     def __init__(self, effect_id: str, resource_id: str):
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.effect_id = effect_id
         self.resource_id = resource_id
 
@@ -235,7 +235,7 @@ class Text_segment(Visual_segment):
             border (`Text_border`, optional): 文本描边参数, 默认无描边
             background (`Text_background`, optional): 文本背景参数, 默认无背景
         """
-        super().__init__(uuid.uuid4().hex, None, timerange, 1.0, 1.0, clip_settings=clip_settings)
+        super().__init__(new_id(), None, timerange, 1.0, 1.0, clip_settings=clip_settings)
 
         self.text = text
         self.font = font.value if font else None
@@ -256,7 +256,7 @@ class Text_segment(Visual_segment):
         # 处理动画等
         if template.animations_instance:
             new_segment.animations_instance = deepcopy(template.animations_instance)
-            new_segment.animations_instance.animation_id = uuid.uuid4().hex
+            new_segment.animations_instance.animation_id = new_id()
             new_segment.extra_material_refs.append(new_segment.animations_instance.animation_id)
         if template.bubble:
             new_segment.add_bubble(template.bubble.effect_id, template.bubble.resource_id)
@@ -1,6 +1,5 @@
 """轨道类及其元数据"""
 
-import uuid
 
 from enum import Enum
 from typing import TypeVar, Generic, Type
@@ -8,6 +7,7 @@ from typing import Dict, List, Any, Union
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
+from .id_provider import new_id
 from .exceptions import SegmentOverlap
 from .segment import Base_segment
 from .video_segment import Video_segment, Sticker_segment
@@ -81,7 +81,7 @@ class Track(Base_track, Generic[Seg_type]):
     def __init__(self, track_type: Track_type, name: str, render_index: int, mute: bool):
         self.track_type = track_type
         self.name = name
-        self.track_id = uuid.uuid4().hex
+        self.track_id = new_id()
         self.render_index = render_index
 
         self.mute = mute
@@ -3,12 +3,12 @@
 包含图像调节设置、动画效果、特效、转场等相关类
 """
 
-import uuid
 from copy import deepcopy
 
 from typing import Optional, Literal, Union, overload
 from typing import Dict, List, Tuple, Any
 
+from .id_provider import new_id
 from .time_util import tim, Timerange
 from .segment import Visual_segment, Clip_settings
 from .local_materials import Video_material
@@ -46,7 +46,7 @@ class Mask:
                  cx: float, cy: float, w: float, h: float,
                  ratio: float, rot: float, inv: bool, feather: float, round_corner: float):
         self.mask_meta = mask_meta
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
 
         self.center_x, self.center_y = cx, cy
         self.width, self.height = w, h
@@ -104,7 +104,7 @@ class Video_effect:
         """根据给定的特效元数据及参数列表构造一个视频特效对象, params的范围是0~100"""
 
         self.name = effect_meta.value.name
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.effect_id = effect_meta.value.effect_id
         self.resource_id = effect_meta.value.resource_id
         self.adjust_params = []
@@ -162,7 +162,7 @@ class Filter:
                  apply_target_type: Literal[0, 2] = 0):
         """根据给定的滤镜元数据及强度构造滤镜素材对象"""
 
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.effect_meta = meta
         self.intensity = intensity
         self.apply_target_type = apply_target_type
@@ -221,7 +221,7 @@ class Transition:
     def __init__(self, effect_meta: Transition_type, duration: Optional[int] = None):
         """根据给定的转场元数据及持续时间构造一个转场对象"""
         self.name = effect_meta.value.name
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.effect_id = effect_meta.value.effect_id
         self.resource_id = effect_meta.value.resource_id
 
@@ -256,7 +256,7 @@ class BackgroundFilling:
     """背景颜色, 格式为'#RRGGBBAA'"""
 
     def __init__(self, fill_type: Literal["canvas_blur", "canvas_color"], blur: float, color: str):
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.fill_type = fill_type
         self.blur = blur
         self.color = color
@@ -512,7 +512,7 @@ class Sticker_segment(Visual_segment):
             target_timerange (`Timerange`): 片段在轨道上的目标时间范围
             clip_settings (`Clip_settings`, optional): 图像调节设置, 默认不作任何变换
         """
-        super().__init__(uuid.uuid4().hex, None, target_timerange, 1.0, 1.0, clip_settings=clip_settings)
+        super().__init__(new_id(), None, target_timerange, 1.0, 1.0, clip_settings=clip_settings)
         self.resource_id = resource_id
 
     def export_material(self) -> Dict[str, Any]:
@@ -11,7 +11,8 @@ import sys
 import json
 import threading
 import time
-from flask import Flask, render_template, jsonify, request
+import queue
+from flask import Flask, render_template, jsonify, request, Response, stream_with_context
 import webbrowser
 
 # 添加项目根目录到Python路径
@@ -21,17 +22,33 @@ sys.path.append(current_dir)
 # 检查并导入核心模块
 try:
     # 尝试从JianYingDraft.core导入
-    from JianYingDraft.core.configManager import ConfigManager
+    from JianYingDraft.core.configManager import ConfigManager, SimpleConfigHelper
     from JianYingDraft.core.effectExclusionManager import EffectExclusionManager
     from JianYingDraft.core.standardAutoMix import StandardAutoMix
     from JianYingDraft.core.metadataManager import MetadataManager
+    from JianYingDraft.core.progressBus import default_progress_bus
+    from JianYingDraft.core.jobQueue import AutoMixJobQueue, AutoMixJob
+    from JianYingDraft.core.jobJournal import JobJournal
+    from JianYingDraft.core.taskStatistics import TaskStatisticsStore
+    from JianYingDraft.core.versionedSnapshot import VersionedSnapshot, file_version
+    from JianYingDraft.core.configWatcher import default_config_watcher
+    from JianYingDraft.core.overlayPrefetcher import OverlayPrefetcher
+    from JianYingDraft.core.randomStreams import create_rng, derive_seed, new_batch_seed
 except ImportError:
     try:
         # 尝试从当前目录的core导入
-        from core.configManager import ConfigManager
+        from core.configManager import ConfigManager, SimpleConfigHelper
         from core.effectExclusionManager import EffectExclusionManager
         from core.standardAutoMix import StandardAutoMix
         from core.metadataManager import MetadataManager
+        from core.progressBus import default_progress_bus
+        from core.jobQueue import AutoMixJobQueue, AutoMixJob
+        from core.jobJournal import JobJournal
+        from core.taskStatistics import TaskStatisticsStore
+        from core.versionedSnapshot import VersionedSnapshot, file_version
+        from core.configWatcher import default_config_watcher
+        from core.overlayPrefetcher import OverlayPrefetcher
+        from core.randomStreams import create_rng, derive_seed, new_batch_seed
     except ImportError as e:
         print(f"❌ 无法导入核心模块: {e}")
         print("请确保JianYingDraft/core目录存在并包含必要的Python文件")
@@ -40,155 +57,92 @@ except ImportError:
 class OptimizedWebInterface:
     """优化版Web界面类"""
 
-    def __init__(self):
-        """初始化Web界面"""
+    def __init__(self, data_dir=None):
+        """
+        初始化Web界面
+
+        Args:
+            data_dir: 任务日志与统计数据目录，默认为项目根目录下的data
+        """
+        self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), 'data')
         self.config_manager = ConfigManager()
         self.exclusion_manager = EffectExclusionManager()
         self.metadata_manager = MetadataManager()
-        self.automix_status = {
-            'running': False,
-            'progress': '',
-            'error': None,
-            'result': None,
-            'current_count': 0,
-            'total_count': 0
-        }
+        self.progress_bus = default_progress_bus
+
+        # 混剪任务队列（每个任务独立的状态记录，支持并发与取消）
+        self.job_queue = AutoMixJobQueue(max_workers=self.config_manager.get_max_concurrent_jobs())
+
+        # 任务日志：记录每个草稿的计划与完成状态，重启后续跑被中断的任务
+        self.job_journal = JobJournal(os.path.join(self.data_dir, 'job_journal.jsonl'))
 
         # 统计数据文件路径
-        self.statistics_file = os.path.join(os.path.dirname(__file__), 'data', 'task_statistics.json')
+        self.statistics_file = os.path.join(self.data_dir, 'task_statistics.json')
 
-        # 任务统计跟踪
-        self.task_statistics = self._load_statistics()
+        # 任务统计存储（内存计数，防抖原子写盘，按天保留历史）
+        self.statistics_store = TaskStatisticsStore(self.statistics_file)
 
         # 缓存数据，减少重复计算
         self._cache = {
-            'config': None,
-            'exclusions': None,
             'effects': None,
             'products': None,
             'cache_time': 0
         }
         self._cache_timeout = 30  # 缓存30秒
 
-        # 初始化今日统计
-        self._reset_daily_statistics_if_needed()
-
-    def _load_statistics(self):
-        """从文件加载统计数据"""
-        print(f"📂 开始加载统计数据: {self.statistics_file}")
-        try:
-            # 确保data目录存在
-            data_dir = os.path.dirname(self.statistics_file)
-            if not os.path.exists(data_dir):
-                print(f"📁 创建data目录: {data_dir}")
-                os.makedirs(data_dir)
-
-            # 如果文件存在，加载数据
-            if os.path.exists(self.statistics_file):
-                print(f"📄 统计文件存在，开始读取...")
-                with open(self.statistics_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    print(f"📊 原始数据: {data}")
-
-                    # 转换日期字符串为date对象
-                    if data.get('last_reset_date'):
-                        import datetime
-                        date_str = data['last_reset_date']
-                        data['last_reset_date'] = datetime.datetime.strptime(
-                            date_str, '%Y-%m-%d'
-                        ).date()
-                        print(f"📅 日期转换: {date_str} → {data['last_reset_date']}")
-
-                    print(f"✅ 统计数据加载成功: {data}")
-                    return data
-            else:
-                print(f"⚠️ 统计文件不存在: {self.statistics_file}")
-        except Exception as e:
-            print(f"❌ 加载统计数据失败: {e}")
-            import traceback
-            traceback.print_exc()
-
-        # 返回默认数据
-        default_data = {
-            'completed_today': 0,
-            'error_count_today': 0,
-            'last_reset_date': None
-        }
-        print(f"🔄 使用默认数据: {default_data}")
-        return default_data
-
-    def _save_statistics(self):
-        """保存统计数据到文件"""
-        try:
-            # 准备保存的数据
-            data = self.task_statistics.copy()
-
-            # 转换date对象为字符串
-            if data.get('last_reset_date'):
-                data['last_reset_date'] = data['last_reset_date'].strftime('%Y-%m-%d')
-
-            # 确保目录存在
-            data_dir = os.path.dirname(self.statistics_file)
-            if not os.path.exists(data_dir):
-                os.makedirs(data_dir)
-
-            # 保存到文件
-            with open(self.statistics_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-        except Exception as e:
-            print(f"⚠️ 保存统计数据失败: {e}")
-
-    def _reset_daily_statistics_if_needed(self):
-        """如果是新的一天，重置统计数据"""
-        import datetime
-        today = datetime.date.today()
-        last_reset = self.task_statistics['last_reset_date']
-
-        print(f"📅 检查日期重置: 今日={today}, 上次重置={last_reset}")
-
-        if last_reset != today:
-            print(f"🔄 需要重置统计数据: {last_reset} → {today}")
-            old_completed = self.task_statistics['completed_today']
-            old_errors = self.task_statistics['error_count_today']
+        # 配置与排除统计快照：只在配置文件/排除列表文件变化时重建，并提供ETag
+        self.config_snapshot = VersionedSnapshot(
+            self._build_config_info,
+            lambda: file_version(SimpleConfigHelper.get_config_file())
+        )
+        self.exclusion_snapshot = VersionedSnapshot(
+            self._build_exclusion_stats,
+            lambda: file_version(self.exclusion_manager.config_file)
+        )
+
+        # 提前开始预取防审核覆盖视频，混剪时直接从池中取用
+        self.overlay_prefetcher = OverlayPrefetcher.get_default()
+        if self.config_manager.is_pexels_overlay_enabled():
+            self.overlay_prefetcher.start()
+
+        # 配置文件监视器：命令行等外部修改配置后，只在配置值真正变化时重建派生状态
+        self.config_watcher = default_config_watcher
+        self.config_watcher.subscribe(self._on_config_changed)
+        self.config_watcher.start()
+
+        # 续跑上次进程中断的任务
+        self._resume_unfinished_jobs()
+
+    @property
+    def automix_status(self):
+        """最近提交任务的状态（兼容旧版单任务状态格式）"""
+        job = self.job_queue.get_latest_job()
+        if job is None:
+            return {
+                'running': False,
+                'progress': '',
+                'error': None,
+                'result': None,
+                'current_count': 0,
+                'total_count': 0
+            }
+        return job.to_dict()
 
-            self.task_statistics['completed_today'] = 0
-            self.task_statistics['error_count_today'] = 0
-            self.task_statistics['last_reset_date'] = today
+    @property
+    def task_statistics(self):
+        """今日任务统计快照"""
+        return self.statistics_store.get_snapshot()
 
-            print(f"📊 统计重置: 完成任务 {old_completed}→0, 错误 {old_errors}→0")
-            # 保存重置后的数据
-            self._save_statistics()
-        else:
-            print(f"✅ 无需重置，日期相同: {today}")
-
-    def _increment_completed_tasks(self):
+    def _increment_completed_tasks(self, count=1):
         """增加完成任务计数"""
-        self._reset_daily_statistics_if_needed()
-        old_count = self.task_statistics['completed_today']
-        self.task_statistics['completed_today'] += 1
-        new_count = self.task_statistics['completed_today']
-        print(f"📈 完成任务计数: {old_count} → {new_count}")
-
-        # 记录计数变化用于Web端显示
-        self.task_statistics['last_increment'] = {
-            'old_count': old_count,
-            'new_count': new_count,
-            'timestamp': time.time()
-        }
+        snapshot = self.statistics_store.add(completed=count)
+        change = snapshot.get('last_increment', {})
+        print(f"📈 完成任务计数: {change.get('old_count')} → {change.get('new_count')}")
 
-        # 立即保存更新的数据
-        self._save_statistics()
-
-    def _increment_error_count(self):
+    def _increment_error_count(self, count=1):
         """增加错误计数"""
-        self._reset_daily_statistics_if_needed()
-        old_count = self.task_statistics['error_count_today']
-        self.task_statistics['error_count_today'] += 1
-        new_count = self.task_statistics['error_count_today']
-        print(f"📉 错误计数: {old_count} → {new_count}")
-        # 立即保存更新的数据
-        self._save_statistics()
+        snapshot = self.statistics_store.add(errors=count)
+        print(f"📉 错误计数: {snapshot['error_count_today']}")
 
     def _is_cache_valid(self):
         """检查缓存是否有效"""
@@ -198,181 +152,185 @@ class OptimizedWebInterface:
         """更新缓存时间"""
         self._cache['cache_time'] = time.time()
 
-    def get_config_info(self):
-        """获取配置信息（带缓存）"""
-        if self._cache['config'] and self._is_cache_valid():
-            return self._cache['config']
-
-        try:
-            config = {}
-
-            # 基础路径配置
-            config['material_path'] = self.config_manager.get_material_path()
-            config['draft_output_path'] = self.config_manager.get_draft_output_path()
-
-            # 视频参数
-            min_dur, max_dur = self.config_manager.get_video_duration_range()
-            config['video_duration_min'] = min_dur // 1000000
-            config['video_duration_max'] = max_dur // 1000000
-            config['video_scale_factor'] = self.config_manager.get_video_scale_factor()
-
-            # 音频设置
-            config['narration_volume'] = self.config_manager.get_narration_volume()
-            config['background_volume'] = self.config_manager.get_background_volume()
-
-            # 滤镜强度
-            min_intensity, max_intensity = self.config_manager.get_filter_intensity_range()
-            config['filter_intensity_min'] = min_intensity
-            config['filter_intensity_max'] = max_intensity
-
-            # 批量生成
-            config['batch_count'] = self.config_manager.get_batch_count()
-
-            # 防审核配置
-            config['pexels_overlay_enabled'] = self.config_manager.is_pexels_overlay_enabled()
-            config['pexels_overlay_opacity'] = self.config_manager.get_pexels_overlay_opacity()
-
-            # 高级防审核技术配置
-            config['flip_probability'] = self.config_manager.get_flip_probability()
-            config['blur_background_enabled'] = self.config_manager.is_blur_background_enabled()
-            config['blur_background_probability'] = self.config_manager.get_blur_background_probability()
-            config['foreground_scale'] = self.config_manager.get_foreground_scale()
-            config['background_scale'] = self.config_manager.get_background_scale()
-            config['background_blur_intensity'] = self.config_manager.get_background_blur_intensity()
-            config['frame_manipulation_enabled'] = self.config_manager.is_frame_manipulation_enabled()
-            config['frame_drop_probability'] = self.config_manager.get_frame_drop_probability()
-            config['frame_drop_interval'] = self.config_manager.get_frame_drop_interval()
-            config['max_frame_drops_per_segment'] = self.config_manager.get_max_frame_drops_per_segment()
-
-            # 版本信息和特效参数说明
-            config['version_info'] = {
-                'version': '2.1.0',
-                'last_updated': '2025-07-05',
-                'features': [
-                    '轻微特效参数优化',
-                    '纹理和滤镜参数支持',
-                    '智能编码检测修复',
-                    '界面性能重构'
-                ]
-            }
+    def _on_config_changed(self, event):
+        """配置文件变化通知"""
+        self.config_snapshot.invalidate()
 
-            config['effect_params_info'] = {
-                '亮度': '15-35 (轻微调整)',
-                '对比度': '20-40 (轻微调整)',
-                '饱和度': '25-45 (轻微调整)',
-                '大小': '10-30 (轻微缩放)',
-                '速度': '25-45 (轻微变速)',
-                '强度': '10-25 (轻微强度)',
-                '透明度': '20-40 (轻微透明)',
-                '模糊': '5-20 (轻微模糊)',
-                '旋转': '10-30 (轻微旋转)',
-                '纹理': '15-35 (轻微纹理)',
-                '滤镜': '20-40 (轻微滤镜)',
-                '其他': '中心25±8 (轻微正态分布)'
-            }
+        if 'max_concurrent_jobs' in event['changed_keys']:
+            self.job_queue.set_max_workers(event['snapshot'].get_max_concurrent_jobs())
 
-            # 缓存结果
-            self._cache['config'] = config
-            self._update_cache_time()
+        if 'overlay_pool_size' in event['changed_keys']:
+            self.overlay_prefetcher.set_pool_size(event['snapshot'].get_overlay_pool_size())
 
+    def get_config_info(self):
+        """获取配置信息（版本化快照）"""
+        try:
+            config, _ = self.config_snapshot.get()
             return config
         except Exception as e:
             return {'error': str(e)}
 
-    def get_exclusion_stats(self):
-        """获取排除统计信息（带缓存）"""
-        if self._cache['exclusions'] and self._is_cache_valid():
-            return self._cache['exclusions']
-
-        try:
-            stats = {}
-
-            # 获取各类型统计
-            video_effects = self.exclusion_manager.excluded_effects
-            filters = self.exclusion_manager.excluded_filters
-            transitions = self.exclusion_manager.excluded_transitions
-
-            stats['video_effects'] = {
-                'total': 912,
-                'excluded': len(video_effects),
-                'available': 912 - len(video_effects)
-            }
-
-            stats['filters'] = {
-                'total': 468,
-                'excluded': len(filters),
-                'available': 468 - len(filters)
-            }
+    def _build_config_info(self):
+        """构建配置信息快照（配置文件被外部修改时先重新加载）"""
+        SimpleConfigHelper.reload_if_changed()
+
+        config = {}
+
+        # 基础路径配置
+        config['material_path'] = self.config_manager.get_material_path()
+        config['draft_output_path'] = self.config_manager.get_draft_output_path()
+
+        # 视频参数
+        min_dur, max_dur = self.config_manager.get_video_duration_range()
+        config['video_duration_min'] = min_dur // 1000000
+        config['video_duration_max'] = max_dur // 1000000
+        config['video_scale_factor'] = self.config_manager.get_video_scale_factor()
+
+        # 音频设置
+        config['narration_volume'] = self.config_manager.get_narration_volume()
+        config['background_volume'] = self.config_manager.get_background_volume()
+
+        # 滤镜强度
+        min_intensity, max_intensity = self.config_manager.get_filter_intensity_range()
+        config['filter_intensity_min'] = min_intensity
+        config['filter_intensity_max'] = max_intensity
+
+        # 批量生成
+        config['batch_count'] = self.config_manager.get_batch_count()
+
+        # 防审核配置
+        config['pexels_overlay_enabled'] = self.config_manager.is_pexels_overlay_enabled()
+        config['pexels_overlay_opacity'] = self.config_manager.get_pexels_overlay_opacity()
+
+        # 高级防审核技术配置
+        config['flip_probability'] = self.config_manager.get_flip_probability()
+        config['blur_background_enabled'] = self.config_manager.is_blur_background_enabled()
+        config['blur_background_probability'] = self.config_manager.get_blur_background_probability()
+        config['foreground_scale'] = self.config_manager.get_foreground_scale()
+        config['background_scale'] = self.config_manager.get_background_scale()
+        config['background_blur_intensity'] = self.config_manager.get_background_blur_intensity()
+        config['frame_manipulation_enabled'] = self.config_manager.is_frame_manipulation_enabled()
+        config['frame_drop_probability'] = self.config_manager.get_frame_drop_probability()
+        config['frame_drop_interval'] = self.config_manager.get_frame_drop_interval()
+        config['max_frame_drops_per_segment'] = self.config_manager.get_max_frame_drops_per_segment()
+
+        # 版本信息和特效参数说明
+        config['version_info'] = {
+            'version': '2.1.0',
+            'last_updated': '2025-07-05',
+            'features': [
+                '轻微特效参数优化',
+                '纹理和滤镜参数支持',
+                '智能编码检测修复',
+                '界面性能重构'
+            ]
+        }
 
-            stats['transitions'] = {
-                'total': 362,
-                'excluded': len(transitions),
-                'available': 362 - len(transitions)
-            }
+        config['effect_params_info'] = {
+            '亮度': '15-35 (轻微调整)',
+            '对比度': '20-40 (轻微调整)',
+            '饱和度': '25-45 (轻微调整)',
+            '大小': '10-30 (轻微缩放)',
+            '速度': '25-45 (轻微变速)',
+            '强度': '10-25 (轻微强度)',
+            '透明度': '20-40 (轻微透明)',
+            '模糊': '5-20 (轻微模糊)',
+            '旋转': '10-30 (轻微旋转)',
+            '纹理': '15-35 (轻微纹理)',
+            '滤镜': '20-40 (轻微滤镜)',
+            '其他': '中心25±8 (轻微正态分布)'
+        }
 
-            # 缓存结果
-            self._cache['exclusions'] = stats
-            self._update_cache_time()
+        return config
 
+    def get_exclusion_stats(self):
+        """获取排除统计信息（版本化快照）"""
+        try:
+            stats, _ = self.exclusion_snapshot.get()
             return stats
         except Exception as e:
             return {'error': str(e)}
 
+    def _build_exclusion_stats(self):
+        """构建排除统计快照（总数取自元数据目录，可用数与实际混剪使用的过滤结果一致）"""
+        # 排除列表文件可能被命令行工具修改，以文件内容为准
+        self.exclusion_manager.load_exclusions()
+
+        catalog = {
+            'video_effects': (
+                self.metadata_manager.get_available_effects(),
+                self.exclusion_manager.excluded_effects,
+                self.exclusion_manager.get_filtered_effects()
+            ),
+            'filters': (
+                self.metadata_manager.get_available_filters(),
+                self.exclusion_manager.excluded_filters,
+                self.exclusion_manager.get_filtered_filters()
+            ),
+            'transitions': (
+                self.metadata_manager.get_available_transitions(),
+                self.exclusion_manager.excluded_transitions,
+                self.exclusion_manager.get_filtered_transitions()
+            )
+        }
+
+        stats = {}
+        for category, (available_items, excluded_names, filtered_items) in catalog.items():
+            names = {item.name for item in available_items}
+            stats[category] = {
+                'total': len(available_items),
+                'excluded': len(names & excluded_names),
+                'available': len(filtered_items)
+            }
+        return stats
+
+    # Web配置字段 -> (配置项名称, 值转换函数)
+    CONFIG_FIELDS = {
+        'material_path': ('material_path', str),
+        'draft_output_path': ('draft_output_path', str),
+        'video_duration_min': ('video_duration_min', lambda value: int(value) * 1000000),
+        'video_duration_max': ('video_duration_max', lambda value: int(value) * 1000000),
+        'video_scale_factor': ('video_scale_factor', float),
+        'narration_volume': ('narration_volume', float),
+        'background_volume': ('background_volume', float),
+        'filter_intensity_min': ('filter_intensity_min', int),
+        'filter_intensity_max': ('filter_intensity_max', int),
+        'batch_count': ('batch_count', int),
+        # 高级防审核技术配置
+        'flip_probability': ('flip_probability', float),
+        'blur_background_enabled': ('enable_blur_background', bool),
+        'blur_background_probability': ('blur_background_probability', float),
+        'foreground_scale': ('foreground_scale', float),
+        'background_scale': ('background_scale', float),
+        'background_blur_intensity': ('background_blur_intensity', float),
+        'frame_manipulation_enabled': ('enable_frame_manipulation', bool),
+        'frame_drop_probability': ('frame_drop_probability', float),
+        'frame_drop_interval': ('frame_drop_interval', float),
+        'max_frame_drops_per_segment': ('max_frame_drops_per_segment', int),
+    }
+
     def update_config(self, config_data):
-        """更新配置"""
+        """更新配置（校验全部字段后一次性写入配置文件）"""
         try:
-            success = True
             errors = []
+            values = {}
 
-            # 更新各项配置
             for key, value in config_data.items():
+                if key not in self.CONFIG_FIELDS:
+                    continue
+                config_key, convert = self.CONFIG_FIELDS[key]
                 try:
-                    if key == 'material_path':
-                        success &= self.config_manager._set_config_value('material_path', value)
-                    elif key == 'draft_output_path':
-                        success &= self.config_manager._set_config_value('draft_output_path', value)
-                    elif key == 'video_duration_min':
-                        success &= self.config_manager._set_config_value('video_duration_min', int(value) * 1000000)
-                    elif key == 'video_duration_max':
-                        success &= self.config_manager._set_config_value('video_duration_max', int(value) * 1000000)
-                    elif key == 'video_scale_factor':
-                        success &= self.config_manager._set_config_value('video_scale_factor', float(value))
-                    elif key == 'narration_volume':
-                        success &= self.config_manager._set_config_value('narration_volume', float(value))
-                    elif key == 'background_volume':
-                        success &= self.config_manager._set_config_value('background_volume', float(value))
-                    elif key == 'filter_intensity_min':
-                        success &= self.config_manager._set_config_value('filter_intensity_min', int(value))
-                    elif key == 'filter_intensity_max':
-                        success &= self.config_manager._set_config_value('filter_intensity_max', int(value))
-                    elif key == 'batch_count':
-                        success &= self.config_manager._set_config_value('batch_count', int(value))
-                    # 高级防审核技术配置
-                    elif key == 'flip_probability':
-                        success &= self.config_manager.set_flip_probability(float(value))
-                    elif key == 'blur_background_enabled':
-                        success &= self.config_manager.set_blur_background_enabled(bool(value))
-                    elif key == 'blur_background_probability':
-                        success &= self.config_manager.set_blur_background_probability(float(value))
-                    elif key == 'foreground_scale':
-                        success &= self.config_manager.set_foreground_scale(float(value))
-                    elif key == 'background_scale':
-                        success &= self.config_manager.set_background_scale(float(value))
-                    elif key == 'background_blur_intensity':
-                        success &= self.config_manager.set_background_blur_intensity(float(value))
-                    elif key == 'frame_manipulation_enabled':
-                        success &= self.config_manager.set_frame_manipulation_enabled(bool(value))
-                    elif key == 'frame_drop_probability':
-                        success &= self.config_manager.set_frame_drop_probability(float(value))
-                    elif key == 'frame_drop_interval':
-                        success &= self.config_manager.set_frame_drop_interval(float(value))
-                    elif key == 'max_frame_drops_per_segment':
-                        success &= self.config_manager.set_max_frame_drops_per_segment(int(value))
+                    values[config_key] = convert(value)
                 except Exception as e:
                     errors.append(f"{key}: {str(e)}")
 
-            # 清除配置缓存
-            self._cache['config'] = None
+            if errors:
+                return {'success': False, 'errors': errors}
+
+            success, errors = self.config_manager.update(**values)
+
+            # 标记配置快照失效
+            self.config_snapshot.invalidate()
 
             return {'success': success, 'errors': errors}
         except Exception as e:
@@ -418,228 +376,411 @@ class OptimizedWebInterface:
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
-    def start_single_automix(self, product, duration):
-        """启动单个混剪任务"""
+    def start_single_automix(self, product, duration, seed=None):
+        """启动单个混剪任务（加入任务队列）；指定seed时按该草稿种子重新生成"""
         try:
-            if self.automix_status['running']:
-                return {'success': False, 'error': '已有混剪任务在运行中'}
-
-            # 更新状态
-            self.automix_status['running'] = True
-            self.automix_status['progress'] = '正在初始化混剪任务...'
-            self.automix_status['error'] = None
-            self.automix_status['result'] = None
-            self.automix_status['current_count'] = 0
-            self.automix_status['total_count'] = 1
-
-            # 在后台线程中执行混剪
-            def run_automix():
-                try:
-                    # 调用真正的混剪逻辑
-                    from JianYingDraft.core.standardAutoMix import StandardAutoMix
+            if seed is not None:
+                drafts = [{'index': 1, 'duration': duration, 'seed': int(seed)}]
+            else:
+                drafts = self._plan_drafts([duration], new_batch_seed())
+            job = self._submit_planned_job('single', product, drafts, {'product': product, 'duration': duration})
+            return {'success': True, 'message': '混剪任务已启动', 'job_id': job.job_id}
 
-                    # 创建草稿名称
-                    import datetime
-                    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                    draft_name = f"{product}_单个混剪_{duration}s_{timestamp}"
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
 
-                    self.automix_status['progress'] = f'正在为产品 {product} 生成 {duration}秒 混剪视频...'
+    def start_batch_automix(self, product, count, min_duration, max_duration, seed=None):
+        """启动批量混剪任务（加入任务队列）；指定seed时按该批量种子重新生成整批草稿"""
+        try:
+            batch_seed = int(seed) if seed is not None else new_batch_seed()
+
+            # 预先规划每个草稿的时长与随机种子，写入任务日志后再执行
+            batch_rng = create_rng(batch_seed)
+            durations = [batch_rng.randint(min_duration, max_duration) for _ in range(count)]
+            drafts = self._plan_drafts(durations, batch_seed)
+            params = {
+                'product': product,
+                'count': count,
+                'min_duration': min_duration,
+                'max_duration': max_duration,
+                'batch_seed': batch_seed
+            }
+            job = self._submit_planned_job('batch', product, drafts, params)
+            return {'success': True, 'message': f'批量混剪任务已启动 (共{count}个视频)', 'job_id': job.job_id}
 
-                    # 创建StandardAutoMix实例
-                    automix = StandardAutoMix(draft_name)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
 
-                    # 设置进度回调
-                    def progress_callback(message, progress):
-                        self.automix_status['progress'] = f'{message} ({progress:.1f}%)'
+    def _plan_drafts(self, durations, batch_seed):
+        """为每个草稿生成计划（序号、时长、由批量种子派生的草稿种子）"""
+        return [
+            {'index': i + 1, 'duration': duration, 'seed': derive_seed(batch_seed, i + 1)}
+            for i, duration in enumerate(durations)
+        ]
+
+    def _submit_planned_job(self, job_type, product, drafts, params, job_id=None, finished=None):
+        """
+        先写任务日志再提交任务
+
+        Args:
+            job_type: single/batch
+            product: 产品型号
+            drafts: 草稿计划列表
+            params: 任务原始参数
+            job_id: 续跑时沿用的任务ID
+            finished: 续跑时已经结束的草稿记录（index -> 日志记录）
+        """
+        job_id = job_id or AutoMixJob.new_job_id()
+        if finished is None:
+            self.job_journal.record_job_planned(job_id, job_type, product, drafts, params)
+
+        runner = self._run_single_automix if job_type == 'single' else self._run_batch_automix
+        job_params = dict(params, product=product, drafts=drafts, finished=finished or {})
+        return self.job_queue.submit(job_type, runner, params=job_params, total_count=len(drafts), job_id=job_id)
+
+    def _resume_unfinished_jobs(self):
+        """续跑任务日志中被中断的任务，从第一个未完成的草稿开始"""
+        try:
+            self.job_journal.compact()
+            for journal_job in self.job_journal.load_unfinished_jobs():
+                if not journal_job['pending_drafts']:
+                    # 所有草稿都已结束，只是没来得及记录任务结束
+                    self.job_journal.record_job_finished(journal_job['job_id'], 'completed')
+                    continue
 
-                    automix.progress_callback = progress_callback
+                print(f"🔁 续跑中断的任务 {journal_job['job_id']}: "
+                      f"剩余{len(journal_job['pending_drafts'])}/{len(journal_job['drafts'])}个草稿")
+                self._submit_planned_job(
+                    journal_job['job_type'],
+                    journal_job['product'],
+                    journal_job['drafts'],
+                    journal_job['params'],
+                    job_id=journal_job['job_id'],
+                    finished=journal_job['finished']
+                )
+        except Exception as e:
+            print(f"⚠️ 续跑中断任务失败: {e}")
+
+    def cancel_job(self, job_id):
+        """取消混剪任务"""
+        if self.job_queue.cancel(job_id):
+            job = self.job_queue.get_job(job_id)
+            if job.is_finished:
+                # 排队中直接取消的任务不会再运行，在这里记录结束
+                self.job_journal.record_job_finished(job_id, 'cancelled')
+                return {'success': True, 'message': '任务已取消'}
+            return {'success': True, 'message': '正在取消任务'}
+        if self.job_queue.get_job(job_id) is None:
+            return {'success': False, 'error': '任务不存在'}
+        return {'success': False, 'error': '任务已结束，无法取消'}
+
+    def _create_automix(self, job, draft_name, draft_index, draft_total, draft_plan=None, seed=None):
+        """为任务创建StandardAutoMix实例（使用草稿种子），并把进度写入任务记录"""
+        from JianYingDraft.core.standardAutoMix import StandardAutoMix
+
+        automix = StandardAutoMix(draft_name, seed=seed)
+        automix.draft_plan = draft_plan
+        automix.progress_bus = self.progress_bus
+        automix.job_id = job.job_id
+        automix.draft_index = draft_index
+        automix.draft_total = draft_total
+
+        # 设置进度回调（progress为0.0-1.0）；取消检查点也放在这里，按阶段停止
+        def progress_callback(message, progress):
+            if progress >= 0:
+                job.check_cancelled()
+            prefix = f'第{draft_index}/{draft_total}个: ' if draft_total > 1 else ''
+            percent = max(progress, 0) * 100
+            job.update(
+                progress=f'{prefix}{message} ({percent:.1f}%)',
+                percent=round(((draft_index - 1) + max(progress, 0)) / draft_total * 100, 1),
+                stage=message
+            )
+
+        automix.progress_callback = progress_callback
+        return automix
+
+    def _run_single_automix(self, job):
+        """执行单个混剪任务（在队列工作线程中运行）"""
+        import datetime
 
-                    # 执行混剪 (duration秒转换为微秒)
-                    target_duration = duration * 1000000  # 秒转微秒
-                    result = automix.auto_mix(target_duration=target_duration, product_model=product)
+        product = job.params['product']
+        draft_plan = job.params['drafts'][0]
+        duration = draft_plan['duration']
 
-                    if result.get('success', False):
-                        # 混剪成功，提取统计信息
-                        statistics = result.get('statistics', {})
-                        print(f"📊 混剪成功，统计信息: {statistics}")
+        try:
+            # 创建草稿名称
+            # 队列中的任务并发执行，名称带上任务ID，同一秒提交的同产品任务不会使用同一个草稿文件夹
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            draft_name = f"{product}_单个混剪_{duration}s_{timestamp}_{job.job_id}"
+
+            job.update(progress=f'正在为产品 {product} 生成 {duration}秒 混剪视频...')
+
+            automix = self._create_automix(job, draft_name, 1, 1, seed=draft_plan.get('seed'))
+
+            # 执行混剪 (duration秒转换为微秒)
+            target_duration = duration * 1000000  # 秒转微秒
+            result = automix.auto_mix(target_duration=target_duration, product_model=product)
+
+            if job.is_cancel_requested():
+                self._publish_job_finished(job, False, 0, 0)
+                return
+
+            if result.get('success', False):
+                # 混剪成功，提取统计信息
+                statistics = result.get('statistics', {})
+                print(f"📊 混剪成功，统计信息: {statistics}")
+
+                job.update(
+                    status='completed',
+                    progress='混剪完成',
+                    percent=100.0,
+                    current_count=1,
+                    result={
+                        'draft_name': draft_name,
+                        'draft_path': result.get('draft_path', ''),
+                        'duration': result.get('duration', duration * 1000000),  # 使用实际时长，备用目标时长
+                        'video_count': statistics.get('selected_materials', 0),
+                        'effects_count': statistics.get('applied_effects', 0),
+                        'transitions_count': statistics.get('applied_transitions', 0),
+                        'filters_count': statistics.get('applied_filters', 0),
+                        'seed': draft_plan.get('seed'),
+                        'statistics': statistics  # 添加完整的统计信息
+                    }
+                )
 
-                        self.automix_status['running'] = False
-                        self.automix_status['progress'] = '混剪完成'
-                        self.automix_status['result'] = {
-                            'draft_name': draft_name,
-                            'draft_path': result.get('draft_path', ''),
-                            'duration': result.get('duration', duration * 1000000),  # 使用实际时长，备用目标时长
-                            'video_count': statistics.get('selected_materials', 0),
-                            'effects_count': statistics.get('applied_effects', 0),
-                            'transitions_count': statistics.get('applied_transitions', 0),
-                            'filters_count': statistics.get('applied_filters', 0),
-                            'statistics': statistics  # 添加完整的统计信息
-                        }
+                print(f"📊 任务 {job.job_id} 结果: {job.get('result')}")
+                self.job_journal.record_draft_finished(
+                    job.job_id, draft_plan['index'], 'success',
+                    draft_name=draft_name, draft_path=result.get('draft_path', '')
+                )
 
-                        print(f"📊 设置automix_status结果: {self.automix_status['result']}")
+                # 更新完成任务统计
+                self._increment_completed_tasks()
+                self._publish_job_finished(job, True, 1, 0)
+            else:
+                # 混剪失败
+                job.update(
+                    status='failed',
+                    error=result.get('error', '未知错误'),
+                    progress='混剪失败'
+                )
+                self.job_journal.record_draft_finished(
+                    job.job_id, draft_plan['index'], 'failed',
+                    draft_name=draft_name, error=result.get('error', '未知错误')
+                )
+
+                # 更新错误统计
+                self._increment_error_count()
+                self._publish_job_finished(job, False, 0, 1)
 
-                        # 更新完成任务统计
-                        self._increment_completed_tasks()
-                    else:
-                        # 混剪失败
-                        self.automix_status['running'] = False
-                        self.automix_status['error'] = result.get('error', '未知错误')
-                        self.automix_status['progress'] = '混剪失败'
+        except Exception as e:
+            job.update(status='failed', error=str(e), progress='混剪失败')
 
-                        # 更新错误统计
-                        self._increment_error_count()
+            # 更新错误统计
+            self._increment_error_count()
+            self._publish_job_finished(job, False, 0, 1)
 
-                except Exception as e:
-                    self.automix_status['running'] = False
-                    self.automix_status['error'] = str(e)
-                    self.automix_status['progress'] = '混剪失败'
+    def _run_batch_automix(self, job):
+        """执行批量混剪任务（在队列工作线程中运行，续跑时跳过已结束的草稿）"""
+        import datetime
+        from JianYingDraft.core.standardAutoMix import StandardAutoMix
 
-                    # 更新错误统计
-                    self._increment_error_count()
+        product = job.params['product']
+        drafts = job.params['drafts']
+        finished = job.params.get('finished', {})
+        count = len(drafts)
 
-            # 启动后台线程
-            threading.Thread(target=run_automix, daemon=True).start()
+        try:
+            job.update(progress=f'正在初始化批量混剪任务 (共{count}个)...')
+
+            # 统一规划整批草稿的素材与特效组合；以批量种子初始化，续跑时得到相同的方案
+            job.update(progress=f'正在规划 {count} 个草稿的素材与特效组合...')
+            planning_seed = job.params.get('batch_seed', drafts[0].get('seed') if drafts else None)
+            draft_plans = StandardAutoMix.plan_batch(
+                [draft_plan['duration'] * 1000000 for draft_plan in drafts],
+                product,
+                rng=create_rng(planning_seed)
+            )
+
+            results = []
+            successful_count = 0
+            failed_count = 0
+
+            for i, draft_plan in enumerate(drafts):
+                current_duration = draft_plan['duration']
+
+                # 上次运行已结束的草稿直接从任务日志恢复结果
+                journal_record = finished.get(draft_plan['index'])
+                if journal_record is not None:
+                    result = {
+                        'index': draft_plan['index'],
+                        'draft_name': journal_record.get('draft_name'),
+                        'duration': current_duration,
+                        'status': journal_record.get('status'),
+                        'resumed': True
+                    }
+                    if journal_record.get('status') == 'success':
+                        result['draft_path'] = journal_record.get('draft_path', '')
+                        result.update(journal_record.get('extra', {}))
+                    else:
+                        result['error'] = journal_record.get('error')
+                    results.append(result)
+                    job.update(current_count=i + 1, percent=round((i + 1) / count * 100, 1))
+                    continue
 
-            return {'success': True, 'message': '混剪任务已启动'}
+                # 草稿之间的取消检查点
+                if job.is_cancel_requested():
+                    break
 
-        except Exception as e:
-            self.automix_status['running'] = False
-            return {'success': False, 'error': str(e)}
+                job.update(
+                    current_count=i,
+                    progress=f'正在生成第 {i+1}/{count} 个视频 ({current_duration}秒)...'
+                )
 
-    def start_batch_automix(self, product, count, min_duration, max_duration):
-        """启动批量混剪任务"""
-        try:
-            if self.automix_status['running']:
-                return {'success': False, 'error': '已有混剪任务在运行中'}
-
-            # 更新状态
-            self.automix_status['running'] = True
-            self.automix_status['progress'] = f'正在初始化批量混剪任务 (共{count}个)...'
-            self.automix_status['error'] = None
-            self.automix_status['result'] = None
-            self.automix_status['current_count'] = 0
-            self.automix_status['total_count'] = count
-
-            # 在后台线程中执行批量混剪
-            def run_batch_automix():
+                draft_name = None
                 try:
-                    from JianYingDraft.core.standardAutoMix import StandardAutoMix
-                    import datetime
-                    import random
-
-                    results = []
-                    successful_count = 0
-                    failed_count = 0
-
-                    for i in range(count):
-                        current_duration = random.randint(min_duration, max_duration)
-                        self.automix_status['current_count'] = i
-                        self.automix_status['progress'] = f'正在生成第 {i+1}/{count} 个视频 ({current_duration}秒)...'
-
-                        try:
-                            # 创建草稿名称
-                            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                            draft_name = f"{product}_批量_{i+1:02d}_{current_duration}s_{timestamp}"
-
-                            # 创建StandardAutoMix实例
-                            automix = StandardAutoMix(draft_name)
-
-                            # 设置进度回调
-                            def progress_callback(message, progress):
-                                self.automix_status['progress'] = f'第{i+1}/{count}个: {message} ({progress:.1f}%)'
-
-                            automix.progress_callback = progress_callback
-
-                            # 执行混剪
-                            target_duration = current_duration * 1000000  # 秒转微秒
-                            mix_result = automix.auto_mix(target_duration=target_duration, product_model=product)
-
-                            if mix_result.get('success', False):
-                                # 提取统计信息
-                                statistics = mix_result.get('statistics', {})
-                                result = {
-                                    'index': i + 1,
-                                    'draft_name': draft_name,
-                                    'draft_path': mix_result.get('draft_path', ''),
-                                    'duration': current_duration,
-                                    'video_count': statistics.get('selected_materials', 0),
-                                    'effects_count': statistics.get('applied_effects', 0),
-                                    'transitions_count': statistics.get('applied_transitions', 0),
-                                    'filters_count': statistics.get('applied_filters', 0),
-                                    'status': 'success'
-                                }
-                                successful_count += 1
-                            else:
-                                result = {
-                                    'index': i + 1,
-                                    'draft_name': draft_name,
-                                    'duration': current_duration,
-                                    'error': mix_result.get('error', '未知错误'),
-                                    'status': 'failed'
-                                }
-                                failed_count += 1
-
-                            results.append(result)
-
-                            # 更新完成计数
-                            self.automix_status['current_count'] = i + 1
-
-                        except Exception as e:
-                            result = {
-                                'index': i + 1,
-                                'duration': current_duration,
-                                'error': str(e),
-                                'status': 'failed'
-                            }
-                            results.append(result)
-                            failed_count += 1
-
-                            # 更新完成计数
-                            self.automix_status['current_count'] = i + 1
-
-                    # 批量混剪完成
-                    self.automix_status['running'] = False
-                    self.automix_status['progress'] = f'批量混剪完成: 成功{successful_count}个, 失败{failed_count}个'
-
-                    # 计算批量统计信息
-                    batch_statistics = self._calculate_batch_statistics(results, successful_count, failed_count)
-
-                    self.automix_status['result'] = {
-                        'total_count': count,
-                        'successful_count': successful_count,
-                        'failed_count': failed_count,
-                        'results': results,
-                        'total_duration': sum(r['duration'] for r in results),
-                        'statistics': batch_statistics  # 添加批量统计信息
-                    }
+                    # 创建草稿名称
+                    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                    draft_name = f"{product}_批量_{i+1:02d}_{current_duration}s_{timestamp}_{job.job_id}"
 
-                    # 更新统计数据
-                    print(f"📊 批量混剪完成，更新统计: 成功{successful_count}个, 失败{failed_count}个")
-                    try:
-                        for _ in range(successful_count):
-                            self._increment_completed_tasks()
-                        for _ in range(failed_count):
-                            self._increment_error_count()
-                        print(f"✅ 统计更新完成: 完成任务+{successful_count}, 错误+{failed_count}")
-                    except Exception as stats_error:
-                        print(f"❌ 统计更新失败: {stats_error}")
+                    automix = self._create_automix(job, draft_name, i + 1, count, draft_plans[i],
+                                                   seed=draft_plan.get('seed'))
 
-                except Exception as e:
-                    self.automix_status['running'] = False
-                    self.automix_status['error'] = str(e)
-                    self.automix_status['progress'] = '批量混剪失败'
+                    # 执行混剪
+                    target_duration = current_duration * 1000000  # 秒转微秒
+                    mix_result = automix.auto_mix(target_duration=target_duration, product_model=product)
+
+                    if job.is_cancel_requested():
+                        break
+
+                    if mix_result.get('success', False):
+                        # 提取统计信息
+                        statistics = mix_result.get('statistics', {})
+                        counts = {
+                            'video_count': statistics.get('selected_materials', 0),
+                            'effects_count': statistics.get('applied_effects', 0),
+                            'transitions_count': statistics.get('applied_transitions', 0),
+                            'filters_count': statistics.get('applied_filters', 0)
+                        }
+                        result = {
+                            'index': i + 1,
+                            'draft_name': draft_name,
+                            'draft_path': mix_result.get('draft_path', ''),
+                            'duration': current_duration,
+                            'seed': draft_plan.get('seed'),
+                            'status': 'success'
+                        }
+                        result.update(counts)
+                        successful_count += 1
+                        self.job_journal.record_draft_finished(
+                            job.job_id, draft_plan['index'], 'success',
+                            draft_name=draft_name, draft_path=result['draft_path'], extra=counts
+                        )
+                    else:
+                        result = {
+                            'index': i + 1,
+                            'draft_name': draft_name,
+                            'duration': current_duration,
+                            'seed': draft_plan.get('seed'),
+                            'error': mix_result.get('error', '未知错误'),
+                            'status': 'failed'
+                        }
+                        failed_count += 1
+                        self.job_journal.record_draft_finished(
+                            job.job_id, draft_plan['index'], 'failed',
+                            draft_name=draft_name, error=result['error']
+                        )
+
+                    results.append(result)
+
+                    # 更新完成计数
+                    job.update(current_count=i + 1, percent=round((i + 1) / count * 100, 1))
+                    self.progress_bus.publish(
+                        'draft_finished',
+                        job_id=job.job_id,
+                        draft_index=i + 1,
+                        draft_total=count,
+                        draft_name=draft_name,
+                        status=result['status'],
+                        percent=100.0,
+                        message=f'第{i+1}/{count}个视频已{"完成" if result["status"] == "success" else "失败"}'
+                    )
 
-                    # 更新错误统计
-                    self._increment_error_count()
+                except Exception as e:
+                    result = {
+                        'index': i + 1,
+                        'duration': current_duration,
+                        'seed': draft_plan.get('seed'),
+                        'error': str(e),
+                        'status': 'failed'
+                    }
+                    results.append(result)
+                    failed_count += 1
+                    self.job_journal.record_draft_finished(
+                        job.job_id, draft_plan['index'], 'failed', draft_name=draft_name, error=str(e)
+                    )
+
+                    # 更新完成计数
+                    job.update(current_count=i + 1, percent=round((i + 1) / count * 100, 1))
+
+            # 计算批量统计信息（包含续跑前已完成的草稿）
+            total_successful = sum(1 for r in results if r.get('status') == 'success')
+            total_failed = sum(1 for r in results if r.get('status') == 'failed')
+            batch_statistics = self._calculate_batch_statistics(results, total_successful, total_failed)
+
+            if job.is_cancel_requested():
+                progress = f'批量混剪已取消: 成功{total_successful}个, 失败{total_failed}个'
+            else:
+                progress = f'批量混剪完成: 成功{total_successful}个, 失败{total_failed}个'
+
+            job.update(
+                progress=progress,
+                result={
+                    'total_count': count,
+                    'successful_count': total_successful,
+                    'failed_count': total_failed,
+                    'results': results,
+                    'total_duration': sum(r['duration'] for r in results),
+                    'statistics': batch_statistics  # 添加批量统计信息
+                }
+            )
 
-            # 启动后台线程
-            threading.Thread(target=run_batch_automix, daemon=True).start()
+            # 更新统计数据（只统计本次运行生成的草稿）
+            print(f"📊 批量混剪完成，更新统计: 成功{successful_count}个, 失败{failed_count}个")
+            try:
+                self.statistics_store.add(completed=successful_count, errors=failed_count)
+                print(f"✅ 统计更新完成: 完成任务+{successful_count}, 错误+{failed_count}")
+            except Exception as stats_error:
+                print(f"❌ 统计更新失败: {stats_error}")
 
-            return {'success': True, 'message': f'批量混剪任务已启动 (共{count}个视频)'}
+            self._publish_job_finished(job, total_failed == 0, total_successful, total_failed)
 
         except Exception as e:
-            self.automix_status['running'] = False
-            return {'success': False, 'error': str(e)}
+            job.update(status='failed', error=str(e), progress='批量混剪失败')
+
+            # 更新错误统计
+            self._increment_error_count()
+            self._publish_job_finished(job, False, 0, count)
+
+    def _publish_job_finished(self, job, success, successful_count, failed_count):
+        """记录任务结束并发布结束事件，通知SSE客户端拉取最终结果"""
+        if job.is_cancel_requested():
+            journal_status = 'cancelled'
+        else:
+            journal_status = 'completed' if success else 'failed'
+        self.job_journal.record_job_finished(job.job_id, journal_status)
+
+        self.progress_bus.publish(
+            'job_finished',
+            job_id=job.job_id,
+            success=success,
+            cancelled=job.is_cancel_requested(),
+            successful_count=successful_count,
+            failed_count=failed_count,
+            percent=100.0,
+            message=job.get('progress', '')
+        )
 
     def _calculate_batch_statistics(self, results, successful_count, failed_count):
         """计算批量混剪的统计信息"""
@@ -802,8 +943,8 @@ class OptimizedWebInterface:
                         self.exclusion_manager.add_excluded_transition(effect_name)
                         excluded_count += 1
 
-            # 清除缓存
-            self._cache['exclusions'] = None
+            # 标记排除统计快照失效
+            self.exclusion_snapshot.invalidate()
 
             return {'success': True, 'excluded_count': excluded_count}
         except Exception as e:
@@ -827,8 +968,8 @@ class OptimizedWebInterface:
                         self.exclusion_manager.remove_excluded_transition(effect_name)
                         included_count += 1
 
-            # 清除缓存
-            self._cache['exclusions'] = None
+            # 标记排除统计快照失效
+            self.exclusion_snapshot.invalidate()
 
             return {'success': True, 'included_count': included_count}
         except Exception as e:
@@ -837,13 +978,11 @@ class OptimizedWebInterface:
     def reset_all_exclusions(self):
         """重置所有排除设置"""
         try:
-            # 清空所有排除列表
-            self.exclusion_manager.excluded_effects.clear()
-            self.exclusion_manager.excluded_filters.clear()
-            self.exclusion_manager.excluded_transitions.clear()
+            # 清空所有排除列表（同时写回排除列表文件）
+            self.exclusion_manager.clear_all_exclusions()
 
-            # 清除缓存
-            self._cache['exclusions'] = None
+            # 标记排除统计快照失效
+            self.exclusion_snapshot.invalidate()
 
             return {'success': True, 'message': '已重置所有排除设置'}
         except Exception as e:
@@ -922,12 +1061,13 @@ class OptimizedWebInterface:
         """保存滤镜设置"""
         try:
             # 保存滤镜强度设置到配置管理器
-            success = True
-            success &= self.config_manager._set_config_value('filter_intensity_min', min_intensity)
-            success &= self.config_manager._set_config_value('filter_intensity_max', max_intensity)
+            success, _ = self.config_manager.update(
+                filter_intensity_min=min_intensity,
+                filter_intensity_max=max_intensity
+            )
 
-            # 清除缓存
-            self._cache['config'] = None
+            # 标记配置快照失效
+            self.config_snapshot.invalidate()
 
             return {'success': success, 'message': f'滤镜强度设置已保存: {min_intensity}-{max_intensity}%'}
         except Exception as e:
@@ -971,14 +1111,16 @@ class OptimizedWebInterface:
         """保存转场设置"""
         try:
             # 保存转场设置到配置管理器
-            success = True
-            success &= self.config_manager._set_config_value('transition_min_duration', min_duration)
-            success &= self.config_manager._set_config_value('transition_max_duration', max_duration)
-            success &= self.config_manager._set_config_value('transition_probability', probability)
-            success &= self.config_manager._set_config_value('transition_max_consecutive', max_consecutive)
+            # 页面提交的概率是百分比，配置中保存0.0-1.0的概率
+            success, _ = self.config_manager.update(
+                transition_min_duration=min_duration,
+                transition_max_duration=max_duration,
+                transition_probability=float(probability) / 100,
+                transition_max_consecutive=max_consecutive
+            )
 
-            # 清除缓存
-            self._cache['config'] = None
+            # 标记配置快照失效
+            self.config_snapshot.invalidate()
 
             return {
                 'success': success,
@@ -1029,8 +1171,8 @@ class OptimizedWebInterface:
                         excluded_count += 1
                         total_excluded += 1
 
-            # 清除缓存
-            self._cache['exclusions'] = None
+            # 标记排除统计快照失效
+            self.exclusion_snapshot.invalidate()
 
             if exclude_type == 'all':
                 return {
@@ -1063,45 +1205,36 @@ class OptimizedWebInterface:
                 'timestamp': current_time.strftime('%Y-%m-%d %H:%M:%S')
             }
 
-            # 活跃任务数量
-            active_tasks = 0
-            if self.automix_status['running']:
-                active_tasks = 1
-
-            # 今日完成任务数（真实数据）
-            self._reset_daily_statistics_if_needed()
-            completed_today = self.task_statistics['completed_today']
+            # 活跃任务数量（排队中+运行中）
+            active_jobs = self.job_queue.get_active_jobs()
+            active_tasks = len(active_jobs)
+            running_jobs = [job for job in active_jobs if job.status == 'running']
 
-            # 错误次数（真实数据）
-            error_count = self.task_statistics['error_count_today']
+            # 今日完成任务数与错误次数（真实数据）
+            statistics = self.task_statistics
+            completed_today = statistics['completed_today']
+            error_count = statistics['error_count_today']
 
             # 当前操作状态
             current_operation = '空闲中'
             progress = 0
-            if self.automix_status['running']:
-                current_operation = self.automix_status.get('progress', '处理中...')
-                # 简单的进度估算
-                if '初始化' in current_operation:
-                    progress = 10
-                elif '扫描' in current_operation:
-                    progress = 20
-                elif '选择' in current_operation:
-                    progress = 30
-                elif '视频' in current_operation:
-                    progress = 50
-                elif '特效' in current_operation:
-                    progress = 70
-                elif '音频' in current_operation:
-                    progress = 80
-                elif '保存' in current_operation:
-                    progress = 90
-                elif '完成' in current_operation:
-                    progress = 100
-                else:
-                    progress = 50
+            stage = None
+            if running_jobs:
+                # 显示最早开始的运行中任务，进度取自任务记录中的结构化进度
+                job = running_jobs[0]
+                current_operation = job.get('progress', '处理中...')
+                progress = job.get('percent', 0)
+                stage = {
+                    'job_id': job.job_id,
+                    'name': job.get('stage'),
+                    'current_count': job.get('current_count'),
+                    'total_count': job.get('total_count')
+                }
+            elif active_jobs:
+                current_operation = f'{len(active_jobs)}个任务排队中'
 
             # 获取计数变化信息
-            task_change_info = self.task_statistics.get('last_increment', {})
+            task_change_info = statistics.get('last_increment', {})
 
             return {
                 'success': True,
@@ -1111,6 +1244,7 @@ class OptimizedWebInterface:
                 'error_count': error_count,
                 'current_operation': current_operation,
                 'progress': progress,
+                'stage': stage,
                 'logs': self._get_recent_logs(),
                 'task_change': task_change_info  # 新增：任务计数变化信息
             }
@@ -1139,11 +1273,11 @@ class OptimizedWebInterface:
         current_time = datetime.datetime.now()
 
         # 添加当前任务日志
-        if self.automix_status['running']:
+        for job in self.job_queue.get_active_jobs():
             logs.append({
                 'time': current_time.strftime('%H:%M:%S'),
                 'type': 'info',
-                'message': self.automix_status.get('progress', '处理中...')
+                'message': job.get('progress', '处理中...')
             })
 
         # 添加系统启动日志
@@ -1157,7 +1291,18 @@ class OptimizedWebInterface:
 
 # 创建Flask应用
 app = Flask(__name__)
-web_interface = OptimizedWebInterface()
+
+# Web界面实例在首次使用时创建：导入本模块不会续跑任务、启动后台线程或写入data目录
+_web_interface = None
+_web_interface_lock = threading.Lock()
+
+def get_web_interface():
+    """获取Web界面实例（首次调用时创建）"""
+    global _web_interface
+    with _web_interface_lock:
+        if _web_interface is None:
+            _web_interface = OptimizedWebInterface()
+        return _web_interface
 
 @app.route('/')
 def index():
@@ -1175,34 +1320,53 @@ def test():
     except Exception as e:
         return f"<h1>测试页面</h1><p>Flask服务器正常运行</p><p>模板错误: {str(e)}</p>"
 
+def snapshot_response(snapshot):
+    """以ETag返回版本化快照，客户端缓存仍然有效时返回304"""
+    try:
+        data, etag = snapshot.get()
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+    response = jsonify(data)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
 @app.route('/api/config')
 def get_config():
     """获取配置信息API"""
-    config = web_interface.get_config_info()
-    return jsonify(config)
+    return snapshot_response(get_web_interface().config_snapshot)
 
 @app.route('/api/config', methods=['POST'])
 def update_config():
     """更新配置API"""
     config_data = request.get_json()
-    result = web_interface.update_config(config_data)
+    result = get_web_interface().update_config(config_data)
     return jsonify(result)
 
 @app.route('/api/exclusions')
 def get_exclusions():
     """获取排除统计API"""
-    stats = web_interface.get_exclusion_stats()
-    return jsonify(stats)
+    return snapshot_response(get_web_interface().exclusion_snapshot)
 
 @app.route('/api/system/status')
 def get_system_status():
     """获取系统状态API"""
     try:
-        result = web_interface.get_system_status()
+        result = get_web_interface().get_system_status()
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/statistics/history')
+def get_statistics_history():
+    """获取按天的任务吞吐历史API"""
+    try:
+        days = min(max(int(request.args.get('days', 30)), 1), get_web_interface().statistics_store.history_days)
+        return jsonify({'success': True, 'history': get_web_interface().statistics_store.get_history(days)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/test/increment', methods=['POST'])
 def test_increment():
     """测试统计增量API"""
@@ -1211,9 +1375,10 @@ def test_increment():
         increment_type = data.get('type', 'completed')
 
         if increment_type == 'completed':
-            web_interface._increment_completed_tasks()
-            current_count = web_interface.task_statistics['completed_today']
-            change_info = web_interface.task_statistics.get('last_increment', {})
+            get_web_interface()._increment_completed_tasks()
+            statistics = get_web_interface().task_statistics
+            current_count = statistics['completed_today']
+            change_info = statistics.get('last_increment', {})
             return jsonify({
                 'success': True,
                 'message': f'完成任务计数+1，当前: {current_count}',
@@ -1221,7 +1386,7 @@ def test_increment():
                 'change_info': change_info
             })
         elif increment_type == 'error':
-            web_interface._increment_error_count()
+            get_web_interface()._increment_error_count()
             return jsonify({'success': True, 'message': '错误计数+1'})
         else:
             return jsonify({'success': False, 'error': '无效的增量类型'})
@@ -1233,8 +1398,8 @@ def test_mock_automix():
     """测试模拟混剪完成状态"""
     try:
         # 模拟混剪完成的状态
-        web_interface.automix_status = {
-            'running': False,
+        job = get_web_interface().job_queue.add_finished_job('single', {
+            'status': 'completed',
             'progress': '混剪完成',
             'error': None,
             'current_count': 1,
@@ -1258,12 +1423,13 @@ def test_mock_automix():
                     'product_model': 'TestProduct'
                 }
             }
-        }
+        })
 
         return jsonify({
             'success': True,
             'message': '模拟混剪状态已设置',
-            'status': web_interface.automix_status
+            'job_id': job.job_id,
+            'status': job.to_dict()
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1271,13 +1437,20 @@ def test_mock_automix():
 @app.route('/api/products')
 def get_products():
     """获取产品列表API"""
-    products = web_interface.get_available_products()
+    products = get_web_interface().get_available_products()
     return jsonify(products)
 
 @app.route('/api/status')
 def get_status():
-    """获取状态信息API"""
-    status = web_interface.automix_status.copy()
+    """获取状态信息API（可通过job_id参数指定任务，默认最近提交的任务）"""
+    job_id = request.args.get('job_id')
+    if job_id:
+        job = get_web_interface().job_queue.get_job(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': '任务不存在'}), 404
+        status = job.to_dict()
+    else:
+        status = get_web_interface().automix_status
 
     # 如果有结果，添加详细的统计信息
     if status.get('result') and isinstance(status['result'], dict):
@@ -1310,6 +1483,78 @@ def get_status():
 
     return jsonify(status)
 
+@app.route('/api/jobs')
+def list_jobs():
+    """获取混剪任务列表API"""
+    return jsonify({'success': True, 'jobs': get_web_interface().job_queue.list_jobs()})
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """提交混剪任务API（type为single或batch）"""
+    try:
+        data = request.get_json()
+        job_type = data.get('type', 'single')
+        product = data.get('product')
+
+        if not product:
+            return jsonify({'success': False, 'error': '未指定产品'})
+
+        if job_type == 'single':
+            result = get_web_interface().start_single_automix(product, data.get('duration', 35), data.get('seed'))
+        elif job_type == 'batch':
+            result = get_web_interface().start_batch_automix(
+                product,
+                data.get('count', 5),
+                data.get('min_duration', 30),
+                data.get('max_duration', 40),
+                data.get('seed')
+            )
+        else:
+            return jsonify({'success': False, 'error': f'无效的任务类型: {job_type}'})
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """获取单个混剪任务API"""
+    job = get_web_interface().job_queue.get_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': '任务不存在'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """取消混剪任务API"""
+    result = get_web_interface().cancel_job(job_id)
+    return jsonify(result), (404 if result.get('error') == '任务不存在' else 200)
+
+@app.route('/api/events')
+def stream_events():
+    """混剪进度事件流API（Server-Sent Events）"""
+    subscriber = get_web_interface().progress_bus.subscribe()
+
+    def generate():
+        try:
+            while True:
+                try:
+                    event = subscriber.get(timeout=15)
+                except queue.Empty:
+                    # 心跳注释，保持连接不被代理断开
+                    yield ': keep-alive\n\n'
+                    continue
+                data = json.dumps(event, ensure_ascii=False)
+                yield f"id: {event['id']}\ndata: {data}\n\n"
+        finally:
+            get_web_interface().progress_bus.unsubscribe(subscriber)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/automix/single', methods=['POST'])
 def start_single_automix():
     """启动单个混剪API"""
@@ -1322,7 +1567,7 @@ def start_single_automix():
             return jsonify({'success': False, 'error': '未指定产品'})
 
         # 启动混剪任务
-        result = web_interface.start_single_automix(product, duration)
+        result = get_web_interface().start_single_automix(product, duration, data.get('seed'))
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1341,7 +1586,7 @@ def start_batch_automix():
             return jsonify({'success': False, 'error': '未指定产品'})
 
         # 启动批量混剪任务
-        result = web_interface.start_batch_automix(product, count, min_duration, max_duration)
+        result = get_web_interface().start_batch_automix(product, count, min_duration, max_duration, data.get('seed'))
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1353,7 +1598,7 @@ def smart_exclude_effects():
         data = request.get_json()
         exclude_type = data.get('type', 'all')
 
-        result = web_interface.smart_exclude_effects(exclude_type)
+        result = get_web_interface().smart_exclude_effects(exclude_type)
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1366,7 +1611,7 @@ def search_effects():
         search_term = data.get('search_term', '')
         effect_type = data.get('effect_type', 'all')
 
-        result = web_interface.search_effects(search_term, effect_type)
+        result = get_web_interface().search_effects(search_term, effect_type)
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1378,7 +1623,7 @@ def exclude_effects():
         data = request.get_json()
         effect_ids = data.get('effect_ids', [])
 
-        result = web_interface.exclude_effects(effect_ids)
+        result = get_web_interface().exclude_effects(effect_ids)
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1390,7 +1635,7 @@ def include_effects():
         data = request.get_json()
         effect_ids = data.get('effect_ids', [])
 
-        result = web_interface.include_effects(effect_ids)
+        result = get_web_interface().include_effects(effect_ids)
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1399,7 +1644,7 @@ def include_effects():
 def reset_effects():
     """重置特效排除API"""
     try:
-        result = web_interface.reset_all_exclusions()
+        result = get_web_interface().reset_all_exclusions()
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1412,7 +1657,7 @@ def search_filters():
         search_term = data.get('search_term', '')
         category = data.get('category', 'all')
 
-        result = web_interface.search_filters(search_term, category)
+        result = get_web_interface().search_filters(search_term, category)
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1425,7 +1670,7 @@ def save_filter_settings():
         min_intensity = data.get('min_intensity', 15)
         max_intensity = data.get('max_intensity', 25)
 
-        result = web_interface.save_filter_settings(min_intensity, max_intensity)
+        result = get_web_interface().save_filter_settings(min_intensity, max_intensity)
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1438,7 +1683,7 @@ def search_transitions():
         search_term = data.get('search_term', '')
         transition_type = data.get('type', 'all')
 
-        result = web_interface.search_transitions(search_term, transition_type)
+        result = get_web_interface().search_transitions(search_term, transition_type)
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1453,7 +1698,7 @@ def save_transition_settings():
         probability = data.get('probability', 80)
         max_consecutive = data.get('max_consecutive', 3)
 
-        result = web_interface.save_transition_settings(min_duration, max_duration, probability, max_consecutive)
+        result = get_web_interface().save_transition_settings(min_duration, max_duration, probability, max_consecutive)
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1468,7 +1713,7 @@ def test_pexels_api():
         if not api_key:
             return jsonify({'success': False, 'error': 'API密钥不能为空'})
 
-        result = web_interface.test_pexels_api_key(api_key)
+        result = get_web_interface().test_pexels_api_key(api_key)
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1504,6 +1749,9 @@ def main():
 
     print("✅ 项目结构检查通过")
     print()
+
+    # 启动时即创建Web界面：续跑中断的任务、开始预取覆盖视频
+    get_web_interface()
     print("🚀 启动Web服务器...")
     print("📱 浏览器访问: http://localhost:5001")
     print("⚙️  功能: 重构版界面，性能优化，一级二级菜单")